@@ -0,0 +1,83 @@
+"""
+Командная строка WolfEye.
+
+    python -m app ingest <каталог> [-o scores.jsonl] [--workers N] ...
+    python -m app serve [--host 0.0.0.0] [--port 8000] [--workers N] ...
+"""
+
+import argparse
+import json
+import logging
+import sys
+from typing import List, Optional
+
+
+def _ingest(args: argparse.Namespace) -> int:
+    # Импорт здесь, чтобы --help не тянул за собой pypdf и LLM-стек
+    from app.application.core import CoreML
+    from app.application.ingest import IngestPipeline
+
+    core = CoreML(
+        max_in_flight=args.max_in_flight,
+        chunk_size=args.chunk_size,
+        fio_batch_size=args.fio_batch_size,
+    )
+    pipeline = IngestPipeline(workers=args.workers, queue_size=args.queue_size, core=core)
+    stats = pipeline.run(args.directory, args.output, checkpoint=args.checkpoint, fmt=args.format)
+    print(json.dumps(stats, ensure_ascii=False, indent=2), file=sys.stderr)
+    return 0
+
+
+def _serve(args: argparse.Namespace) -> int:
+    import uvicorn
+
+    from app.presentation.api import create_app
+
+    app = create_app(
+        workers=args.workers,
+        max_batch=args.max_batch,
+        max_wait=args.max_wait_ms / 1000 if args.max_wait_ms is not None else None,
+        queue_size=args.queue_size,
+    )
+    # Один процесс: очередь и микропакеты общие для всех соединений
+    uvicorn.run(app, host=args.host, port=args.port, log_level="info", access_log=False)
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app", description="WolfEye: скоринг резюме")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    ingest = commands.add_parser("ingest", help="Обработать каталог PDF-резюме")
+    ingest.add_argument("directory", help="Каталог с PDF (обходится рекурсивно)")
+    ingest.add_argument("-o", "--output", default="scores.jsonl", help="Выходной файл .jsonl или .csv")
+    ingest.add_argument("--format", choices=("jsonl", "csv"), help="Формат вывода (по умолчанию — по расширению)")
+    ingest.add_argument("--checkpoint", help="Файл checkpoint (по умолчанию — <output>.checkpoint)")
+    ingest.add_argument("--workers", type=int, help="Процессов извлечения (по умолчанию — число ядер)")
+    ingest.add_argument("--queue-size", type=int, default=256, help="Ёмкость очередей между этапами")
+    ingest.add_argument("--max-in-flight", type=int, default=16, help="Одновременных LLM-запросов")
+    ingest.add_argument("--chunk-size", type=int, default=64, help="Порция резюме для скоринга")
+    ingest.add_argument("--fio-batch-size", type=int, default=1, help="ФИО в одном запросе к LLM")
+    ingest.set_defaults(handler=_ingest)
+
+    serve = commands.add_parser("serve", help="Запустить HTTP API скоринга")
+    serve.add_argument("--host", default="127.0.0.1", help="Адрес")
+    serve.add_argument("--port", type=int, default=8000, help="Порт")
+    serve.add_argument("--workers", type=int, help="Одновременно обрабатываемых микропакетов (SERVICE_WORKERS)")
+    serve.add_argument("--max-batch", type=int, help="Резюме в микропакете (SERVICE_MAX_BATCH)")
+    serve.add_argument("--max-wait-ms", type=float, help="Ожидание добора микропакета, мс (SERVICE_MAX_WAIT)")
+    serve.add_argument("--queue-size", type=int, help="Ёмкость очереди (SERVICE_QUEUE_SIZE)")
+    serve.set_defaults(handler=_serve)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    args = build_parser().parse_args(argv)
+    from app.infrastructure.telemetry import configure_telemetry
+    configure_telemetry()
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,197 @@
+"""
+Асинхронная очередь скоринга с микропакетами для HTTP-сервиса.
+
+Запросы, пришедшие почти одновременно, собираются в пакет (до max_batch
+резюме или max_wait секунд ожидания) и уходят в CoreML.score_batch одним
+вызовом — так проверки ФИО из разных запросов попадают в общие пакетные
+запросы к LLM. Пакеты обрабатывают workers обработчиков в пуле потоков,
+событийный цикл при этом не блокируется.
+
+Очередь ограничена: если она заполнена, новый запрос сразу получает
+QueueFullError (сервис отвечает 503), а не ждёт, раздувая задержку
+всех остальных.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from app.application.core import CoreML
+from app.domain.models import Rezume, ScoreResult
+
+
+class QueueFullError(RuntimeError):
+    """Очередь скоринга заполнена — запрос нужно повторить позже."""
+
+
+_STOP = object()
+
+
+class BatchScorer:
+    """
+    Использование:
+        scorer = BatchScorer(CoreML(fio_batch_size=20), workers=4)
+        await scorer.start()
+        result = await scorer.score(rezume)
+        await scorer.stop()
+    """
+
+    def __init__(
+        self,
+        core: CoreML,
+        *,
+        workers: int = 4,
+        max_batch: int = 32,
+        max_wait: float = 0.005,
+        queue_size: int = 1024,
+    ):
+        """
+        Args:
+            core: Экземпляр CoreML (для общих LLM-пакетов — с fio_batch_size > 1)
+            workers: Сколько пакетов обрабатывать одновременно
+            max_batch: Максимальный размер микропакета
+            max_wait: Сколько ждать добора пакета после первого резюме, секунды
+            queue_size: Ёмкость очереди ожидающих резюме
+        """
+        if workers < 1 or max_batch < 1 or queue_size < 1:
+            raise ValueError("workers, max_batch и queue_size должны быть >= 1")
+        if max_wait < 0:
+            raise ValueError("max_wait не может быть отрицательным")
+        self._core = core
+        self._workers = workers
+        self._max_batch = max_batch
+        self._max_wait = max_wait
+        self._queue_size = queue_size
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        self._batches = 0
+        self._items = 0
+        self._rejected = 0
+        self._busy = 0
+        self._busy_seconds = 0.0
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    async def start(self) -> None:
+        """Запускает обработчиков (в текущем событийном цикле)."""
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue(maxsize=self._queue_size)
+        self._executor = ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="score")
+        self._tasks = [asyncio.create_task(self._worker(), name=f"score-worker-{i}") for i in range(self._workers)]
+
+    async def stop(self) -> None:
+        """Дорабатывает уже принятые резюме и останавливает обработчиков."""
+        if not self._tasks:
+            return
+        for _ in self._tasks:
+            await self._queue.put(_STOP)
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._executor.shutdown(wait=True)
+        self._executor = None
+
+    async def score(self, rezume: Rezume) -> ScoreResult:
+        """
+        Скоринг одного резюме в составе ближайшего микропакета.
+
+        Raises:
+            QueueFullError: Если очередь заполнена
+        """
+        return (await self.score_many([rezume]))[0]
+
+    async def score_many(self, rezumes: Sequence[Rezume]) -> List[ScoreResult]:
+        """
+        Скоринг нескольких резюме; принимаются либо все, либо ни одного.
+
+        Raises:
+            QueueFullError: Если в очереди не хватает места
+        """
+        if not self._tasks:
+            raise RuntimeError("BatchScorer не запущен")
+        if self._queue_size - self._queue.qsize() < len(rezumes):
+            self._rejected += len(rezumes)
+            raise QueueFullError("Очередь скоринга заполнена")
+        loop = asyncio.get_running_loop()
+        futures = []
+        for rezume in rezumes:
+            future = loop.create_future()
+            # Места проверены выше, а между put_nowait нет await — гонки нет
+            self._queue.put_nowait((rezume, future))
+            futures.append(future)
+        return list(await asyncio.gather(*futures))
+
+    async def _worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await self._queue.get()
+            if item is _STOP:
+                return
+            batch, stop = await self._collect(item, loop)
+            await self._run(batch, loop)
+            if stop:
+                return
+
+    async def _collect(self, first: Tuple[Rezume, asyncio.Future], loop) -> Tuple[list, bool]:
+        """Добирает пакет: сначала то, что уже в очереди, затем ждёт до max_wait."""
+        batch = [first]
+        deadline = loop.time() + self._max_wait
+        while len(batch) < self._max_batch:
+            try:
+                item = self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    async def _run(self, batch: list, loop) -> None:
+        # Клиент мог уже отключиться — такие резюме не считаем
+        batch = [(rezume, future) for rezume, future in batch if not future.done()]
+        if not batch:
+            return
+        self._busy += 1
+        started = time.perf_counter()
+        try:
+            results = await loop.run_in_executor(self._executor, self._core.score_batch, [r for r, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            self._busy -= 1
+            self._busy_seconds += time.perf_counter() - started
+        self._batches += 1
+        self._items += len(batch)
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    def stats(self) -> Dict[str, Any]:
+        """Состояние очереди и счётчики микропакетов."""
+        return {
+            "workers": self._workers,
+            "busy_workers": self._busy,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "queue_size": self._queue_size,
+            "batches": self._batches,
+            "items": self._items,
+            "mean_batch": self._items / self._batches if self._batches else 0.0,
+            "rejected": self._rejected,
+            "busy_seconds": self._busy_seconds,
+        }
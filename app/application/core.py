@@ -1,24 +1,363 @@
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from app.application.incremental import ComponentStore, Fingerprints, component_fingerprints
 from app.application.services.age_education_analysis import analyze_age_education_comprehensive
-from app.application.services.company import analyze_company
-from app.application.services.education import analyze_education
-from app.application.services.fio import check_fio
+from app.application.services.age_education_columnar import analyze_age_education_batch
+from app.application.services.duplicates import DuplicateDetector
+from app.application.services.company import analyze_company, analyze_company_batch
+from app.application.services.education import analyze_education, analyze_education_batch
+from app.application.services.fio import check_fio, check_fio_batch, check_fio_local
+from app.infrastructure.llm import LLMService, get_llm
+from app.infrastructure.llm.circuit_breaker import LLMUnavailableError
+from app.infrastructure.telemetry import span
+
+from app.domain.batch import RezumeBatch
+from app.domain.models import NameParts, Rezume, ScoreResult
 
-from app.domain.models import Rezume
+logger = logging.getLogger(__name__)
+
+# Надбавка к баллу, если тот же текст прислали другие люди (шаблон со сменой ФИО)
+DUPLICATE_WEIGHT = 30
 
 ### Пока неизвестна функция финального просчета, поэтому решил пока оставить как есть
 class CoreML:
-    def __init__(self):
-        pass
+    def __init__(
+        self,
+        max_in_flight: int = 16,
+        chunk_size: int = 1000,
+        fio_batch_size: int = 1,
+        llm: Optional[LLMService] = None,
+        component_store: Optional[ComponentStore] = None,
+        duplicates: Optional[DuplicateDetector] = None,
+    ):
+        """
+        Args:
+            max_in_flight: Максимальное число одновременных LLM-запросов при пакетном скоринге
+            chunk_size: Размер порции резюме, обрабатываемой за один проход в пакетном режиме
+            fio_batch_size: Сколько ФИО проверять одним запросом к LLM (1 — по одному)
+            llm: LLM сервис этого экземпляра (None — глобальный, создаётся при первом запросе)
+            component_store: Кэш значений компонентов по отпечаткам входов; с ним
+                повторный скоринг изменённого резюме пересчитывает только то, что
+                зависит от изменённых полей (None — считать всё заново)
+            duplicates: Индекс резюме-дубликатов; с ним каждое резюме добавляется
+                в индекс, а совпадение текста с резюме других людей повышает
+                балл на DUPLICATE_WEIGHT (None — резюме оцениваются по отдельности)
+        """
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight должен быть >= 1")
+        if chunk_size < 1:
+            raise ValueError("chunk_size должен быть >= 1")
+        if fio_batch_size < 1:
+            raise ValueError("fio_batch_size должен быть >= 1")
+        self._max_in_flight = max_in_flight
+        self._chunk_size = chunk_size
+        self._fio_batch_size = fio_batch_size
+        self._llm = llm
+        self._components = component_store
+        self._duplicates = duplicates
+
+    @property
+    def llm(self) -> LLMService:
+        """LLM сервис экземпляра (глобальный, если свой не передан)."""
+        return self._llm or get_llm()
 
     def get_score(self, rezume: Rezume) -> int:
-        fio_score = check_fio(rezume.fio)
-        age_education_score = analyze_age_education_comprehensive(rezume.born_date, rezume.first_work, rezume.education)
-        education_score = analyze_education(rezume.education, rezume.residence_city)
-        company_score = analyze_company(rezume.places)
-        
+        return self.score(rezume).score
+
+    def score(self, rezume: Rezume) -> ScoreResult:
+        """
+        Скоринг одного резюме с признаком деградации.
+
+        Если LLM недоступна (сбой или разомкнутый выключатель), ФИО оценивается
+        только локальными проверками, а результат помечается degraded=True.
+        С component_store компоненты с неизменившимися входами не пересчитываются
+        и перечисляются в ScoreResult.reused. С индексом дубликатов в
+        ScoreResult.duplicates — сколько других людей прислали почти тот же текст.
+
+        Args:
+            rezume: Резюме для скоринга
+
+        Returns:
+            ScoreResult: Итоговый балл
+        """
+        with span("core.score") as score_span:
+            prints = self._fingerprints(rezume)
+            reused: List[str] = []
+            fio_score, degraded = self._reuse("fio", prints, reused), False
+            if fio_score is None:
+                with span("core.fio"):
+                    try:
+                        fio_score = check_fio(rezume.fio, llm=self._llm)
+                    except LLMUnavailableError:
+                        fio_score, degraded = check_fio_local(rezume.fio), True
+                if not degraded:
+                    self._remember("fio", prints, fio_score)
+            score_span.set("degraded", degraded)
+            rules = self._rule_scores(rezume, prints, reused)
+            duplicates = self._count_duplicates(rezume)
+            return ScoreResult(
+                score=self._with_duplicates(self._combine(fio_score, rules), duplicates),
+                degraded=degraded,
+                reused=reused,
+                duplicates=duplicates,
+            )
+
+    def score_batch(self, rezumes: Union[Iterable[Rezume], RezumeBatch]) -> List[ScoreResult]:
+        """
+        Скоринг пакета резюме.
+
+        Правила без LLM считаются для всей порции сразу, проверки ФИО
+        уходят в LLM параллельно (не более max_in_flight запросов одновременно).
+        Ошибка в одном резюме не останавливает обработку остальных; при
+        недоступности LLM результат считается по локальным проверкам (degraded).
+
+        RezumeBatch обрабатывается колоночно: правила считаются над массивами
+        всего пакета, а каждое уникальное ФИО проверяется один раз.
+
+        Args:
+            rezumes: Резюме для скоринга (список, итератор или RezumeBatch)
+
+        Returns:
+            List[ScoreResult]: Результаты в порядке входных резюме
+        """
+        return list(self.iter_score_batch(rezumes))
+
+    def iter_score_batch(self, rezumes: Union[Iterable[Rezume], RezumeBatch]) -> Iterator[ScoreResult]:
+        """
+        Генераторный вариант score_batch: читает вход порциями по chunk_size
+        и отдаёт результаты по мере готовности, сохраняя порядок.
+
+        Args:
+            rezumes: Резюме для скоринга (может быть ленивым итератором или RezumeBatch)
+
+        Yields:
+            ScoreResult: Результат для очередного резюме
+        """
+        if isinstance(rezumes, RezumeBatch):
+            yield from self._score_rezume_batch(rezumes)
+            return
+        with ThreadPoolExecutor(max_workers=self._max_in_flight, thread_name_prefix="fio") as pool:
+            chunk: List[Rezume] = []
+            for rezume in rezumes:
+                chunk.append(rezume)
+                if len(chunk) >= self._chunk_size:
+                    yield from self._timed_chunk(chunk, pool)
+                    chunk = []
+            if chunk:
+                yield from self._timed_chunk(chunk, pool)
+
+    def _timed_chunk(self, chunk: List[Rezume], pool: ThreadPoolExecutor) -> List[ScoreResult]:
+        # Результаты отдаются уже после span'а: внутри yield замер включал бы время потребителя
+        with span("core.chunk", size=len(chunk)):
+            return self._score_chunk(chunk, pool)
+
+    def _score_chunk(self, chunk: List[Rezume], pool: ThreadPoolExecutor) -> List[ScoreResult]:
+        prints = [self._fingerprints(rezume) for rezume in chunk]
+        reused: List[List[str]] = [[] for _ in chunk]
+        cached_fio = [self._reuse("fio", p, r) for p, r in zip(prints, reused)]
+
+        # Сначала отправляем LLM-проверки, чтобы сеть работала, пока считаются правила
+        to_check = [index for index, value in enumerate(cached_fio) if value is None]
+        submitted = iter(self._submit_fio([chunk[index].fio for index in to_check], pool))
+        fio_scores: List[Callable[[], float]] = [
+            next(submitted) if value is None else partial(_cached, value) for value in cached_fio
+        ]
+
+        rule_scores: List[Tuple[Optional[Tuple[float, float, float]], Optional[str]]] = []
+        duplicates: List[int] = []
+        for rezume, rezume_prints, rezume_reused in zip(chunk, prints, reused):
+            try:
+                rule_scores.append((self._rule_scores(rezume, rezume_prints, rezume_reused), None))
+            except Exception as e:
+                rule_scores.append((None, _format_error(e)))
+            duplicates.append(self._count_duplicates(rezume))
+
+        results: List[ScoreResult] = []
+        for i, (rezume, fio_score_getter, (rules, rules_error)) in enumerate(zip(chunk, fio_scores, rule_scores)):
+            degraded = False
+            try:
+                try:
+                    fio_score = fio_score_getter()
+                except LLMUnavailableError:
+                    fio_score, degraded = check_fio_local(rezume.fio), True
+            except Exception as e:
+                results.append(ScoreResult(error=_format_error(e)))
+                continue
+            if cached_fio[i] is None and not degraded:
+                self._remember("fio", prints[i], fio_score)
+            if rules_error is not None:
+                results.append(ScoreResult(error=rules_error))
+                continue
+            results.append(ScoreResult(
+                score=self._with_duplicates(self._combine(fio_score, rules), duplicates[i]),
+                degraded=degraded,
+                reused=reused[i],
+                duplicates=duplicates[i],
+            ))
+        return results
+
+    def _score_rezume_batch(self, batch: RezumeBatch) -> List[ScoreResult]:
+        """Колоночный скоринг RezumeBatch (см. score_batch)."""
+        names, inverse = batch.unique_names()
+
+        # Значение, признак деградации и ошибка для каждого уникального ФИО
+        fio_values = np.full(len(names), np.nan)
+        fio_degraded = np.zeros(len(names), dtype=bool)
+        fio_errors: List[Optional[str]] = [None] * len(names)
+        with span("core.batch_fio", names=len(names)), \
+                ThreadPoolExecutor(max_workers=self._max_in_flight, thread_name_prefix="fio") as pool:
+            for start in range(0, len(names), self._chunk_size):
+                chunk = names[start:start + self._chunk_size]
+                for offset, (fio, getter) in enumerate(zip(chunk, self._submit_fio(chunk, pool))):
+                    index = start + offset
+                    try:
+                        try:
+                            fio_values[index] = getter()
+                        except LLMUnavailableError:
+                            fio_values[index], fio_degraded[index] = check_fio_local(fio), True
+                    except Exception as e:
+                        fio_errors[index] = _format_error(e)
+
+        try:
+            with span("core.batch_rules", size=len(batch)):
+                rules = (
+                    analyze_age_education_batch(batch),
+                    analyze_education_batch(batch),
+                    analyze_company_batch(batch),
+                )
+        except Exception as e:
+            error = _format_error(e)
+            return [ScoreResult(error=error) for _ in range(len(batch))]
+        duplicates = np.array([self._count_duplicates(row) for row in batch], dtype=np.int64)
+
+        final = self._combine_columns(fio_values[inverse], rules)
+        final = np.minimum(np.where(duplicates > 0, final + DUPLICATE_WEIGHT, final), 100.0)
+        degraded = fio_degraded[inverse]
+        results: List[ScoreResult] = []
+        for row, name_index in enumerate(inverse):
+            error = fio_errors[name_index]
+            if error is not None:
+                results.append(ScoreResult(error=error))
+            else:
+                results.append(ScoreResult(
+                    score=float(final[row]), degraded=bool(degraded[row]), duplicates=int(duplicates[row])
+                ))
+        return results
+
+    def _submit_fio(self, names: List[NameParts], pool: ThreadPoolExecutor) -> List[Callable[[], float]]:
+        """Отправляет проверки ФИО в пул; возвращает по функции получения результата на каждое ФИО."""
+        if self._fio_batch_size == 1:
+            return [pool.submit(check_fio, fio, llm=self._llm).result for fio in names]
+
+        getters: List[Callable[[], float]] = []
+        for start in range(0, len(names), self._fio_batch_size):
+            names_slice = names[start:start + self._fio_batch_size]
+            future = pool.submit(check_fio_batch, names_slice, llm=self._llm)
+            getters.extend(
+                partial(_batch_item, future, index, data, self._llm) for index, data in enumerate(names_slice)
+            )
+        return getters
+
+    def _rule_scores(
+        self,
+        rezume: Rezume,
+        prints: Optional[Fingerprints] = None,
+        reused: Optional[List[str]] = None,
+    ) -> Tuple[float, float, float]:
+        age_education_score = self._reuse("age_education", prints, reused)
+        if age_education_score is None:
+            with span("core.age_education"):
+                age_education_score = analyze_age_education_comprehensive(
+                    rezume.born_date, rezume.first_work, rezume.education
+                )
+            self._remember("age_education", prints, age_education_score)
+
+        education_score = self._reuse("education", prints, reused)
+        if education_score is None:
+            with span("core.education"):
+                education_score = analyze_education(rezume.education, rezume.residence_city)
+            self._remember("education", prints, education_score)
+
+        company_score = self._reuse("company", prints, reused)
+        if company_score is None:
+            with span("core.company"):
+                company_score = analyze_company(rezume.places, rezume.work_history)
+            self._remember("company", prints, company_score)
+        return age_education_score, education_score, company_score
+
+    def _count_duplicates(self, rezume: Rezume) -> int:
+        # Не кэшируется в ComponentStore: сигнал зависит от других резюме
+        if self._duplicates is None:
+            return 0
+        with span("core.duplicates") as duplicates_span:
+            try:
+                return self._duplicates.check(rezume)
+            except Exception as e:
+                # Сбой общего индекса не должен лишать резюме (и весь пакет) балла
+                duplicates_span.set("error", type(e).__name__)
+                logger.exception("Проверка дубликатов не удалась")
+                return 0
+
+    def _fingerprints(self, rezume: Rezume) -> Optional[Fingerprints]:
+        # Представления строк RezumeBatch не кэшируются: пакет считается колоночно
+        if self._components is None or not isinstance(rezume, Rezume):
+            return None
+        return component_fingerprints(rezume)
+
+    def _reuse(self, component: str, prints: Optional[Fingerprints], reused: Optional[List[str]]) -> Optional[float]:
+        if prints is None:
+            return None
+        value = self._components.get(component, prints[component])
+        if value is not None:
+            reused.append(component)
+        return value
+
+    def _remember(self, component: str, prints: Optional[Fingerprints], value: float) -> None:
+        if prints is not None:
+            self._components.put(component, prints[component], value)
+
+    @staticmethod
+    def _combine(fio_score: float, rules: Tuple[float, float, float]) -> int:
+        age_education_score, education_score, company_score = rules
         final_score = fio_score * 60 + age_education_score * 40 + education_score * 20 + company_score * 10
 
         if final_score > 100:
             final_score = 100
 
-        return final_score 
+        return final_score
+
+    @staticmethod
+    def _with_duplicates(score: float, duplicates: int) -> float:
+        if duplicates > 0:
+            return min(score + DUPLICATE_WEIGHT, 100)
+        return score
+
+    @staticmethod
+    def _combine_columns(fio_scores: np.ndarray, rules: Tuple[np.ndarray, np.ndarray, np.ndarray]) -> np.ndarray:
+        """Векторный _combine без ограничения сверху (порядок сложения тот же)."""
+        age_education_score, education_score, company_score = rules
+        return fio_scores * 60 + age_education_score * 40 + education_score * 20 + company_score * 10
+
+
+def _cached(value: float) -> float:
+    return value
+
+
+def _batch_item(future: "Future[List[float]]", index: int, data, llm: Optional[LLMService]) -> float:
+    try:
+        return future.result()[index]
+    except LLMUnavailableError:
+        # Провайдер недоступен — поштучные запросы тоже не пройдут
+        raise
+    except Exception:
+        # Пакет целиком упал — проверяем ФИО по одному, чтобы ошибка досталась только виновнику
+        return check_fio(data, llm=llm)
+
+
+def _format_error(e: Exception) -> str:
+    return f"{type(e).__name__}: {e}"
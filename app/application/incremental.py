@@ -0,0 +1,118 @@
+"""
+Инкрементальный пересчёт: результаты компонентов скоринга по отпечаткам входов.
+
+Каждая составляющая итогового балла зависит от своей части резюме:
+
+    fio            — fio
+    age_education  — born_date, первая работа, education
+    education      — education, residence_city, сегодняшняя дата
+    company        — places, сегодняшняя дата
+
+Отпечаток компонента — хэш именно этих входов. Дата входит в отпечатки
+education (окончено ли обучение — сравнение с сегодняшним днём) и company
+(незакрытое место работы длится «по сегодня»): иначе после даты выпуска
+или с течением времени кэш отдавал бы устаревшие значения. Если резюме загружено заново
+с новым телефоном или навыком, отпечатки не меняются, и CoreML берёт готовые
+значения из ComponentStore вместо повторного расчёта (в том числе без
+повторного запроса к LLM за ФИО).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Dict, Optional, Tuple
+
+from app.domain.models import Rezume
+
+
+COMPONENTS = ("fio", "age_education", "education", "company")
+
+Fingerprints = Dict[str, str]
+
+
+def component_fingerprints(rezume: Rezume) -> Fingerprints:
+    """
+    Отпечатки входов каждого компонента.
+
+    Args:
+        rezume: Резюме
+
+    Returns:
+        Fingerprints: Компонент → 32 шестнадцатеричных символа
+    """
+    fio = rezume.fio
+    education = rezume.education.model_dump(mode="json")
+    today = date.today().isoformat()
+    return {
+        "fio": _digest("fio", fio.surname, fio.name, fio.father_name),
+        "age_education": _digest("age_education", _iso(rezume.born_date), _iso(rezume.first_work), education),
+        "education": _digest("education", education, rezume.residence_city, today),
+        "company": _digest("company", [place.model_dump(mode="json") for place in rezume.places], today),
+    }
+
+
+def _digest(*parts: Any) -> str:
+    data = json.dumps(parts, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(data.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _iso(value: Optional[date]) -> Optional[str]:
+    return value.isoformat() if value is not None else None
+
+
+class ComponentStore:
+    """
+    Потокобезопасный LRU-кэш значений компонентов по (компонент, отпечаток).
+
+    Деградированные оценки ФИО (LLM была недоступна) сюда не кладутся —
+    при следующем скоринге ФИО будет проверено заново.
+    """
+
+    def __init__(self, max_entries: int = 100_000):
+        """
+        Args:
+            max_entries: Сколько значений хранить (вытесняются давно не использованные)
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries должен быть >= 1")
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._values: "OrderedDict[Tuple[str, str], float]" = OrderedDict()
+        self._hits = dict.fromkeys(COMPONENTS, 0)
+        self._misses = dict.fromkeys(COMPONENTS, 0)
+
+    def get(self, component: str, fingerprint: str) -> Optional[float]:
+        key = (component, fingerprint)
+        with self._lock:
+            value = self._values.get(key)
+            if value is None:
+                self._misses[component] += 1
+                return None
+            self._values.move_to_end(key)
+            self._hits[component] += 1
+            return value
+
+    def put(self, component: str, fingerprint: str, value: float) -> None:
+        key = (component, fingerprint)
+        with self._lock:
+            self._values[key] = value
+            self._values.move_to_end(key)
+            while len(self._values) > self._max_entries:
+                self._values.popitem(last=False)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._values)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Число значений и попадания/промахи по компонентам."""
+        with self._lock:
+            return {"entries": len(self._values), "hits": dict(self._hits), "misses": dict(self._misses)}
@@ -0,0 +1,349 @@
+"""
+Пакетная обработка каталога PDF-резюме: извлечение → проверка ФИО → скоринг.
+
+Этапы конвейера:
+    1. Извлечение (ExtractData) — в пуле процессов, это CPU-нагрузка.
+    2. Проверки ФИО в LLM — в пуле потоков CoreML (не более max_in_flight запросов).
+    3. Итоговый скоринг CoreML и потоковая запись результатов (JSONL или CSV).
+
+Между этапами стоят ограниченные окна и очередь: если LLM отвечает медленно,
+очередь заполняется и извлечение приостанавливается, поэтому в памяти
+одновременно находится не больше нескольких сотен Rezume.
+
+Checkpoint — текстовый файл с путями уже записанных документов. Он дописывается
+после сброса выходного файла, так что при перезапуске обработанные файлы
+пропускаются (после аварийной остановки последние строки могут повториться).
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Any, Dict, Iterator, List, Optional, Set, TextIO, Tuple
+
+from app.application.core import CoreML
+from app.domain.models import Rezume, ScoreResult
+from app.infrastructure.extract import ExtractData
+
+
+OUTPUT_FIELDS = ("path", "score", "degraded", "error")
+
+# (путь, резюме или None, ошибка извлечения, тайминги этапов извлечения)
+Extracted = Tuple[str, Optional[Rezume], Optional[str], Dict[str, Any]]
+
+_DONE = object()
+
+
+# -----------------------
+# Этап извлечения (выполняется в дочерних процессах)
+# -----------------------
+
+_extractor: Optional[ExtractData] = None
+
+
+def _init_worker() -> None:
+    global _extractor
+    _extractor = ExtractData()
+
+
+def _extract_worker(path: str) -> Extracted:
+    try:
+        rezume, timings = _extractor.extract_timed(path)
+    except Exception as e:
+        return path, None, f"{type(e).__name__}: {e}", {}
+    return path, rezume, None, timings
+
+
+# -----------------------
+# Вход и выход
+# -----------------------
+
+def iter_pdf_files(root: str) -> Iterator[str]:
+    """
+    Лениво обходит каталог и отдаёт пути к PDF (в отсортированном порядке внутри каталога).
+
+    Args:
+        root: Корневой каталог
+
+    Yields:
+        str: Путь к PDF-файлу
+    """
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for name in sorted(filenames):
+            if name.lower().endswith(".pdf"):
+                yield os.path.join(dirpath, name)
+
+
+class ResultWriter:
+    """Потоковая запись результатов в JSONL или CSV (дописывает существующий файл)."""
+
+    def __init__(self, path: str, fmt: Optional[str] = None):
+        """
+        Args:
+            path: Выходной файл
+            fmt: "jsonl" или "csv" (по умолчанию — по расширению файла)
+        """
+        self.format = fmt or ("csv" if path.lower().endswith(".csv") else "jsonl")
+        if self.format not in ("jsonl", "csv"):
+            raise ValueError(f"Неподдерживаемый формат вывода: {self.format}")
+        is_new = not os.path.exists(path) or os.path.getsize(path) == 0
+        self._file: TextIO = open(path, "a", encoding="utf-8", newline="")
+        self._csv = None
+        if self.format == "csv":
+            self._csv = csv.DictWriter(self._file, fieldnames=OUTPUT_FIELDS)
+            if is_new:
+                self._csv.writeheader()
+
+    def write(self, row: Dict[str, Any]) -> None:
+        if self._csv is not None:
+            self._csv.writerow(row)
+        else:
+            self._file.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+    def flush(self) -> None:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        self.flush()
+        self._file.close()
+
+
+class Checkpoint:
+    """Список уже обработанных файлов (по пути на строку)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.done: Set[str] = set()
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.done.update(line.rstrip("\n") for line in f if line.strip())
+        self._file: TextIO = open(path, "a", encoding="utf-8")
+        self._pending: List[str] = []
+
+    def mark(self, path: str) -> None:
+        """Запоминает путь; на диск он попадает при commit()."""
+        self._pending.append(path)
+
+    def commit(self) -> None:
+        if self._pending:
+            self._file.write("".join(p + "\n" for p in self._pending))
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self.done.update(self._pending)
+            self._pending.clear()
+
+    def close(self) -> None:
+        self.commit()
+        self._file.close()
+
+
+# -----------------------
+# Конвейер
+# -----------------------
+
+class IngestPipeline:
+    """
+    Конвейер «каталог PDF → файл с оценками».
+
+    Использование:
+        stats = IngestPipeline(workers=8).run("resumes/", "scores.jsonl")
+    """
+
+    def __init__(
+        self,
+        *,
+        workers: Optional[int] = None,
+        queue_size: int = 256,
+        core: Optional[CoreML] = None,
+        flush_every: int = 100,
+    ):
+        """
+        Args:
+            workers: Число процессов извлечения (по умолчанию — число ядер)
+            queue_size: Ёмкость очереди между извлечением и скорингом; столько же
+                документов может одновременно находиться в пуле процессов
+            core: Экземпляр CoreML (по умолчанию — с порцией 64 резюме)
+            flush_every: Как часто (в документах) сбрасывать вывод и checkpoint
+        """
+        if queue_size < 1 or flush_every < 1:
+            raise ValueError("queue_size и flush_every должны быть >= 1")
+        self._workers = workers or os.cpu_count() or 1
+        self._queue_size = queue_size
+        self._core = core or CoreML(chunk_size=64)
+        self._flush_every = flush_every
+
+    def run(
+        self,
+        root: str,
+        output: str,
+        *,
+        checkpoint: Optional[str] = None,
+        fmt: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Обрабатывает все PDF в каталоге.
+
+        Args:
+            root: Каталог с резюме
+            output: Выходной файл (JSONL или CSV)
+            checkpoint: Файл checkpoint (по умолчанию — output + ".checkpoint")
+            fmt: Формат вывода ("jsonl" или "csv")
+
+        Returns:
+            Dict[str, Any]: Счётчики и время этапов
+        """
+        stats: Dict[str, Any] = {
+            "skipped": 0, "extracted": 0, "extract_failed": 0,
+            "scored": 0, "score_failed": 0, "degraded": 0,
+            "extract_seconds": {"open": 0.0, "text": 0.0, "parse": 0.0, "validate": 0.0},
+        }
+        started = time.perf_counter()
+        progress = Checkpoint(checkpoint or output + ".checkpoint")
+        writer = ResultWriter(output, fmt)
+        extracted: "queue.Queue[Any]" = queue.Queue(maxsize=self._queue_size)
+        scorer_error: List[BaseException] = []
+
+        scorer = threading.Thread(
+            target=self._score_stage,
+            args=(extracted, writer, progress, stats, scorer_error),
+            name="ingest-score",
+            daemon=True,
+        )
+        try:
+            with ProcessPoolExecutor(max_workers=self._workers, initializer=_init_worker) as pool:
+                self._extract_stage(root, pool, extracted, progress.done, stats, scorer, scorer_error)
+        finally:
+            # Скоринг дорабатывает то, что уже в очереди, и сбрасывает вывод
+            if scorer.ident is None:
+                scorer.start()
+            try:
+                _put(extracted, _DONE, scorer_error)
+            except RuntimeError:
+                pass                # скоринг уже остановлен, ошибка будет поднята ниже
+            scorer.join()
+            writer.close()
+            progress.close()
+
+        if scorer_error:
+            raise scorer_error[0]
+        stats["elapsed"] = time.perf_counter() - started
+        return stats
+
+    def _extract_stage(
+        self,
+        root: str,
+        pool: ProcessPoolExecutor,
+        extracted: "queue.Queue[Any]",
+        done: Set[str],
+        stats: Dict[str, Any],
+        scorer: threading.Thread,
+        scorer_error: List[BaseException],
+    ) -> None:
+        """Подаёт файлы в пул процессов, держа в работе не больше queue_size документов."""
+        in_flight: Set[Future] = set()
+        for path in iter_pdf_files(root):
+            if path in done:
+                stats["skipped"] += 1
+                continue
+            if len(in_flight) >= self._queue_size:
+                in_flight = _drain(in_flight, extracted, stats, scorer_error)
+            in_flight.add(pool.submit(_extract_worker, path))
+            # Поток скоринга стартует после первой отправки: к этому моменту
+            # пул уже создал процессы, и fork не копирует рабочие потоки
+            if scorer.ident is None:
+                scorer.start()
+        while in_flight:
+            in_flight = _drain(in_flight, extracted, stats, scorer_error)
+
+    def _score_stage(
+        self,
+        extracted: "queue.Queue[Any]",
+        writer: ResultWriter,
+        progress: Checkpoint,
+        stats: Dict[str, Any],
+        scorer_error: List[BaseException],
+    ) -> None:
+        paths: "deque[str]" = deque()
+        written = 0
+
+        def emit(path: str, result: ScoreResult) -> None:
+            nonlocal written
+            writer.write({"path": path, "score": result.score, "degraded": result.degraded, "error": result.error})
+            progress.mark(path)
+            written += 1
+            if written % self._flush_every == 0:
+                # Сначала вывод, потом checkpoint: отмеченный файл уже точно записан
+                writer.flush()
+                progress.commit()
+
+        def rezumes() -> Iterator[Rezume]:
+            # Генератор выполняется в этом же потоке, поэтому ошибки извлечения
+            # пишутся сразу, не нарушая порядок сопоставления путей и результатов
+            while True:
+                item = extracted.get()
+                if item is _DONE:
+                    return
+                path, rezume, error, _ = item
+                if rezume is None:
+                    emit(path, ScoreResult(error=error))
+                    continue
+                paths.append(path)
+                yield rezume
+
+        try:
+            for result in self._core.iter_score_batch(rezumes()):
+                stats["scored" if result.ok else "score_failed"] += 1
+                stats["degraded"] += result.degraded
+                emit(paths.popleft(), result)
+            writer.flush()
+            progress.commit()
+        except BaseException as e:
+            scorer_error.append(e)
+            # Не даём этапу извлечения навсегда заблокироваться на полной очереди
+            while True:
+                try:
+                    extracted.get_nowait()
+                except queue.Empty:
+                    break
+
+
+def _drain(
+    in_flight: Set[Future],
+    extracted: "queue.Queue[Any]",
+    stats: Dict[str, Any],
+    scorer_error: List[BaseException],
+) -> Set[Future]:
+    """Ждёт хотя бы один извлечённый документ и передаёт готовые на скоринг."""
+    finished, pending = wait(in_flight, return_when=FIRST_COMPLETED)
+    for future in finished:
+        item: Extracted = future.result()
+        _, rezume, _, timings = item
+        if rezume is None:
+            stats["extract_failed"] += 1
+        else:
+            stats["extracted"] += 1
+            for stage, seconds in timings.items():
+                if stage in stats["extract_seconds"]:
+                    stats["extract_seconds"][stage] += seconds
+        _put(extracted, item, scorer_error)
+    return pending
+
+
+def _put(extracted: "queue.Queue[Any]", item: Any, scorer_error: List[BaseException]) -> None:
+    # Блокирующий put — обратное давление: пока скоринг не разгрёб очередь,
+    # новые файлы в пул не отправляются. Если скоринг упал, ждать некого.
+    while not scorer_error:
+        try:
+            extracted.put(item, timeout=0.5)
+            return
+        except queue.Full:
+            continue
+    raise RuntimeError("Этап скоринга завершился с ошибкой") from scorer_error[0]
@@ -0,0 +1,149 @@
+"""
+Колоночный (векторизованный) вариант age_education_analysis.
+
+Вместо объектов date и try/except по каждому резюме правила считаются над
+массивами datetime64[D] целиком; пропуски задаются NaT. Результат совпадает
+со скалярной analyze_age_education_comprehensive для каждого элемента,
+включая перенос 29 февраля на 28-е и отсчёт курсов от 1 сентября.
+"""
+
+from __future__ import annotations
+
+from datetime import date
+from typing import Iterable, Optional, Sequence
+
+import numpy as np
+
+from app.domain.batch import RezumeBatch, days_to_datetime64
+from app.domain.models import Education
+
+
+def to_datetime64(values: Iterable[Optional[date]]) -> np.ndarray:
+    """
+    Переводит последовательность дат (None — пропуск) в массив datetime64[D] с NaT.
+
+    Args:
+        values: Даты
+
+    Returns:
+        np.ndarray: Массив datetime64[D]
+    """
+    return np.array(list(values), dtype="datetime64[D]")
+
+
+def education_end_dates(educations: Iterable[Optional[Education]]) -> np.ndarray:
+    """
+    Дата окончания первого (основного) образования для каждого резюме — столбец
+    для analyze_age_education_columnar. Нет образования или даты — NaT.
+
+    Args:
+        educations: Данные об образовании
+
+    Returns:
+        np.ndarray: Массив datetime64[D]
+    """
+    return to_datetime64(
+        edu.items[0].end_date if edu and edu.items else None
+        for edu in educations
+    )
+
+
+def analyze_age_education_batch(batch: RezumeBatch) -> np.ndarray:
+    """
+    analyze_age_education_comprehensive для каждого резюме пакета
+    (первая работа — самая ранняя дата начала среди places).
+
+    Args:
+        batch: Пакет резюме
+
+    Returns:
+        np.ndarray: Коэффициенты подозрительности (float64)
+    """
+    return analyze_age_education_columnar(
+        batch.born_dates(),
+        batch.first_work_dates(),
+        days_to_datetime64(batch.first_education("end")),
+    )
+
+
+def analyze_age_education_columnar(
+    born: np.ndarray,
+    first_work: np.ndarray,
+    education_end: np.ndarray,
+) -> np.ndarray:
+    """
+    Векторный аналог analyze_age_education_comprehensive.
+
+    Args:
+        born: Даты рождения, datetime64[D] (NaT — не указана)
+        first_work: Даты начала первой работы, datetime64[D]
+        education_end: Даты окончания первого образования, datetime64[D]
+            (NaT — нет образования или даты окончания, см. education_end_dates)
+
+    Returns:
+        np.ndarray: Коэффициенты подозрительности от 0.0 до 1.0 (float64)
+    """
+    born, first_work, education_end = _as_days(born, first_work, education_end)
+    total = when_start_working_columnar(born, first_work) + education_bonus_columnar(born, first_work, education_end)
+    return np.clip(total / 5.0, 0.0, 1.0)
+
+
+def when_start_working_columnar(born: np.ndarray, first_work: np.ndarray) -> np.ndarray:
+    """
+    Векторный аналог _when_start_working: 3 — нет даты рождения,
+    2 — нет даты работы или работа до 18 лет, 0 — иначе.
+
+    Returns:
+        np.ndarray: Штрафные баллы (int64)
+    """
+    born, first_work = _as_days(born, first_work)
+    has_born = ~np.isnat(born)
+    has_work = ~np.isnat(first_work)
+
+    # 18-летие: тот же день того же месяца через 18 лет; день, которого
+    # в этом месяце нет (29 февраля в невисокосный год), становится последним днём
+    month = born.astype("datetime64[M]")
+    day_offset = (born - month.astype("datetime64[D]")).astype(np.int64)
+    month_18 = month + np.timedelta64(18 * 12, "M")
+    start_18 = month_18.astype("datetime64[D]")
+    days_in_month = ((month_18 + np.timedelta64(1, "M")).astype("datetime64[D]") - start_18).astype(np.int64)
+    birthday_18 = start_18 + np.minimum(day_offset, days_in_month - 1).astype("timedelta64[D]")
+
+    before_18 = has_born & has_work & (birthday_18 > first_work)
+    return np.where(~has_born, 3, np.where(~has_work | before_18, 2, 0)).astype(np.int64)
+
+
+def education_bonus_columnar(
+    born: np.ndarray,
+    first_work: np.ndarray,
+    education_end: np.ndarray,
+) -> np.ndarray:
+    """
+    Векторный аналог _calculate_education_bonus.
+
+    Returns:
+        np.ndarray: Дополнительные баллы (float64)
+    """
+    born, first_work, education_end = _as_days(born, first_work, education_end)
+    known = ~np.isnat(first_work) & ~np.isnat(education_end)
+
+    # Начало обучения = 1 сентября (год окончания - 4)
+    start_year = education_end.astype("datetime64[Y]") - np.timedelta64(4, "Y")
+    education_start = (start_year.astype("datetime64[M]") + np.timedelta64(8, "M")).astype("datetime64[D]")
+    before_start = known & (first_work < education_start)
+
+    work_month = first_work.astype("datetime64[M]")
+    work_year = first_work.astype("datetime64[Y]")
+    before_september = (work_month - work_year.astype("datetime64[M]")).astype(np.int64) < 8
+    years_diff = (work_year - start_year).astype(np.int64) - before_september
+
+    by_course = np.select([years_diff == 0, years_diff == 1], [-1.5, -2.0], default=-3.0)
+    early = np.where(np.isnat(born), 2.0, 0.0)
+    return np.where(~known, 2.0, np.where(before_start, early, by_course))
+
+
+def _as_days(*columns: Sequence) -> tuple:
+    arrays = tuple(np.asarray(c, dtype="datetime64[D]") for c in columns)
+    if len({a.shape for a in arrays}) > 1:
+        raise ValueError("Столбцы должны быть одной длины")
+    return arrays
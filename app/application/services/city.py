@@ -1,13 +1,24 @@
-def compare_cities(residence_city: str, education_city: str) -> bool:
+from typing import Dict, Optional
+
+import numpy as np
+
+from app.domain.batch import MISSING, StringPool
+from app.infrastructure.geo import UNKNOWN, CityGazetteer, get_gazetteer, normalize_city
+
+
+def compare_cities(residence_city: str, education_city: str, gazetteer: Optional[CityGazetteer] = None) -> bool:
     """
     Проверяет, совпадают ли города проживания и обучения.
     
-    Сравнение происходит без учета регистра и лишних пробелов.
+    Города сверяются по справочнику: «СПб», «г. Санкт-Петербург» и
+    «Saint Petersburg» — один город. Если хотя бы одного города нет
+    в справочнике, сравниваются нормализованные написания (регистр,
+    ё/е, префикс «г.» и пунктуация не учитываются).
     
     Args:
         residence_city: Город проживания
         education_city: Город обучения
-    
+        gazetteer: Справочник городов (по умолчанию — глобальный)
     
     Returns:
         bool: True если города совпадают, False иначе
@@ -15,9 +26,40 @@ def compare_cities(residence_city: str, education_city: str) -> bool:
     if not residence_city or not education_city:
         return False
     
-    residence_clean = residence_city.strip().lower()
-    education_clean = education_city.strip().lower()
+    gazetteer = gazetteer or get_gazetteer()
+    same = gazetteer.same_city(residence_city, education_city)
+    if same is not None:
+        return same
+    
+    residence_clean = normalize_city(residence_city)
+    education_clean = normalize_city(education_city)
     
-    return residence_clean == education_clean
+    return bool(residence_clean) and residence_clean == education_clean
 
 
+def city_keys(pool: StringPool, codes: np.ndarray, gazetteer: Optional[CityGazetteer] = None) -> np.ndarray:
+    """
+    Ключи городов для столбца кодов строк RezumeBatch: равные ключи — один
+    город в смысле compare_cities. Каждая уникальная строка разбирается один раз.
+    
+    Args:
+        pool: Пул строк пакета
+        codes: Коды строк (MISSING — пропуск)
+        gazetteer: Справочник городов (по умолчанию — глобальный)
+    
+    Returns:
+        np.ndarray: Ключи int64; -1 — город не указан
+    """
+    gazetteer = gazetteer or get_gazetteer()
+    unique, inverse = np.unique(codes, return_inverse=True)
+    texts = [pool.get(code) for code in unique]
+    cities = gazetteer.resolve_many(texts).astype(np.int64)
+    
+    # Города вне справочника получают ключи после его номеров — по нормализованному написанию
+    spellings: Dict[str, int] = {}
+    for position, (code, text) in enumerate(zip(unique, texts)):
+        if cities[position] != UNKNOWN:
+            continue
+        key = normalize_city(text) if code != MISSING else ""
+        cities[position] = spellings.setdefault(key, len(gazetteer) + len(spellings)) if key else -1
+    return cities[inverse.reshape(-1)]
@@ -1,17 +1,212 @@
+"""
+Проверка мест работы.
+
+Для каждого места из резюме выставляется флаг:
+
+    missing              — название организации не указано               (1.0)
+    unknown              — организации нет в реестре юрлиц               (1.0)
+    before_registration  — работа началась раньше регистрации организации (1.0)
+    after_liquidation    — работа началась после ликвидации              (1.0)
+    overlap              — место пересекается по датам с другим          (0.5)
+
+Балл резюме — наибольший вес среди флагов (0, если подозрительного нет).
+Проверки по реестру выполняются, только если реестр загружен
+(COMPANY_REGISTRY_PATH); параллельная работа встречается и честно,
+поэтому весит меньше.
+"""
+
+from datetime import date
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.domain.batch import MISSING_DAY, RezumeBatch, date_to_day
 from app.domain.models import PlaceWork
-from typing import List
+from app.domain.work_history import WorkHistory
+from app.infrastructure.registry import CompanyRegistry, get_company_registry
 
-def analyze_company(companies: List[PlaceWork]) -> float:
+FLAG_WEIGHTS: Dict[str, float] = {
+    "missing": 1.0,
+    "unknown": 1.0,
+    "before_registration": 1.0,
+    "after_liquidation": 1.0,
+    "overlap": 0.5,
+}
+
+# Окно существования организации: (дата регистрации, дата ликвидации), None — не ограничено
+_Window = Tuple[Optional[date], Optional[date]]
+
+
+def check_places(
+    companies: Sequence[PlaceWork],
+    history: Optional[WorkHistory] = None,
+    registry: Optional[CompanyRegistry] = None,
+) -> List[List[str]]:
     """
-    Проверяет отсутствие компании в резюме и выдает на основе этого балл. 
+    Флаги каждого места работы (в порядке companies).
+
     Args:
-        companies (List[PlaceWork]): Список компаний.
+        companies: Места работы
+        history: Индекс трудовой истории этих мест (по умолчанию строится заново)
+        registry: Реестр юрлиц (по умолчанию — глобальный, если настроен)
 
     Returns:
-        float: 1 если компания не указана, 0 если указана.
+        List[List[str]]: Флаги мест работы
+    """
+    registry = registry if registry is not None else get_company_registry()
+    # Представления RezumeBatch создаются при каждом обращении — фиксируем объекты
+    companies = list(companies)
+    history = history if history is not None else WorkHistory(companies)
+
+    flags: List[List[str]] = [[] for _ in companies]
+    position = {id(place): index for index, place in enumerate(companies)}
+    for index, place in enumerate(companies):
+        if not (place.company or "").strip():
+            flags[index].append("missing")
+            continue
+        if registry is None:
+            continue
+        window = _window(registry, place.company, place.company_info)
+        if window is None:
+            flags[index].append("unknown")
+            continue
+        registered, liquidated = window
+        if place.start_date is not None:
+            if registered is not None and place.start_date < registered:
+                flags[index].append("before_registration")
+            if liquidated is not None and place.start_date > liquidated:
+                flags[index].append("after_liquidation")
+
+    for first, second in history.overlaps:
+        for place in (first, second):
+            index = position.get(id(place))
+            if index is not None and "overlap" not in flags[index]:
+                flags[index].append("overlap")
+    return flags
+
+
+def analyze_company(
+    companies: Sequence[PlaceWork],
+    history: Optional[WorkHistory] = None,
+    registry: Optional[CompanyRegistry] = None,
+) -> float:
+    """
+    Проверяет места работы по реестру и датам и выдаёт балл подозрительности.
+
+    Args:
+        companies (Sequence[PlaceWork]): Список мест работы.
+        history (Optional[WorkHistory]): Индекс трудовой истории (rezume.work_history).
+        registry (Optional[CompanyRegistry]): Реестр юрлиц.
+
+    Returns:
+        float: Наибольший вес флага среди мест работы (0.0 — всё в порядке).
+    """
+    flags = check_places(companies, history, registry)
+    return max((FLAG_WEIGHTS[flag] for place_flags in flags for flag in place_flags), default=0.0)
+
+
+def analyze_company_batch(batch: RezumeBatch, registry: Optional[CompanyRegistry] = None) -> np.ndarray:
     """
-    
-    if len(companies) == 2:
-        return 1
-    
-    return 0
\ No newline at end of file
+    analyze_company для каждого резюме пакета.
+
+    Реестр опрашивается один раз на уникальную пару (название, сведения)
+    пакета, остальное считается над столбцами мест работы.
+
+    Args:
+        batch (RezumeBatch): Пакет резюме.
+        registry (Optional[CompanyRegistry]): Реестр юрлиц.
+
+    Returns:
+        np.ndarray: Баллы (float64).
+    """
+    registry = registry if registry is not None else get_company_registry()
+    columns = batch.columns
+    offsets = columns["place_offsets"]
+    company = columns["place_company"]
+    weights = np.zeros(len(company), dtype=np.float64)
+
+    missing = batch.pool.blank_mask(company)
+    weights[missing] = FLAG_WEIGHTS["missing"]
+
+    if registry is not None and len(company):
+        start = columns["place_start"].astype(np.int64)
+        pairs, inverse = np.unique(np.stack([company, columns["place_company_info"]], axis=1), axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        found = np.zeros(len(pairs), dtype=bool)
+        registered = np.full(len(pairs), MISSING_DAY, dtype=np.int64)
+        liquidated = np.full(len(pairs), MISSING_DAY, dtype=np.int64)
+        for index, (company_code, info_code) in enumerate(pairs):
+            window = _window(registry, batch.pool.get(company_code), batch.pool.get(info_code))
+            if window is not None:
+                found[index] = True
+                registered[index] = date_to_day(window[0])
+                liquidated[index] = date_to_day(window[1])
+
+        # У ненайденных организаций окно пустое, поэтому флаги дат для них не выставляются
+        dated = ~missing & (start != MISSING_DAY)
+        place_registered, place_liquidated = registered[inverse], liquidated[inverse]
+        _flag(weights, ~missing & ~found[inverse], "unknown")
+        _flag(weights, dated & (place_registered != MISSING_DAY) & (start < place_registered), "before_registration")
+        _flag(weights, dated & (place_liquidated != MISSING_DAY) & (start > place_liquidated), "after_liquidation")
+
+    _flag(weights, _overlap_mask(columns["place_start"], columns["place_end"], offsets), "overlap")
+
+    result = np.zeros(len(offsets) - 1, dtype=np.float64)
+    nonempty = np.diff(offsets) > 0
+    if weights.size:
+        result[nonempty] = np.maximum.reduceat(weights, offsets[:-1][nonempty])
+    return result
+
+
+def _flag(weights: np.ndarray, mask: np.ndarray, flag: str) -> None:
+    """Учитывает вес флага у отмеченных мест (вес места — наибольший из его флагов)."""
+    weights[mask] = np.maximum(weights[mask], FLAG_WEIGHTS[flag])
+
+
+def _window(registry: CompanyRegistry, company: Optional[str], company_info: Optional[str]) -> Optional[_Window]:
+    """Окно существования по всем найденным записям (None — организации нет в реестре)."""
+    records = registry.find(company, company_info)
+    if not records:
+        return None
+    # Одноимённых организаций может быть несколько — берём самое широкое окно
+    starts = [record.registered for record in records]
+    ends = [record.liquidated for record in records]
+    registered = None if any(d is None for d in starts) else min(starts)
+    liquidated = None if any(d is None for d in ends) else max(ends)
+    return registered, liquidated
+
+
+def _overlap_mask(start_days: np.ndarray, end_days: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    """
+    Места, пересекающиеся по датам с другим местом того же резюме
+    (те же правила, что у WorkHistory.overlaps).
+    """
+    mask = np.zeros(len(start_days), dtype=bool)
+    dated = np.flatnonzero(start_days != MISSING_DAY)
+    if len(dated) < 2:
+        return mask
+
+    rows = np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))[dated]
+    start = start_days[dated].astype(np.int64)
+    end = end_days[dated].astype(np.int64)
+    end[end == MISSING_DAY] = date_to_day(date.today())
+    end = np.maximum(end, start)
+
+    order = np.lexsort((start, rows))
+    rows, start, end, places = rows[order], start[order], end[order], dated[order]
+
+    # Наибольший конец среди предыдущих мест того же резюме: к концу добавляется
+    # сдвиг по номеру строки, чтобы накопленный максимум не переходил между резюме
+    shift = rows * (1 << 32)
+    running = np.maximum.accumulate(end + shift) - shift
+    same_row = np.zeros(len(rows), dtype=bool)
+    same_row[1:] = rows[1:] == rows[:-1]
+    previous_end = np.empty_like(running)
+    previous_end[1:] = running[:-1]
+    # Позднее место пересекается, если начинается раньше наибольшего конца
+    # предыдущих; раннее — если следующее за ним по началу стартует до его конца
+    later = same_row & (start < previous_end)
+    earlier = np.zeros(len(rows), dtype=bool)
+    earlier[:-1] = same_row[1:] & (start[1:] < end[:-1])
+    mask[places[later | earlier]] = True
+    return mask
@@ -0,0 +1,111 @@
+"""
+Поиск резюме, размноженных из одного шаблона.
+
+Поддельные резюме часто делают пачкой: один текст, разные ФИО. Каждое
+резюме по отдельности выглядит нормально, поэтому резюме сравниваются
+между собой: текстовые поля (о себе, легенды мест работы, навыки,
+желаемая должность) склеиваются в один текст, и по нему в DuplicateIndex
+ищутся почти одинаковые резюме других людей. Люди с совпавшими текстами
+объединяются в кластер; размер кластера и есть сигнал для скоринга.
+
+Индекс пополняется по мере поступления резюме и может сохраняться на диск
+(DUPLICATE_INDEX_PATH).
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Dict, Optional
+
+from app.config import CONFIG
+from app.domain.models import Rezume
+from app.infrastructure.similarity import DuplicateIndex
+
+
+def owner_key(rezume: Rezume) -> str:
+    """Ключ человека: ФИО и дата рождения (повторная загрузка резюме — не дубликат)."""
+    born = rezume.born_date.isoformat() if rezume.born_date is not None else ""
+    return f"{rezume.fio}|{born}".replace("\n", " ")
+
+
+def rezume_text(rezume: Rezume) -> str:
+    """Текстовые поля резюме одной строкой (ФИО, даты и контакты не входят)."""
+    parts = [rezume.about, rezume.desired_position]
+    parts.extend(place.legend for place in rezume.places)
+    parts.extend(rezume.skills)
+    return "\n".join(part for part in parts if part)
+
+
+class DuplicateDetector:
+    """
+    Использование:
+        detector = DuplicateDetector(DuplicateIndex.open("duplicates.npz"))
+        detector.check(rezume)      # сколько других людей прислали почти тот же текст
+        detector.save("duplicates.npz")
+    """
+
+    def __init__(self, index: Optional[DuplicateIndex] = None, min_chars: int = 40):
+        """
+        Args:
+            index: Индекс текстов (по умолчанию — пустой в памяти)
+            min_chars: Более короткие тексты не индексируются: у них слишком
+                мало шинглов, и совпадения случайны
+        """
+        self._index = index if index is not None else DuplicateIndex()
+        self._min_chars = min_chars
+        self._skipped = 0
+        self._lock = threading.Lock()
+
+    @property
+    def index(self) -> DuplicateIndex:
+        return self._index
+
+    def check(self, rezume: Rezume) -> int:
+        """
+        Добавляет резюме в индекс и возвращает размер его кластера без него самого.
+
+        Args:
+            rezume: Резюме (или RezumeView)
+
+        Returns:
+            int: Сколько других людей в кластере (0 — дубликатов нет или текст слишком короткий)
+        """
+        text = rezume_text(rezume)
+        if len(text) < self._min_chars:
+            with self._lock:
+                self._skipped += 1
+            return 0
+        return self._index.add(owner_key(rezume), text).duplicates
+
+    def save(self, path: str) -> None:
+        self._index.save(path)
+
+    def stats(self) -> Dict[str, float]:
+        """Статистика индекса и число резюме, пропущенных из-за короткого текста."""
+        with self._lock:
+            skipped = self._skipped
+        return {**self._index.stats(), "skipped": skipped}
+
+
+_detector: Optional[DuplicateDetector] = None
+_detector_lock = threading.Lock()
+
+
+def get_duplicate_detector() -> DuplicateDetector:
+    """
+    Возвращает общий детектор, загружая индекс из DUPLICATE_INDEX_PATH
+    (если файл есть) при первом обращении.
+
+    Returns:
+        DuplicateDetector: Глобальный экземпляр
+    """
+    global _detector
+    if _detector is None:
+        with _detector_lock:
+            if _detector is None:
+                index = DuplicateIndex.open(
+                    CONFIG.get("DUPLICATE_INDEX_PATH"),
+                    threshold=CONFIG.get("DUPLICATE_THRESHOLD", 0.8),
+                )
+                _detector = DuplicateDetector(index, min_chars=CONFIG.get("DUPLICATE_MIN_CHARS", 40))
+    return _detector
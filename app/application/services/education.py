@@ -1,5 +1,10 @@
+from datetime import date
+
+import numpy as np
+
+from app.domain.batch import MISSING_DAY, RezumeBatch, date_to_day
 from app.domain.models import Education, EducationEntry
-from app.application.services.city import compare_cities
+from app.application.services.city import city_keys, compare_cities
 
 
 def analyze_education(education: Education, residence_city: str) -> float:
@@ -47,6 +52,43 @@ def analyze_education(education: Education, residence_city: str) -> float:
     return 0  # Образование окончено  
 
 
+def analyze_education_batch(batch: RezumeBatch) -> np.ndarray:
+    """
+    analyze_education для каждого резюме пакета: полнота и окончание
+    считаются над столбцами, города обоих столбцов разбираются справочником
+    один раз на уникальную строку и сравниваются по ключам.
+    
+    Args:
+        batch: Пакет резюме
+    
+    Returns:
+        np.ndarray: Вероятности подозрительности (float64)
+    """
+    pool = batch.pool
+    university = batch.first_education("university")
+    city = batch.first_education("city")
+    faculty = batch.first_education("faculty")
+    end = batch.first_education("end")
+    
+    complete = (
+        (batch.education_counts() > 0)
+        & ~pool.blank_mask(university)
+        & ~pool.blank_mask(city)
+        & ~pool.blank_mask(faculty)
+    )
+    finished = (end != MISSING_DAY) & (end < date_to_day(date.today()))
+    
+    residence = batch.columns["residence_city"]
+    check = complete & ~finished
+    same_city = np.zeros(len(batch), dtype=bool)
+    if check.any():
+        keys = city_keys(pool, np.concatenate([residence[check], city[check]]))
+        residence_keys, education_keys = np.split(keys, 2)
+        same_city[check] = (residence_keys == education_keys) & (residence_keys != -1)
+    
+    return np.where(~complete, 1.0, np.where(finished | same_city, 0.0, 0.75))
+
+
 def _is_education_basic_complete(edu_entry: EducationEntry) -> bool:
     """
     Проверяет базовую полноту данных об образовании (без даты окончания).
@@ -87,7 +129,6 @@ def _is_education_finished(edu_entry: EducationEntry) -> bool:
     if edu_entry.end_date is None:
         return False
     
-    from datetime import date
     return edu_entry.end_date < date.today()
 
 
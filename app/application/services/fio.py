@@ -1,5 +1,10 @@
+from typing import List, Optional, Sequence, Tuple, Union
+
+from app.application.services.homoglyph import ScriptClass, classify_name, classify_names, classify_part, local_verdict
+from app.domain.batch import RezumeBatch
 from app.domain.models import FIOResult, NameParts
-from app.infrastructure.llm import get_llm
+from app.infrastructure.lexicon import get_lexicon
+from app.infrastructure.llm import LLMService, get_llm
 
 
 
@@ -20,51 +25,140 @@ def _calculate_suspicion_score(fio_result: FIOResult) -> float:
 
 
 def _has_visual_substitution(name: str) -> bool:
-    """Проверяет, есть ли хотя бы одна визуальная подмена в строке"""
-    suspicious_chars = 'aoepcyxABEKMHOPCTYX'
+    """Проверяет, есть ли в строке латиница, смешение алфавитов или символы-двойники"""
+    return classify_part(name) in (ScriptClass.LATIN, ScriptClass.MIXED, ScriptClass.CONFUSABLE)
+
 
-    return any(char in suspicious_chars for char in name)
+LocalVerdicts = Tuple[Optional[int], Optional[int], Optional[int]]
 
 
-def _analysis_fio(data: NameParts) -> FIOResult:
+def _local_verdicts(data: NameParts, scripts: Tuple[ScriptClass, ScriptClass, ScriptClass]) -> LocalVerdicts:
+    """
+    Оценки частей ФИО, которые можно поставить без LLM (None — нужна LLM).
+    
+    Сначала по письменности, затем оставшиеся кириллические части сверяются
+    со словарём известных фамилий, имён и отчеств.
+    """
+    surname, name, father_name = scripts
+    verdicts = (local_verdict(surname), local_verdict(name), local_verdict(father_name))
+    
+    needed = tuple(v is None and s is ScriptClass.CYRILLIC for v, s in zip(verdicts, scripts))
+    if not any(needed):
+        return verdicts
+    
+    lexicon = get_lexicon()
+    known = lexicon.verdicts(data, needed)
+    merged = tuple(v if v is not None else k for v, k in zip(verdicts, known))
+    lexicon.record_name(_is_settled(merged))
+    return merged
+
+
+def _is_settled(verdicts: LocalVerdicts) -> bool:
+    return all(v is not None for v in verdicts)
+
+
+def _merge_verdicts(llm_result: Optional[FIOResult], verdicts: LocalVerdicts) -> FIOResult:
+    """Локальные оценки имеют приоритет над ответом LLM."""
+    surname_result, name_result, father_name_result = verdicts
+    if surname_result is None:
+        surname_result = llm_result.surname
+    if name_result is None:
+        name_result = llm_result.name
+    if father_name_result is None:
+        father_name_result = llm_result.father_name
+    return FIOResult.of(surname_result, name_result, father_name_result)
+
+
+def _analysis_fio(data: NameParts, llm: Optional[LLMService] = None) -> FIOResult:
     """
     Анализирует ФИО с помощью LLM.
     
+    Части, набранные латиницей, со смешением алфавитов, с символами-двойниками
+    или пустые, а также известные словарю оцениваются локально; если так
+    оценены все части, LLM не вызывается.
+    
     Args:
         data: Данные ФИО для анализа
+        llm: LLM сервис (None — глобальный, см. get_llm)
         
     Returns:
         FIOResult: Результат анализа ФИО
     """
-    # Проверяем каждую часть отдельно на визуальную подмену
-    surname_has_substitution = _has_visual_substitution(data.surname)
-    name_has_substitution = _has_visual_substitution(data.name)
-    father_name_has_substitution = _has_visual_substitution(data.father_name)
+    verdicts = _local_verdicts(data, classify_name(data))
     
-    if (surname_has_substitution and name_has_substitution and father_name_has_substitution):
-        return FIOResult("444")
+    if _is_settled(verdicts):
+        return _merge_verdicts(None, verdicts)
     
 
-    llm = get_llm()
+    llm = llm or get_llm()
+
+    return _merge_verdicts(llm.checking_FIO(data), verdicts)
 
-    final_result = llm.checking_FIO(data)
-    surname_result = final_result.surname
-    name_result = final_result.name
-    father_name_result = final_result.father_name
+
+def _analysis_fio_batch(names: Sequence[NameParts], llm: Optional[LLMService] = None) -> List[FIOResult]:
+    """
+    Пакетный вариант _analysis_fio: классификация письменности одним проходом
+    по всем ФИО, оставшиеся ФИО уходят в LLM пакетными запросами.
+    
+    Args:
+        names: ФИО для анализа
+        llm: LLM сервис (None — глобальный, см. get_llm)
+        
+    Returns:
+        List[FIOResult]: Результаты в порядке входных ФИО
+    """
+    verdicts = [_local_verdicts(data, scripts) for data, scripts in zip(names, classify_names(names))]
+    to_llm = [index for index, v in enumerate(verdicts) if not _is_settled(v)]
     
-    if (surname_has_substitution):
-        surname_result = 4
-    if (name_has_substitution):
-        name_result = 4
-    if (father_name_has_substitution):
-        father_name_result = 4
-    return FIOResult(str(surname_result) + str(name_result) + str(father_name_result))
+    llm_results: List[Optional[FIOResult]] = [None] * len(names)
+    if to_llm:
+        checked = (llm or get_llm()).checking_FIO_batch([names[index] for index in to_llm])
+        for index, llm_result in zip(to_llm, checked):
+            llm_results[index] = llm_result
+    return [_merge_verdicts(r, v) for r, v in zip(llm_results, verdicts)]
 
 
-def check_fio(data: NameParts) -> float:
-    fio_result = _analysis_fio(data)
+def check_fio(data: NameParts, llm: Optional[LLMService] = None) -> float:
+    fio_result = _analysis_fio(data, llm)
     return _calculate_suspicion_score(fio_result)
 
 
+def check_fio_local(data: NameParts) -> float:
+    """
+    Деградированный вариант check_fio для режима, когда LLM недоступна:
+    учитываются только локальные проверки (письменность и словарь),
+    части ФИО, которые без LLM не оценить, считаются непроверенными (0).
+    
+    Args:
+        data: ФИО для проверки
+        
+    Returns:
+        float: Коэффициент подозрительности по локальным проверкам
+    """
+    verdicts = _local_verdicts(data, classify_name(data))
+    return _calculate_suspicion_score(_merge_verdicts(FIOResult.of(0, 0, 0), verdicts))
+
+
+def check_fio_batch(
+    names: Union[Sequence[NameParts], RezumeBatch],
+    llm: Optional[LLMService] = None,
+) -> List[float]:
+    """
+    Пакетный вариант check_fio: меньше запросов к LLM за счёт упаковки нескольких ФИО в один.
+    
+    Args:
+        names: ФИО для проверки или пакет резюме (каждое уникальное ФИО проверяется один раз)
+        llm: LLM сервис (None — глобальный, см. get_llm)
+        
+    Returns:
+        List[float]: Коэффициенты подозрительности в порядке входных ФИО
+    """
+    if isinstance(names, RezumeBatch):
+        unique, inverse = names.unique_names()
+        scores = check_fio_batch(unique, llm)
+        return [scores[index] for index in inverse]
+    return [_calculate_suspicion_score(result) for result in _analysis_fio_batch(names, llm)]
+
+
 if __name__ == "__main__":
     print(check_fio(NameParts(surname="Лызь", name="Дмитрий", father_name="Михайлович")))
\ No newline at end of file
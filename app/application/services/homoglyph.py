@@ -0,0 +1,138 @@
+"""
+Локальная проверка письменности частей ФИО.
+
+Каждый символ переводится в класс письменности одной таблицей str.translate,
+собранной при импорте модуля, поэтому часть ФИО (или целый пакет ФИО)
+классифицируется за один проход без обращения к LLM.
+"""
+
+from enum import Enum
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from app.domain.models import NameParts
+
+
+class ScriptClass(str, Enum):
+    """Класс письменности части ФИО."""
+    MISSING = "missing"          # часть не указана
+    CYRILLIC = "cyrillic"        # только кириллица — решает LLM
+    LATIN = "latin"              # только латиница — транслит
+    MIXED = "mixed"              # кириллица вперемешку с латиницей
+    CONFUSABLE = "confusable"    # греческие, цифры, полноширинные и прочие двойники букв
+    OTHER = "other"              # другие алфавиты (армянский, грузинский и т.п.) — решает LLM
+
+
+# Оценки по шкале FIO_PROMPT для классов, которые решаются без LLM
+LOCAL_VERDICTS: Dict[ScriptClass, int] = {
+    ScriptClass.MISSING: 1,
+    ScriptClass.LATIN: 4,
+    ScriptClass.MIXED: 4,
+    ScriptClass.CONFUSABLE: 4,
+}
+
+_CYRILLIC = "C"
+_LATIN = "L"
+_CONFUSABLE = "G"
+# Разделитель частей при пакетной классификации; таблица его не трогает
+_SEPARATOR = "\x00"
+
+
+def _build_table() -> Dict[int, Optional[str]]:
+    table: Dict[int, Optional[str]] = {}
+
+    def mark(start: int, end: int, cls: Optional[str]) -> None:
+        for code in range(start, end + 1):
+            table[code] = cls
+
+    # Кириллица и дополнение к ней
+    mark(0x0400, 0x052F, _CYRILLIC)
+    # Латиница: ASCII, Latin-1 (кроме × и ÷), расширенная A/B и дополнительная
+    mark(ord("A"), ord("Z"), _LATIN)
+    mark(ord("a"), ord("z"), _LATIN)
+    mark(0x00C0, 0x024F, _LATIN)
+    mark(0x1E00, 0x1EFF, _LATIN)
+    table[0x00D7] = _CONFUSABLE
+    table[0x00F7] = _CONFUSABLE
+    # Двойники кириллических букв из других блоков
+    mark(ord("0"), ord("9"), _CONFUSABLE)      # 0 → О, 3 → З, 6 → б
+    mark(0x0370, 0x03FF, _CONFUSABLE)          # греческий: Α, Β, Ε, Ο, Ρ, Τ, Χ …
+    mark(0x1D00, 0x1D7F, _CONFUSABLE)          # малые капители латиницы
+    mark(0xFF10, 0xFF5A, _CONFUSABLE)          # полноширинные цифры и буквы
+    mark(0x1D400, 0x1D7FF, _CONFUSABLE)        # математические буквы
+    # Невидимые символы внутри слова — тоже приём подмены
+    for code in (0x00AD, 0x200B, 0x200C, 0x200D, 0x2060, 0xFEFF):
+        table[code] = _CONFUSABLE
+    # Допустимые разделители в двойных именах/фамилиях не влияют на класс
+    for char in " -‐‑–'’.":
+        table[ord(char)] = None
+    return table
+
+
+_TABLE = _build_table()
+_KNOWN = frozenset((_CYRILLIC, _LATIN, _CONFUSABLE))
+
+
+def _classify_translated(translated: str, original: str) -> ScriptClass:
+    if not original.strip():
+        return ScriptClass.MISSING
+    classes = set(translated)
+    if _CONFUSABLE in classes:
+        return ScriptClass.CONFUSABLE
+    has_cyrillic = _CYRILLIC in classes
+    has_latin = _LATIN in classes
+    if has_cyrillic and has_latin:
+        return ScriptClass.MIXED
+    if has_latin:
+        return ScriptClass.LATIN
+    if has_cyrillic and classes <= _KNOWN:
+        return ScriptClass.CYRILLIC
+    return ScriptClass.OTHER
+
+
+def classify_part(text: str) -> ScriptClass:
+    """
+    Классифицирует одну часть ФИО по письменности.
+
+    Args:
+        text: Фамилия, имя или отчество
+
+    Returns:
+        ScriptClass: Класс письменности
+    """
+    return _classify_translated(text.translate(_TABLE), text)
+
+
+def classify_parts(parts: Sequence[str]) -> List[ScriptClass]:
+    """
+    Пакетная классификация: все строки переводятся одним вызовом str.translate.
+
+    Args:
+        parts: Части ФИО (в любом порядке, из любого количества ФИО)
+
+    Returns:
+        List[ScriptClass]: Классы в порядке входных строк
+    """
+    if not parts:
+        return []
+    # Разделитель внутри самой строки сломал бы разбиение — такие строки считаем отдельно
+    if any(_SEPARATOR in part for part in parts):
+        return [classify_part(part) for part in parts]
+    translated = _SEPARATOR.join(parts).translate(_TABLE).split(_SEPARATOR)
+    return [_classify_translated(t, part) for t, part in zip(translated, parts)]
+
+
+def classify_name(data: NameParts) -> Tuple[ScriptClass, ScriptClass, ScriptClass]:
+    """Классы письменности фамилии, имени и отчества."""
+    surname, name, father_name = classify_parts([data.surname, data.name, data.father_name])
+    return surname, name, father_name
+
+
+def classify_names(names: Sequence[NameParts]) -> List[Tuple[ScriptClass, ScriptClass, ScriptClass]]:
+    """Пакетный вариант classify_name: один проход по всем частям всех ФИО."""
+    flat = classify_parts([part for data in names for part in (data.surname, data.name, data.father_name)])
+    return [(flat[i], flat[i + 1], flat[i + 2]) for i in range(0, len(flat), 3)]
+
+
+def local_verdict(script: ScriptClass) -> Optional[int]:
+    """Оценка части ФИО без LLM или None, если нужна проверка LLM."""
+    return LOCAL_VERDICTS.get(script)
@@ -0,0 +1,280 @@
+"""
+Анализ легенд резюме (PlaceWork.legend и Rezume.about) на накрутку.
+
+Два уровня:
+
+    1. Локальный, без сети:
+        - пустые и короткие тексты без шаблонных фраз — честные;
+        - текст, почти совпадающий с легендой другого резюме (MinHash/LSH
+          по уже проверенным легендам), — шаблон, скопированный между резюме;
+          копии ищутся только у легенд с известным владельцем: без него
+          повторная проверка того же текста выглядела бы копией самого себя;
+        - много шаблонных фраз из словаря — накрутка, ни одной — честный текст.
+    2. LLM — только для неоднозначного остатка (мало шаблонных фраз).
+
+Если LLM недоступна, неоднозначная легенда оценивается по числу фраз
+(вердикт помечается tier="degraded").
+"""
+
+from __future__ import annotations
+
+import itertools
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Hashable, List, Mapping, Optional, Sequence, Set, Tuple
+
+from app.config import CONFIG
+from app.application.services.duplicates import owner_key
+from app.domain.models import Rezume
+from app.infrastructure.legend import DEFAULT_PATTERNS_PATH, PatternMatcher, load_patterns
+from app.infrastructure.llm import LLMService, get_llm
+from app.infrastructure.llm.circuit_breaker import LLMUnavailableError
+from app.infrastructure.similarity import LSHIndex, MinHasher
+
+LEGEND_CLEAN = 0
+LEGEND_SUSPICIOUS = 1
+
+TIERS = ("empty", "patterns", "duplicate", "llm", "degraded")
+
+
+class LegendVerdict:
+    """
+    Атрибуты:
+        verdict: LEGEND_CLEAN или LEGEND_SUSPICIOUS
+        tier: Чем принято решение: "empty", "patterns", "duplicate", "llm", "degraded"
+        hits: Номера найденных шаблонных фраз
+        duplicate_of: Владелец похожей легенды (для tier="duplicate")
+        similarity: Оценка сходства с ней
+    """
+
+    __slots__ = ("verdict", "tier", "hits", "duplicate_of", "similarity")
+
+    def __init__(
+        self,
+        verdict: int,
+        tier: str,
+        hits: Set[int] = frozenset(),
+        duplicate_of: Optional[Hashable] = None,
+        similarity: Optional[float] = None,
+    ):
+        self.verdict = verdict
+        self.tier = tier
+        self.hits = hits
+        self.duplicate_of = duplicate_of
+        self.similarity = similarity
+
+    @property
+    def suspicious(self) -> bool:
+        return self.verdict == LEGEND_SUSPICIOUS
+
+    def __repr__(self) -> str:
+        return f"LegendVerdict(verdict={self.verdict}, tier={self.tier!r}, hits={sorted(self.hits)})"
+
+
+class LegendAnalyzer:
+    """
+    Использование:
+        analyzer = LegendAnalyzer()
+        analyzer.analyze("Стрессоустойчив, нацелен на результат...", owner="rezume-42")
+        analyzer.score(rezume)          # доля подозрительных легенд резюме
+    """
+
+    def __init__(
+        self,
+        patterns: Optional[Mapping[int, str]] = None,
+        llm: Optional[LLMService] = None,
+        *,
+        min_words: int = 8,
+        suspicious_hits: int = 3,
+        duplicate_threshold: float = 0.8,
+        max_indexed: int = 100_000,
+        num_perm: int = 128,
+        bands: int = 16,
+    ):
+        """
+        Args:
+            patterns: Словарь шаблонных фраз (по умолчанию — встроенный)
+            llm: LLM сервис для неоднозначных легенд (None — глобальный)
+            min_words: Короче — без поиска копий; без шаблонных фраз считается честным
+            suspicious_hits: Сколько разных фраз достаточно для вердикта без LLM
+            duplicate_threshold: Сходство с чужой легендой, при котором она считается копией
+            max_indexed: Сколько последних легенд помнить для поиска копий
+            num_perm: Длина MinHash-сигнатуры
+            bands: Число полос LSH
+        """
+        if suspicious_hits < 1 or max_indexed < 1:
+            raise ValueError("suspicious_hits и max_indexed должны быть >= 1")
+        self._patterns = dict(patterns) if patterns is not None else load_patterns(DEFAULT_PATTERNS_PATH)
+        self._matcher = PatternMatcher.for_patterns(self._patterns)
+        self._llm = llm
+        self._min_words = min_words
+        self._suspicious_hits = suspicious_hits
+        self._max_indexed = max_indexed
+
+        self._hasher = MinHasher(num_perm=num_perm)
+        self._index = LSHIndex(num_perm=num_perm, bands=bands, threshold=duplicate_threshold)
+        self._order: "OrderedDict[Tuple[Hashable, int], None]" = OrderedDict()
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        self._tiers = dict.fromkeys(TIERS, 0)
+
+    @property
+    def patterns(self) -> Dict[int, str]:
+        return dict(self._patterns)
+
+    def analyze(self, text: Optional[str], owner: Optional[Hashable] = None) -> LegendVerdict:
+        """
+        Вердикт по одной легенде.
+
+        Args:
+            text: Текст легенды
+            owner: Чья это легенда (совпадения с легендами того же владельца копией не считаются;
+                None — копии не ищутся, легенда не запоминается)
+
+        Returns:
+            LegendVerdict: Вердикт и уровень, на котором он принят
+        """
+        verdict = self._local(text, owner)
+        if verdict is None:
+            verdict = self._ask_llm(text)
+        return self._count(verdict)
+
+    def analyze_many(
+        self,
+        items: Sequence[Tuple[Optional[str], Optional[Hashable]]],
+        max_in_flight: int = 4,
+    ) -> List[LegendVerdict]:
+        """
+        Вердикты по нескольким легендам: сначала локальный уровень для всех,
+        затем неоднозначный остаток параллельно уходит в LLM.
+
+        Args:
+            items: Пары (текст, владелец; None — без поиска копий)
+            max_in_flight: Сколько запросов к LLM выполнять одновременно
+
+        Returns:
+            List[LegendVerdict]: Вердикты в порядке items
+        """
+        verdicts: List[Optional[LegendVerdict]] = [self._local(text, owner) for text, owner in items]
+        tail = [index for index, verdict in enumerate(verdicts) if verdict is None]
+        if tail:
+            with ThreadPoolExecutor(max_workers=max(1, min(max_in_flight, len(tail)))) as pool:
+                for index, verdict in zip(tail, pool.map(lambda i: self._ask_llm(items[i][0]), tail)):
+                    verdicts[index] = verdict
+        return [self._count(verdict) for verdict in verdicts]
+
+    def analyze_rezume(self, rezume: Rezume) -> List[LegendVerdict]:
+        """Вердикты по легендам мест работы (по порядку) и по разделу «О себе» (последним)."""
+        owner = owner_key(rezume)
+        texts = [place.legend for place in rezume.places] + [rezume.about]
+        return self.analyze_many([(text, owner) for text in texts])
+
+    def score(self, rezume: Rezume) -> float:
+        """
+        Доля подозрительных среди непустых легенд резюме.
+
+        Returns:
+            float: От 0.0 до 1.0 (0.0, если легенд нет)
+        """
+        verdicts = [v for v in self.analyze_rezume(rezume) if v.tier != "empty"]
+        if not verdicts:
+            return 0.0
+        return sum(v.suspicious for v in verdicts) / len(verdicts)
+
+    def stats(self) -> Dict[str, Any]:
+        """Сколько легенд решено на каждом уровне и доля обращений к LLM."""
+        with self._lock:
+            tiers = dict(self._tiers)
+            indexed = len(self._index)
+        total = sum(tiers.values())
+        llm_calls = tiers["llm"] + tiers["degraded"]
+        return {
+            "tiers": tiers,
+            "total": total,
+            "llm_share": llm_calls / total if total else 0.0,
+            "indexed": indexed,
+            "patterns": len(self._matcher),
+        }
+
+    # -----------------------
+    # Уровни
+    # -----------------------
+
+    def _local(self, text: Optional[str], owner: Optional[Hashable]) -> Optional[LegendVerdict]:
+        """Вердикт без LLM или None, если легенда неоднозначна."""
+        if not text or not text.strip():
+            return LegendVerdict(LEGEND_CLEAN, "empty")
+        hits = self._matcher.hits(text)
+        long_enough = len(text.split()) >= self._min_words
+
+        if long_enough and owner is not None:
+            duplicate = self._find_copy(text, owner)
+            if duplicate is not None:
+                return LegendVerdict(LEGEND_SUSPICIOUS, "duplicate", hits, *duplicate)
+        if len(hits) >= self._suspicious_hits:
+            return LegendVerdict(LEGEND_SUSPICIOUS, "patterns", hits)
+        if not hits:
+            return LegendVerdict(LEGEND_CLEAN, "patterns", hits)
+        return None
+
+    def _ask_llm(self, text: str) -> LegendVerdict:
+        hits = self._matcher.hits(text)
+        llm = self._llm or get_llm()
+        try:
+            return LegendVerdict(llm.analysis_of_legend(text, self._patterns), "llm", hits)
+        except (LLMUnavailableError, ValueError):
+            # Половина порога фраз — уже повод насторожиться
+            verdict = LEGEND_SUSPICIOUS if 2 * len(hits) >= self._suspicious_hits else LEGEND_CLEAN
+            return LegendVerdict(verdict, "degraded", hits)
+
+    def _find_copy(self, text: str, owner: Hashable) -> Optional[Tuple[Hashable, float]]:
+        """Ищет похожую чужую легенду и запоминает эту."""
+        signature = self._hasher.signature(text)
+        with self._lock:
+            matches = self._index.query(signature)
+            foreign = [(key, similarity) for key, similarity in matches if key[0] != owner]
+            repeated = any(key[0] == owner and similarity == 1.0 for key, similarity in matches)
+            if not repeated:
+                key = (owner, next(self._sequence))
+                self._index.insert(key, signature)
+                self._order[key] = None
+                while len(self._order) > self._max_indexed:
+                    oldest, _ = self._order.popitem(last=False)
+                    self._index.remove(oldest)
+        if not foreign:
+            return None
+        (duplicate_owner, _), similarity = foreign[0]
+        return duplicate_owner, similarity
+
+    def _count(self, verdict: LegendVerdict) -> LegendVerdict:
+        with self._lock:
+            self._tiers[verdict.tier] += 1
+        return verdict
+
+
+_analyzer: Optional[LegendAnalyzer] = None
+_analyzer_lock = threading.Lock()
+
+
+def get_legend_analyzer() -> LegendAnalyzer:
+    """
+    Возвращает общий анализатор легенд, создавая его при первом обращении
+    (настройки — LEGEND_* из конфигурации).
+
+    Returns:
+        LegendAnalyzer: Глобальный экземпляр
+    """
+    global _analyzer
+    if _analyzer is None:
+        with _analyzer_lock:
+            if _analyzer is None:
+                path = CONFIG.get("LEGEND_PATTERNS_PATH")
+                _analyzer = LegendAnalyzer(
+                    load_patterns(path) if path else None,
+                    min_words=CONFIG.get("LEGEND_MIN_WORDS", 8),
+                    suspicious_hits=CONFIG.get("LEGEND_SUSPICIOUS_HITS", 3),
+                    duplicate_threshold=CONFIG.get("LEGEND_DUPLICATE_THRESHOLD", 0.8),
+                    max_indexed=CONFIG.get("LEGEND_MAX_INDEXED", 100_000),
+                )
+    return _analyzer
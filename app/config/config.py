@@ -11,9 +11,93 @@ PROXY_API_BASE_URL = os.getenv("PROXY_API_BASE_URL ")
 DB_URL = os.getenv("DB_URL")
 DEBUG = os.getenv("DEBUG", "False").lower() in ("true", "1", "yes")
 
+FIO_CACHE_PATH = os.getenv("FIO_CACHE_PATH")
+FIO_CACHE_TTL = float(os.getenv("FIO_CACHE_TTL", str(30 * 24 * 3600)))
+FIO_CACHE_MAX_ENTRIES = int(os.getenv("FIO_CACHE_MAX_ENTRIES", "1000000"))
+FIO_CACHE_MEMORY_SIZE = int(os.getenv("FIO_CACHE_MEMORY_SIZE", "10000"))
+FIO_BATCH_SIZE = int(os.getenv("FIO_BATCH_SIZE", "20"))
+FIO_BATCH_FLUSH_INTERVAL = float(os.getenv("FIO_BATCH_FLUSH_INTERVAL", "0.05"))
+NAME_LEXICON_PATH = os.getenv("NAME_LEXICON_PATH")
+CITY_GAZETTEER_PATH = os.getenv("CITY_GAZETTEER_PATH")
+CITY_CACHE_SIZE = int(os.getenv("CITY_CACHE_SIZE", "4096"))
+# Анализ легенд: словарь шаблонных фраз (по умолчанию встроенный) и пороги локального уровня
+LEGEND_PATTERNS_PATH = os.getenv("LEGEND_PATTERNS_PATH")
+LEGEND_MIN_WORDS = int(os.getenv("LEGEND_MIN_WORDS", "8"))
+LEGEND_SUSPICIOUS_HITS = int(os.getenv("LEGEND_SUSPICIOUS_HITS", "3"))
+LEGEND_DUPLICATE_THRESHOLD = float(os.getenv("LEGEND_DUPLICATE_THRESHOLD", "0.8"))
+LEGEND_MAX_INDEXED = int(os.getenv("LEGEND_MAX_INDEXED", "100000"))
+# Индекс резюме-дубликатов (шаблон со сменой ФИО); без пути индекс живёт только в памяти
+DUPLICATE_INDEX_PATH = os.getenv("DUPLICATE_INDEX_PATH")
+DUPLICATE_THRESHOLD = float(os.getenv("DUPLICATE_THRESHOLD", "0.8"))
+DUPLICATE_MIN_CHARS = int(os.getenv("DUPLICATE_MIN_CHARS", "40"))
+# Включить сигнал дубликатов в сервисе
+SERVICE_DUPLICATES = os.getenv("SERVICE_DUPLICATES", "False").lower() in ("true", "1", "yes")
+# Выгрузка реестра юрлиц (CSV или Parquet); без неё места работы по реестру не сверяются
+COMPANY_REGISTRY_PATH = os.getenv("COMPANY_REGISTRY_PATH")
+LLM_RPS = float(os.getenv("LLM_RPS")) if os.getenv("LLM_RPS") else None
+LLM_TPM = float(os.getenv("LLM_TPM")) if os.getenv("LLM_TPM") else None
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "64"))
+LLM_BREAKER_FAILURES = int(os.getenv("LLM_BREAKER_FAILURES", "5"))
+LLM_BREAKER_RECOVERY = float(os.getenv("LLM_BREAKER_RECOVERY", "30"))
+LLM_PROVIDER = os.getenv("LLM_PROVIDER", "gemini")
+LLM_REPLAY_PATH = os.getenv("LLM_REPLAY_PATH")
+LLM_REPLAY_MODE = os.getenv("LLM_REPLAY_MODE", "replay")
+LLM_REPLAY_LATENCY = float(os.getenv("LLM_REPLAY_LATENCY", "0"))
+LLM_REPLAY_UPSTREAM = os.getenv("LLM_REPLAY_UPSTREAM", "gemini")
+TELEMETRY_SINKS = os.getenv("TELEMETRY_SINKS", "")
+TELEMETRY_PROMETHEUS_PATH = os.getenv("TELEMETRY_PROMETHEUS_PATH", "wolfeye.prom")
+TELEMETRY_OTLP_PATH = os.getenv("TELEMETRY_OTLP_PATH", "wolfeye-spans.jsonl")
+SERVICE_WORKERS = int(os.getenv("SERVICE_WORKERS", "4"))
+SERVICE_MAX_BATCH = int(os.getenv("SERVICE_MAX_BATCH", "32"))
+SERVICE_MAX_WAIT = float(os.getenv("SERVICE_MAX_WAIT", "0.005"))
+SERVICE_QUEUE_SIZE = int(os.getenv("SERVICE_QUEUE_SIZE", "1024"))
+SERVICE_MAX_REQUEST_ITEMS = int(os.getenv("SERVICE_MAX_REQUEST_ITEMS", "1000"))
+SERVICE_MAX_IN_FLIGHT = int(os.getenv("SERVICE_MAX_IN_FLIGHT", "16"))
+# Кэш компонентов скоринга по отпечаткам входов (0 — выключен)
+SERVICE_COMPONENT_CACHE_SIZE = int(os.getenv("SERVICE_COMPONENT_CACHE_SIZE", "100000"))
+
 CONFIG = {
     "API_KEY": API_KEY,
     "DB_URL": DB_URL,
     "DEBUG": DEBUG,
-    "PROXY_API_BASE_URL":PROXY_API_BASE_URL
+    "PROXY_API_BASE_URL":PROXY_API_BASE_URL,
+    "FIO_CACHE_PATH": FIO_CACHE_PATH,
+    "FIO_CACHE_TTL": FIO_CACHE_TTL,
+    "FIO_CACHE_MAX_ENTRIES": FIO_CACHE_MAX_ENTRIES,
+    "FIO_CACHE_MEMORY_SIZE": FIO_CACHE_MEMORY_SIZE,
+    "FIO_BATCH_SIZE": FIO_BATCH_SIZE,
+    "FIO_BATCH_FLUSH_INTERVAL": FIO_BATCH_FLUSH_INTERVAL,
+    "NAME_LEXICON_PATH": NAME_LEXICON_PATH,
+    "CITY_GAZETTEER_PATH": CITY_GAZETTEER_PATH,
+    "CITY_CACHE_SIZE": CITY_CACHE_SIZE,
+    "COMPANY_REGISTRY_PATH": COMPANY_REGISTRY_PATH,
+    "LEGEND_PATTERNS_PATH": LEGEND_PATTERNS_PATH,
+    "LEGEND_MIN_WORDS": LEGEND_MIN_WORDS,
+    "LEGEND_SUSPICIOUS_HITS": LEGEND_SUSPICIOUS_HITS,
+    "LEGEND_DUPLICATE_THRESHOLD": LEGEND_DUPLICATE_THRESHOLD,
+    "LEGEND_MAX_INDEXED": LEGEND_MAX_INDEXED,
+    "DUPLICATE_INDEX_PATH": DUPLICATE_INDEX_PATH,
+    "DUPLICATE_THRESHOLD": DUPLICATE_THRESHOLD,
+    "DUPLICATE_MIN_CHARS": DUPLICATE_MIN_CHARS,
+    "SERVICE_DUPLICATES": SERVICE_DUPLICATES,
+    "LLM_RPS": LLM_RPS,
+    "LLM_TPM": LLM_TPM,
+    "LLM_MAX_CONCURRENCY": LLM_MAX_CONCURRENCY,
+    "LLM_BREAKER_FAILURES": LLM_BREAKER_FAILURES,
+    "LLM_BREAKER_RECOVERY": LLM_BREAKER_RECOVERY,
+    "LLM_PROVIDER": LLM_PROVIDER,
+    "LLM_REPLAY_PATH": LLM_REPLAY_PATH,
+    "LLM_REPLAY_MODE": LLM_REPLAY_MODE,
+    "LLM_REPLAY_LATENCY": LLM_REPLAY_LATENCY,
+    "LLM_REPLAY_UPSTREAM": LLM_REPLAY_UPSTREAM,
+    "TELEMETRY_SINKS": TELEMETRY_SINKS,
+    "TELEMETRY_PROMETHEUS_PATH": TELEMETRY_PROMETHEUS_PATH,
+    "TELEMETRY_OTLP_PATH": TELEMETRY_OTLP_PATH,
+    "SERVICE_WORKERS": SERVICE_WORKERS,
+    "SERVICE_MAX_BATCH": SERVICE_MAX_BATCH,
+    "SERVICE_MAX_WAIT": SERVICE_MAX_WAIT,
+    "SERVICE_QUEUE_SIZE": SERVICE_QUEUE_SIZE,
+    "SERVICE_MAX_REQUEST_ITEMS": SERVICE_MAX_REQUEST_ITEMS,
+    "SERVICE_MAX_IN_FLIGHT": SERVICE_MAX_IN_FLIGHT,
+    "SERVICE_COMPONENT_CACHE_SIZE": SERVICE_COMPONENT_CACHE_SIZE,
 }
@@ -0,0 +1,444 @@
+"""
+Компактное колоночное представление пакета резюме (structure of arrays).
+
+Вместо сотен тысяч pydantic-объектов RezumeBatch хранит:
+    - строки — кодами int32 в общем пуле интернированных строк (-1 — None);
+    - даты — int32 числом дней от 1970-01-01 (MISSING_DAY — None);
+    - списки переменной длины (places, education.items, skills) — плоскими
+      столбцами и массивом смещений: элементы i-го резюме лежат в
+      диапазоне offsets[i]:offsets[i + 1].
+
+batch[i] возвращает RezumeView — представление строки, читающее значения
+прямо из массивов; to_rezume(i) собирает полноценный Rezume.
+"""
+
+from __future__ import annotations
+
+from datetime import date
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.domain.models import Education, EducationEntry, NameParts, PlaceWork, Rezume
+from app.domain.work_history import WorkHistory
+
+
+MISSING = -1                                  # код отсутствующей строки (и None в higher)
+MISSING_INT = np.iinfo(np.int32).min          # отсутствующее число
+MISSING_DAY = MISSING_INT                     # отсутствующая дата
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def date_to_day(value: Optional[date]) -> int:
+    """Дата → число дней от 1970-01-01 (None → MISSING_DAY)."""
+    return MISSING_DAY if value is None else value.toordinal() - _EPOCH_ORDINAL
+
+
+def day_to_date(value: int) -> Optional[date]:
+    """Обратное преобразование к date_to_day."""
+    return None if value == MISSING_DAY else date.fromordinal(int(value) + _EPOCH_ORDINAL)
+
+
+def days_to_datetime64(days: np.ndarray) -> np.ndarray:
+    """Столбец дней → datetime64[D] с NaT на месте пропусков."""
+    result = days.astype("datetime64[D]")
+    result[days == MISSING_DAY] = np.datetime64("NaT")
+    return result
+
+
+class StringPool:
+    """Интернированные строки: каждая уникальная строка хранится один раз."""
+
+    def __init__(self):
+        self.strings: List[str] = []
+        self._codes: Dict[str, int] = {}
+
+    def intern(self, value: Optional[str]) -> int:
+        if value is None:
+            return MISSING
+        code = self._codes.get(value)
+        if code is None:
+            code = len(self.strings)
+            self._codes[value] = code
+            self.strings.append(value)
+        return code
+
+    def get(self, code: int) -> Optional[str]:
+        return None if code == MISSING else self.strings[code]
+
+    def blank_mask(self, codes: np.ndarray) -> np.ndarray:
+        """True там, где строка отсутствует или состоит из пробелов."""
+        blank = np.fromiter((not s.strip() for s in self.strings), dtype=bool, count=len(self.strings))
+        # Последний элемент — для кода MISSING (-1)
+        return np.append(blank, True)[codes]
+
+    def __len__(self) -> int:
+        return len(self.strings)
+
+
+_FIELDS = ("phone", "residence_city", "desired_position", "about")
+_PLACE_FIELDS = ("company", "company_info", "position", "legend")
+_EDU_FIELDS = ("university", "city", "faculty")
+
+
+class RezumeBatch:
+    """
+    Пакет резюме в колоночном виде.
+
+    Использование:
+        batch = RezumeBatch.from_rezumes(rezumes)
+        view = batch[0]                 # без копирования
+        rezume = batch.to_rezume(0)     # полноценный Rezume
+    """
+
+    def __init__(self, pool: StringPool, columns: Dict[str, np.ndarray]):
+        self.pool = pool
+        self.columns = columns
+        self._size = len(columns["surname"])
+
+    # -----------------------
+    # Построение и обратное преобразование
+    # -----------------------
+
+    @classmethod
+    def from_rezumes(cls, rezumes: Iterable[Rezume]) -> "RezumeBatch":
+        """
+        Строит пакет из резюме (вход читается один раз, может быть генератором).
+
+        Args:
+            rezumes: Резюме
+
+        Returns:
+            RezumeBatch: Колоночное представление
+        """
+        pool = StringPool()
+        intern = pool.intern
+        rows: Dict[str, List[int]] = {
+            name: [] for name in (
+                "surname", "name", "father_name", "born_date", "experience_years", "higher",
+                *_FIELDS, "place_offsets", "edu_offsets", "skill_offsets",
+                *(f"place_{f}" for f in _PLACE_FIELDS), "place_start", "place_end",
+                *(f"edu_{f}" for f in _EDU_FIELDS), "edu_end", "skills",
+            )
+        }
+        for key in ("place_offsets", "edu_offsets", "skill_offsets"):
+            rows[key].append(0)
+
+        for rezume in rezumes:
+            fio = rezume.fio
+            rows["surname"].append(intern(fio.surname))
+            rows["name"].append(intern(fio.name))
+            rows["father_name"].append(intern(fio.father_name))
+            rows["born_date"].append(date_to_day(rezume.born_date))
+            rows["experience_years"].append(
+                MISSING_INT if rezume.experience_years is None else rezume.experience_years
+            )
+            higher = rezume.education.higher
+            rows["higher"].append(MISSING if higher is None else int(higher))
+            for field in _FIELDS:
+                rows[field].append(intern(getattr(rezume, field)))
+
+            for place in rezume.places:
+                for field in _PLACE_FIELDS:
+                    rows[f"place_{field}"].append(intern(getattr(place, field)))
+                rows["place_start"].append(date_to_day(place.start_date))
+                rows["place_end"].append(date_to_day(place.end_date))
+            rows["place_offsets"].append(rows["place_offsets"][-1] + len(rezume.places))
+
+            items = rezume.education.items
+            for item in items:
+                for field in _EDU_FIELDS:
+                    rows[f"edu_{field}"].append(intern(getattr(item, field)))
+                rows["edu_end"].append(date_to_day(item.end_date))
+            rows["edu_offsets"].append(rows["edu_offsets"][-1] + len(items))
+
+            rows["skills"].extend(intern(skill) for skill in rezume.skills)
+            rows["skill_offsets"].append(len(rows["skills"]))
+
+        columns = {
+            key: np.array(values, dtype=np.int64 if key.endswith("_offsets") else np.int32)
+            for key, values in rows.items()
+        }
+        columns["higher"] = columns["higher"].astype(np.int8)
+        return cls(pool, columns)
+
+    def to_rezume(self, index: int) -> Rezume:
+        """Собирает полноценный Rezume для строки index."""
+        return self[index].to_rezume()
+
+    def to_rezumes(self) -> List[Rezume]:
+        return [view.to_rezume() for view in self]
+
+    # -----------------------
+    # Доступ к строкам
+    # -----------------------
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, index: int) -> "RezumeView":
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError(index)
+        return RezumeView(self, index)
+
+    def __iter__(self) -> Iterator["RezumeView"]:
+        return (RezumeView(self, i) for i in range(self._size))
+
+    # -----------------------
+    # Столбцы для векторных правил
+    # -----------------------
+
+    def born_dates(self) -> np.ndarray:
+        """Даты рождения, datetime64[D]."""
+        return days_to_datetime64(self.columns["born_date"])
+
+    def first_work_dates(self) -> np.ndarray:
+        """Самая ранняя дата начала работы по places каждого резюме, datetime64[D]."""
+        starts = self.columns["place_start"].astype(np.int64)
+        # MISSING_DAY не должен выигрывать минимум: заменяем на +inf-подобное значение
+        starts[starts == MISSING_DAY] = np.iinfo(np.int64).max
+        result = _segment_min(starts, self.columns["place_offsets"], np.iinfo(np.int64).max)
+        result[result == np.iinfo(np.int64).max] = MISSING_DAY
+        return days_to_datetime64(result)
+
+    def place_counts(self) -> np.ndarray:
+        return np.diff(self.columns["place_offsets"])
+
+    def education_counts(self) -> np.ndarray:
+        return np.diff(self.columns["edu_offsets"])
+
+    def first_education(self, field: str) -> np.ndarray:
+        """
+        Значение поля первой записи об образовании для каждого резюме
+        (MISSING / MISSING_DAY, если образования нет).
+
+        Args:
+            field: "university", "city", "faculty" или "end"
+        """
+        values = self.columns[f"edu_{field}"]
+        missing = MISSING_DAY if field == "end" else MISSING
+        offsets = self.columns["edu_offsets"]
+        has_items = np.diff(offsets) > 0
+        result = np.full(self._size, missing, dtype=np.int32)
+        result[has_items] = values[offsets[:-1][has_items]]
+        return result
+
+    def names(self) -> List[NameParts]:
+        return [view.fio for view in self]
+
+    def unique_names(self) -> Tuple[List[NameParts], np.ndarray]:
+        """
+        Уникальные ФИО пакета и индекс уникального ФИО для каждой строки.
+
+        Returns:
+            Tuple[List[NameParts], np.ndarray]: ФИО и массив индексов длины len(batch)
+        """
+        keys = np.stack([self.columns["surname"], self.columns["name"], self.columns["father_name"]], axis=1)
+        if not len(keys):
+            return [], np.zeros(0, dtype=np.int64)
+        unique, inverse = np.unique(keys, axis=0, return_inverse=True)
+        get = self.pool.get
+        names = [NameParts(surname=get(s), name=get(n), father_name=get(f)) for s, n, f in unique]
+        return names, inverse.reshape(-1)
+
+    @property
+    def nbytes(self) -> int:
+        """Размер массивов и пула строк в байтах (оценка)."""
+        strings = sum(len(s.encode("utf-8")) + 49 for s in self.pool.strings)
+        return sum(column.nbytes for column in self.columns.values()) + strings
+
+
+def _segment_min(values: np.ndarray, offsets: np.ndarray, empty: int) -> np.ndarray:
+    """Минимум values по сегментам offsets; пустые сегменты получают empty."""
+    counts = np.diff(offsets)
+    result = np.full(len(counts), empty, dtype=values.dtype)
+    nonempty = counts > 0
+    if values.size:
+        result[nonempty] = np.minimum.reduceat(values, offsets[:-1][nonempty])
+    return result
+
+
+# -----------------------
+# Представления строк (без копирования данных)
+# -----------------------
+
+class _ItemsView(Sequence):
+    """Срез вложенного списка (places или education.items) одного резюме."""
+
+    def __init__(self, batch: RezumeBatch, factory, start: int, stop: int):
+        self._batch = batch
+        self._factory = factory
+        self._start = start
+        self._stop = stop
+
+    def __len__(self) -> int:
+        return self._stop - self._start
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return self._factory(self._batch, self._start + index)
+
+
+class PlaceView:
+    """Место работы внутри RezumeBatch (поля как у PlaceWork)."""
+
+    __slots__ = ("_batch", "_index")
+
+    def __init__(self, batch: RezumeBatch, index: int):
+        self._batch = batch
+        self._index = index
+
+    def __getattr__(self, field: str) -> Any:
+        columns = self._batch.columns
+        if field == "start_date":
+            return day_to_date(columns["place_start"][self._index])
+        if field == "end_date":
+            return day_to_date(columns["place_end"][self._index])
+        if field in _PLACE_FIELDS:
+            return self._batch.pool.get(columns[f"place_{field}"][self._index])
+        raise AttributeError(field)
+
+    def to_model(self) -> PlaceWork:
+        return PlaceWork(
+            **{field: getattr(self, field) for field in _PLACE_FIELDS},
+            start_date=self.start_date,
+            end_date=self.end_date,
+        )
+
+
+class EducationEntryView:
+    """Запись об образовании внутри RezumeBatch (поля как у EducationEntry)."""
+
+    __slots__ = ("_batch", "_index")
+
+    def __init__(self, batch: RezumeBatch, index: int):
+        self._batch = batch
+        self._index = index
+
+    def __getattr__(self, field: str) -> Any:
+        columns = self._batch.columns
+        if field == "end_date":
+            return day_to_date(columns["edu_end"][self._index])
+        if field in _EDU_FIELDS:
+            return self._batch.pool.get(columns[f"edu_{field}"][self._index])
+        raise AttributeError(field)
+
+    def to_model(self) -> EducationEntry:
+        return EducationEntry(**{field: getattr(self, field) for field in _EDU_FIELDS}, end_date=self.end_date)
+
+
+class EducationView:
+    """Образование резюме внутри RezumeBatch (поля как у Education)."""
+
+    __slots__ = ("_batch", "_row")
+
+    def __init__(self, batch: RezumeBatch, row: int):
+        self._batch = batch
+        self._row = row
+
+    @property
+    def higher(self) -> Optional[bool]:
+        value = self._batch.columns["higher"][self._row]
+        return None if value == MISSING else bool(value)
+
+    @property
+    def items(self) -> _ItemsView:
+        offsets = self._batch.columns["edu_offsets"]
+        return _ItemsView(self._batch, EducationEntryView, int(offsets[self._row]), int(offsets[self._row + 1]))
+
+    def to_model(self) -> Education:
+        return Education(higher=self.higher, items=[item.to_model() for item in self.items])
+
+
+class RezumeView:
+    """
+    Строка RezumeBatch с интерфейсом Rezume: значения читаются из массивов
+    при обращении, поэтому представление можно передавать в сервисы анализа.
+    """
+
+    __slots__ = ("_batch", "_row")
+
+    def __init__(self, batch: RezumeBatch, row: int):
+        self._batch = batch
+        self._row = row
+
+    def _string(self, column: str) -> Optional[str]:
+        return self._batch.pool.get(self._batch.columns[column][self._row])
+
+    @property
+    def fio(self) -> NameParts:
+        return NameParts(
+            surname=self._string("surname"),
+            name=self._string("name"),
+            father_name=self._string("father_name"),
+        )
+
+    @property
+    def born_date(self) -> Optional[date]:
+        return day_to_date(self._batch.columns["born_date"][self._row])
+
+    @property
+    def phone(self) -> Optional[str]:
+        return self._string("phone")
+
+    @property
+    def residence_city(self) -> Optional[str]:
+        return self._string("residence_city")
+
+    @property
+    def desired_position(self) -> Optional[str]:
+        return self._string("desired_position")
+
+    @property
+    def about(self) -> Optional[str]:
+        return self._string("about")
+
+    @property
+    def experience_years(self) -> Optional[int]:
+        value = self._batch.columns["experience_years"][self._row]
+        return None if value == MISSING_INT else int(value)
+
+    @property
+    def places(self) -> _ItemsView:
+        offsets = self._batch.columns["place_offsets"]
+        return _ItemsView(self._batch, PlaceView, int(offsets[self._row]), int(offsets[self._row + 1]))
+
+    @property
+    def work_history(self) -> WorkHistory:
+        # Представление не кэширует: оно само создаётся на одно обращение
+        return WorkHistory(self.places)
+
+    @property
+    def first_work(self) -> Optional[date]:
+        return self.work_history.first_work
+
+    @property
+    def education(self) -> EducationView:
+        return EducationView(self._batch, self._row)
+
+    @property
+    def skills(self) -> List[str]:
+        offsets = self._batch.columns["skill_offsets"]
+        codes = self._batch.columns["skills"][offsets[self._row]:offsets[self._row + 1]]
+        return [self._batch.pool.strings[code] for code in codes]
+
+    def to_rezume(self) -> Rezume:
+        return Rezume(
+            fio=self.fio,
+            born_date=self.born_date,
+            phone=self.phone,
+            residence_city=self.residence_city,
+            desired_position=self.desired_position,
+            experience_years=self.experience_years,
+            places=[place.to_model() for place in self.places],
+            education=self.education.to_model(),
+            skills=self.skills,
+            about=self.about,
+        )
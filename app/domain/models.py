@@ -1,10 +1,16 @@
 from __future__ import annotations
 from datetime import date
-from typing import Optional, List, Dict, ClassVar
-from pydantic import BaseModel, Field, field_validator
+from itertools import product
+from typing import Optional, List, Dict, ClassVar, Tuple
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, field_validator
+
+from app.domain.work_history import DerivedCache, WorkHistory
 
 
 class FIOResult(BaseModel):
+    # Экземпляры интернированы (см. FIOResult.of), поэтому неизменяемы
+    model_config = ConfigDict(frozen=True)
+
     name: int
     surname: int
     father_name: int
@@ -50,6 +56,56 @@ class FIOResult(BaseModel):
             raise ValueError(f"Значение должно быть одним из {cls.ALLOWED}, получено {v}")
         return v
 
+    @classmethod
+    def of(cls, surname: int, name: int, father_name: int) -> "FIOResult":
+        """
+        Готовый экземпляр из таблицы всех 64 сочетаний — без разбора строки
+        и валидации pydantic. Для внутренних вызовов на горячем пути.
+
+        Args:
+            surname: Оценка фамилии
+            name: Оценка имени
+            father_name: Оценка отчества
+
+        Returns:
+            FIOResult: Интернированный экземпляр
+
+        Raises:
+            ValueError: Если оценка не из {0,1,2,4}
+        """
+        try:
+            return _FIO_TABLE[(surname, name, father_name)]
+        except (KeyError, TypeError):
+            raise ValueError(
+                f"Оценки должны быть из {cls.ALLOWED}, получено {(surname, name, father_name)!r}"
+            ) from None
+
+    @classmethod
+    def from_flags(cls, s: str) -> "FIOResult":
+        """
+        То же, что FIOResult(s), но корректная строка берётся из таблицы
+        интернированных экземпляров; некорректная проходит обычную валидацию
+        (и получает ту же ошибку).
+
+        Args:
+            s: Строка из трёх символов из {0,1,2,4}, например '024'
+
+        Returns:
+            FIOResult: Интернированный экземпляр
+        """
+        result = _FIO_BY_FLAGS.get(s)
+        if result is None:
+            result = _FIO_BY_FLAGS.get(s.strip()) if isinstance(s, str) else None
+        return result if result is not None else cls(s)
+
+
+# Все допустимые результаты: значения уже проверены, поэтому без валидации
+_FIO_TABLE: Dict[Tuple[int, int, int], FIOResult] = {
+    (s, n, f): FIOResult.model_construct(surname=s, name=n, father_name=f)
+    for s, n, f in product(sorted(FIOResult.ALLOWED), repeat=3)
+}
+_FIO_BY_FLAGS: Dict[str, FIOResult] = {f"{s}{n}{f}": r for (s, n, f), r in _FIO_TABLE.items()}
+
 
 
 class NameParts(BaseModel):
@@ -93,3 +149,42 @@ class Rezume(BaseModel):
     education: Education = Education()
     skills: List[str] = []
     about: Optional[str] = None
+
+    # Кэш индекса трудовой истории; в сравнение и копии не попадает
+    _derived: DerivedCache = PrivateAttr(default_factory=DerivedCache)
+
+    @property
+    def work_history(self) -> WorkHistory:
+        """
+        Индекс трудовой истории (см. WorkHistory). Строится при первом обращении
+        и пересобирается, только если изменились places (список, сами места
+        или их даты) либо наступил новый день.
+        """
+        today = date.today()
+        key = (today, tuple((id(place), place.start_date, place.end_date) for place in self.places))
+        entry = self._derived.entry
+        if entry is None or entry[0] != key:
+            entry = (key, WorkHistory(self.places, as_of=today))
+            self._derived.entry = entry
+        return entry[1]
+
+    @property
+    def first_work(self) -> Optional[date]:
+        """Дата начала самой ранней работы (из work_history)."""
+        return self.work_history.first_work
+
+
+class ScoreResult(BaseModel):
+    """Результат скоринга одного резюме в пакетном режиме."""
+    score: Optional[float] = None
+    error: Optional[str] = None
+    # True — LLM была недоступна, ФИО оценено только локальными проверками
+    degraded: bool = False
+    # Компоненты, взятые из ComponentStore без пересчёта ("fio", "age_education", ...)
+    reused: List[str] = []
+    # Сколько других людей прислали почти тот же текст резюме (0 — без индекса дубликатов)
+    duplicates: int = 0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
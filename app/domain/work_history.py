@@ -0,0 +1,119 @@
+"""
+Производный индекс трудовой истории резюме.
+
+Строится из places за один проход после сортировки по дате начала
+(O(n log n)): первая работа, общий стаж без двойного счёта параллельных
+работ, перерывы между работами и пересекающиеся места. Незакрытое место
+(end_date is None) считается действующим на дату as_of.
+
+Rezume.work_history строит индекс лениво и кэширует его до изменения places,
+поэтому анализаторы читают его, а не перебирают places заново.
+"""
+
+from __future__ import annotations
+
+import heapq
+from datetime import date
+from typing import Any, List, Optional, Sequence, Tuple
+
+
+class WorkHistory:
+    """
+    Атрибуты:
+        places: Места с датой начала, по возрастанию start_date
+        undated: Места без даты начала (в стаж и перерывы не входят)
+        first_work: Дата начала самой ранней работы
+        last_end: Дата окончания последней работы (as_of, если работа не закрыта)
+        tenure_days: Общий стаж в днях; пересекающиеся периоды считаются один раз
+        gaps: Перерывы между работами — пары (конец предыдущего периода, начало следующего)
+        overlaps: Пары пересекающихся мест (раньше начатое место — первым)
+    """
+
+    __slots__ = ("places", "undated", "first_work", "last_end", "tenure_days", "gaps", "overlaps", "as_of")
+
+    def __init__(self, places: Sequence[Any], as_of: Optional[date] = None):
+        """
+        Args:
+            places: Места работы (PlaceWork или объекты с полями start_date и end_date)
+            as_of: Дата, до которой длится незакрытая работа (по умолчанию — сегодня)
+        """
+        self.as_of = as_of or date.today()
+        dated = [place for place in places if place.start_date is not None]
+        dated.sort(key=lambda place: place.start_date)
+        self.places: Tuple[Any, ...] = tuple(dated)
+        self.undated: Tuple[Any, ...] = tuple(place for place in places if place.start_date is None)
+        self.first_work: Optional[date] = dated[0].start_date if dated else None
+        self.last_end: Optional[date] = None
+        self.tenure_days = 0
+        self.gaps: List[Tuple[date, date]] = []
+        self.overlaps: List[Tuple[Any, Any]] = []
+
+        # Активные места — куча по дате окончания; всё, что ещё активно к началу
+        # очередного места, с ним пересекается
+        active: List[Tuple[date, int]] = []
+        run_start: Optional[date] = None
+        run_end: Optional[date] = None
+        for index, place in enumerate(dated):
+            start, end = place.start_date, self._end(place)
+            while active and active[0][0] <= start:
+                heapq.heappop(active)
+            self.overlaps.extend((dated[other], place) for _, other in sorted(active, key=lambda item: item[1]))
+            heapq.heappush(active, (end, index))
+
+            if run_end is None:
+                run_start, run_end = start, end
+            elif start > run_end:
+                self.tenure_days += (run_end - run_start).days
+                self.gaps.append((run_end, start))
+                run_start, run_end = start, end
+            elif end > run_end:
+                run_end = end
+        if run_end is not None:
+            self.tenure_days += (run_end - run_start).days
+            self.last_end = run_end
+
+    def _end(self, place: Any) -> date:
+        end = place.end_date if place.end_date is not None else self.as_of
+        # Дата окончания раньше начала — ошибка ввода, считаем место однодневным
+        return max(end, place.start_date)
+
+    @property
+    def tenure_years(self) -> float:
+        return self.tenure_days / 365.25
+
+    @property
+    def longest_gap_days(self) -> int:
+        return max(((start - end).days for end, start in self.gaps), default=0)
+
+    def __repr__(self) -> str:
+        return (
+            f"WorkHistory(places={len(self.places)}, first_work={self.first_work}, "
+            f"tenure_days={self.tenure_days}, gaps={len(self.gaps)}, overlaps={len(self.overlaps)})"
+        )
+
+
+class DerivedCache:
+    """
+    Ячейка для производных значений модели (PrivateAttr).
+
+    Не участвует в сравнении моделей (любые две ячейки равны) и не переносится
+    копированием — копия модели строит свои значения заново.
+    """
+
+    __slots__ = ("entry",)
+
+    def __init__(self):
+        # (ключ входов, значение) — одним кортежем, чтобы читатели из разных
+        # потоков не увидели новый ключ со старым значением
+        self.entry: Optional[Tuple[Any, Any]] = None
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, DerivedCache)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __copy__(self) -> "DerivedCache":
+        return DerivedCache()
+
+    def __deepcopy__(self, memo) -> "DerivedCache":
+        return DerivedCache()
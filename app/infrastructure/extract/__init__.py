@@ -0,0 +1,4 @@
+from .parsing_pdf import ExtractData, ExtractionError
+from .resume_text import ResumeTextParser, parse_date
+
+__all__ = ["ExtractData", "ExtractionError", "ResumeTextParser", "parse_date"]
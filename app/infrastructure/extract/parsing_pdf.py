@@ -1,19 +1,155 @@
 from __future__ import annotations
-from app.domain.models import Rezume, NameParts, Education, EducationEntry
+
+import threading
+import time
+from typing import Any, Dict, Iterable, Tuple
+
+from pydantic import ValidationError
+
+from app.domain.models import Rezume
+from .pdf_reader import iter_page_texts, open_pdf
+from .resume_text import ResumeTextParser
+
+
+STAGES = ("open", "text", "parse", "validate")
+
+
+class ExtractionError(ValueError):
+    """Из документа не удалось собрать резюме (нет ФИО или поля не прошли валидацию)."""
+
 
 class ExtractData:
+    """
+    Извлечение резюме из PDF.
+
+    Документ читается постранично поверх mmap, текст каждой страницы сразу
+    разбирается ResumeTextParser и отбрасывается. Время этапов (open, text,
+    parse, validate) возвращает extract_timed и накапливает stats().
+    """
+
     def __init__(self):
-        pass
+        self._lock = threading.Lock()
+        self._totals: Dict[str, float] = dict.fromkeys(STAGES, 0.0)
+        self._documents = 0
+        self._pages = 0
+        self._empty_pages = 0
+        self._failed = 0
 
     def extract(self, path: str) -> Rezume:
-        # Мокаем извлечение данных из PDF — возвращаем демо-резюме
-        fio = NameParts(surname="Иванов", name="Иван", father_name="Иванович")
-        edu = Education(higher=True, items=[EducationEntry(university="МГУ", city="Москва")])
-        return Rezume(
-            fio=fio,
-            residence_city="Москва",
-            desired_position="Python-разработчик",
-            education=edu,
-            skills=["Python", "Pydantic", "SQL"],
-            about="Проверочный мок."
-        )
+        """
+        Извлекает резюме из PDF.
+
+        Args:
+            path: Путь к PDF
+
+        Returns:
+            Rezume: Извлечённое резюме
+
+        Raises:
+            ExtractionError: Если резюме собрать не удалось
+        """
+        rezume, _ = self.extract_timed(path)
+        return rezume
+
+    def extract_timed(self, path: str) -> Tuple[Rezume, Dict[str, Any]]:
+        """
+        Вариант extract, возвращающий время этапов для этого документа.
+
+        Args:
+            path: Путь к PDF
+
+        Returns:
+            Tuple[Rezume, Dict[str, Any]]: Резюме и тайминги в секундах
+            по этапам плюс число страниц
+        """
+        timings: Dict[str, Any] = dict.fromkeys(STAGES, 0.0)
+        parser = ResumeTextParser()
+        pages = empty = 0
+
+        started = time.perf_counter()
+        try:
+            with open_pdf(path) as reader:
+                now = time.perf_counter()
+                timings["open"] = now - started
+                # Текст и разбор чередуются постранично: в памяти только текущая страница
+                page_texts = iter_page_texts(reader)
+                while True:
+                    text = next(page_texts, None)
+                    extracted = time.perf_counter()
+                    timings["text"] += extracted - now
+                    if text is None:
+                        break
+                    pages += 1
+                    if not text.strip():
+                        empty += 1
+                    parser.feed(text)
+                    now = time.perf_counter()
+                    timings["parse"] += now - extracted
+
+            rezume = self._validate(parser, timings)
+        except Exception:
+            with self._lock:
+                self._failed += 1
+            raise
+        finally:
+            timings["pages"] = pages
+            self._record(timings, empty)
+        return rezume, timings
+
+    def parse_text(self, pages: Iterable[str]) -> Rezume:
+        """
+        Собирает резюме из уже извлечённого текста (по странице на элемент).
+
+        Args:
+            pages: Текст страниц
+
+        Returns:
+            Rezume: Извлечённое резюме
+        """
+        parser = ResumeTextParser()
+        for text in pages:
+            parser.feed(text)
+        return self._validate(parser, {"validate": 0.0})
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Накопленная статистика извлечения.
+
+        Returns:
+            Dict[str, Any]: число документов, страниц (и страниц без текстового
+            слоя — сканов), ошибок, суммарное и среднее время по этапам
+        """
+        with self._lock:
+            documents = self._documents
+            return {
+                "documents": documents,
+                "pages": self._pages,
+                "empty_pages": self._empty_pages,
+                "failed": self._failed,
+                "total_seconds": dict(self._totals),
+                "mean_seconds": {
+                    stage: (total / documents if documents else 0.0) for stage, total in self._totals.items()
+                },
+            }
+
+    @staticmethod
+    def _validate(parser: ResumeTextParser, timings: Dict[str, Any]) -> Rezume:
+        started = time.perf_counter()
+        try:
+            fields = parser.result()
+            if fields["fio"] is None:
+                raise ExtractionError("В документе не найдено ФИО")
+            try:
+                return Rezume(**fields)
+            except ValidationError as e:
+                raise ExtractionError(f"Поля резюме не прошли валидацию: {e}") from e
+        finally:
+            timings["validate"] = time.perf_counter() - started
+
+    def _record(self, timings: Dict[str, Any], empty_pages: int) -> None:
+        with self._lock:
+            self._documents += 1
+            self._pages += timings["pages"]
+            self._empty_pages += empty_pages
+            for stage in STAGES:
+                self._totals[stage] += timings[stage]
@@ -0,0 +1,57 @@
+"""
+Постраничное чтение текста из PDF.
+
+Файл отображается в память (mmap): pypdf читает только нужные объекты,
+а страницы ОС подкачивает сама, поэтому даже большой скан не копируется
+в память процесса целиком. Текст отдаётся по одной странице.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+from contextlib import contextmanager
+from typing import Iterator
+
+try:
+    from pypdf import PdfReader
+except ImportError:  # pragma: no cover - зависит от окружения
+    PdfReader = None
+
+
+@contextmanager
+def open_pdf(path: str) -> Iterator["PdfReader"]:
+    """
+    Открывает PDF поверх отображённого в память файла.
+
+    Args:
+        path: Путь к PDF
+
+    Yields:
+        PdfReader: Читатель документа (действителен только внутри with)
+
+    Raises:
+        ImportError: Если не установлен pypdf
+    """
+    if PdfReader is None:
+        raise ImportError("Для извлечения данных из PDF нужен пакет pypdf")
+
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise ValueError(f"Пустой файл: {path}")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield PdfReader(mapped)
+
+
+def iter_page_texts(reader: "PdfReader") -> Iterator[str]:
+    """
+    Текст страниц по одной; страницы без текстового слоя (сканы) дают пустую строку.
+
+    Args:
+        reader: Открытый документ (см. open_pdf)
+
+    Yields:
+        str: Текст очередной страницы
+    """
+    for page in reader.pages:
+        yield page.extract_text() or ""
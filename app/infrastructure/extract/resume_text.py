@@ -0,0 +1,422 @@
+"""
+Разбор текста резюме (экспорт hh.ru и похожие шаблоны) в поля Rezume.
+
+ResumeTextParser — конечный автомат по строкам: текст подаётся постранично
+через feed(), состояние (текущий раздел, незаконченный период работы)
+переживает границу страниц, поэтому документ не нужно склеивать целиком.
+"""
+
+from __future__ import annotations
+
+import re
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+
+# -----------------------
+# Даты
+# -----------------------
+
+_MONTHS = {
+    "янв": 1, "фев": 2, "мар": 3, "апр": 4, "май": 5, "мая": 5, "мае": 5,
+    "июн": 6, "июл": 7, "авг": 8, "сен": 9, "окт": 10, "ноя": 11, "дек": 12,
+}
+
+_MONTH = r"(?:январ[ьяе]|янв|феврал[ьяе]|фев|марта?|мар|апрел[ьяе]|апр|ма[йяе]|июн[ьяе]|июн|июл[ьяе]|июл|августа?|авг|сентябр[ьяе]|сент?|октябр[ьяе]|окт|ноябр[ьяе]|ноя|декабр[ьяе]|дек)\.?"
+_DATE = rf"(?:(?:\d{{1,2}}\s+)?{_MONTH}\s+\d{{4}}|(?:\d{{1,2}}\.)?\d{{1,2}}\.\d{{4}}|\d{{4}})"
+_NOW = r"(?:по\s+)?(?:настоящее\s+время|н\.\s?в\.|сейчас|текущее\s+время)"
+_DASH = r"(?:[—–-]|по)"
+
+_TEXT_DATE_RE = re.compile(rf"(?:(?P<day>\d{{1,2}})\s+)?(?P<month>{_MONTH})\s+(?P<year>\d{{4}})", re.IGNORECASE)
+_NUM_DATE_RE = re.compile(r"(?:(?P<day>\d{1,2})\.)?(?P<month>\d{1,2})\.(?P<year>\d{4})")
+_YEAR_RE = re.compile(r"(?P<year>\d{4})")
+_PERIOD_RE = re.compile(
+    rf"(?P<start>{_DATE})\s*{_DASH}\s*(?P<end>{_DATE}|{_NOW})?\s*(?:г\.?)?",
+    re.IGNORECASE,
+)
+_NOW_RE = re.compile(_NOW, re.IGNORECASE)
+_DURATION_RE = re.compile(r"(?:\d+\s+(?:год|года|лет|месяц|месяца|месяцев)\s*)+", re.IGNORECASE)
+_BORN_RE = re.compile(
+    rf"(?:родил(?:ся|ась)|дата\s+рождения:?)\s*(?P<date>{_DATE})|(?P<date2>{_DATE})\s*г\.?\s*р\.?",
+    re.IGNORECASE,
+)
+_PHONE_RE = re.compile(r"\+?[78][\s(-]*\d{3}[\s)-]*\d{3}[\s-]*\d{2}[\s-]*\d{2}")
+_NAME_WORD_RE = re.compile(r"[А-ЯЁA-Z][а-яёa-z]+(?:-[А-ЯЁA-Z][а-яёa-z]+)?")
+_DOMAIN_RE = re.compile(r"\b[\w-]+\.(?:ru|com|рф|org|net|io|su|by|kz)\b", re.IGNORECASE)
+_LEADING_YEAR_RE = re.compile(r"(?P<year>(?:19|20)\d{2})\s+(?P<rest>\S.*)")
+_TRAILING_YEAR_RE = re.compile(r"(?P<rest>.*\S)\s*[,(]\s*(?P<year>(?:19|20)\d{2})\s*\)?")
+_SKILL_SPLIT_RE = re.compile(r"\s*[,;•·]\s*|\s{2,}")
+
+
+def parse_date(text: str) -> Optional[date]:
+    """
+    Разбирает дату вида «1 января 2000», «январь 2019», «01.02.2000», «02.2019», «2019».
+    Если день или месяц не указан, берётся первое число / январь.
+
+    Args:
+        text: Строка с одной датой
+
+    Returns:
+        Optional[date]: Дата или None, если строка не похожа на дату
+    """
+    text = text.strip().rstrip(".").strip()
+    for pattern in (_TEXT_DATE_RE, _NUM_DATE_RE, _YEAR_RE):
+        m = pattern.fullmatch(text)
+        if m is None:
+            continue
+        groups = m.groupdict()
+        month = groups.get("month")
+        if month is None:
+            month_num = 1
+        elif month.isdigit():
+            month_num = int(month)
+        else:
+            month_num = _MONTHS.get(month.lower()[:3])
+            if month_num is None:
+                return None
+        try:
+            return date(int(groups["year"]), month_num, int(groups.get("day") or 1))
+        except ValueError:
+            return None
+    return None
+
+
+# -----------------------
+# Разделы
+# -----------------------
+
+HEAD, POSITION, EXPERIENCE, EDUCATION, SKILLS, ABOUT, OTHER = (
+    "head", "position", "experience", "education", "skills", "about", "other"
+)
+
+_SECTION_PREFIXES = (
+    ("опыт работы", EXPERIENCE),
+    ("желаемая должность", POSITION),
+    ("основное образование", EDUCATION),
+    ("образование", EDUCATION),
+    ("ключевые навыки", SKILLS),
+    ("навыки", SKILLS),
+    ("о себе", ABOUT),
+    ("обо мне", ABOUT),
+    ("дополнительная информация", ABOUT),
+    ("повышение квалификации", OTHER),
+    ("курсы", OTHER),
+    ("тесты, экзамены", OTHER),
+    ("электронные сертификаты", OTHER),
+    ("знание языков", OTHER),
+    ("гражданство", OTHER),
+    ("специализации", OTHER),
+    ("контакты", HEAD),
+)
+
+_LEVELS = {
+    "высшее": True, "высшее образование": True, "бакалавр": True, "магистр": True,
+    "специалист": True, "аспирантура": True, "кандидат наук": True, "доктор наук": True,
+    "неоконченное высшее": False, "среднее специальное": False, "среднее": False,
+}
+
+_CITY_LABELS = ("проживает", "город проживания", "место проживания", "город")
+
+
+def _section_of(line: str) -> Optional[str]:
+    lowered = line.lower().rstrip(":").strip()
+    for prefix, section in _SECTION_PREFIXES:
+        # «Опыт работы — 3 года», «Желаемая должность и зарплата»,
+        # но не «Желаемая должность: …» — это поле с меткой
+        if lowered == prefix or (
+            section in (EXPERIENCE, POSITION) and lowered.startswith(prefix) and ":" not in lowered
+        ):
+            return section
+    return None
+
+
+def _label(line: str, *labels: str) -> Optional[str]:
+    """Значение строки вида «Метка: значение» для одной из меток."""
+    head, sep, value = line.partition(":")
+    if sep and head.strip().lower() in labels:
+        return value.strip()
+    return None
+
+
+def _strip_city_prefix(city: str) -> str:
+    city = city.split(",")[0].strip()
+    return re.sub(r"^г\.\s*", "", city)
+
+
+class ResumeTextParser:
+    """
+    Построчный разбор текста резюме.
+
+    Использование:
+        parser = ResumeTextParser()
+        for page_text in pages:
+            parser.feed(page_text)
+        fields = parser.result()   # словарь полей для Rezume
+    """
+
+    def __init__(self):
+        self._section = HEAD
+        self._fio: Optional[Dict[str, str]] = None
+        self._born: Optional[date] = None
+        self._phone: Optional[str] = None
+        self._city: Optional[str] = None
+        self._position: Optional[str] = None
+        self._places: List[Dict[str, Any]] = []
+        self._place: Optional[Dict[str, Any]] = None
+        self._awaiting_end = False
+        self._higher: Optional[bool] = None
+        self._education: List[Dict[str, Any]] = []
+        self._entry: Optional[Dict[str, Any]] = None
+        self._pending_year: Optional[int] = None
+        self._skills: List[str] = []
+        self._about: List[str] = []
+        self.lines = 0
+
+    def feed(self, text: str) -> None:
+        """Подаёт очередную порцию текста (обычно страницу)."""
+        for raw in text.splitlines():
+            line = " ".join(raw.split())
+            if line:
+                self.lines += 1
+                self._feed_line(line)
+
+    def result(self) -> Dict[str, Any]:
+        """
+        Итоговые поля; вызывается после подачи последней страницы.
+
+        Returns:
+            Dict[str, Any]: Аргументы для Rezume (fio — словарь частей ФИО или None)
+        """
+        self._close_place()
+        self._close_entry()
+        skills = list(dict.fromkeys(s for s in self._skills if s))
+        return {
+            "fio": self._fio,
+            "born_date": self._born,
+            "phone": self._phone,
+            "residence_city": self._city,
+            "desired_position": self._position,
+            "places": list(self._places),
+            "education": {"higher": self._higher, "items": list(self._education)},
+            "skills": skills,
+            "about": "\n".join(self._about) or None,
+        }
+
+    # -----------------------
+    # Разбор строки
+    # -----------------------
+
+    def _feed_line(self, line: str) -> None:
+        section = _section_of(line)
+        if section is not None:
+            self._close_place()
+            self._close_entry()
+            self._section = section
+            return
+
+        if self._global_field(line):
+            return
+
+        if self._section == HEAD:
+            self._head_line(line)
+        elif self._section == POSITION:
+            if self._position is None:
+                self._position = line
+        elif self._section == EXPERIENCE:
+            self._experience_line(line)
+        elif self._section == EDUCATION:
+            self._education_line(line)
+        elif self._section == SKILLS:
+            self._skills.extend(_SKILL_SPLIT_RE.split(line))
+        elif self._section == ABOUT:
+            self._about.append(line)
+
+    def _global_field(self, line: str) -> bool:
+        """Поля с меткой, которые могут встретиться в любом разделе."""
+        value = _label(line, "фио", "ф.и.о.")
+        if value is not None:
+            self._set_fio(value.split())
+            return True
+        value = _label(line, "желаемая должность", "должность") if self._section != EXPERIENCE else None
+        if value:
+            self._position = value
+            return True
+        if self._born is None:
+            m = _BORN_RE.search(line)
+            if m is not None:
+                self._born = parse_date(m.group("date") or m.group("date2"))
+                return True
+        if self._phone is None:
+            value = _label(line, "телефон", "тел.", "тел")
+            if value is not None:
+                m = _PHONE_RE.search(value)
+                self._phone = m.group(0) if m else value
+                return True
+        if self._section not in (EDUCATION, EXPERIENCE):
+            value = _label(line, *_CITY_LABELS)
+            if value:
+                self._city = self._city or _strip_city_prefix(value)
+                return True
+        return False
+
+    def _head_line(self, line: str) -> None:
+        if self._phone is None:
+            m = _PHONE_RE.search(line)
+            if m is not None:
+                self._phone = m.group(0)
+                return
+        if self._fio is None:
+            words = line.split()
+            if 2 <= len(words) <= 3 and all(_NAME_WORD_RE.fullmatch(w) for w in words):
+                self._set_fio(words)
+
+    def _set_fio(self, words: List[str]) -> None:
+        words = words + [""] * (3 - len(words))
+        self._fio = {"surname": words[0], "name": words[1], "father_name": " ".join(words[2:]).strip()}
+
+    # -----------------------
+    # Опыт работы
+    # -----------------------
+
+    def _experience_line(self, line: str) -> None:
+        m = _PERIOD_RE.fullmatch(line)
+        if m is not None:
+            self._close_place()
+            end = m.group("end")
+            self._place = {
+                "start_date": parse_date(m.group("start")),
+                "end_date": parse_date(end) if end and not _NOW_RE.fullmatch(end) else None,
+            }
+            # «Октябрь 2019 —» и «настоящее время» часто стоят на разных строках (и страницах)
+            self._awaiting_end = end is None
+            return
+
+        if self._awaiting_end:
+            self._awaiting_end = False
+            if _NOW_RE.fullmatch(line):
+                return
+            end = parse_date(line)
+            if end is not None:
+                self._place["end_date"] = end
+                return
+
+        value = _label(line, "компания", "организация", "место работы")
+        if value is not None:
+            if self._place is None or self._place.get("company"):
+                self._close_place()
+                self._place = {}
+            self._place["company"] = value
+            return
+        value = _label(line, "период", "период работы")
+        if value is not None:
+            period = _PERIOD_RE.fullmatch(value)
+            if period is not None:
+                if self._place is None or self._place.get("start_date"):
+                    self._close_place()
+                    self._place = {}
+                end = period.group("end")
+                self._place["start_date"] = parse_date(period.group("start"))
+                self._place["end_date"] = parse_date(end) if end and not _NOW_RE.fullmatch(end) else None
+            return
+
+        place = self._place
+        if place is None or _DURATION_RE.fullmatch(line):
+            return
+        value = _label(line, "должность")
+        if value is not None:
+            place["position"] = value
+        elif not place.get("company"):
+            place["company"] = line
+        elif not place.get("position") and _DOMAIN_RE.search(line):
+            place["company_info"] = line
+        elif not place.get("position"):
+            place["position"] = line
+        else:
+            place.setdefault("legend_lines", []).append(line)
+
+    def _close_place(self) -> None:
+        place, self._place = self._place, None
+        self._awaiting_end = False
+        if not place:
+            return
+        legend = place.pop("legend_lines", None)
+        if legend:
+            place["legend"] = "\n".join(legend)
+        self._places.append(place)
+
+    # -----------------------
+    # Образование
+    # -----------------------
+
+    def _education_line(self, line: str) -> None:
+        lowered = line.lower().rstrip(".")
+        if lowered in _LEVELS:
+            self._higher = _LEVELS[lowered]
+            return
+
+        value = _label(line, "уровень", "уровень образования", "образование")
+        if value is not None:
+            self._higher = _LEVELS.get(value.lower())
+            return
+        value = _label(line, "учебное заведение", "вуз", "университет")
+        if value is not None:
+            self._start_entry(value, None)
+            return
+        value = _label(line, "год окончания", "окончание")
+        if value is not None:
+            if self._entry is not None:
+                self._entry["end_date"] = _graduation(value)
+            else:
+                self._pending_year = _year(value)
+            return
+        value = _label(line, "факультет", "специальность")
+        if value is not None:
+            if self._entry is not None:
+                self._entry["faculty"] = value
+            return
+        value = _label(line, *_CITY_LABELS)
+        if value is not None:
+            if self._entry is not None:
+                self._entry["city"] = _strip_city_prefix(value)
+            return
+
+        year = _year(line)
+        if year is not None:
+            self._close_entry()
+            self._pending_year = year
+            return
+        m = _LEADING_YEAR_RE.fullmatch(line) or _TRAILING_YEAR_RE.fullmatch(line)
+        if m is not None:
+            self._start_entry(m.group("rest"), int(m.group("year")))
+            return
+
+        if self._pending_year is not None:
+            self._start_entry(line, self._pending_year)
+        elif self._entry is not None and not self._entry.get("faculty"):
+            self._entry["faculty"] = line
+
+    def _start_entry(self, university: str, year: Optional[int]) -> None:
+        self._close_entry()
+        year = year if year is not None else self._pending_year
+        self._pending_year = None
+        self._entry = {"university": university.strip(" ,")}
+        if year is not None:
+            self._entry["end_date"] = _graduation(str(year))
+
+    def _close_entry(self) -> None:
+        entry, self._entry = self._entry, None
+        if entry:
+            self._education.append(entry)
+
+
+def _year(text: str) -> Optional[int]:
+    m = _YEAR_RE.fullmatch(text.strip())
+    return int(m.group("year")) if m else None
+
+
+def _graduation(text: str) -> Optional[date]:
+    """Год окончания без даты считается концом учебного года (30 июня)."""
+    year = _year(text)
+    if year is not None:
+        return date(year, 6, 30)
+    return parse_date(text)
@@ -0,0 +1,30 @@
+import threading
+from typing import Optional
+
+from app.config import CONFIG
+from .city_gazetteer import DEFAULT_GAZETTEER_PATH, UNKNOWN, CityGazetteer, latin_key, normalize_city
+
+__all__ = ["UNKNOWN", "CityGazetteer", "get_gazetteer", "latin_key", "normalize_city"]
+
+
+_gazetteer: Optional[CityGazetteer] = None
+_gazetteer_lock = threading.Lock()
+
+
+def get_gazetteer() -> CityGazetteer:
+    """
+    Возвращает справочник городов, загружая его при первом обращении.
+    Путь берётся из CITY_GAZETTEER_PATH, по умолчанию — встроенный список.
+
+    Returns:
+        CityGazetteer: Глобальный экземпляр справочника
+    """
+    global _gazetteer
+    if _gazetteer is None:
+        with _gazetteer_lock:
+            if _gazetteer is None:
+                _gazetteer = CityGazetteer.from_file(
+                    CONFIG.get("CITY_GAZETTEER_PATH") or DEFAULT_GAZETTEER_PATH,
+                    cache_size=CONFIG.get("CITY_CACHE_SIZE", 4096),
+                )
+    return _gazetteer
@@ -0,0 +1,287 @@
+"""
+Справочник городов: любое написание → код города.
+
+Справочник загружается из текстового файла один раз. Каждое название
+(каноническое и синонимы) попадает в индекс в двух видах — нормализованном
+кириллическом и в упрощённой латинской транслитерации, — поэтому «СПб»,
+«г. Санкт-Петербург», «Санкт Петербург» и «Saint Petersburg» дают один код.
+
+Нормализация: нижний регистр, ё → е, без префикса «г.» / «город», без
+пояснений в скобках, пунктуация → пробел. Латиница дополнительно
+«сворачивается» (kh → h, ye → e, iy → y ...), чтобы разные системы
+транслитерации совпадали. Результаты разбора строк кэшируются (LRU).
+
+Свёртка может склеить написания разных городов («ННовгород» и «Новгород»
+дают «novgorod»). Такой латинский ключ неоднозначен и из индекса
+удаляется: кириллические написания по-прежнему находят свои города,
+а латиница, по которой город не определить, считается ненайденной.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+
+DEFAULT_GAZETTEER_PATH = Path(__file__).resolve().parent / "data" / "cities.txt"
+
+UNKNOWN = -1                                   # код строки, не найденной в справочнике
+
+_TRANSLIT = {
+    "а": "a", "б": "b", "в": "v", "г": "g", "д": "d", "е": "e", "ж": "zh", "з": "z", "и": "i",
+    "й": "y", "к": "k", "л": "l", "м": "m", "н": "n", "о": "o", "п": "p", "р": "r", "с": "s",
+    "т": "t", "у": "u", "ф": "f", "х": "kh", "ц": "ts", "ч": "ch", "ш": "sh", "щ": "shch",
+    "ъ": "", "ы": "y", "ь": "", "э": "e", "ю": "yu", "я": "ya",
+    "і": "i", "ї": "yi", "є": "ye", "ґ": "g",
+}
+_TRANSLIT_TABLE = str.maketrans(_TRANSLIT)
+
+# Упрощение латиницы: порядок важен (сначала длинные сочетания)
+_LATIN_FOLDS: Tuple[Tuple[re.Pattern, str], ...] = tuple(
+    (re.compile(pattern), replacement) for pattern, replacement in (
+        (r"[äàáâ]", "a"), (r"[öòóô]", "o"), (r"[üùúû]", "u"), (r"[ëèéê]", "e"),
+        (r"shch|sch", "sh"),
+        (r"kh", "h"),
+        (r"tz|ts", "c"),
+        (r"x", "ks"),
+        (r"w", "v"),
+        (r"j", "y"),
+        (r"\b(ye|yo)", "e"),
+        (r"(?<=[aeiou])(ye|yo)", "e"),
+        (r"i(?=[aue])", "y"),
+        (r"(iy|yy|ij|ii)\b", "y"),
+        (r"(.)\1", r"\1"),
+    )
+)
+
+_PREFIXES = ("город ", "гор ", "г ", "city of ", "city ")
+_PARENS = re.compile(r"\([^)]*\)")
+_NON_WORD = re.compile(r"[^\w]+")
+_SEPARATORS = re.compile(r"[,/;]")
+
+
+def normalize_city(text: Optional[str]) -> str:
+    """
+    Нормализованное написание: нижний регистр, ё → е, без «г.» и скобок.
+
+    Args:
+        text: Название города как в резюме
+
+    Returns:
+        str: Нормализованная строка ("" для пустой)
+    """
+    if not text:
+        return ""
+    text = _PARENS.sub(" ", text.lower().replace("ё", "е"))
+    text = " ".join(_NON_WORD.sub(" ", text).replace("_", " ").split())
+    for prefix in _PREFIXES:
+        if text.startswith(prefix) and len(text) > len(prefix):
+            text = text[len(prefix):]
+            break
+    return text
+
+
+def latin_key(normalized: str) -> str:
+    """Транслитерация нормализованной строки и свёртка вариантов латиницы."""
+    text = normalized.translate(_TRANSLIT_TABLE)
+    for pattern, replacement in _LATIN_FOLDS:
+        text = pattern.sub(replacement, text)
+    return text
+
+
+class CityGazetteer:
+    """
+    Использование:
+        gazetteer = CityGazetteer.from_file()
+        gazetteer.resolve("г. СПб")                      # "spb"
+        gazetteer.same_city("Питер", "Saint Petersburg")  # True
+    """
+
+    def __init__(self, cities: Iterable[Tuple[str, str, Sequence[str]]], cache_size: int = 4096):
+        """
+        Args:
+            cities: Тройки (код, каноническое название, синонимы)
+            cache_size: Сколько разобранных строк держать в LRU-кэше
+
+        Raises:
+            ValueError: Если одно написание относится к разным городам
+        """
+        self._codes: List[str] = []
+        self._names: List[str] = []
+        self._index: Dict[str, int] = {}
+        self._latin: Dict[str, int] = {}
+        self._ambiguous_latin: Set[str] = set()
+
+        for code, name, aliases in cities:
+            if code in self._codes:
+                raise ValueError(f"Код города {code!r} указан дважды")
+            city = len(self._codes)
+            self._codes.append(code)
+            self._names.append(name)
+            for spelling in (name, *aliases):
+                key = normalize_city(spelling)
+                if not key:
+                    continue
+                _add(self._index, key, city, self._codes, spelling)
+                self._add_latin(latin_key(key), city)
+
+        self._lock = threading.Lock()
+        self._resolved = 0
+        self._unresolved = 0
+        self._lookup = lru_cache(maxsize=cache_size)(self._find)
+
+    def _add_latin(self, key: str, city: int) -> None:
+        if key in self._ambiguous_latin:
+            return
+        existing = self._latin.get(key)
+        if existing is not None and existing != city:
+            del self._latin[key]
+            self._ambiguous_latin.add(key)
+            return
+        self._latin[key] = city
+
+    @property
+    def ambiguous_latin(self) -> Set[str]:
+        """Латинские ключи, которые свёртка дала написаниям разных городов."""
+        return set(self._ambiguous_latin)
+
+    @classmethod
+    def from_file(cls, path: str | Path = DEFAULT_GAZETTEER_PATH, cache_size: int = 4096) -> "CityGazetteer":
+        """
+        Загружает справочник из текстового файла.
+
+        Формат: «<код>\\t<каноническое название>[\\t<синонимы через ;>]».
+        Пустые строки и строки с «#» в начале пропускаются.
+
+        Args:
+            path: Путь к файлу справочника
+            cache_size: Размер LRU-кэша разобранных строк
+
+        Returns:
+            CityGazetteer: Загруженный справочник
+        """
+        cities = []
+        with open(path, encoding="utf-8") as f:
+            for line_no, line in enumerate(f, 1):
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                code, _, rest = line.partition("\t")
+                name, _, aliases = rest.partition("\t")
+                if not code or not name:
+                    raise ValueError(f"{path}:{line_no}: ожидается '<код>\\t<название>[\\t<синонимы>]', получено {line!r}")
+                cities.append((code, name, [a.strip() for a in aliases.split(";") if a.strip()]))
+        return cls(cities, cache_size=cache_size)
+
+    # -----------------------
+    # Поиск
+    # -----------------------
+
+    def resolve(self, text: Optional[str]) -> Optional[str]:
+        """
+        Код города по любому написанию.
+
+        Args:
+            text: Название города
+
+        Returns:
+            Optional[str]: Код или None, если город не найден
+        """
+        city = self.resolve_index(text)
+        return self._codes[city] if city != UNKNOWN else None
+
+    def resolve_index(self, text: Optional[str]) -> int:
+        """Номер города в справочнике (UNKNOWN, если не найден)."""
+        if not text:
+            return UNKNOWN
+        city = self._lookup(text)
+        with self._lock:
+            if city == UNKNOWN:
+                self._unresolved += 1
+            else:
+                self._resolved += 1
+        return city
+
+    def resolve_many(self, texts: Sequence[Optional[str]]) -> np.ndarray:
+        """
+        Номера городов для столбца строк; каждая уникальная строка разбирается один раз.
+
+        Args:
+            texts: Названия городов (None — пропуск)
+
+        Returns:
+            np.ndarray: Номера городов, int32 (UNKNOWN — не найден)
+        """
+        unique: Dict[Optional[str], int] = {}
+        result = np.empty(len(texts), dtype=np.int32)
+        for position, text in enumerate(texts):
+            city = unique.get(text)
+            if city is None:
+                city = unique[text] = self.resolve_index(text)
+            result[position] = city
+        return result
+
+    def same_city(self, first: Optional[str], second: Optional[str]) -> Optional[bool]:
+        """
+        Один ли это город.
+
+        Returns:
+            Optional[bool]: None, если хотя бы одно название не найдено в справочнике
+        """
+        a, b = self.resolve_index(first), self.resolve_index(second)
+        if a == UNKNOWN or b == UNKNOWN:
+            return None
+        return a == b
+
+    def name(self, code: str) -> str:
+        """Каноническое название по коду."""
+        return self._names[self._codes.index(code)]
+
+    def _find(self, text: str) -> int:
+        key = normalize_city(text)
+        if not key:
+            return UNKNOWN
+        candidates = [key]
+        # «Москва, Россия», «Казань / Татарстан» — пробуем первую часть
+        head_key = normalize_city(_SEPARATORS.split(text, 1)[0])
+        if head_key and head_key != key:
+            candidates.append(head_key)
+        for candidate in candidates:
+            city = self._index.get(candidate)
+            if city is None:
+                city = self._latin.get(latin_key(candidate))
+            if city is not None:
+                return city
+        return UNKNOWN
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    def stats(self) -> Dict[str, float]:
+        """Размер индекса, доля найденных строк и состояние LRU-кэша."""
+        info = self._lookup.cache_info()
+        with self._lock:
+            total = self._resolved + self._unresolved
+            return {
+                "cities": len(self._codes),
+                "spellings": len(self._index),
+                "ambiguous_latin": len(self._ambiguous_latin),
+                "resolved": self._resolved,
+                "unresolved": self._unresolved,
+                "resolve_rate": self._resolved / total if total else 0.0,
+                "cache_hits": info.hits,
+                "cache_misses": info.misses,
+                "cache_size": info.currsize,
+            }
+
+
+def _add(index: Dict[str, int], key: str, city: int, codes: List[str], spelling: str) -> None:
+    existing = index.get(key)
+    if existing is not None and existing != city:
+        raise ValueError(f"Написание {spelling!r} относится к городам {codes[existing]!r} и {codes[city]!r}")
+    index[key] = city
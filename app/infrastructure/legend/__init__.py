@@ -0,0 +1,3 @@
+from .patterns import DEFAULT_PATTERNS_PATH, PatternMatcher, load_patterns, normalize_phrase
+
+__all__ = ["DEFAULT_PATTERNS_PATH", "PatternMatcher", "load_patterns", "normalize_phrase"]
@@ -0,0 +1,107 @@
+"""
+Словарь шаблонных фраз легенд и их поиск в тексте.
+
+Все фразы собираются в одно регулярное выражение — альтернацию, упорядоченную
+от длинных фраз к коротким. Проход по тексту выполняет движок re на C за один
+просмотр, поэтому на сотнях фраз это быстрее автомата Ахо — Корасик,
+написанного на чистом Python. Скомпилированные словари кэшируются.
+"""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Mapping, Tuple
+
+
+DEFAULT_PATTERNS_PATH = Path(__file__).resolve().parent / "data" / "patterns.txt"
+
+
+def normalize_phrase(text: str) -> str:
+    """Нижний регистр, ё → е, повторные пробелы — один пробел."""
+    return " ".join(text.lower().replace("ё", "е").split())
+
+
+def load_patterns(path: str | Path = DEFAULT_PATTERNS_PATH) -> Dict[int, str]:
+    """
+    Загружает словарь фраз.
+
+    Формат: строка «<номер>\\t<фраза>». Пустые строки и строки с «#» в начале пропускаются.
+
+    Args:
+        path: Путь к файлу словаря
+
+    Returns:
+        Dict[int, str]: Номер → фраза
+    """
+    patterns: Dict[int, str] = {}
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            number, _, phrase = line.partition("\t")
+            if not number.isdigit() or not phrase.strip():
+                raise ValueError(f"{path}:{line_no}: ожидается '<номер>\\t<фраза>', получено {line!r}")
+            if int(number) in patterns:
+                raise ValueError(f"{path}:{line_no}: номер {number} указан дважды")
+            patterns[int(number)] = phrase.strip()
+    return patterns
+
+
+class PatternMatcher:
+    """
+    Использование:
+        matcher = PatternMatcher.for_patterns(patterns)
+        matcher.find("Стрессоустойчив, быстро обучаем")   # [(1, 0, 15), (4, 17, 31)]
+        matcher.hits(text)                                 # {1, 4}
+    """
+
+    def __init__(self, patterns: Mapping[int, str]):
+        """
+        Args:
+            patterns: Номер → фраза (фраза ищется с начала слова)
+        """
+        self._ids: Dict[str, int] = {}
+        for number, phrase in patterns.items():
+            key = normalize_phrase(phrase)
+            if key:
+                self._ids.setdefault(key, number)
+        phrases = sorted(self._ids, key=len, reverse=True)
+        # Пробелы внутри фразы совпадают с любыми пробельными символами текста
+        alternation = "|".join(r"\s+".join(map(re.escape, phrase.split())) for phrase in phrases)
+        self._regex = re.compile(rf"(?<!\w)(?:{alternation})") if phrases else None
+
+    @classmethod
+    def for_patterns(cls, patterns: Mapping[int, str]) -> "PatternMatcher":
+        """Скомпилированный матчер для словаря (повторные вызовы берут его из кэша)."""
+        return _compiled(tuple(sorted(patterns.items())))
+
+    def find(self, text: str) -> List[Tuple[int, int, int]]:
+        """
+        Вхождения фраз (без перекрытий, длинные фразы в приоритете).
+
+        Returns:
+            List[Tuple[int, int, int]]: (номер фразы, начало, конец) в исходном тексте
+        """
+        if self._regex is None or not text:
+            return []
+        # Замена ё → е и lower() не меняют длину русского текста, позиции совпадают
+        folded = text.lower().replace("ё", "е")
+        return [
+            (self._ids[" ".join(match.group().split())], match.start(), match.end())
+            for match in self._regex.finditer(folded)
+        ]
+
+    def hits(self, text: str) -> set:
+        """Номера найденных фраз."""
+        return {number for number, _, _ in self.find(text)}
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+
+@lru_cache(maxsize=32)
+def _compiled(items: Tuple[Tuple[int, str], ...]) -> PatternMatcher:
+    return PatternMatcher(dict(items))
@@ -0,0 +1,27 @@
+import threading
+from typing import Optional
+
+from app.config import CONFIG
+from .name_lexicon import DEFAULT_LEXICON_PATH, NameLexicon, normalize_word
+
+__all__ = ["NameLexicon", "get_lexicon", "normalize_word"]
+
+
+_lexicon: Optional[NameLexicon] = None
+_lexicon_lock = threading.Lock()
+
+
+def get_lexicon() -> NameLexicon:
+    """
+    Возвращает словарь ФИО, загружая его при первом обращении.
+    Путь к словарю берётся из NAME_LEXICON_PATH, по умолчанию — встроенный список.
+    
+    Returns:
+        NameLexicon: Глобальный экземпляр словаря
+    """
+    global _lexicon
+    if _lexicon is None:
+        with _lexicon_lock:
+            if _lexicon is None:
+                _lexicon = NameLexicon.from_file(CONFIG.get("NAME_LEXICON_PATH") or DEFAULT_LEXICON_PATH)
+    return _lexicon
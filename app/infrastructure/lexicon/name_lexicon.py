@@ -0,0 +1,296 @@
+"""
+Словарь распространённых фамилий, имён и отчеств для проверки ФИО без LLM.
+
+Словарь загружается из текстового списка один раз и хранится во frozenset,
+поэтому проверка части ФИО — одно обращение к хэш-таблице. Женские формы
+фамилий и отчества от мужских имён достраиваются правилами при загрузке.
+
+Для каждого имени строится ровно одна правильная пара отчеств: словарь
+подтверждает только грамотное написание, а опечатки («Дмитрьевич»,
+«Василиевич») уходят на проверку LLM. Отчества от имён на -а/-я
+(«Ильинична», «Фоминична») правилом не строятся и берутся из словаря.
+"""
+
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, Optional, Set, Tuple
+
+from app.domain.models import NameParts
+
+
+DEFAULT_LEXICON_PATH = Path(__file__).resolve().parent / "data" / "names.txt"
+
+_MALE = "male"
+_FEMALE = "female"
+_ANY = "any"
+
+# Тюркские отчества: «Али оглы», «Айдар кызы»
+_TURKIC_MALE_MARKERS = frozenset({"оглы", "оглу", "улы"})
+_TURKIC_FEMALE_MARKERS = frozenset({"кызы", "гызы"})
+
+Verdicts = Tuple[Optional[int], Optional[int], Optional[int]]
+
+
+def normalize_word(word: str) -> str:
+    """Нижний регистр, без краевых пробелов, ё → е."""
+    return word.strip().lower().replace("ё", "е")
+
+
+def _feminine_surname(surname: str) -> Optional[str]:
+    """Женская форма фамилии или None, если фамилия не изменяется по роду."""
+    if surname.endswith(("ов", "ев", "ин", "ын")):
+        return surname + "а"
+    if surname.endswith(("ский", "цкий", "ой")):
+        return surname[:-2] + "ая"
+    return None
+
+
+# Имена с беглой гласной или нестандартной основой; «-иевич» пишется
+# только после двух согласных (Дмитрий, Георгий), остальные «-ий» — «-ьевич»
+_PATRONYMIC_EXCEPTIONS: Dict[str, Tuple[str, str]] = {
+    "павел": ("павлович", "павловна"),
+    "лев": ("львович", "львовна"),
+    "яков": ("яковлевич", "яковлевна"),
+    "петр": ("петрович", "петровна"),
+    "дмитрий": ("дмитриевич", "дмитриевна"),
+    "георгий": ("георгиевич", "георгиевна"),
+}
+
+
+def _patronymics(name: str) -> Optional[Tuple[str, str]]:
+    """
+    Мужское и женское отчество от мужского имени по правилам словообразования.
+
+    Returns:
+        Пара (мужское, женское) или None для имён на -а/-я: их отчества
+        нерегулярны («Никитична», но «Фоминична») и задаются в словаре
+    """
+    if name in _PATRONYMIC_EXCEPTIONS:
+        return _PATRONYMIC_EXCEPTIONS[name]
+    if name.endswith(("а", "я")):
+        return None
+    if name.endswith("ий"):
+        stem = name[:-2]
+        return stem + "ьевич", stem + "ьевна"
+    if name.endswith(("й", "ь")):
+        stem = name[:-1]
+        return stem + "евич", stem + "евна"
+    if name.endswith(("и", "о", "е", "у", "ж", "ш", "ч", "щ", "ц")):
+        return name + "евич", name + "евна"
+    return name + "ович", name + "овна"
+
+
+class NameLexicon:
+    """
+    Индекс известных частей ФИО.
+
+    Часть ФИО считается подтверждённой, если найдена в словаре; имя и отчество
+    дополнительно сверяются по роду. Неподтверждённые части проверяет LLM.
+    """
+
+    def __init__(
+        self,
+        *,
+        surnames: Iterable[str] = (),
+        male_names: Iterable[str] = (),
+        female_names: Iterable[str] = (),
+        patronymics: Iterable[Tuple[str, str]] = (),
+    ):
+        """
+        Args:
+            surnames: Фамилии (в мужской форме или неизменяемые)
+            male_names: Мужские имена; от них строятся отчества
+            female_names: Женские имена
+            patronymics: Отчества-исключения в виде пар (отчество, "male" | "female")
+        """
+        neutral_surnames: Set[str] = set()
+        male_surnames: Set[str] = set()
+        female_surnames: Set[str] = set()
+        for surname in map(normalize_word, surnames):
+            feminine = _feminine_surname(surname)
+            if feminine is None:
+                neutral_surnames.add(surname)
+            else:
+                male_surnames.add(surname)
+                female_surnames.add(feminine)
+
+        male = {normalize_word(n) for n in male_names}
+        female = {normalize_word(n) for n in female_names}
+
+        male_patronymics: Set[str] = set()
+        female_patronymics: Set[str] = set()
+        for name in male:
+            pair = _patronymics(name)
+            if pair is not None:
+                male_patronymics.add(pair[0])
+                female_patronymics.add(pair[1])
+        for patronymic, gender in patronymics:
+            target = male_patronymics if gender == _MALE else female_patronymics
+            target.add(normalize_word(patronymic))
+
+        self._neutral_surnames: FrozenSet[str] = frozenset(neutral_surnames)
+        self._male_surnames: FrozenSet[str] = frozenset(male_surnames)
+        self._female_surnames: FrozenSet[str] = frozenset(female_surnames)
+        self._male_names: FrozenSet[str] = frozenset(male)
+        self._female_names: FrozenSet[str] = frozenset(female)
+        self._male_patronymics: FrozenSet[str] = frozenset(male_patronymics)
+        self._female_patronymics: FrozenSet[str] = frozenset(female_patronymics)
+
+        self._lock = threading.Lock()
+        self._parts_checked = 0
+        self._parts_hit = 0
+        self._names_checked = 0
+        self._names_resolved = 0
+
+    @classmethod
+    def from_file(cls, path: str | Path = DEFAULT_LEXICON_PATH) -> "NameLexicon":
+        """
+        Загружает словарь из текстового файла.
+
+        Формат: строка «<вид>\\t<слово>», вид — surname, male, female или patronymic.
+        Отчества-исключения указываются с родом: «patronymic\\tИльинична» считается
+        женским, если оканчивается на «на», иначе мужским. Пустые строки и строки
+        с «#» в начале пропускаются.
+
+        Args:
+            path: Путь к файлу словаря
+
+        Returns:
+            NameLexicon: Загруженный словарь
+        """
+        words: Dict[str, list] = {"surname": [], "male": [], "female": [], "patronymic": []}
+        with open(path, encoding="utf-8") as f:
+            for line_no, line in enumerate(f, 1):
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                kind, _, word = line.partition("\t")
+                if kind not in words or not word:
+                    raise ValueError(f"{path}:{line_no}: ожидается '<вид>\\t<слово>', получено {line!r}")
+                words[kind].append(word)
+
+        patronymics = [
+            (word, _FEMALE if normalize_word(word).endswith("на") else _MALE)
+            for word in words["patronymic"]
+        ]
+        return cls(
+            surnames=words["surname"],
+            male_names=words["male"],
+            female_names=words["female"],
+            patronymics=patronymics,
+        )
+
+    def is_surname(self, word: str) -> bool:
+        return self.surname_gender(word) is not None
+
+    def surname_gender(self, word: str) -> Optional[str]:
+        """
+        Род фамилии: "male", "female", "any" для неизменяемых («Шевченко»)
+        или None, если фамилия неизвестна.
+        """
+        word = normalize_word(word)
+        if word in self._male_surnames:
+            return _MALE
+        if word in self._female_surnames:
+            return _FEMALE
+        if word in self._neutral_surnames:
+            return _ANY
+        return None
+
+    def name_gender(self, word: str) -> Optional[str]:
+        """Род имени: "male", "female" или None, если имя неизвестно."""
+        word = normalize_word(word)
+        if word in self._male_names:
+            return _MALE
+        if word in self._female_names:
+            return _FEMALE
+        return None
+
+    def patronymic_gender(self, word: str) -> Optional[str]:
+        """Род отчества: "male", "female" или None, если отчество не подтверждено."""
+        word = normalize_word(word)
+        if word in self._male_patronymics:
+            return _MALE
+        if word in self._female_patronymics:
+            return _FEMALE
+
+        # «Али оглы», «Айдар-кызы»: известное мужское имя + тюркский маркер
+        parts = word.replace("-", " ").split()
+        if len(parts) == 2 and parts[0] in self._male_names:
+            if parts[1] in _TURKIC_MALE_MARKERS:
+                return _MALE
+            if parts[1] in _TURKIC_FEMALE_MARKERS:
+                return _FEMALE
+        return None
+
+    def verdicts(self, data: NameParts, needed: Tuple[bool, bool, bool] = (True, True, True)) -> Verdicts:
+        """
+        Оценки частей ФИО, подтверждённых словарём: 0 — часть известна, None — решает LLM.
+
+        Если имя и отчество известны, но разного рода, обе части отдаются LLM.
+        Фамилия другого рода («Иванова Иван Иванович») тоже отдаётся LLM; род
+        берётся из имени и отчества, даже если сами они уже оценены.
+
+        Args:
+            data: ФИО
+            needed: Какие части проверять (остальные уже оценены другим способом)
+
+        Returns:
+            Verdicts: Оценки фамилии, имени и отчества
+        """
+        need_surname, need_name, need_father_name = needed
+        surname_gender = self.surname_gender(data.surname) if need_surname else None
+        name_gender = self.name_gender(data.name)
+        father_gender = self.patronymic_gender(data.father_name)
+
+        if name_gender and father_gender and name_gender != father_gender:
+            name_gender = father_gender = None
+        person_gender = name_gender or father_gender
+        if surname_gender in (_MALE, _FEMALE) and person_gender and surname_gender != person_gender:
+            surname_gender = None
+
+        result = (
+            0 if surname_gender else None,
+            0 if need_name and name_gender else None,
+            0 if need_father_name and father_gender else None,
+        )
+
+        checked = need_surname + need_name + need_father_name
+        hit = sum(v is not None for v in result)
+        with self._lock:
+            self._parts_checked += checked
+            self._parts_hit += hit
+        return result
+
+    def record_name(self, resolved: bool) -> None:
+        """Учитывает ФИО, которое сверялось по словарю; resolved — LLM больше не нужна."""
+        with self._lock:
+            self._names_checked += 1
+            self._names_resolved += resolved
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Счётчики словаря.
+
+        Returns:
+            Dict[str, float]: доля подтверждённых частей и количество ФИО,
+            которым словарь сэкономил запрос к LLM
+        """
+        with self._lock:
+            return {
+                "parts_checked": self._parts_checked,
+                "parts_hit": self._parts_hit,
+                "part_hit_rate": self._parts_hit / self._parts_checked if self._parts_checked else 0.0,
+                "names_checked": self._names_checked,
+                "llm_calls_avoided": self._names_resolved,
+                "name_hit_rate": self._names_resolved / self._names_checked if self._names_checked else 0.0,
+            }
+
+    def __len__(self) -> int:
+        return (
+            len(self._neutral_surnames) + len(self._male_surnames) + len(self._female_surnames)
+            + len(self._male_names) + len(self._female_names)
+            + len(self._male_patronymics) + len(self._female_patronymics)
+        )
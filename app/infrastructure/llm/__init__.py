@@ -1,8 +1,49 @@
-from typing import Dict, Any
-from .llm_client import LLMClient
-from .adapters import GeminiAdapter, OpenAIAdapter
-from .prompts.fio import FIO_PROMPT
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, Any, List, Optional, Sequence
+from .llm_client import LLMClient, AsyncLLMClient
+from .adapters import GeminiAdapter, OpenAIAdapter, AsyncGeminiAdapter, AsyncOpenAIAdapter, ReplayAdapter, ReplayMissError
+from .batching import FIOBatcher, format_fio_batch, parse_fio_batch_response
+from .circuit_breaker import (
+    AsyncGuardedLLMClient,
+    CircuitBreaker,
+    CircuitOpenError,
+    CircuitState,
+    GuardedLLMClient,
+    LLMRequestError,
+    LLMUnavailableError,
+)
+from .cache import FIOCache, FIOKey, fio_cache_key, make_namespace
+from .config import (
+    get_circuit_breaker_config,
+    get_fio_batch_config,
+    get_fio_cache_config,
+    get_llm_config,
+    get_replay_config,
+)
+from .prompts.fio import FIO_PROMPT, FIO_BATCH_PROMPT
+from .prompts.legend import LEGEND_PROMPT
+from .singleflight import SingleFlight
 from app.domain.models import FIOResult, NameParts
+from app.infrastructure.legend import PatternMatcher
+
+
+_FIO_GENERATION_CONFIG = {
+    "candidateCount": 1,
+    "maxOutputTokens": 3,
+    "temperature": 0.0,
+    "topP": 1.0,
+    "seed": 0,
+    "responseMimeType": "text/plain",
+}
+
+_LEGEND_GENERATION_CONFIG = dict(_FIO_GENERATION_CONFIG, maxOutputTokens=2)
+
+# Длинные легенды обрезаются: для вердикта хватает начала, а токены ограничены
+_LEGEND_MAX_CHARS = 4000
 
 
 class LLMService:
@@ -11,14 +52,51 @@ class LLMService:
     Содержит бизнес-логику для различных типов анализа.
     """
     
-    def __init__(self, llm_client: LLMClient):
+    def __init__(
+        self,
+        llm_client: LLMClient,
+        cache: Optional[FIOCache] = None,
+        async_client: Optional[AsyncLLMClient] = None,
+        fio_batch_size: int = 20,
+        fio_flush_interval: float = 0.05,
+    ):
         """
         Инициализирует сервис с конкретной реализацией LLMClient.
         
         Args:
             llm_client: Реализация интерфейса LLMClient
+            cache: Кэш вердиктов по ФИО (None — без кэширования)
+            async_client: Асинхронный клиент для acheck_fio (None — синхронный клиент в пуле потоков)
+            fio_batch_size: Сколько ФИО упаковывать в один пакетный запрос
+            fio_flush_interval: Сколько ждать добора пакета в submit_FIO, секунды
         """
+        if fio_batch_size < 1:
+            raise ValueError("fio_batch_size должен быть >= 1")
         self._llm_client = llm_client
+        self._async_client = async_client
+        self._cache = cache
+        # Ключи кэша зависят от промптов и модели: смена любого из них инвалидирует кэш.
+        # Одиночный и пакетный промпты задают один и тот же вопрос, поэтому вердикты общие.
+        self._fio_namespace = make_namespace(FIO_PROMPT + FIO_BATCH_PROMPT, llm_client.model)
+        self._fio_batch_size = fio_batch_size
+        self._fio_flush_interval = fio_flush_interval
+        # Одинаковые ФИО, проверяемые одновременно, уходят в LLM одним запросом
+        self._singleflight = SingleFlight()
+        self._batcher: Optional[FIOBatcher] = None
+        self._batcher_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._batch_requests = 0
+        self._batch_fallbacks = 0
+    
+    @property
+    def cache(self) -> Optional[FIOCache]:
+        """Кэш вердиктов по ФИО (если подключён)."""
+        return self._cache
+    
+    @property
+    def breaker(self) -> Optional[CircuitBreaker]:
+        """Выключатель вокруг LLM-клиента (если клиент обёрнут в GuardedLLMClient)."""
+        return getattr(self._llm_client, "breaker", None)
     
     def checking_FIO(self, data: NameParts) -> FIOResult:
         """
@@ -29,54 +107,278 @@ class LLMService:
             
         Returns:
             FIOResult: Результат анализа ФИО
+            
+        Raises:
+            LLMUnavailableError: Если LLM не ответила или выключатель разомкнут
         """
-        generation_config = {
-            "candidateCount": 1,
-            "maxOutputTokens": 3,
-            "temperature": 0.0,
-            "topP": 1.0,
-            "seed": 0,
-            "responseMimeType": "text/plain",
-        }
+        cached = self._lookup_fio(data)
+        if cached is not None:
+            return cached
+        return self._singleflight.do(fio_cache_key(data), lambda: self._request_fio(data))
+    
+    def checking_FIO_batch(self, names: Sequence[NameParts]) -> List[FIOResult]:
+        """
+        Анализирует несколько ФИО, упаковывая их в пакетные запросы к LLM.
+        
+        Повторяющиеся и закэшированные ФИО в LLM не отправляются. Строки ответа,
+        которые не удалось разобрать, перепроверяются одиночными запросами.
+        
+        Args:
+            names: ФИО для анализа
+            
+        Returns:
+            List[FIOResult]: Результаты в порядке входных ФИО
+            
+        Raises:
+            LLMUnavailableError: Если LLM не ответила или выключатель разомкнут
+        """
+        results: List[Optional[FIOResult]] = [self._lookup_fio(data) for data in names]
+        
+        pending: Dict[FIOKey, List[int]] = {}
+        for index, (data, result) in enumerate(zip(names, results)):
+            if result is None:
+                pending.setdefault(fio_cache_key(data), []).append(index)
+        unique = [names[indices[0]] for indices in pending.values()]
+        
+        for start in range(0, len(unique), self._fio_batch_size):
+            chunk = unique[start:start + self._fio_batch_size]
+            for data, result in zip(chunk, self._request_fio_chunk(chunk)):
+                for index in pending[fio_cache_key(data)]:
+                    results[index] = result
+        return results
+    
+    def submit_FIO(self, data: NameParts) -> "Future[FIOResult]":
+        """
+        Ставит ФИО в очередь пакетной проверки.
+        
+        Одиночные вызовы из разных потоков собираются в пакеты размером
+        fio_batch_size или по истечении fio_flush_interval.
+        
+        Args:
+            data: Данные ФИО для анализа
+            
+        Returns:
+            Future[FIOResult]: Результат анализа ФИО
+        """
+        if self._batcher is None:
+            with self._batcher_lock:
+                if self._batcher is None:
+                    self._batcher = FIOBatcher(
+                        self.checking_FIO_batch,
+                        batch_size=self._fio_batch_size,
+                        flush_interval=self._fio_flush_interval,
+                    )
+        return self._batcher.submit(data)
+    
+    def fio_batch_stats(self) -> Dict[str, Any]:
+        """
+        Статистика пакетного режима.
+        
+        Returns:
+            Dict[str, Any]: число пакетных запросов, перепроверок одиночными
+            запросами и статистика накопителя submit_FIO
+        """
+        with self._stats_lock:
+            stats: Dict[str, Any] = {
+                "batch_requests": self._batch_requests,
+                "single_fallbacks": self._batch_fallbacks,
+            }
+        if self._batcher is not None:
+            stats["batcher"] = self._batcher.stats()
+        return stats
+    
+    async def acheck_fio(self, data: NameParts) -> FIOResult:
+        """
+        Асинхронный вариант checking_FIO.
+        
+        Использует асинхронный клиент, если он передан; иначе выполняет
+        синхронный запрос в пуле потоков, не блокируя событийный цикл.
+        
+        Args:
+            data: Данные ФИО для анализа
+            
+        Returns:
+            FIOResult: Результат анализа ФИО
+        """
+        if self._async_client is None:
+            return await asyncio.to_thread(self.checking_FIO, data)
+        
+        cached = self._lookup_fio(data)
+        if cached is not None:
+            return cached
+        return await self._singleflight.ado(fio_cache_key(data), lambda: self._arequest_fio(data))
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Сводная статистика сервиса: кэш, склейка одинаковых запросов, пакетный режим,
+        лимиты нагрузки на провайдера, состояние выключателя.
         
+        Returns:
+            Dict[str, Any]: Счётчики по подсистемам
+        """
+        limiter = getattr(self._llm_client, "rate_limiter", None)
+        breaker = self.breaker
+        return {
+            "cache": self._cache.stats() if self._cache is not None else None,
+            "coalescing": self._singleflight.stats(),
+            "batch": self.fio_batch_stats(),
+            "rate_limit": limiter.stats() if limiter is not None else None,
+            "circuit": breaker.stats() if breaker is not None else None,
+        }
+    
+    def _request_fio(self, data: NameParts) -> FIOResult:
+        """Одиночный запрос к LLM в обход кэша (результат в кэш сохраняется)."""
+        started = time.perf_counter()
         response = self._llm_client.generate_content(
             system_prompt=FIO_PROMPT,
             user_text=str(data),
+            generation_config=_FIO_GENERATION_CONFIG
+        )
+        return self._finish_fio(data, response, started)
+    
+    async def _arequest_fio(self, data: NameParts) -> FIOResult:
+        """Асинхронный одиночный запрос к LLM в обход кэша."""
+        started = time.perf_counter()
+        response = await self._async_client.agenerate_content(
+            system_prompt=FIO_PROMPT,
+            user_text=str(data),
+            generation_config=_FIO_GENERATION_CONFIG
+        )
+        return self._finish_fio(data, response, started)
+    
+    def _request_fio_chunk(self, chunk: List[NameParts]) -> List[FIOResult]:
+        """Один пакетный запрос к LLM с перепроверкой неразобранных строк."""
+        if len(chunk) == 1:
+            return [self._request_fio(chunk[0])]
+        
+        generation_config = dict(_FIO_GENERATION_CONFIG, maxOutputTokens=8 * len(chunk))
+        started = time.perf_counter()
+        response = self._llm_client.generate_content(
+            system_prompt=FIO_BATCH_PROMPT,
+            user_text=format_fio_batch(chunk),
             generation_config=generation_config
         )
+        elapsed = time.perf_counter() - started
+        if response is None:
+            raise LLMUnavailableError("LLM не вернула ответ на пакетный запрос")
+        parsed = parse_fio_batch_response(response, len(chunk))
+        
+        results: List[FIOResult] = []
+        fallbacks = 0
+        for index, data in enumerate(chunk, 1):
+            result = parsed.get(index)
+            if result is None:
+                fallbacks += 1
+                result = self._request_fio(data)
+            elif self._cache is not None:
+                self._cache.record_miss_latency(elapsed / len(chunk))
+                self._cache.set(
+                    self._fio_namespace,
+                    fio_cache_key(data),
+                    f"{result.surname}{result.name}{result.father_name}",
+                )
+            results.append(result)
         
+        with self._stats_lock:
+            self._batch_requests += 1
+            self._batch_fallbacks += fallbacks
+        return results
+    
+    def _lookup_fio(self, data: NameParts) -> Optional[FIOResult]:
+        if self._cache is None:
+            return None
+        cached = self._cache.get(self._fio_namespace, fio_cache_key(data))
+        # В кэше только ответы, уже прошедшие валидацию в _finish_fio
+        return FIOResult.from_flags(cached) if cached is not None else None
+    
+    def _finish_fio(self, data: NameParts, response: Optional[str], started: float) -> FIOResult:
         if response is None:
-            return FIOResult("000")
-        return FIOResult(response)
+            # Раньше здесь возвращался FIOResult("000") — сбой провайдера выглядел как «чистое» ФИО
+            raise LLMUnavailableError("LLM не вернула ответ")
+        result = FIOResult(response)
+        
+        if self._cache is not None:
+            self._cache.record_miss_latency(time.perf_counter() - started)
+            # В кэш попадают только ответы, прошедшие валидацию
+            self._cache.set(self._fio_namespace, fio_cache_key(data), response.strip())
+        return result
 
     def analysis_of_legend(self, text: str, patterns: Dict[int, str]) -> int:
         """
         Анализ легенды резюме на предмет накрутки.
         
+        Найденные в тексте шаблонные фразы передаются LLM подсказкой. Сервис
+        спрашивает LLM всегда — локальный отбор легенд, которым LLM не нужна,
+        выполняет LegendAnalyzer (app/application/services/legend.py).
+        
         Args:
             text: Текст для анализа
-            patterns: Паттерны для поиска
+            patterns: Паттерны для поиска (номер → фраза)
             
         Returns:
-            int: Результат анализа (пока мок - возвращает 1)
+            int: 1 — легенда похожа на накрутку, 0 — правдоподобна
+            
+        Raises:
+            LLMUnavailableError: Если LLM не ответила или выключатель разомкнут
+            ValueError: Если ответ LLM не 0 и не 1
         """
-        # Реализовать реальный анализ легенды
-        return 1
+        hits = sorted({patterns[number] for number, _, _ in PatternMatcher.for_patterns(patterns).find(text)})
+        user_text = text[:_LEGEND_MAX_CHARS]
+        if hits:
+            user_text = f"Найденные шаблоны: {'; '.join(hits)}\n\n{user_text}"
+        
+        response = self._llm_client.generate_content(
+            system_prompt=LEGEND_PROMPT,
+            user_text=user_text,
+            generation_config=_LEGEND_GENERATION_CONFIG
+        )
+        if response is None:
+            raise LLMUnavailableError("LLM не вернула ответ")
+        verdict = response.strip()
+        if verdict not in ("0", "1"):
+            raise ValueError(f"Ожидается ответ 0 или 1, получено {response!r}")
+        return int(verdict)
     
     def close(self) -> None:
         """
-        Закрывает соединения LLM клиента.
+        Закрывает соединения LLM клиента и файл кэша.
         """
+        if self._batcher is not None:
+            self._batcher.close()
         self._llm_client.close()
+        if self._cache is not None:
+            self._cache.close()
+    
+    async def aclose(self) -> None:
+        """
+        Закрывает соединения обоих клиентов и файл кэша.
+        """
+        if self._async_client is not None:
+            await self._async_client.aclose()
+        self.close()
 
 
 # Фабрика для создания LLM сервиса
-def create_llm_service(provider: str = "gemini", **kwargs) -> LLMService:
+def create_llm_service(
+    provider: Optional[str] = None,
+    cache: Optional[FIOCache] = None,
+    with_async: bool = False,
+    http_client=None,
+    breaker: Optional[CircuitBreaker] = None,
+    **kwargs
+) -> LLMService:
     """
     Создает LLM сервис с указанным провайдером.
     
     Args:
-        provider: Провайдер LLM ("gemini", "openai", etc.)
+        provider: Провайдер LLM ("gemini", "openai", "replay" — запись/воспроизведение
+            ответов, см. ReplayAdapter; параметры path, mode, latency, default, upstream).
+            По умолчанию — LLM_PROVIDER из конфигурации
+        cache: Кэш вердиктов по ФИО; по умолчанию создаётся из конфигурации
+            (при записи replay — только в памяти, см. ниже)
+        with_async: Создать также асинхронный клиент для acheck_fio
+        http_client: Общий асинхронный пул соединений (см. create_async_http_client)
+        breaker: Выключатель для клиентов; по умолчанию создаётся из конфигурации
         **kwargs: Дополнительные параметры для инициализации клиента
         
     Returns:
@@ -85,27 +387,114 @@ def create_llm_service(provider: str = "gemini", **kwargs) -> LLMService:
     Raises:
         ValueError: Если указан неподдерживаемый провайдер
     """
+    provider = provider or get_llm_config()["provider"]
+    recording = False
     if provider == "gemini":
         llm_client = GeminiAdapter(**kwargs)
+        async_cls = AsyncGeminiAdapter
     elif provider == "openai": ## на всякий случай как пример пусть будет
         llm_client = OpenAIAdapter(**kwargs)
+        async_cls = AsyncOpenAIAdapter
+    elif provider == "replay":
+        llm_client = _create_replay_adapter(**kwargs)
+        async_cls = None            # acheck_fio выполнит синхронный replay в пуле потоков
+        recording = llm_client.mode == "record"
     else:
         raise ValueError(f"Неподдерживаемый провайдер LLM: {provider}")
     
-    return LLMService(llm_client)
+    async_client = None
+    if with_async and async_cls is not None:
+        async_client = async_cls(
+            http_client=http_client,
+            timeout=kwargs.get("timeout", 10.0),
+            endpoint=kwargs.get("endpoint"),
+            rate_limiter=kwargs.get("rate_limiter"),
+        )
+    
+    # Синхронный и асинхронный клиенты ходят к одному провайдеру — выключатель общий
+    if breaker is None:
+        breaker = CircuitBreaker(**get_circuit_breaker_config())
+    llm_client = GuardedLLMClient(llm_client, breaker)
+    if async_client is not None:
+        async_client = AsyncGuardedLLMClient(async_client, breaker)
+    
+    if cache is None:
+        cache_config = get_fio_cache_config()
+        if recording:
+            # ФИО, уже лежащие в дисковом кэше, не дошли бы до ReplayAdapter и не попали
+            # бы в запись — при воспроизведении на них был бы промах
+            cache_config = dict(cache_config, path=None)
+        cache = FIOCache(**cache_config)
+    
+    return LLMService(llm_client, cache=cache, async_client=async_client, **get_fio_batch_config())
+
 
+def _create_replay_adapter(**kwargs) -> ReplayAdapter:
+    options = {**get_replay_config(), **kwargs}
+    if not options.get("path"):
+        raise ValueError("Для провайдера replay нужен путь к файлу записей (path или LLM_REPLAY_PATH)")
+    upstream = options.pop("upstream")
+    if options["mode"] == "record" and (upstream is None or isinstance(upstream, str)):
+        # Записываем ответы настоящего провайдера с настройками по умолчанию
+        upstream_provider = upstream or "gemini"
+        if upstream_provider == "gemini":
+            upstream = GeminiAdapter()
+        elif upstream_provider == "openai":
+            upstream = OpenAIAdapter()
+        else:
+            raise ValueError(f"Неподдерживаемый провайдер для записи: {upstream_provider}")
+    elif isinstance(upstream, str):
+        upstream = None             # при воспроизведении upstream не нужен
+    return ReplayAdapter(options.pop("path"), upstream=upstream, **options)
 
-# Глобальный экземпляр для обратной совместимости
-_llm_service = create_llm_service()
+
+# Глобальный экземпляр для обратной совместимости; создаётся при первом get_llm(),
+# чтобы импорт модуля не открывал сессии и файлы кэша
+_llm_service: Optional[LLMService] = None
+_llm_service_lock = threading.Lock()
 
 
 def get_llm() -> LLMService:
     """
-    Возвращает глобальный экземпляр LLM сервиса.
+    Возвращает глобальный экземпляр LLM сервиса, создавая его при первом обращении.
     Для обратной совместимости с существующим кодом.
     
     Returns:
         LLMService: Глобальный экземпляр сервиса
     """
+    global _llm_service
+    if _llm_service is None:
+        with _llm_service_lock:
+            if _llm_service is None:
+                _llm_service = create_llm_service()
     return _llm_service
 
+
+def set_llm(service: Optional[LLMService]) -> Optional[LLMService]:
+    """
+    Подменяет глобальный экземпляр LLM сервиса (None — пересоздать при следующем get_llm()).
+    Прежний экземпляр не закрывается: им может продолжать пользоваться вызывающий код.
+    
+    Args:
+        service: Новый сервис
+        
+    Returns:
+        Optional[LLMService]: Прежний экземпляр (если был создан)
+    """
+    global _llm_service
+    with _llm_service_lock:
+        previous, _llm_service = _llm_service, service
+    return previous
+
+
+def _forget_llm_after_fork() -> None:
+    # Сессия, пулы потоков и соединение с кэшем родителя в дочернем процессе
+    # непригодны: рабочий процесс создаёт свой сервис при первом get_llm()
+    global _llm_service, _llm_service_lock
+    _llm_service = None
+    _llm_service_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_llm_after_fork)
+
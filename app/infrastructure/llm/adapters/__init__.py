@@ -1,4 +1,17 @@
 from .gemini_adapter import GeminiAdapter
 from .openai_adapter import OpenAIAdapter
+from .async_gemini_adapter import AsyncGeminiAdapter
+from .async_openai_adapter import AsyncOpenAIAdapter
+from .async_http import create_async_http_client
+from .replay_adapter import ReplayAdapter, ReplayMissError, replay_key
 
-__all__ = ['GeminiAdapter', 'OpenAIAdapter']
+__all__ = [
+    'GeminiAdapter',
+    'OpenAIAdapter',
+    'AsyncGeminiAdapter',
+    'AsyncOpenAIAdapter',
+    'create_async_http_client',
+    'ReplayAdapter',
+    'ReplayMissError',
+    'replay_key',
+]
@@ -0,0 +1,82 @@
+"""
+Общий асинхронный HTTP-пул и повторы запросов для асинхронных адаптеров.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Dict, Optional
+
+import httpx
+
+
+from app.infrastructure.llm.circuit_breaker import LLMRequestError, is_request_error
+from app.infrastructure.llm.rate_limit import THROTTLE_STATUSES, RateLimiter, parse_retry_after
+from app.infrastructure.telemetry import span
+
+
+RETRY_STATUSES = frozenset({500, 502, 504})
+
+
+def create_async_http_client(*, pool_maxsize: int = 200, timeout: float = 10.0) -> httpx.AsyncClient:
+    """
+    Создаёт пул соединений, который можно передать сразу в несколько асинхронных адаптеров.
+
+    Args:
+        pool_maxsize: Максимальное число одновременных соединений
+        timeout: Таймаут запросов
+
+    Returns:
+        httpx.AsyncClient: Клиент с keep-alive пулом
+    """
+    limits = httpx.Limits(max_connections=pool_maxsize, max_keepalive_connections=pool_maxsize)
+    return httpx.AsyncClient(limits=limits, timeout=timeout)
+
+
+async def post_with_retries(
+    client: httpx.AsyncClient,
+    url: str,
+    *,
+    headers: Dict[str, str],
+    limiter: RateLimiter,
+    tokens: int,
+    content: Optional[bytes] = None,
+    json: Optional[Any] = None,
+    total: int = 3,
+    backoff_factor: float = 0.3,
+) -> Optional[httpx.Response]:
+    """
+    POST с повторами, повторяющий поведение синхронных адаптеров: каждая попытка
+    занимает слот общего RateLimiter; 429/503 уменьшают общий лимит и ставят
+    паузу по Retry-After, 5xx и сетевые ошибки повторяются с экспоненциальной задержкой.
+
+    Returns:
+        Optional[httpx.Response]: Успешный ответ или None, если попытки исчерпаны
+
+    Raises:
+        LLMRequestError: Если провайдер отклонил запрос (4xx, кроме 408 и 429)
+    """
+    for attempt in range(total + 1):
+        with span("llm.acquire"):
+            slot = await limiter.aacquire(tokens)
+        async with slot:
+            with span("llm.http", attempt=attempt + 1) as s:
+                try:
+                    resp = await client.post(url, headers=headers, content=content, json=json)
+                except httpx.HTTPError as e:
+                    s.set("error", type(e).__name__)
+                    resp = None
+                else:
+                    s.set("status", resp.status_code)
+                    slot.report(resp.status_code, parse_retry_after(resp.headers.get("Retry-After")))
+
+        if resp is not None and is_request_error(resp.status_code):
+            raise LLMRequestError(f"LLM отклонила запрос: HTTP {resp.status_code}")
+        if resp is not None and resp.status_code not in RETRY_STATUSES | THROTTLE_STATUSES:
+            return resp if resp.is_success else None
+        if attempt == total:
+            return None
+        if resp is None or resp.status_code in RETRY_STATUSES:
+            await asyncio.sleep(backoff_factor * (2 ** attempt))
+        # после 429/503 пауза уже выставлена в лимитере — aacquire её выждет
+    return None
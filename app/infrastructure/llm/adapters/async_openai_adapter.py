@@ -0,0 +1,114 @@
+"""
+Асинхронный адаптер для OpenAI API.
+"""
+
+from typing import Optional, Dict, Any
+from app.infrastructure.llm.llm_client import AsyncLLMClient
+from app.infrastructure.llm.circuit_breaker import LLMRequestError
+from app.infrastructure.llm.adapters.async_http import create_async_http_client, post_with_retries
+from app.infrastructure.llm.adapters.openai_adapter import (
+    OPENAI_ENDPOINT,
+    build_openai_payload,
+    parse_openai_response,
+)
+from app.infrastructure.llm.rate_limit import RateLimiter, estimate_tokens, get_shared_rate_limiter
+from app.infrastructure.telemetry import span
+from app.config import CONFIG
+
+import httpx
+
+
+class AsyncOpenAIAdapter(AsyncLLMClient):
+    """
+    Асинхронная реализация клиента OpenAI API поверх httpx.
+    Формат запроса и разбор ответа общие с OpenAIAdapter.
+    """
+
+    def __init__(
+        self,
+        *,
+        http_client: Optional[httpx.AsyncClient] = None,
+        pool_maxsize: int = 200,
+        timeout: float = 10.0,
+        endpoint: Optional[str] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+    ):
+        """
+        Инициализирует асинхронный адаптер для работы с OpenAI API.
+
+        Args:
+            http_client: Общий пул соединений (см. create_async_http_client);
+                если не передан, адаптер создаёт и закрывает собственный
+            pool_maxsize: Размер собственного пула соединений
+            timeout: Таймаут для запросов собственного пула
+            endpoint: URL chat/completions (по умолчанию — api.openai.com)
+            rate_limiter: Ограничитель нагрузки (по умолчанию — общий для процесса)
+        """
+        self._ENDPOINT = endpoint or OPENAI_ENDPOINT
+        self._headers = {"Content-Type": "application/json"}
+        # httpx не пропускает заголовок "Bearer " с пустым ключом
+        api_key = CONFIG.get("OPENAI_API_KEY", "")
+        if api_key:
+            self._headers["Authorization"] = f"Bearer {api_key}"
+        self._model = CONFIG.get("OPENAI_MODEL", "gpt-4")
+        self._rate_limiter = rate_limiter or get_shared_rate_limiter()
+        self._owns_client = http_client is None
+        self._client = http_client or create_async_http_client(pool_maxsize=pool_maxsize, timeout=timeout)
+
+    async def agenerate_content(
+        self,
+        system_prompt: str,
+        user_text: str,
+        generation_config: Optional[Dict[str, Any]] = None
+    ) -> Optional[str]:
+        """
+        Генерирует контент через OpenAI API.
+
+        Args:
+            system_prompt: Системный промпт
+            user_text: Пользовательский текст
+            generation_config: Конфигурация генерации
+
+        Returns:
+            Optional[str]: Сгенерированный текст или None, если провайдер недоступен
+
+        Raises:
+            LLMRequestError: Если запрос отклонён (4xx) или ответ не разобран
+        """
+        payload = build_openai_payload(self._model, system_prompt, user_text, generation_config)
+
+        resp = await post_with_retries(
+            self._client,
+            self._ENDPOINT,
+            headers=self._headers,
+            limiter=self._rate_limiter,
+            tokens=estimate_tokens(system_prompt, user_text, generation_config),
+            json=payload,
+        )
+        if resp is None:
+            return None
+
+        with span("llm.parse", provider="openai"):
+            try:
+                text = parse_openai_response(resp.json())
+            except ValueError:
+                text = None
+        if text is None:
+            # Провайдер ответил, но не так, как ожидалось: это не сбой связи
+            raise LLMRequestError("Неразборчивый ответ LLM")
+        return text
+
+    @property
+    def model(self) -> str:
+        return self._model
+
+    @property
+    def rate_limiter(self) -> RateLimiter:
+        return self._rate_limiter
+
+    async def aclose(self) -> None:
+        """
+        Закрывает собственный пул соединений (общий пул закрывает его владелец).
+        """
+        if self._owns_client:
+            await self._client.aclose()
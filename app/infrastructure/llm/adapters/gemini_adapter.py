@@ -1,12 +1,46 @@
 from __future__ import annotations
 from typing import Optional, Dict, Any
 from app.infrastructure.llm.llm_client import LLMClient
+from app.infrastructure.llm.circuit_breaker import LLMRequestError
 from app.config import CONFIG
 
 import json
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util import Retry
+from app.infrastructure.llm.adapters.sync_http import create_session, post_throttled
+from app.infrastructure.llm.rate_limit import RateLimiter, estimate_tokens, get_shared_rate_limiter
+from app.infrastructure.telemetry import span
+
+
+GEMINI_ENDPOINT = "https://api.proxyapi.ru/google/v1beta/models/gemini-2.0-flash:generateContent"
+
+
+def build_gemini_payload(
+    system_prompt: str,
+    user_text: str,
+    generation_config: Optional[Dict[str, Any]] = None
+) -> str:
+    """
+    Собирает тело запроса generateContent.
+    Готовим payload один раз как str -> экономим на encode в HTTP-клиенте.
+    """
+    return json.dumps({
+        "systemInstruction": {"parts": [{"text": system_prompt}]},
+        "contents": [{"parts": [{"text": user_text}]}],
+        "generationConfig": generation_config,
+    }, ensure_ascii=False)
+
+
+def parse_gemini_response(data: Any) -> Optional[str]:
+    """
+    Достаёт текст первого кандидата из JSON-ответа Gemini.
+    
+    Returns:
+        Optional[str]: Текст ответа или None, если формат неожиданный
+    """
+    try:
+        parts = data["candidates"][0]["content"]["parts"]
+        return "".join(p.get("text", "") for p in parts if isinstance(p, dict)).strip()
+    except Exception:
+        return None
 
 
 class GeminiAdapter(LLMClient):
@@ -15,7 +49,15 @@ class GeminiAdapter(LLMClient):
     Содержит всю логику для HTTP-запросов, ретраев и обработки ответов.
     """
     
-    def __init__(self, *, pool_connections: int = 10, pool_maxsize: int = 50, timeout: float = 10.0):
+    def __init__(
+        self,
+        *,
+        pool_connections: int = 10,
+        pool_maxsize: int = 50,
+        timeout: float = 10.0,
+        endpoint: Optional[str] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+    ):
         """
         Инициализирует адаптер для работы с Gemini API.
         
@@ -23,9 +65,10 @@ class GeminiAdapter(LLMClient):
             pool_connections: Количество соединений в пуле
             pool_maxsize: Максимальный размер пула соединений
             timeout: Таймаут для запросов
+            endpoint: URL generateContent (по умолчанию — прокси ProxyAPI)
+            rate_limiter: Ограничитель нагрузки (по умолчанию — общий для процесса)
         """
-        print("SIII!")
-        self._ENDPOINT = "https://api.proxyapi.ru/google/v1beta/models/gemini-2.0-flash:generateContent"
+        self._ENDPOINT = endpoint or GEMINI_ENDPOINT
         # keep-alive по умолчанию включён у requests; явно не вредно
         self._headers = {
             "Authorization": f"Bearer {CONFIG['API_KEY']}",
@@ -33,28 +76,12 @@ class GeminiAdapter(LLMClient):
             "Connection": "keep-alive",
         }
         self._timeout = timeout
+        self._model = "gemini-2.0-flash"
 
-        # Настраиваем сессию с пулом соединений и ретраями
-        self._session = requests.Session()
-
-        retries = Retry(
-            total=3,
-            backoff_factor=0.3,                # экспоненциальная задержка: 0.3, 0.6, 1.2 …
-            status_forcelist=(429, 500, 502, 503, 504),
-            allowed_methods=frozenset(["POST"]),
-            raise_on_status=False,
-            respect_retry_after_header=True,
-        )
-
-        adapter = HTTPAdapter(
-            pool_connections=pool_connections,
-            pool_maxsize=pool_maxsize,
-            max_retries=retries,
-        )
+        self._rate_limiter = rate_limiter or get_shared_rate_limiter()
 
-        # HTTP и HTTPS — один и тот же адаптер
-        self._session.mount("http://", adapter)
-        self._session.mount("https://", adapter)
+        # Настраиваем сессию с пулом соединений и ретраями
+        self._session = create_session(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
     
     def generate_content(
         self, 
@@ -71,37 +98,44 @@ class GeminiAdapter(LLMClient):
             generation_config: Конфигурация генерации
             
         Returns:
-            Optional[str]: Сгенерированный текст или None в случае ошибки
-        """
-        # Подготовим payload один раз как str -> экономим на encode в urllib3
-        payload = json.dumps({
-            "systemInstruction": {"parts": [{"text": system_prompt}]},
-            "contents": [{"parts": [{"text": user_text}]}],
-            "generationConfig": generation_config,
-        }, ensure_ascii=False)
+            Optional[str]: Сгенерированный текст или None, если провайдер недоступен
 
-        try:
-            # Используем persistent-сессию и соединение из пула
-            resp = self._session.post(
-                self._ENDPOINT,
-                headers=self._headers,
-                data=payload,           # data со строкой быстрее, чем json= (меньше работы на сериализацию)
-                timeout=self._timeout,
-            )
-            # Если пришёл ретраябельный код — Retry в адаптере уже попробовал сам
-            resp.raise_for_status()
-        except requests.RequestException:
-            return None
+        Raises:
+            LLMRequestError: Если запрос отклонён (4xx) или ответ не разобран
+        """
+        payload = build_gemini_payload(system_prompt, user_text, generation_config)
 
-        try:
-            data = resp.json()
-            parts = data["candidates"][0]["content"]["parts"]
-            text = "".join(p.get("text", "") for p in parts if isinstance(p, dict)).strip()
-        except Exception:
+        # Используем persistent-сессию и соединение из пула
+        resp = post_throttled(
+            self._session,
+            self._ENDPOINT,
+            limiter=self._rate_limiter,
+            tokens=estimate_tokens(system_prompt, user_text, generation_config),
+            headers=self._headers,
+            data=payload,           # data со строкой быстрее, чем json= (меньше работы на сериализацию)
+            timeout=self._timeout,
+        )
+        if resp is None:
             return None
 
+        with span("llm.parse", provider="gemini"):
+            try:
+                text = parse_gemini_response(resp.json())
+            except ValueError:
+                text = None
+        if text is None:
+            # Провайдер ответил, но не так, как ожидалось: это не сбой связи
+            raise LLMRequestError("Неразборчивый ответ LLM")
         return text
     
+    @property
+    def model(self) -> str:
+        return self._model
+    
+    @property
+    def rate_limiter(self) -> RateLimiter:
+        return self._rate_limiter
+    
     def close(self) -> None:
         """
         Закрывает соединения.
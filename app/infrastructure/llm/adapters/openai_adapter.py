@@ -5,12 +5,64 @@
 
 from typing import Optional, Dict, Any
 from app.infrastructure.llm.llm_client import LLMClient
+from app.infrastructure.llm.circuit_breaker import LLMRequestError
 from app.config import CONFIG
 
 import json
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util import Retry
+from app.infrastructure.llm.adapters.sync_http import create_session, post_throttled
+from app.infrastructure.llm.rate_limit import RateLimiter, estimate_tokens, get_shared_rate_limiter
+from app.infrastructure.telemetry import span
+
+
+OPENAI_ENDPOINT = "https://api.openai.com/v1/chat/completions"
+
+
+def build_openai_payload(
+    model: str,
+    system_prompt: str,
+    user_text: str,
+    generation_config: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Собирает тело запроса chat/completions, адаптируя параметры генерации в формате Gemini.
+    """
+    messages = [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_text}
+    ]
+    
+    payload = {
+        "model": model,
+        "messages": messages,
+    }
+    
+    # Добавляем конфигурацию генерации, если есть
+    if generation_config:
+        # Адаптируем параметры под OpenAI API
+        openai_config = {}
+        if "temperature" in generation_config:
+            openai_config["temperature"] = generation_config["temperature"]
+        if "maxOutputTokens" in generation_config:
+            openai_config["max_tokens"] = generation_config["maxOutputTokens"]
+        if "topP" in generation_config:
+            openai_config["top_p"] = generation_config["topP"]
+        
+        payload.update(openai_config)
+    return payload
+
+
+def parse_openai_response(data: Any) -> Optional[str]:
+    """
+    Достаёт текст ответа из JSON chat/completions.
+    
+    Returns:
+        Optional[str]: Текст ответа или None, если формат неожиданный
+    """
+    try:
+        # OpenAI возвращает ответ в другом формате
+        return data["choices"][0]["message"]["content"].strip()
+    except Exception:
+        return None
 
 
 class OpenAIAdapter(LLMClient):
@@ -19,7 +71,15 @@ class OpenAIAdapter(LLMClient):
     Демонстрирует паттерн адаптера для другого провайдера.
     """
     
-    def __init__(self, *, pool_connections: int = 10, pool_maxsize: int = 50, timeout: float = 10.0):
+    def __init__(
+        self,
+        *,
+        pool_connections: int = 10,
+        pool_maxsize: int = 50,
+        timeout: float = 10.0,
+        endpoint: Optional[str] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+    ):
         """
         Инициализирует адаптер для работы с OpenAI API.
         
@@ -27,8 +87,10 @@ class OpenAIAdapter(LLMClient):
             pool_connections: Количество соединений в пуле
             pool_maxsize: Максимальный размер пула соединений
             timeout: Таймаут для запросов
+            endpoint: URL chat/completions (по умолчанию — api.openai.com)
+            rate_limiter: Ограничитель нагрузки (по умолчанию — общий для процесса)
         """
-        self._ENDPOINT = "https://api.openai.com/v1/chat/completions"
+        self._ENDPOINT = endpoint or OPENAI_ENDPOINT
         self._headers = {
             "Authorization": f"Bearer {CONFIG.get('OPENAI_API_KEY', '')}",
             "Content-Type": "application/json",
@@ -36,26 +98,10 @@ class OpenAIAdapter(LLMClient):
         self._timeout = timeout
         self._model = CONFIG.get("OPENAI_MODEL", "gpt-4")
 
-        # Настраиваем сессию с пулом соединений и ретраями
-        self._session = requests.Session()
-
-        retries = Retry(
-            total=3,
-            backoff_factor=0.3,
-            status_forcelist=(429, 500, 502, 503, 504),
-            allowed_methods=frozenset(["POST"]),
-            raise_on_status=False,
-            respect_retry_after_header=True,
-        )
-
-        adapter = HTTPAdapter(
-            pool_connections=pool_connections,
-            pool_maxsize=pool_maxsize,
-            max_retries=retries,
-        )
+        self._rate_limiter = rate_limiter or get_shared_rate_limiter()
 
-        self._session.mount("http://", adapter)
-        self._session.mount("https://", adapter)
+        # Настраиваем сессию с пулом соединений и ретраями
+        self._session = create_session(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
     
     def generate_content(
         self, 
@@ -72,52 +118,43 @@ class OpenAIAdapter(LLMClient):
             generation_config: Конфигурация генерации
             
         Returns:
-            Optional[str]: Сгенерированный текст или None в случае ошибки
-        """
-        # Формируем payload для OpenAI API
-        messages = [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_text}
-        ]
-        
-        payload = {
-            "model": self._model,
-            "messages": messages,
-        }
-        
-        # Добавляем конфигурацию генерации, если есть
-        if generation_config:
-            # Адаптируем параметры под OpenAI API
-            openai_config = {}
-            if "temperature" in generation_config:
-                openai_config["temperature"] = generation_config["temperature"]
-            if "maxOutputTokens" in generation_config:
-                openai_config["max_tokens"] = generation_config["maxOutputTokens"]
-            if "topP" in generation_config:
-                openai_config["top_p"] = generation_config["topP"]
-            
-            payload.update(openai_config)
+            Optional[str]: Сгенерированный текст или None, если провайдер недоступен
 
-        try:
-            resp = self._session.post(
-                self._ENDPOINT,
-                headers=self._headers,
-                json=payload,
-                timeout=self._timeout,
-            )
-            resp.raise_for_status()
-        except requests.RequestException:
-            return None
+        Raises:
+            LLMRequestError: Если запрос отклонён (4xx) или ответ не разобран
+        """
+        payload = build_openai_payload(self._model, system_prompt, user_text, generation_config)
 
-        try:
-            data = resp.json()
-            # OpenAI возвращает ответ в другом формате
-            text = data["choices"][0]["message"]["content"].strip()
-        except (KeyError, IndexError, Exception):
+        resp = post_throttled(
+            self._session,
+            self._ENDPOINT,
+            limiter=self._rate_limiter,
+            tokens=estimate_tokens(system_prompt, user_text, generation_config),
+            headers=self._headers,
+            json=payload,
+            timeout=self._timeout,
+        )
+        if resp is None:
             return None
 
+        with span("llm.parse", provider="openai"):
+            try:
+                text = parse_openai_response(resp.json())
+            except ValueError:
+                text = None
+        if text is None:
+            # Провайдер ответил, но не так, как ожидалось: это не сбой связи
+            raise LLMRequestError("Неразборчивый ответ LLM")
         return text
     
+    @property
+    def model(self) -> str:
+        return self._model
+    
+    @property
+    def rate_limiter(self) -> RateLimiter:
+        return self._rate_limiter
+    
     def close(self) -> None:
         """
         Закрывает соединения.
@@ -0,0 +1,205 @@
+"""
+Запись и воспроизведение ответов LLM.
+
+В режиме record адаптер проксирует запросы в настоящий клиент и дописывает
+пары «запрос → ответ» в файл; в режиме replay отвечает из этого файла без
+сети (с необязательной искусственной задержкой). Так весь путь check_fio
+можно прогонять офлайн и детерминированно — в тестах и нагрузочных прогонах.
+
+Формат файла — JSONL: первая строка — заголовок {"model": ...}, далее
+{"k": <ключ>, "r": <ответ>}. Ключ — blake2b от промпта, текста и параметров
+генерации, поэтому сами тексты (и персональные данные) в файл не попадают.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Optional, TextIO
+
+from app.infrastructure.llm.circuit_breaker import LLMRequestError
+from app.infrastructure.llm.llm_client import LLMClient
+
+
+REPLAY_MODES = ("replay", "record")
+
+
+class ReplayMissError(LLMRequestError):
+    """
+    Запроса нет в записи. Это пробел в записи, а не сбой провайдера:
+    выключатель его не считает, иначе несколько промахов разомкнули бы его
+    и для записанных запросов.
+    """
+
+
+def replay_key(system_prompt: str, user_text: str, generation_config: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Ключ записи: хэш промпта, текста и параметров генерации.
+
+    Returns:
+        str: 32 шестнадцатеричных символа
+    """
+    h = hashlib.blake2b(digest_size=16)
+    for part in (system_prompt, user_text, json.dumps(generation_config, sort_keys=True, ensure_ascii=False)):
+        data = part.encode("utf-8")
+        h.update(len(data).to_bytes(8, "little"))
+        h.update(data)
+    return h.hexdigest()
+
+
+class ReplayAdapter(LLMClient):
+    """
+    LLMClient, записывающий или воспроизводящий ответы другого клиента.
+
+    Использование:
+        # запись
+        recorder = ReplayAdapter("fio.replay.jsonl", mode="record", upstream=GeminiAdapter())
+        # воспроизведение
+        service = create_llm_service("replay", path="fio.replay.jsonl", latency=0.001)
+    """
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        mode: str = "replay",
+        upstream: Optional[LLMClient] = None,
+        latency: float = 0.0,
+        default: Optional[str] = None,
+    ):
+        """
+        Args:
+            path: Файл записей
+            mode: "replay" — отвечать из файла, "record" — проксировать в upstream и дописывать файл
+            upstream: Настоящий клиент (обязателен для record)
+            latency: Искусственная задержка ответа в replay, секунды
+            default: Ответ на запрос, которого нет в записи (None — ReplayMissError)
+        """
+        if mode not in REPLAY_MODES:
+            raise ValueError(f"Неподдерживаемый режим: {mode} (ожидается один из {REPLAY_MODES})")
+        if mode == "record" and upstream is None:
+            raise ValueError("Для записи нужен upstream-клиент")
+        if latency < 0:
+            raise ValueError("latency не может быть отрицательной")
+        self._path = path
+        self._mode = mode
+        self._upstream = upstream
+        self._latency = latency
+        self._default = default
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._recorded = 0
+
+        self._responses: Dict[str, str] = {}
+        self._model: Optional[str] = None
+        if os.path.exists(path):
+            self._load(path)
+        elif mode == "replay":
+            raise FileNotFoundError(f"Нет файла записей: {path}")
+
+        self._file: Optional[TextIO] = None
+        if mode == "record":
+            model = upstream.model
+            if self._model is not None and self._model != model:
+                raise ValueError(f"Файл {path} записан для модели {self._model}, а не {model}")
+            self._model = model
+            is_new = not os.path.exists(path) or os.path.getsize(path) == 0
+            self._file = open(path, "a", encoding="utf-8")
+            if is_new:
+                self._write({"model": model})
+
+    def _load(self, path: str) -> None:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if "model" in record:
+                    self._model = record["model"]
+                else:
+                    # Повторная запись того же запроса перекрывает прежнюю
+                    self._responses[record["k"]] = record["r"]
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        self._file.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+        self._file.flush()
+
+    def generate_content(
+        self,
+        system_prompt: str,
+        user_text: str,
+        generation_config: Optional[Dict[str, Any]] = None
+    ) -> Optional[str]:
+        """
+        Ответ из записи (replay) или от upstream с сохранением (record).
+
+        Returns:
+            Optional[str]: Текст ответа или None (сбой upstream в режиме record)
+
+        Raises:
+            ReplayMissError: Если запроса нет в записи, а default не задан
+        """
+        key = replay_key(system_prompt, user_text, generation_config)
+        if self._mode == "record":
+            response = self._upstream.generate_content(system_prompt, user_text, generation_config)
+            if response is not None:
+                # Сбои не записываем: при воспроизведении они были бы неотличимы от ответа
+                with self._lock:
+                    if self._responses.get(key) != response:
+                        self._responses[key] = response
+                        self._write({"k": key, "r": response})
+                        self._recorded += 1
+            return response
+
+        if self._latency:
+            time.sleep(self._latency)
+        response = self._responses.get(key)
+        with self._lock:
+            if response is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+        if response is None:
+            if self._default is None:
+                raise ReplayMissError("Запроса нет в записи ответов LLM")
+            return self._default
+        return response
+
+    @property
+    def model(self) -> str:
+        # Модель из записи: ключи кэша ФИО совпадают с теми, что были при записи
+        return self._model or "replay"
+
+    @property
+    def rate_limiter(self):
+        return getattr(self._upstream, "rate_limiter", None)
+
+    @property
+    def mode(self) -> str:
+        return self._mode
+
+    def __len__(self) -> int:
+        return len(self._responses)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "mode": self._mode,
+                "entries": len(self._responses),
+                "hits": self._hits,
+                "misses": self._misses,
+                "recorded": self._recorded,
+            }
+
+    def close(self) -> None:
+        """Закрывает файл записи и upstream-клиент."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+        if self._upstream is not None:
+            self._upstream.close()
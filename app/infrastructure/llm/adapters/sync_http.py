@@ -0,0 +1,102 @@
+"""
+Общая HTTP-обвязка синхронных адаптеров: сессия с пулом соединений и
+отправка запроса через общий RateLimiter.
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+
+from app.infrastructure.llm.circuit_breaker import LLMRequestError, is_request_error
+from app.infrastructure.llm.rate_limit import THROTTLE_STATUSES, RateLimiter, parse_retry_after
+from app.infrastructure.telemetry import span
+
+
+def create_session(*, pool_connections: int = 10, pool_maxsize: int = 50) -> requests.Session:
+    """
+    Создаёт сессию с пулом соединений и ретраями транспортного уровня.
+
+    429 и 503 urllib3 не повторяет: их обрабатывает RateLimiter, чтобы
+    все потоки отступили вместе, а не засыпали независимо друг от друга.
+    """
+    session = requests.Session()
+
+    retries = Retry(
+        total=3,
+        backoff_factor=0.3,                # экспоненциальная задержка: 0.3, 0.6, 1.2 …
+        status_forcelist=(500, 502, 504),
+        allowed_methods=frozenset(["POST"]),
+        raise_on_status=False,
+        respect_retry_after_header=False,  # иначе urllib3 сам повторяет 429/503 с Retry-After
+    )
+
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=retries,
+    )
+
+    # HTTP и HTTPS — один и тот же адаптер
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def post_throttled(
+    session: requests.Session,
+    url: str,
+    *,
+    limiter: RateLimiter,
+    tokens: int,
+    throttle_retries: int = 3,
+    **kwargs,
+) -> Optional[requests.Response]:
+    """
+    POST через RateLimiter: каждая попытка занимает слот, ответы 429/503
+    уменьшают общий лимит и ставят паузу по Retry-After, после чего запрос повторяется.
+
+    Args:
+        session: Сессия requests
+        url: Адрес запроса
+        limiter: Общий ограничитель нагрузки
+        tokens: Оценка токенов запроса
+        throttle_retries: Сколько раз повторять после 429/503
+        **kwargs: Параметры session.post
+
+    Returns:
+        Optional[requests.Response]: Успешный ответ или None (провайдер недоступен)
+
+    Raises:
+        LLMRequestError: Если провайдер отклонил запрос (4xx, кроме 408 и 429)
+    """
+    for attempt in range(throttle_retries + 1):
+        with span("llm.acquire"):
+            slot = limiter.acquire(tokens)
+        # Один span на попытку; ретраи urllib3 (5xx, обрывы) идут внутри неё — их число в атрибуте retries
+        with slot, span("llm.http", attempt=attempt + 1) as s:
+            try:
+                resp = session.post(url, **kwargs)
+            except requests.RequestException as e:
+                s.set("error", type(e).__name__)
+                return None
+            s.set("status", resp.status_code)
+            s.set("retries", transport_retries(resp))
+            slot.report(resp.status_code, parse_retry_after(resp.headers.get("Retry-After")))
+        if resp.status_code not in THROTTLE_STATUSES:
+            break
+
+    if is_request_error(resp.status_code):
+        raise LLMRequestError(f"LLM отклонила запрос: HTTP {resp.status_code}")
+    if not resp.ok:
+        return None
+    return resp
+
+
+def transport_retries(resp: requests.Response) -> int:
+    """Сколько повторов сделал urllib3 Retry, прежде чем получен ответ."""
+    retries = getattr(resp.raw, "retries", None)
+    return len(getattr(retries, "history", ()) or ())
@@ -0,0 +1,163 @@
+"""
+Пакетная проверка ФИО: разбор нумерованного ответа LLM и накопитель запросов,
+который собирает одиночные проверки из разных потоков в пакеты.
+"""
+
+from __future__ import annotations
+
+import queue
+import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from app.domain.models import FIOResult, NameParts
+
+
+_BATCH_LINE_RE = re.compile(r"^\s*(\d+)\s*[:.)\-]\s*(\S+)\s*$")
+
+
+def format_fio_batch(names: Sequence[NameParts]) -> str:
+    """Пользовательский текст пакетного запроса: «N. Фамилия Имя Отчество» по строке на ФИО."""
+    return "\n".join(f"{i}. {data}" for i, data in enumerate(names, 1))
+
+
+def parse_fio_batch_response(text: Optional[str], size: int) -> Dict[int, FIOResult]:
+    """
+    Разбирает ответ пакетного запроса в формате «N: XYZ».
+
+    Каждая строка валидируется через FIOResult; строки с неверным номером,
+    повторным номером или невалидными флагами пропускаются.
+
+    Args:
+        text: Ответ LLM
+        size: Количество ФИО в запросе
+
+    Returns:
+        Dict[int, FIOResult]: Результаты по номерам (с 1); отсутствующие номера нужно перепроверить
+    """
+    parsed: Dict[int, FIOResult] = {}
+    if not text:
+        return parsed
+    for line in text.splitlines():
+        match = _BATCH_LINE_RE.match(line)
+        if match is None:
+            continue
+        index = int(match.group(1))
+        if not 1 <= index <= size or index in parsed:
+            continue
+        try:
+            parsed[index] = FIOResult(match.group(2))
+        except ValueError:
+            continue
+    return parsed
+
+
+_STOP = object()
+
+
+class FIOBatcher:
+    """
+    Собирает одиночные проверки ФИО в пакеты.
+
+    Пакет отправляется, когда набралось batch_size имён или с момента
+    первого имени в пакете прошло flush_interval секунд.
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[List[NameParts]], List[FIOResult]],
+        *,
+        batch_size: int = 20,
+        flush_interval: float = 0.05,
+        max_concurrent_batches: int = 4,
+    ):
+        """
+        Args:
+            flush: Функция пакетной проверки (например, LLMService.checking_FIO_batch)
+            batch_size: Максимальный размер пакета
+            flush_interval: Максимальное ожидание добора пакета, секунды
+            max_concurrent_batches: Сколько пакетов может быть в полёте одновременно
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size должен быть >= 1")
+        self._flush = flush
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._queue: "queue.Queue" = queue.Queue()
+        self._pool = ThreadPoolExecutor(max_workers=max_concurrent_batches, thread_name_prefix="fio-batch")
+        self._thread = threading.Thread(target=self._collect, name="fio-batcher", daemon=True)
+        self._lock = threading.Lock()
+        self._closed = False
+        self._batches = 0
+        self._items = 0
+        self._thread.start()
+
+    def submit(self, data: NameParts) -> "Future[FIOResult]":
+        """
+        Ставит ФИО в очередь на пакетную проверку.
+
+        Returns:
+            Future[FIOResult]: Результат, который будет готов после отправки пакета
+        """
+        future: "Future[FIOResult]" = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("FIOBatcher закрыт")
+            self._queue.put((data, future))
+        return future
+
+    def stats(self) -> Dict[str, float]:
+        """Количество отправленных пакетов, имён и средний размер пакета."""
+        with self._lock:
+            return {
+                "batches": self._batches,
+                "items": self._items,
+                "avg_batch_size": self._items / self._batches if self._batches else 0.0,
+            }
+
+    def close(self) -> None:
+        """Отправляет накопленное и останавливает фоновые потоки."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._thread.join()
+        self._pool.shutdown(wait=True)
+
+    def _collect(self) -> None:
+        stop = False
+        while not stop:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            batch: List[Tuple[NameParts, Future]] = [item]
+            deadline = time.monotonic() + self._flush_interval
+            while len(batch) < self._batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+            with self._lock:
+                self._batches += 1
+                self._items += len(batch)
+            self._pool.submit(self._run, batch)
+
+    def _run(self, batch: List[Tuple[NameParts, Future]]) -> None:
+        try:
+            results = self._flush([data for data, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
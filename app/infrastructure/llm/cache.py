@@ -0,0 +1,219 @@
+"""
+Двухуровневый кэш вердиктов LLM по ФИО.
+
+Запрос на проверку ФИО детерминирован (temperature 0.0, seed 0), поэтому
+ответ можно переиспользовать для того же ФИО, пока не поменялись промпт и модель.
+Первый уровень — LRU в памяти процесса, второй — SQLite на диске с TTL
+и ограничением по количеству записей.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from app.domain.models import NameParts
+
+FIOKey = Tuple[str, str, str]
+
+
+def fio_cache_key(data: NameParts) -> FIOKey:
+    """
+    Нормализованный ключ ФИО: части без краевых пробелов и в нижнем регистре.
+    Символы не заменяются — латиница внутри кириллицы должна давать другой ключ.
+    """
+    return (
+        data.surname.strip().lower(),
+        data.name.strip().lower(),
+        data.father_name.strip().lower(),
+    )
+
+
+def make_namespace(prompt: str, model: str) -> str:
+    """Пространство ключей кэша: хэш промпта и идентификатора модели."""
+    digest = hashlib.sha256()
+    digest.update(prompt.encode("utf-8"))
+    digest.update(b"\x00")
+    digest.update(model.encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+class FIOCache:
+    """
+    Кэш вердиктов LLM по ФИО: LRU в памяти + опциональное хранилище SQLite.
+    Потокобезопасен.
+    """
+
+    _SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS fio_cache ("
+        " key TEXT PRIMARY KEY,"
+        " value TEXT NOT NULL,"
+        " created REAL NOT NULL"
+        ")"
+    )
+
+    def __init__(
+        self,
+        *,
+        memory_size: int = 10000,
+        path: Optional[str] = None,
+        ttl: float = 30 * 24 * 3600.0,
+        max_disk_entries: int = 1_000_000,
+    ):
+        """
+        Args:
+            memory_size: Размер LRU в памяти (0 — отключить)
+            path: Путь к файлу SQLite (None — без дискового уровня)
+            ttl: Время жизни записи на диске в секундах
+            max_disk_entries: Максимум записей на диске, старые вытесняются
+        """
+        self._memory_size = memory_size
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self._ttl = ttl
+        self._max_disk_entries = max_disk_entries
+        self._lock = threading.Lock()
+
+        self._memory_hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._miss_latency_total = 0.0
+        self._miss_latency_count = 0
+        self._writes_since_trim = 0
+        self._trim_every = max(1, min(1000, max_disk_entries // 10))
+
+        self._db: Optional[sqlite3.Connection] = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(self._SCHEMA)
+            self._db.execute("CREATE INDEX IF NOT EXISTS fio_cache_created ON fio_cache(created)")
+
+    @staticmethod
+    def _make_key(namespace: str, key: FIOKey) -> str:
+        return namespace + "\x1f" + "\x1f".join(key)
+
+    def get(self, namespace: str, key: FIOKey) -> Optional[str]:
+        """
+        Возвращает закэшированный ответ или None.
+
+        Args:
+            namespace: Пространство ключей (см. make_namespace)
+            key: Нормализованный ключ ФИО (см. fio_cache_key)
+        """
+        full_key = self._make_key(namespace, key)
+        with self._lock:
+            value = self._memory.get(full_key)
+            if value is not None:
+                self._memory.move_to_end(full_key)
+                self._memory_hits += 1
+                return value
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, created FROM fio_cache WHERE key = ?", (full_key,)
+                ).fetchone()
+                if row is not None:
+                    value, created = row
+                    if time.time() - created <= self._ttl:
+                        self._disk_hits += 1
+                        self._remember(full_key, value)
+                        return value
+                    self._db.execute("DELETE FROM fio_cache WHERE key = ?", (full_key,))
+                    self._evictions += 1
+
+            self._misses += 1
+            return None
+
+    def set(self, namespace: str, key: FIOKey, value: str) -> None:
+        """Сохраняет ответ на обоих уровнях."""
+        full_key = self._make_key(namespace, key)
+        with self._lock:
+            self._remember(full_key, value)
+            if self._db is None:
+                return
+            self._db.execute(
+                "INSERT OR REPLACE INTO fio_cache (key, value, created) VALUES (?, ?, ?)",
+                (full_key, value, time.time()),
+            )
+            self._writes_since_trim += 1
+            # Проверяем размер не на каждой записи: COUNT(*) по большой таблице не бесплатен
+            if self._writes_since_trim >= self._trim_every:
+                self._writes_since_trim = 0
+                self._trim_disk()
+
+    def record_miss_latency(self, seconds: float) -> None:
+        """Учитывает время запроса к LLM при промахе — для оценки экономии."""
+        with self._lock:
+            self._miss_latency_total += seconds
+            self._miss_latency_count += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Счётчики кэша.
+
+        Returns:
+            Dict[str, Any]: попадания по уровням, промахи, доля попаданий,
+            средняя задержка LLM при промахе и оценка сэкономленного времени
+        """
+        with self._lock:
+            hits = self._memory_hits + self._disk_hits
+            total = hits + self._misses
+            avg_miss = (
+                self._miss_latency_total / self._miss_latency_count
+                if self._miss_latency_count else 0.0
+            )
+            return {
+                "memory_hits": self._memory_hits,
+                "disk_hits": self._disk_hits,
+                "misses": self._misses,
+                "hit_rate": hits / total if total else 0.0,
+                "evictions": self._evictions,
+                "memory_entries": len(self._memory),
+                "avg_miss_latency": avg_miss,
+                "saved_requests": hits,
+                "saved_seconds_estimate": hits * avg_miss,
+            }
+
+    def clear(self) -> None:
+        """Очищает оба уровня кэша."""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM fio_cache")
+
+    def close(self) -> None:
+        """Закрывает файл SQLite."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _remember(self, full_key: str, value: str) -> None:
+        if self._memory_size <= 0:
+            return
+        self._memory[full_key] = value
+        self._memory.move_to_end(full_key)
+        while len(self._memory) > self._memory_size:
+            self._memory.popitem(last=False)
+
+    def _trim_disk(self) -> None:
+        expired = self._db.execute(
+            "DELETE FROM fio_cache WHERE created < ?", (time.time() - self._ttl,)
+        ).rowcount
+        self._evictions += max(expired, 0)
+
+        (count,) = self._db.execute("SELECT COUNT(*) FROM fio_cache").fetchone()
+        overflow = count - self._max_disk_entries
+        if overflow > 0:
+            self._db.execute(
+                "DELETE FROM fio_cache WHERE key IN "
+                "(SELECT key FROM fio_cache ORDER BY created LIMIT ?)",
+                (overflow,),
+            )
+            self._evictions += overflow
@@ -0,0 +1,293 @@
+"""
+Автоматический выключатель (circuit breaker) вокруг LLM-клиента.
+
+Пока провайдер отвечает, выключатель замкнут (CLOSED). После серии неудач
+подряд он размыкается (OPEN): вызовы сразу завершаются ошибкой
+CircuitOpenError, не дожидаясь таймаутов и ретраев. Через recovery_timeout
+выключатель пропускает пробный запрос (HALF_OPEN): успех замыкает его,
+неудача снова размыкает.
+
+Неудача — это только недоступность провайдера: сетевая ошибка, таймаут,
+5xx или 429 после всех повторов (клиент вернул None). Отказ в конкретном
+запросе (4xx, неразборчивый ответ) — LLMRequestError: провайдер работает,
+и несколько «плохих» ФИО не должны размыкать выключатель для всех.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional
+
+from .llm_client import AsyncLLMClient, LLMClient
+
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class LLMUnavailableError(RuntimeError):
+    """LLM-провайдер не ответил: результат проверки получить не удалось."""
+
+
+class CircuitOpenError(LLMUnavailableError):
+    """Выключатель разомкнут — запрос к провайдеру не отправлялся."""
+
+
+class LLMRequestError(LLMUnavailableError):
+    """
+    Провайдер ответил, но результата для этого запроса нет (4xx, неразборчивый
+    ответ). Выключатель такие ошибки неудачей не считает; для вызывающего кода
+    это по-прежнему LLMUnavailableError — проверка уходит в деградированный режим.
+    """
+
+
+def is_request_error(status: int) -> bool:
+    """4xx, кроме 408 и 429: запрос отклонён, а не провайдер недоступен."""
+    return 400 <= status < 500 and status not in (408, 429)
+
+
+# (старое состояние, новое состояние)
+StateListener = Callable[[CircuitState, CircuitState], None]
+
+
+class CircuitBreaker:
+    """
+    Потокобезопасный выключатель. Переходы между состояниями пишутся в лог,
+    считаются в stats() и передаются подписчикам (add_listener).
+    """
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            failure_threshold: Сколько неудач подряд размыкают выключатель
+            recovery_timeout: Через сколько секунд после размыкания пропустить пробный запрос
+            half_open_max_calls: Сколько пробных запросов одновременно допускается в HALF_OPEN
+            clock: Источник монотонного времени (подменяется в тестах)
+        """
+        if failure_threshold < 1 or half_open_max_calls < 1:
+            raise ValueError("failure_threshold и half_open_max_calls должны быть >= 1")
+        self._failure_threshold = failure_threshold
+        self._recovery_timeout = recovery_timeout
+        self._half_open_max_calls = half_open_max_calls
+        self._clock = clock
+
+        # RLock: подписчики вызываются под блокировкой и могут читать stats()
+        self._lock = threading.RLock()
+        self._state = CircuitState.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._trial_calls = 0
+        self._listeners: List[StateListener] = []
+        self._transitions: Dict[str, int] = {}
+        self._rejected = 0
+
+    @property
+    def state(self) -> CircuitState:
+        with self._lock:
+            return self._current_state()
+
+    def add_listener(self, listener: StateListener) -> None:
+        """Подписывает listener(old, new) на смену состояния."""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def before_call(self) -> None:
+        """
+        Резервирует право на вызов.
+
+        Raises:
+            CircuitOpenError: Если выключатель разомкнут или пробные запросы уже в полёте
+        """
+        with self._lock:
+            state = self._current_state()
+            if state is CircuitState.CLOSED:
+                return
+            if state is CircuitState.HALF_OPEN and self._trial_calls < self._half_open_max_calls:
+                self._trial_calls += 1
+                return
+            self._rejected += 1
+            retry_in = max(0.0, self._opened_at + self._recovery_timeout - self._clock())
+        raise CircuitOpenError(f"LLM недоступна, повтор через {retry_in:.1f} с")
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._consecutive_failures = 0
+            if self._state is CircuitState.HALF_OPEN:
+                self._trial_calls = max(0, self._trial_calls - 1)
+                self._transition(CircuitState.CLOSED)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._consecutive_failures += 1
+            if self._state is CircuitState.HALF_OPEN:
+                self._trial_calls = max(0, self._trial_calls - 1)
+                self._open()
+            elif self._state is CircuitState.CLOSED and self._consecutive_failures >= self._failure_threshold:
+                self._open()
+
+    def abandon(self) -> None:
+        """Вызов прерван без ответа (например, отменён): освобождает пробный слот, не меняя состояние."""
+        with self._lock:
+            if self._state is CircuitState.HALF_OPEN:
+                self._trial_calls = max(0, self._trial_calls - 1)
+
+    def reset(self) -> None:
+        """Принудительно замыкает выключатель."""
+        with self._lock:
+            self._consecutive_failures = 0
+            self._trial_calls = 0
+            self._transition(CircuitState.CLOSED)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Состояние выключателя.
+
+        Returns:
+            Dict[str, Any]: состояние, неудачи подряд, через сколько секунд пробный
+            запрос, число отклонённых вызовов и счётчики переходов вида "closed->open"
+        """
+        with self._lock:
+            state = self._current_state()
+            retry_in = (
+                max(0.0, self._opened_at + self._recovery_timeout - self._clock())
+                if state is CircuitState.OPEN else 0.0
+            )
+            return {
+                "state": state.value,
+                "consecutive_failures": self._consecutive_failures,
+                "retry_in": retry_in,
+                "rejected": self._rejected,
+                "transitions": dict(self._transitions),
+            }
+
+    def _current_state(self) -> CircuitState:
+        # OPEN сам переходит в HALF_OPEN по истечении recovery_timeout
+        if self._state is CircuitState.OPEN and self._clock() - self._opened_at >= self._recovery_timeout:
+            self._trial_calls = 0
+            self._transition(CircuitState.HALF_OPEN)
+        return self._state
+
+    def _open(self) -> None:
+        self._opened_at = self._clock()
+        self._transition(CircuitState.OPEN)
+
+    def _transition(self, new: CircuitState) -> None:
+        old = self._state
+        if old is new:
+            return
+        self._state = new
+        name = f"{old.value}->{new.value}"
+        self._transitions[name] = self._transitions.get(name, 0) + 1
+        logger.warning("LLM circuit breaker: %s", name)
+        for listener in list(self._listeners):
+            try:
+                listener(old, new)
+            except Exception:
+                logger.exception("Ошибка в подписчике circuit breaker")
+
+
+class GuardedLLMClient(LLMClient):
+    """
+    LLMClient за выключателем: None или исключение от клиента считаются
+    неудачей и превращаются в LLMUnavailableError вместо «пустого» ответа.
+    LLMRequestError пробрасывается как есть и неудачей не считается.
+    """
+
+    def __init__(self, client: LLMClient, breaker: CircuitBreaker):
+        self._client = client
+        self._breaker = breaker
+
+    def generate_content(
+        self,
+        system_prompt: str,
+        user_text: str,
+        generation_config: Optional[Dict[str, Any]] = None
+    ) -> str:
+        self._breaker.before_call()
+        try:
+            response = self._client.generate_content(system_prompt, user_text, generation_config)
+        except LLMRequestError:
+            # Провайдер ответил — он доступен, хоть запрос и отклонён
+            self._breaker.record_success()
+            raise
+        except Exception as e:
+            self._breaker.record_failure()
+            raise LLMUnavailableError(f"Ошибка LLM-клиента: {e}") from e
+        return _checked(response, self._breaker)
+
+    @property
+    def model(self) -> str:
+        return self._client.model
+
+    @property
+    def rate_limiter(self):
+        return getattr(self._client, "rate_limiter", None)
+
+    @property
+    def breaker(self) -> CircuitBreaker:
+        return self._breaker
+
+    def close(self) -> None:
+        self._client.close()
+
+
+class AsyncGuardedLLMClient(AsyncLLMClient):
+    """Асинхронный вариант GuardedLLMClient (обычно с тем же выключателем)."""
+
+    def __init__(self, client: AsyncLLMClient, breaker: CircuitBreaker):
+        self._client = client
+        self._breaker = breaker
+
+    async def agenerate_content(
+        self,
+        system_prompt: str,
+        user_text: str,
+        generation_config: Optional[Dict[str, Any]] = None
+    ) -> str:
+        self._breaker.before_call()
+        try:
+            response = await self._client.agenerate_content(system_prompt, user_text, generation_config)
+        except LLMRequestError:
+            self._breaker.record_success()
+            raise
+        except Exception as e:
+            self._breaker.record_failure()
+            raise LLMUnavailableError(f"Ошибка LLM-клиента: {e}") from e
+        except BaseException:
+            self._breaker.abandon()
+            raise
+        return _checked(response, self._breaker)
+
+    @property
+    def model(self) -> str:
+        return self._client.model
+
+    @property
+    def breaker(self) -> CircuitBreaker:
+        return self._breaker
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+def _checked(response: Optional[str], breaker: CircuitBreaker) -> str:
+    if response is None:
+        breaker.record_failure()
+        raise LLMUnavailableError("LLM не вернула ответ")
+    breaker.record_success()
+    return response
@@ -36,3 +36,58 @@ def get_gemini_config() -> Dict[str, Any]:
     }
 
 
+
+def get_fio_cache_config() -> Dict[str, Any]:
+    """
+    Возвращает конфигурацию кэша вердиктов по ФИО.
+    
+    Returns:
+        Dict[str, Any]: Конфигурация кэша (path=None — только память)
+    """
+    return {
+        "path": CONFIG.get("FIO_CACHE_PATH"),
+        "ttl": CONFIG.get("FIO_CACHE_TTL", 30 * 24 * 3600.0),
+        "max_disk_entries": CONFIG.get("FIO_CACHE_MAX_ENTRIES", 1_000_000),
+        "memory_size": CONFIG.get("FIO_CACHE_MEMORY_SIZE", 10000),
+    }
+
+
+def get_fio_batch_config() -> Dict[str, Any]:
+    """
+    Возвращает конфигурацию пакетной проверки ФИО.
+    
+    Returns:
+        Dict[str, Any]: Размер пакета и интервал принудительной отправки
+    """
+    return {
+        "fio_batch_size": CONFIG.get("FIO_BATCH_SIZE", 20),
+        "fio_flush_interval": CONFIG.get("FIO_BATCH_FLUSH_INTERVAL", 0.05),
+    }
+
+
+def get_circuit_breaker_config() -> Dict[str, Any]:
+    """
+    Возвращает конфигурацию выключателя вокруг LLM-клиента.
+    
+    Returns:
+        Dict[str, Any]: Порог неудач подряд и пауза до пробного запроса
+    """
+    return {
+        "failure_threshold": CONFIG.get("LLM_BREAKER_FAILURES", 5),
+        "recovery_timeout": CONFIG.get("LLM_BREAKER_RECOVERY", 30.0),
+    }
+
+
+def get_replay_config() -> Dict[str, Any]:
+    """
+    Возвращает конфигурацию провайдера "replay" (запись и воспроизведение ответов).
+    
+    Returns:
+        Dict[str, Any]: Файл записей, режим, искусственная задержка и провайдер для записи
+    """
+    return {
+        "path": CONFIG.get("LLM_REPLAY_PATH"),
+        "mode": CONFIG.get("LLM_REPLAY_MODE", "replay"),
+        "latency": CONFIG.get("LLM_REPLAY_LATENCY", 0.0),
+        "upstream": CONFIG.get("LLM_REPLAY_UPSTREAM", "gemini"),
+    }
@@ -24,10 +24,22 @@ class LLMClient(ABC):
             generation_config: Конфигурация генерации (температура, токены и т.д.)
             
         Returns:
-            Optional[str]: Сгенерированный текст или None в случае ошибки
+            Optional[str]: Сгенерированный текст или None, если провайдер недоступен
+                (сеть, таймаут, 5xx/429 после повторов)
+
+        Raises:
+            LLMRequestError: Если провайдер отклонил запрос (4xx) или ответ не разобран
         """
         pass
     
+    @property
+    def model(self) -> str:
+        """
+        Идентификатор модели, с которой работает клиент.
+        Используется, например, в ключах кэша ответов.
+        """
+        return type(self).__name__
+    
     @abstractmethod
     def close(self) -> None:
         """
@@ -42,3 +54,54 @@ class LLMClient(ABC):
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Автоматическое закрытие при выходе из контекста."""
         self.close()
+
+
+class AsyncLLMClient(ABC):
+    """
+    Асинхронный вариант интерфейса LLMClient.
+    Позволяет держать сотни запросов в полёте в одном потоке событийного цикла.
+    """
+    
+    @abstractmethod
+    async def agenerate_content(
+        self, 
+        system_prompt: str, 
+        user_text: str, 
+        generation_config: Optional[Dict[str, Any]] = None
+    ) -> Optional[str]:
+        """
+        Асинхронно генерирует контент на основе системного промпта и пользовательского текста.
+        
+        Args:
+            system_prompt: Системный промпт для настройки поведения модели
+            user_text: Пользовательский текст для обработки
+            generation_config: Конфигурация генерации (температура, токены и т.д.)
+            
+        Returns:
+            Optional[str]: Сгенерированный текст или None, если провайдер недоступен
+                (сеть, таймаут, 5xx/429 после повторов)
+
+        Raises:
+            LLMRequestError: Если провайдер отклонил запрос (4xx) или ответ не разобран
+        """
+        pass
+    
+    @property
+    def model(self) -> str:
+        """Идентификатор модели, с которой работает клиент."""
+        return type(self).__name__
+    
+    @abstractmethod
+    async def aclose(self) -> None:
+        """
+        Закрывает соединения и освобождает ресурсы.
+        """
+        pass
+    
+    async def __aenter__(self):
+        """Поддержка асинхронного контекстного менеджера."""
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Автоматическое закрытие при выходе из контекста."""
+        await self.aclose()
@@ -0,0 +1,299 @@
+"""
+Клиентское ограничение нагрузки на LLM-провайдера.
+
+RateLimiter объединяет два token bucket (запросы в секунду и токены в минуту)
+и адаптивный лимит одновременных запросов по схеме AIMD: при 429/503 лимит
+уменьшается в разы и новые запросы ждут Retry-After, при успехах — растёт
+на единицу за «окно» успешных ответов. Один экземпляр разделяется всеми
+адаптерами процесса, поэтому всплеск нагрузки не превращается в шторм ретраев.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from app.config import CONFIG
+
+
+THROTTLE_STATUSES = frozenset({429, 503})
+
+
+def estimate_tokens(system_prompt: str, user_text: str, generation_config: Optional[Dict[str, Any]] = None) -> int:
+    """
+    Грубая оценка числа токенов запроса: ~3 символа кириллицы на токен плюс лимит ответа.
+    """
+    max_output = (generation_config or {}).get("maxOutputTokens", 0) or 0
+    return (len(system_prompt) + len(user_text)) // 3 + int(max_output) + 1
+
+
+class TokenBucket:
+    """
+    Token bucket с резервированием: запрос сразу списывает токены (баланс может
+    уйти в минус) и узнаёт, сколько ждать. Так ожидающие обслуживаются по очереди.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Args:
+            rate: Скорость пополнения, токенов в секунду
+            capacity: Ёмкость (допустимый всплеск)
+        """
+        if rate <= 0 or capacity <= 0:
+            raise ValueError("rate и capacity должны быть > 0")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+
+    def reserve(self, amount: float, now: float) -> float:
+        """Списывает amount токенов и возвращает задержку до их доступности, секунды."""
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        self._tokens -= min(amount, self.capacity)
+        return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+
+class RateSlot:
+    """
+    Разрешение на один HTTP-запрос. Адаптер сообщает в report() статус ответа,
+    чтобы лимитер подстроил параллелизм; слот освобождается при выходе из with.
+    """
+
+    def __init__(self, limiter: "RateLimiter"):
+        self._limiter = limiter
+        self._status: Optional[int] = None
+        self._retry_after: Optional[float] = None
+        self._released = False
+
+    def report(self, status: Optional[int], retry_after: Optional[float] = None) -> None:
+        """
+        Args:
+            status: HTTP-статус ответа (None — сетевая ошибка)
+            retry_after: Значение Retry-After в секундах, если было
+        """
+        self._status = status
+        self._retry_after = retry_after
+
+    def release(self) -> None:
+        if not self._released:
+            self._released = True
+            self._limiter._release(self._status, self._retry_after)
+
+    def __enter__(self) -> "RateSlot":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.release()
+
+    async def __aenter__(self) -> "RateSlot":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.release()
+
+
+class RateLimiter:
+    """
+    Общий ограничитель запросов: RPS, токены в минуту и AIMD-параллелизм.
+    Потокобезопасен; подходит и для потоков (acquire), и для asyncio (aacquire).
+    """
+
+    def __init__(
+        self,
+        *,
+        requests_per_second: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        initial_concurrency: int = 8,
+        min_concurrency: int = 1,
+        max_concurrency: int = 64,
+        decrease_factor: float = 0.5,
+        decrease_cooldown: float = 1.0,
+        default_backoff: float = 1.0,
+    ):
+        """
+        Args:
+            requests_per_second: Лимит запросов в секунду (None — без лимита)
+            tokens_per_minute: Лимит токенов в минуту (None — без лимита)
+            initial_concurrency: Начальный лимит одновременных запросов
+            min_concurrency: Нижняя граница лимита
+            max_concurrency: Верхняя граница лимита
+            decrease_factor: Во сколько раз уменьшать лимит при 429/503
+            decrease_cooldown: Не уменьшать лимит чаще, чем раз в столько секунд —
+                пачка 429 от уже отправленных запросов считается одним сигналом
+            default_backoff: Пауза после 429/503 без Retry-After, секунды
+        """
+        if not 1 <= min_concurrency <= initial_concurrency <= max_concurrency:
+            raise ValueError("Ожидается 1 <= min_concurrency <= initial_concurrency <= max_concurrency")
+        self._requests = (
+            TokenBucket(requests_per_second, max(1.0, requests_per_second)) if requests_per_second else None
+        )
+        self._tokens = (
+            TokenBucket(tokens_per_minute / 60.0, tokens_per_minute) if tokens_per_minute else None
+        )
+        self._limit = float(initial_concurrency)
+        self._min = min_concurrency
+        self._max = max_concurrency
+        self._decrease_factor = decrease_factor
+        self._decrease_cooldown = decrease_cooldown
+        self._default_backoff = default_backoff
+
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._waiting = 0
+        self._paused_until = 0.0
+        self._last_decrease = 0.0
+        self._throttled = 0
+        self._succeeded = 0
+
+    @property
+    def concurrency_limit(self) -> int:
+        return int(self._limit)
+
+    def acquire(self, tokens: int = 1) -> RateSlot:
+        """
+        Блокирует поток, пока запрос не уложится во все лимиты.
+
+        Args:
+            tokens: Оценка токенов запроса (см. estimate_tokens)
+
+        Returns:
+            RateSlot: Слот, который нужно освободить (with или release())
+        """
+        with self._cond:
+            self._waiting += 1
+            try:
+                while True:
+                    wait = self._admission_wait()
+                    if wait <= 0:
+                        break
+                    self._cond.wait(timeout=wait)
+                self._in_flight += 1
+                delay = self._reserve(tokens)
+            finally:
+                self._waiting -= 1
+        if delay > 0:
+            time.sleep(delay)
+        return RateSlot(self)
+
+    async def aacquire(self, tokens: int = 1) -> RateSlot:
+        """
+        Асинхронный вариант acquire: ждёт через asyncio.sleep, не блокируя цикл.
+        """
+        with self._cond:
+            self._waiting += 1
+        try:
+            while True:
+                with self._cond:
+                    wait = self._admission_wait()
+                    if wait <= 0:
+                        self._in_flight += 1
+                        delay = self._reserve(tokens)
+                        break
+                await asyncio.sleep(min(wait, 0.05))
+        finally:
+            with self._cond:
+                self._waiting -= 1
+        slot = RateSlot(self)
+        if delay > 0:
+            try:
+                await asyncio.sleep(delay)
+            except BaseException:
+                slot.release()
+                raise
+        return slot
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Текущие лимиты и очередь.
+
+        Returns:
+            Dict[str, Any]: лимит параллелизма, запросы в полёте, глубина очереди,
+            оставшаяся пауза после 429/503, счётчики успехов и троттлинга
+        """
+        with self._cond:
+            return {
+                "concurrency_limit": int(self._limit),
+                "in_flight": self._in_flight,
+                "queue_depth": self._waiting,
+                "paused_for": max(0.0, self._paused_until - time.monotonic()),
+                "requests_per_second": self._requests.rate if self._requests else None,
+                "tokens_per_minute": self._tokens.capacity if self._tokens else None,
+                "succeeded": self._succeeded,
+                "throttled": self._throttled,
+            }
+
+    def _admission_wait(self) -> float:
+        now = time.monotonic()
+        if now < self._paused_until:
+            return self._paused_until - now
+        if self._in_flight >= int(self._limit):
+            # Ждём освобождения слота; таймаут — страховка от потерянного notify
+            return 0.1
+        return 0.0
+
+    def _reserve(self, tokens: int) -> float:
+        now = time.monotonic()
+        delay = 0.0
+        if self._requests is not None:
+            delay = max(delay, self._requests.reserve(1, now))
+        if self._tokens is not None:
+            delay = max(delay, self._tokens.reserve(tokens, now))
+        return delay
+
+    def _release(self, status: Optional[int], retry_after: Optional[float]) -> None:
+        with self._cond:
+            self._in_flight -= 1
+            now = time.monotonic()
+            if status in THROTTLE_STATUSES:
+                self._throttled += 1
+                pause = retry_after if retry_after is not None else self._default_backoff
+                self._paused_until = max(self._paused_until, now + pause)
+                if now - self._last_decrease >= self._decrease_cooldown:
+                    self._last_decrease = now
+                    self._limit = max(float(self._min), self._limit * self._decrease_factor)
+            elif status is not None and status < 500:
+                self._succeeded += 1
+                # Аддитивный рост: +1 к лимиту за «окно» из limit успешных ответов
+                self._limit = min(float(self._max), self._limit + 1.0 / max(self._limit, 1.0))
+            self._cond.notify_all()
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After в секундах (формат HTTP-даты не поддерживается — вернётся None)."""
+    if value is None:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        return None
+    return max(0.0, seconds) if math.isfinite(seconds) else None
+
+
+_shared_limiter: Optional[RateLimiter] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_rate_limiter() -> RateLimiter:
+    """
+    Общий для процесса ограничитель, настроенный из конфигурации
+    (LLM_RPS, LLM_TPM, LLM_MAX_CONCURRENCY).
+
+    Returns:
+        RateLimiter: Глобальный экземпляр ограничителя
+    """
+    global _shared_limiter
+    if _shared_limiter is None:
+        with _shared_lock:
+            if _shared_limiter is None:
+                max_concurrency = CONFIG.get("LLM_MAX_CONCURRENCY") or 64
+                _shared_limiter = RateLimiter(
+                    requests_per_second=CONFIG.get("LLM_RPS"),
+                    tokens_per_minute=CONFIG.get("LLM_TPM"),
+                    initial_concurrency=min(16, max_concurrency),
+                    max_concurrency=max_concurrency,
+                )
+    return _shared_limiter
@@ -0,0 +1,117 @@
+"""
+Склейка одновременных одинаковых запросов (single-flight).
+
+Пока запрос по ключу в полёте, остальные вызовы с тем же ключом не идут
+в сеть, а ждут его результат. Работает и для потоков, и для asyncio.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Реестр запросов в полёте.
+
+    Потоки ждут общий concurrent.futures.Future, корутины — общую задачу
+    своего событийного цикла. Корутина, для ключа которой уже выполняется
+    синхронный запрос из другого потока, тоже ждёт его результат.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Future] = {}
+        self._tasks: Dict[Tuple[int, Hashable], asyncio.Task] = {}
+        self._executed = 0
+        self._coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """
+        Выполняет fn или ждёт результат уже выполняющегося вызова с тем же ключом.
+
+        Args:
+            key: Ключ запроса
+            fn: Функция, выполняющая запрос
+
+        Returns:
+            T: Результат fn (общий для всех склеенных вызовов)
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+                self._executed += 1
+            else:
+                self._coalesced += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    async def ado(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Асинхронный вариант do.
+
+        Args:
+            key: Ключ запроса
+            fn: Функция, возвращающая корутину запроса
+
+        Returns:
+            T: Результат корутины (общий для всех склеенных вызовов)
+        """
+        loop = asyncio.get_running_loop()
+        task_key = (id(loop), key)
+        with self._lock:
+            future = self._calls.get(key)
+            task = self._tasks.get(task_key)
+            if future is not None or task is not None:
+                self._coalesced += 1
+            else:
+                task = loop.create_task(fn())
+                self._tasks[task_key] = task
+                self._executed += 1
+                task.add_done_callback(lambda _: self._forget_task(task_key))
+
+        if future is not None:
+            return await asyncio.wrap_future(future)
+        # shield: отмена одного ожидающего не должна отменять запрос для остальных
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Счётчики склейки.
+
+        Returns:
+            Dict[str, Any]: выполненные запросы, склеенные вызовы и их доля
+        """
+        with self._lock:
+            total = self._executed + self._coalesced
+            return {
+                "executed": self._executed,
+                "coalesced": self._coalesced,
+                "coalesced_rate": self._coalesced / total if total else 0.0,
+                "in_flight": len(self._calls) + len(self._tasks),
+            }
+
+    def _forget_task(self, task_key: Tuple[int, Hashable]) -> None:
+        with self._lock:
+            self._tasks.pop(task_key, None)
@@ -0,0 +1,30 @@
+import threading
+from typing import Optional
+
+from app.config import CONFIG
+from .company_registry import CompanyRecord, CompanyRegistry, extract_inn, normalize_company
+
+__all__ = ["CompanyRecord", "CompanyRegistry", "extract_inn", "get_company_registry", "normalize_company"]
+
+
+_registry: Optional[CompanyRegistry] = None
+_registry_loaded = False
+_registry_lock = threading.Lock()
+
+
+def get_company_registry() -> Optional[CompanyRegistry]:
+    """
+    Возвращает реестр юрлиц, загружая его при первом обращении.
+    Путь берётся из COMPANY_REGISTRY_PATH; если он не задан — None.
+
+    Returns:
+        Optional[CompanyRegistry]: Глобальный экземпляр реестра
+    """
+    global _registry, _registry_loaded
+    if not _registry_loaded:
+        with _registry_lock:
+            if not _registry_loaded:
+                path = CONFIG.get("COMPANY_REGISTRY_PATH")
+                _registry = CompanyRegistry.from_file(path) if path else None
+                _registry_loaded = True
+    return _registry
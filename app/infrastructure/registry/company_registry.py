@@ -0,0 +1,262 @@
+"""
+Локальный реестр юридических лиц для проверки мест работы без внешних запросов.
+
+Реестр загружается из выгрузки (CSV или Parquet) один раз и держит два индекса:
+
+    - хэш-таблица нормализованное название → записи (одно название может
+      принадлежать нескольким организациям) и ИНН → запись: поиск — одно
+      обращение к dict;
+    - отсортированный список нормализованных названий для поиска по префиксу
+      (bisect, O(log n)).
+
+Название нормализуется так же, как названия из резюме: без организационно-
+правовой формы («ООО», «АО», «LLC»...), кавычек и пунктуации, в нижнем
+регистре, ё → е. «ООО "Ромашка"» и «Ромашка ООО» дают один ключ.
+"""
+
+from __future__ import annotations
+
+import csv
+import re
+import threading
+from bisect import bisect_left
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - зависит от окружения
+    pq = None
+
+
+_LEGAL_FORMS = frozenset({
+    "ооо", "оао", "зао", "пао", "нао", "ао", "ип", "фгуп", "гуп", "муп", "нко", "ано", "тоо",
+    "общество с ограниченной ответственностью", "акционерное общество",
+    "публичное акционерное общество", "индивидуальный предприниматель",
+    "llc", "ltd", "inc", "gmbh", "corp", "co", "plc",
+})
+_LONG_FORMS = sorted((form for form in _LEGAL_FORMS if " " in form), key=len, reverse=True)
+_NON_WORD = re.compile(r"[^\w]+")
+_INN = re.compile(r"инн\D{0,3}(\d{12}|\d{10})\b", re.IGNORECASE)
+
+# Обязательные и необязательные столбцы выгрузки
+_COLUMNS = ("inn", "name", "registered")
+_OPTIONAL_COLUMNS = ("liquidated",)
+
+
+def normalize_company(name: Optional[str]) -> str:
+    """
+    Ключ названия организации: без ОПФ, кавычек и пунктуации.
+
+    Args:
+        name: Название как в резюме или в реестре
+
+    Returns:
+        str: Нормализованное название ("" для пустого)
+    """
+    if not name:
+        return ""
+    text = name.lower().replace("ё", "е")
+    text = " ".join(_NON_WORD.sub(" ", text).split())
+    for form in _LONG_FORMS:
+        text = text.replace(form, " ")
+    return " ".join(word for word in text.split() if word not in _LEGAL_FORMS)
+
+
+def extract_inn(text: Optional[str]) -> Optional[str]:
+    """ИНН из свободного текста («ИНН 7707083893», «инн: 500100732259»)."""
+    if not text:
+        return None
+    match = _INN.search(text)
+    return match.group(1) if match else None
+
+
+class CompanyRecord:
+    """Запись реестра."""
+
+    __slots__ = ("inn", "name", "registered", "liquidated")
+
+    def __init__(self, inn: str, name: str, registered: Optional[date], liquidated: Optional[date] = None):
+        self.inn = inn
+        self.name = name
+        self.registered = registered
+        self.liquidated = liquidated
+
+    def __repr__(self) -> str:
+        return f"CompanyRecord(inn={self.inn!r}, name={self.name!r}, registered={self.registered})"
+
+
+class CompanyRegistry:
+    """
+    Использование:
+        registry = CompanyRegistry.from_file("egrul.csv")
+        registry.find("ООО «Ромашка»")           # [CompanyRecord, ...]
+        registry.by_inn("7707083893")
+        registry.prefix("ромаш", limit=5)
+    """
+
+    def __init__(self, records: Iterable[CompanyRecord]):
+        """
+        Args:
+            records: Записи реестра (ИНН уникален; повтор ИНН заменяет запись)
+        """
+        self._by_inn: Dict[str, CompanyRecord] = {}
+        for record in records:
+            self._by_inn[record.inn] = record
+
+        self._by_name: Dict[str, List[CompanyRecord]] = {}
+        for record in self._by_inn.values():
+            key = normalize_company(record.name)
+            if key:
+                self._by_name.setdefault(key, []).append(record)
+        self._names: List[str] = sorted(self._by_name)
+
+        self._lock = threading.Lock()
+        self._lookups = 0
+        self._found = 0
+
+    # -----------------------
+    # Загрузка
+    # -----------------------
+
+    @classmethod
+    def from_file(cls, path: str | Path) -> "CompanyRegistry":
+        """Загружает выгрузку: .parquet — через pyarrow, остальное — как CSV."""
+        if Path(path).suffix.lower() == ".parquet":
+            return cls.from_parquet(path)
+        return cls.from_csv(path)
+
+    @classmethod
+    def from_csv(cls, path: str | Path) -> "CompanyRegistry":
+        """
+        Загружает CSV с заголовком: inn, name, registered[, liquidated].
+        Даты — в формате ГГГГ-ММ-ДД, пустая ячейка — нет даты.
+
+        Args:
+            path: Путь к файлу (UTF-8, разделитель «,» или «;»)
+
+        Returns:
+            CompanyRegistry: Реестр
+        """
+        with open(path, encoding="utf-8", newline="") as f:
+            sample = f.read(4096)
+            f.seek(0)
+            delimiter = ";" if sample.count(";") > sample.count(",") else ","
+            reader = csv.DictReader(f, delimiter=delimiter)
+            _check_columns(path, reader.fieldnames or ())
+            return cls(_record(path, line_no, row) for line_no, row in enumerate(reader, 2))
+
+    @classmethod
+    def from_parquet(cls, path: str | Path) -> "CompanyRegistry":
+        """
+        Загружает Parquet со столбцами inn, name, registered[, liquidated].
+
+        Raises:
+            ImportError: Если не установлен pyarrow
+        """
+        if pq is None:
+            raise ImportError("Для чтения реестра в формате Parquet нужен пакет pyarrow")
+        table = pq.read_table(path)
+        _check_columns(path, table.column_names)
+        columns = [name for name in (*_COLUMNS, *_OPTIONAL_COLUMNS) if name in table.column_names]
+        return cls(_record(path, index, row) for index, row in enumerate(table.select(columns).to_pylist()))
+
+    # -----------------------
+    # Поиск
+    # -----------------------
+
+    def by_inn(self, inn: str) -> Optional[CompanyRecord]:
+        return self._by_inn.get(inn.strip())
+
+    def by_name(self, name: str) -> List[CompanyRecord]:
+        return self._by_name.get(normalize_company(name), [])
+
+    def find(self, company: Optional[str], company_info: Optional[str] = None) -> List[CompanyRecord]:
+        """
+        Записи для места работы из резюме: по ИНН, если он указан в названии
+        или в company_info, иначе по названию.
+
+        Args:
+            company: Название организации
+            company_info: Дополнительные сведения (город, сайт, ИНН)
+
+        Returns:
+            List[CompanyRecord]: Найденные записи (пустой список — организации нет в реестре)
+        """
+        inn = extract_inn(company) or extract_inn(company_info)
+        if inn is not None:
+            record = self._by_inn.get(inn)
+            found = [record] if record is not None else []
+        else:
+            found = self.by_name(company) if company else []
+        with self._lock:
+            self._lookups += 1
+            self._found += bool(found)
+        return found
+
+    def prefix(self, prefix: str, limit: int = 10) -> List[str]:
+        """
+        Нормализованные названия, начинающиеся с prefix (для подсказок и нечёткого ввода).
+
+        Args:
+            prefix: Начало названия (нормализуется)
+            limit: Максимум результатов
+
+        Returns:
+            List[str]: Названия по алфавиту
+        """
+        key = normalize_company(prefix)
+        if not key:
+            return []
+        result = []
+        index = bisect_left(self._names, key)
+        while index < len(self._names) and len(result) < limit and self._names[index].startswith(key):
+            result.append(self._names[index])
+            index += 1
+        return result
+
+    def __len__(self) -> int:
+        return len(self._by_inn)
+
+    def stats(self) -> Dict[str, float]:
+        """Размер индексов и доля найденных мест работы."""
+        with self._lock:
+            return {
+                "records": len(self._by_inn),
+                "names": len(self._names),
+                "lookups": self._lookups,
+                "found": self._found,
+                "found_rate": self._found / self._lookups if self._lookups else 0.0,
+            }
+
+
+def _check_columns(path, columns: Iterable[str]) -> None:
+    missing = [name for name in _COLUMNS if name not in set(columns)]
+    if missing:
+        raise ValueError(f"{path}: в реестре нет столбцов {', '.join(missing)}")
+
+
+def _record(path, line_no: int, row: dict) -> CompanyRecord:
+    inn = str(row["inn"] or "").strip()
+    if not inn:
+        raise ValueError(f"{path}:{line_no}: пустой ИНН")
+    try:
+        return CompanyRecord(
+            inn=inn,
+            name=str(row["name"] or "").strip(),
+            registered=_date(row["registered"]),
+            liquidated=_date(row.get("liquidated")),
+        )
+    except ValueError as e:
+        raise ValueError(f"{path}:{line_no}: {e}") from None
+
+
+def _date(value) -> Optional[date]:
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value).strip())
@@ -0,0 +1,4 @@
+from .duplicate_index import DuplicateIndex, DuplicateMatch
+from .minhash import LSHIndex, MinHasher, normalize_text, shingles
+
+__all__ = ["DuplicateIndex", "DuplicateMatch", "LSHIndex", "MinHasher", "normalize_text", "shingles"]
@@ -0,0 +1,372 @@
+"""
+Индекс почти одинаковых текстов для миллионов записей с сохранением на диск.
+
+В отличие от LSHIndex (словари множеств — удобно для небольших корпусов),
+здесь всё лежит в массивах numpy:
+
+    - сигнатуры MinHash — матрица uint32 (num_perm значений на запись);
+    - для каждой полосы LSH — отсортированный массив хэшей полосы и номеров
+      записей; кандидаты ищутся двоичным поиском (searchsorted), то есть
+      за O(log n) на полосу;
+    - свежие записи копятся в небольшом буфере-словаре и вливаются
+      в отсортированные массивы пачками, поэтому вставка тоже дешёвая.
+
+Каждая запись принадлежит владельцу (например, человеку из резюме). Владельцы,
+чьи тексты совпали, объединяются в кластер (система непересекающихся
+множеств): шаблон, размноженный на десятки резюме с разными ФИО, даёт один
+большой кластер.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .minhash import MinHasher
+
+
+_FORMAT_VERSION = 1
+_LOW_32 = np.uint64(0xFFFFFFFF)
+
+
+class DuplicateMatch:
+    """
+    Атрибуты:
+        matches: Похожие записи других владельцев — пары (владелец, сходство) по убыванию
+        cluster_size: Сколько владельцев в кластере этого владельца (1 — дубликатов нет)
+    """
+
+    __slots__ = ("matches", "cluster_size")
+
+    def __init__(self, matches: List[Tuple[str, float]], cluster_size: int):
+        self.matches = matches
+        self.cluster_size = cluster_size
+
+    @property
+    def duplicates(self) -> int:
+        """Сколько других владельцев в кластере."""
+        return self.cluster_size - 1
+
+    def __repr__(self) -> str:
+        return f"DuplicateMatch(matches={self.matches[:3]}, cluster_size={self.cluster_size})"
+
+
+class DuplicateIndex:
+    """
+    Использование:
+        index = DuplicateIndex.open("duplicates.npz")      # или DuplicateIndex()
+        match = index.add("Иванов Иван|1990-01-01", text)  # поиск и вставка
+        match.cluster_size
+        index.save("duplicates.npz")
+    """
+
+    def __init__(
+        self,
+        num_perm: int = 128,
+        bands: int = 16,
+        threshold: float = 0.8,
+        k: int = 5,
+        seed: int = 1,
+        merge_every: int = 4096,
+    ):
+        """
+        Args:
+            num_perm: Длина сигнатуры
+            bands: Число полос LSH (num_perm должно делиться на bands)
+            threshold: Минимальное оценённое сходство, чтобы считать тексты дубликатами
+            k: Длина символьной k-граммы
+            seed: Зерно хэш-функций (сохраняется вместе с индексом)
+            merge_every: Минимальный размер буфера свежих записей перед слиянием
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm должно делиться на bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.k = k
+        self.seed = seed
+        self._merge_every = merge_every
+        self._hasher = MinHasher(num_perm=num_perm, k=k, seed=seed)
+        self._mix = np.random.default_rng(seed + 1).integers(1, 2 ** 63, size=self.rows, dtype=np.uint64) | np.uint64(1)
+
+        self._size = 0
+        self._signatures = np.empty((1024, num_perm), dtype=np.uint32)
+        self._row_owner = np.empty(1024, dtype=np.int32)
+        self._keys: List[np.ndarray] = [np.empty(0, dtype=np.uint64) for _ in range(bands)]
+        self._ids: List[np.ndarray] = [np.empty(0, dtype=np.int32) for _ in range(bands)]
+        self._pending: List[Dict[int, List[int]]] = [{} for _ in range(bands)]
+        self._pending_rows: List[int] = []
+
+        self._owners: List[str] = []
+        self._owner_ids: Dict[str, int] = {}
+        self._parent: List[int] = []
+        self._cluster: List[int] = []
+
+        self._lock = threading.Lock()
+        self._queries = 0
+        self._matched = 0
+
+    # -----------------------
+    # Поиск и вставка
+    # -----------------------
+
+    def signature(self, text: str) -> np.ndarray:
+        """Сигнатура текста (uint32, num_perm значений)."""
+        return (self._hasher.signature(text) & _LOW_32).astype(np.uint32)
+
+    def add(self, owner: str, text: str) -> DuplicateMatch:
+        """
+        Ищет похожие тексты других владельцев и добавляет этот текст в индекс.
+
+        Текст с той же сигнатурой, что уже есть в индексе (повторная загрузка
+        или точная копия шаблона), новой записи не создаёт: владелец только
+        присоединяется к кластеру.
+
+        Args:
+            owner: Владелец текста
+            text: Текст
+
+        Returns:
+            DuplicateMatch: Найденные дубликаты и размер кластера владельца
+        """
+        signature = self.signature(text)
+        with self._lock:
+            owner_id = self._owner_id(owner)
+            rows, similarities = self._similar_rows(signature)
+            # Точная копия уже хранится: владелец попадает в кластер без новой записи,
+            # поэтому шаблон, размноженный на тысячи резюме, занимает одну строку индекса
+            if not (similarities == 1.0).any():
+                self._insert(signature, owner_id)
+            own = self._row_owner[rows] == owner_id
+            matches = self._matches(rows[~own], similarities[~own])
+            for other, _ in matches:
+                self._union(owner_id, self._owner_ids[other])
+            return DuplicateMatch(matches, self._cluster[self._find(owner_id)])
+
+    def query(self, text: str, owner: Optional[str] = None) -> DuplicateMatch:
+        """
+        Поиск без вставки.
+
+        Args:
+            text: Текст
+            owner: Владелец (его собственные записи не считаются дубликатами)
+
+        Returns:
+            DuplicateMatch: Найденные дубликаты; cluster_size — для известного владельца
+        """
+        signature = self.signature(text)
+        with self._lock:
+            rows, similarities = self._similar_rows(signature)
+            owner_id = self._owner_ids.get(owner) if owner is not None else None
+            if owner_id is not None:
+                foreign = self._row_owner[rows] != owner_id
+                rows, similarities = rows[foreign], similarities[foreign]
+            matches = self._matches(rows, similarities)
+            size = self._cluster[self._find(owner_id)] if owner_id is not None else len(matches) + 1
+            return DuplicateMatch(matches, size)
+
+    def cluster_size(self, owner: str) -> int:
+        """Размер кластера владельца (0 — владелец не встречался)."""
+        with self._lock:
+            owner_id = self._owner_ids.get(owner)
+            return 0 if owner_id is None else self._cluster[self._find(owner_id)]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def stats(self) -> Dict[str, float]:
+        """Размер индекса, число кластеров-дубликатов и доля запросов с совпадениями."""
+        with self._lock:
+            roots = {self._find(i) for i in range(len(self._owners))}
+            clusters = sum(1 for root in roots if self._cluster[root] > 1)
+            return {
+                "records": self._size,
+                "owners": len(self._owners),
+                "duplicate_clusters": clusters,
+                "pending": len(self._pending_rows),
+                "queries": self._queries,
+                "matched": self._matched,
+                "match_rate": self._matched / self._queries if self._queries else 0.0,
+                "nbytes": int(
+                    self._signatures[:self._size].nbytes
+                    + sum(keys.nbytes + ids.nbytes for keys, ids in zip(self._keys, self._ids))
+                ),
+            }
+
+    # -----------------------
+    # Сохранение
+    # -----------------------
+
+    def save(self, path: str) -> None:
+        """Сохраняет индекс в .npz (запись через временный файл — без полузаписанных файлов)."""
+        with self._lock:
+            roots = np.array([self._find(i) for i in range(len(self._owners))], dtype=np.int32)
+            owners = "\n".join(self._owners).encode("utf-8")
+            params = np.array([_FORMAT_VERSION, self.num_perm, self.bands, self.k, self.seed], dtype=np.int64)
+            tmp = f"{path}.tmp"
+            with open(tmp, "wb") as f:
+                np.savez(
+                    f,
+                    params=params,
+                    threshold=np.array([self.threshold]),
+                    signatures=self._signatures[:self._size],
+                    row_owner=self._row_owner[:self._size],
+                    owners=np.frombuffer(owners, dtype=np.uint8),
+                    roots=roots,
+                )
+            os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str, merge_every: int = 4096) -> "DuplicateIndex":
+        """
+        Загружает индекс, сохранённый save().
+
+        Raises:
+            ValueError: Если файл другой версии формата
+        """
+        with np.load(path, allow_pickle=False) as data:
+            version, num_perm, bands, k, seed = (int(v) for v in data["params"])
+            if version != _FORMAT_VERSION:
+                raise ValueError(f"{path}: неподдерживаемая версия индекса {version}")
+            index = cls(
+                num_perm=num_perm, bands=bands, threshold=float(data["threshold"][0]),
+                k=k, seed=seed, merge_every=merge_every,
+            )
+            signatures = data["signatures"]
+            row_owner = data["row_owner"]
+            owners = bytes(data["owners"]).decode("utf-8")
+            roots = data["roots"]
+
+        index._owners = owners.split("\n") if owners or len(roots) else []
+        index._owner_ids = {owner: i for i, owner in enumerate(index._owners)}
+        index._parent = roots.tolist()
+        index._cluster = [0] * len(roots)
+        for root in index._parent:
+            index._cluster[root] += 1
+        index._size = len(signatures)
+        index._signatures = np.array(signatures, dtype=np.uint32, copy=True).reshape(-1, num_perm)
+        index._row_owner = np.array(row_owner, dtype=np.int32, copy=True)
+        index._grow(max(index._size, 1024))
+
+        band_keys = index._band_keys(index._signatures[:index._size])
+        for band in range(bands):
+            order = np.argsort(band_keys[:, band], kind="stable")
+            index._keys[band] = band_keys[order, band]
+            index._ids[band] = order.astype(np.int32)
+        return index
+
+    @classmethod
+    def open(cls, path: Optional[str], **kwargs) -> "DuplicateIndex":
+        """Загружает индекс, если файл существует, иначе создаёт пустой."""
+        if path and os.path.exists(path):
+            return cls.load(path, merge_every=kwargs.get("merge_every", 4096))
+        return cls(**kwargs)
+
+    # -----------------------
+    # Внутреннее
+    # -----------------------
+
+    def _band_keys(self, signatures: np.ndarray) -> np.ndarray:
+        """Хэш каждой полосы: (n, bands) uint64 (умножение по модулю 2^64 — намеренно)."""
+        values = signatures.reshape(len(signatures), self.bands, self.rows).astype(np.uint64)
+        mixed = (values * self._mix).sum(axis=2, dtype=np.uint64)
+        return mixed ^ (mixed >> np.uint64(29))
+
+    def _similar_rows(self, signature: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        keys = self._band_keys(signature[None, :])[0]
+        candidates: List[np.ndarray] = []
+        for band in range(self.bands):
+            key = keys[band]
+            sorted_keys = self._keys[band]
+            left = np.searchsorted(sorted_keys, key, side="left")
+            right = np.searchsorted(sorted_keys, key, side="right")
+            if right > left:
+                candidates.append(self._ids[band][left:right])
+            pending = self._pending[band].get(int(key))
+            if pending:
+                candidates.append(np.array(pending, dtype=np.int32))
+        self._queries += 1
+        if not candidates:
+            return np.empty(0, dtype=np.int32), np.empty(0)
+        rows = np.unique(np.concatenate(candidates))
+        similarities = (self._signatures[rows] == signature).mean(axis=1)
+        keep = similarities >= self.threshold
+        return rows[keep], similarities[keep]
+
+    def _matches(self, rows: np.ndarray, similarities: np.ndarray) -> List[Tuple[str, float]]:
+        best: Dict[int, float] = {}
+        for owner_id, similarity in zip(self._row_owner[rows].tolist(), similarities.tolist()):
+            if similarity > best.get(owner_id, -1.0):
+                best[owner_id] = similarity
+        if best:
+            self._matched += 1
+        ordered = sorted(best.items(), key=lambda item: (-item[1], item[0]))
+        return [(self._owners[owner_id], similarity) for owner_id, similarity in ordered]
+
+    def _insert(self, signature: np.ndarray, owner_id: int) -> None:
+        if self._size == len(self._signatures):
+            self._grow(2 * self._size)
+        row = self._size
+        self._signatures[row] = signature
+        self._row_owner[row] = owner_id
+        self._size += 1
+        for band, key in enumerate(self._band_keys(signature[None, :])[0].tolist()):
+            self._pending[band].setdefault(key, []).append(row)
+        self._pending_rows.append(row)
+        # Буфер растёт вместе с индексом: слияние O(n) выполняется раз в n/8 вставок
+        if len(self._pending_rows) >= max(self._merge_every, self._size // 8):
+            self._merge()
+
+    def _merge(self) -> None:
+        rows = np.array(self._pending_rows, dtype=np.int32)
+        band_keys = self._band_keys(self._signatures[rows])
+        for band in range(self.bands):
+            order = np.argsort(band_keys[:, band], kind="stable")
+            new_keys, new_ids = band_keys[order, band], rows[order]
+            positions = np.searchsorted(self._keys[band], new_keys, side="right")
+            self._keys[band] = np.insert(self._keys[band], positions, new_keys)
+            self._ids[band] = np.insert(self._ids[band], positions, new_ids)
+            self._pending[band].clear()
+        self._pending_rows.clear()
+
+    def _grow(self, capacity: int) -> None:
+        signatures = np.empty((capacity, self.num_perm), dtype=np.uint32)
+        signatures[:self._size] = self._signatures[:self._size]
+        row_owner = np.empty(capacity, dtype=np.int32)
+        row_owner[:self._size] = self._row_owner[:self._size]
+        self._signatures, self._row_owner = signatures, row_owner
+
+    def _owner_id(self, owner: str) -> int:
+        owner_id = self._owner_ids.get(owner)
+        if owner_id is None:
+            if "\n" in owner:
+                raise ValueError("Ключ владельца не должен содержать перевод строки")
+            owner_id = len(self._owners)
+            self._owners.append(owner)
+            self._owner_ids[owner] = owner_id
+            self._parent.append(owner_id)
+            self._cluster.append(1)
+        return owner_id
+
+    def _find(self, owner_id: int) -> int:
+        parent = self._parent
+        root = owner_id
+        while parent[root] != root:
+            root = parent[root]
+        while parent[owner_id] != root:
+            parent[owner_id], owner_id = root, parent[owner_id]
+        return root
+
+    def _union(self, first: int, second: int) -> None:
+        a, b = self._find(first), self._find(second)
+        if a == b:
+            return
+        if self._cluster[a] < self._cluster[b]:
+            a, b = b, a
+        self._parent[b] = a
+        self._cluster[a] += self._cluster[b]
+
@@ -0,0 +1,186 @@
+"""
+MinHash-сигнатуры и LSH-индекс для поиска почти одинаковых текстов.
+
+Текст разбивается на символьные k-граммы (шинглы) нормализованного текста.
+Сигнатура — num_perm минимумов универсальных хэш-функций над шинглами;
+доля совпадающих позиций двух сигнатур оценивает коэффициент Жаккара
+множеств шинглов. LSH делит сигнатуру на bands полос: тексты, совпавшие
+хотя бы в одной полосе целиком, становятся кандидатами, и только для них
+сравниваются сигнатуры — поиск не перебирает весь корпус.
+
+Хэши шинглов — crc32, а коэффициенты хэш-функций задаются seed, поэтому
+сигнатуры воспроизводимы между процессами и их можно хранить на диске.
+"""
+
+from __future__ import annotations
+
+import re
+import zlib
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+
+_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_NON_WORD = re.compile(r"[^\w]+")
+
+
+def normalize_text(text: str) -> str:
+    """Нижний регистр, ё → е, пунктуация и повторные пробелы — один пробел."""
+    return " ".join(_NON_WORD.sub(" ", text.lower().replace("ё", "е")).split())
+
+
+def shingles(text: str, k: int = 5) -> np.ndarray:
+    """
+    Хэши уникальных символьных k-грамм нормализованного текста.
+
+    Args:
+        text: Текст
+        k: Длина k-граммы (текст короче k даёт один шингл — сам текст)
+
+    Returns:
+        np.ndarray: Хэши uint64 (пустой массив для пустого текста)
+    """
+    text = normalize_text(text)
+    if not text:
+        return np.empty(0, dtype=np.uint64)
+    grams = {text[i:i + k] for i in range(max(len(text) - k + 1, 1))}
+    return np.fromiter((zlib.crc32(g.encode("utf-8")) for g in grams), dtype=np.uint64, count=len(grams))
+
+
+class MinHasher:
+    """
+    Использование:
+        hasher = MinHasher(num_perm=128)
+        a, b = hasher.signature(text_a), hasher.signature(text_b)
+        MinHasher.similarity(a, b)          # ≈ коэффициент Жаккара
+    """
+
+    def __init__(self, num_perm: int = 128, k: int = 5, seed: int = 1):
+        """
+        Args:
+            num_perm: Длина сигнатуры (точность оценки ~ 1/sqrt(num_perm))
+            k: Длина символьной k-граммы
+            seed: Зерно коэффициентов (сигнатуры сравнимы только при одинаковом seed)
+        """
+        if num_perm < 1 or k < 1:
+            raise ValueError("num_perm и k должны быть >= 1")
+        rng = np.random.default_rng(seed)
+        # a, b < 2^32 и хэш < 2^32: произведение помещается в uint64 без переполнения
+        self._a = rng.integers(1, int(_MAX_HASH), size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, int(_MAX_HASH), size=num_perm, dtype=np.uint64)
+        self.num_perm = num_perm
+        self.k = k
+        self.seed = seed
+
+    def signature(self, text: str) -> np.ndarray:
+        """
+        Сигнатура текста.
+
+        Returns:
+            np.ndarray: num_perm значений uint64 (для пустого текста — все максимальные)
+        """
+        hashes = shingles(text, self.k)
+        if not hashes.size:
+            return np.full(self.num_perm, _PRIME, dtype=np.uint64)
+        values = (self._a[:, None] * hashes[None, :] % _PRIME + self._b[:, None]) % _PRIME
+        return values.min(axis=1)
+
+    @staticmethod
+    def similarity(first: np.ndarray, second: np.ndarray) -> float:
+        """Оценка коэффициента Жаккара по двум сигнатурам."""
+        return float(np.count_nonzero(first == second)) / len(first)
+
+
+class LSHIndex:
+    """
+    Индекс сигнатур с поиском похожих через полосы (banding).
+
+    Порог, с которого пара почти наверняка становится кандидатом, примерно
+    (1 / bands) ** (1 / rows); итоговое решение принимается по оценке
+    сходства сигнатур (threshold).
+    """
+
+    def __init__(self, num_perm: int = 128, bands: int = 16, threshold: float = 0.8):
+        """
+        Args:
+            num_perm: Длина сигнатур
+            bands: Число полос (num_perm должно делиться на bands)
+            threshold: Минимальное оценённое сходство для query
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm должно делиться на bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self._buckets: List[Dict[bytes, Set[Hashable]]] = [{} for _ in range(bands)]
+        self._signatures: Dict[Hashable, np.ndarray] = {}
+
+    def _band_keys(self, signature: np.ndarray) -> Iterable[Tuple[int, bytes]]:
+        rows = self.rows
+        for band in range(self.bands):
+            yield band, signature[band * rows:(band + 1) * rows].tobytes()
+
+    def insert(self, key: Hashable, signature: np.ndarray) -> None:
+        """Добавляет (или заменяет) сигнатуру под ключом key."""
+        if len(signature) != self.num_perm:
+            raise ValueError(f"Ожидается сигнатура длины {self.num_perm}, получено {len(signature)}")
+        if key in self._signatures:
+            self.remove(key)
+        self._signatures[key] = signature
+        for band, band_key in self._band_keys(signature):
+            self._buckets[band].setdefault(band_key, set()).add(key)
+
+    def remove(self, key: Hashable) -> None:
+        signature = self._signatures.pop(key, None)
+        if signature is None:
+            return
+        for band, band_key in self._band_keys(signature):
+            bucket = self._buckets[band].get(band_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band][band_key]
+
+    def candidates(self, signature: np.ndarray) -> Set[Hashable]:
+        """Ключи, совпавшие с сигнатурой хотя бы в одной полосе."""
+        found: Set[Hashable] = set()
+        for band, band_key in self._band_keys(signature):
+            bucket = self._buckets[band].get(band_key)
+            if bucket:
+                found |= bucket
+        return found
+
+    def query(self, signature: np.ndarray, threshold: Optional[float] = None) -> List[Tuple[Hashable, float]]:
+        """
+        Похожие сигнатуры индекса.
+
+        Args:
+            signature: Сигнатура запроса
+            threshold: Порог сходства (по умолчанию — порог индекса)
+
+        Returns:
+            List[Tuple[Hashable, float]]: (ключ, сходство) по убыванию сходства
+        """
+        threshold = self.threshold if threshold is None else threshold
+        result = []
+        for key in self.candidates(signature):
+            similarity = MinHasher.similarity(signature, self._signatures[key])
+            if similarity >= threshold:
+                result.append((key, similarity))
+        result.sort(key=lambda item: item[1], reverse=True)
+        return result
+
+    def signature(self, key: Hashable) -> Optional[np.ndarray]:
+        return self._signatures.get(key)
+
+    def keys(self) -> List[Hashable]:
+        return list(self._signatures)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._signatures
+
+    def __len__(self) -> int:
+        return len(self._signatures)
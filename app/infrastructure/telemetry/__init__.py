@@ -0,0 +1,68 @@
+"""
+Замеры длительности этапов скоринга: span'ы и их приёмники.
+
+По умолчанию выключены. Включаются set_sink(...) в коде или переменной
+окружения TELEMETRY_SINKS (через запятую: prometheus, otlp) при запуске
+python -m app, см. configure_telemetry.
+"""
+
+import atexit
+from typing import List, Optional
+
+from app.config import CONFIG
+from app.infrastructure.telemetry.sinks import (
+    FanoutSink,
+    MemorySink,
+    OTLPJsonlExporter,
+    PrometheusSink,
+    SpanRecord,
+    SpanSink,
+)
+from app.infrastructure.telemetry.spans import Span, enabled, get_sink, set_sink, span
+
+
+def configure_telemetry(sinks: Optional[str] = None) -> Optional[SpanSink]:
+    """
+    Включает замеры по конфигурации; приёмники закрываются (и сбрасывают
+    данные в файлы) при завершении процесса.
+
+    Args:
+        sinks: Список приёмников через запятую (None — TELEMETRY_SINKS из конфигурации)
+
+    Returns:
+        Optional[SpanSink]: Установленный приёмник (None — замеры выключены)
+
+    Raises:
+        ValueError: Если указан неизвестный приёмник
+    """
+    names = [n.strip() for n in (sinks if sinks is not None else CONFIG.get("TELEMETRY_SINKS") or "").split(",")]
+    created: List[SpanSink] = []
+    for name in filter(None, names):
+        if name == "prometheus":
+            created.append(PrometheusSink(path=CONFIG.get("TELEMETRY_PROMETHEUS_PATH", "wolfeye.prom")))
+        elif name == "otlp":
+            created.append(OTLPJsonlExporter(CONFIG.get("TELEMETRY_OTLP_PATH", "wolfeye-spans.jsonl")))
+        else:
+            raise ValueError(f"Неизвестный приёмник span'ов: {name}")
+    if not created:
+        return None
+    sink = created[0] if len(created) == 1 else FanoutSink(created)
+    set_sink(sink)
+    atexit.register(sink.close)
+    return sink
+
+
+__all__ = [
+    "FanoutSink",
+    "MemorySink",
+    "OTLPJsonlExporter",
+    "PrometheusSink",
+    "Span",
+    "SpanRecord",
+    "SpanSink",
+    "configure_telemetry",
+    "enabled",
+    "get_sink",
+    "set_sink",
+    "span",
+]
@@ -0,0 +1,277 @@
+"""
+Приёмники span'ов.
+
+    MemorySink         — список записей в памяти (тесты, отладка)
+    PrometheusSink     — гистограммы длительностей в текстовом формате Prometheus
+    OTLPJsonlExporter  — span'ы построчно в JSON по схеме OTLP (resourceSpans)
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Optional, Sequence, TextIO, Tuple
+
+
+class SpanRecord:
+    """Завершённый span."""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "start_ns", "duration", "attributes")
+
+    def __init__(
+        self,
+        *,
+        name: str,
+        trace_id: str,
+        span_id: str,
+        parent_id: Optional[str],
+        start_ns: int,
+        duration: float,
+        attributes: Dict[str, Any],
+    ):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.start_ns = start_ns
+        self.duration = duration
+        self.attributes = attributes
+
+    def __repr__(self) -> str:
+        return f"SpanRecord({self.name!r}, {self.duration * 1e3:.3f}ms, {self.attributes!r})"
+
+
+class SpanSink(ABC):
+    """Интерфейс приёмника; record вызывается из любых потоков."""
+
+    @abstractmethod
+    def record(self, span: SpanRecord) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class MemorySink(SpanSink):
+    """Последние max_spans span'ов в памяти."""
+
+    def __init__(self, max_spans: int = 100_000):
+        self._spans: Deque[SpanRecord] = deque(maxlen=max_spans)
+
+    def record(self, span: SpanRecord) -> None:
+        self._spans.append(span)        # deque.append потокобезопасен
+
+    @property
+    def spans(self) -> List[SpanRecord]:
+        return list(self._spans)
+
+    def by_name(self, name: str) -> List[SpanRecord]:
+        return [s for s in self._spans if s.name == name]
+
+    def clear(self) -> None:
+        self._spans.clear()
+
+
+# Границы корзин, секунды: от 100 мкс (правила) до 30 с (LLM с ретраями)
+DEFAULT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class PrometheusSink(SpanSink):
+    """
+    Гистограмма длительностей по имени span'а и выбранным атрибутам.
+
+    В метки попадают только атрибуты из label_keys — остальные (номер
+    попытки, размер пакета) дали бы неограниченное число рядов.
+    """
+
+    def __init__(
+        self,
+        *,
+        metric: str = "wolfeye_span_duration_seconds",
+        label_keys: Sequence[str] = ("status", "provider", "error", "degraded"),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        path: Optional[str] = None,
+    ):
+        """
+        Args:
+            metric: Имя метрики
+            label_keys: Атрибуты, выносимые в метки
+            buckets: Верхние границы корзин, секунды (по возрастанию)
+            path: Файл, куда записать метрики при close() (None — не записывать)
+        """
+        if list(buckets) != sorted(buckets):
+            raise ValueError("Границы корзин должны идти по возрастанию")
+        self._metric = metric
+        self._path = path
+        self._label_keys = tuple(label_keys)
+        self._buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        # метки -> [счётчики по корзинам..., сумма, количество]
+        self._series: Dict[Tuple[Tuple[str, str], ...], List[float]] = {}
+
+    def record(self, span: SpanRecord) -> None:
+        labels = (("span", span.name),) + tuple(
+            (key, str(span.attributes[key])) for key in self._label_keys if key in span.attributes
+        )
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0.0] * (len(self._buckets) + 2)
+            for i, bound in enumerate(self._buckets):
+                if span.duration <= bound:
+                    series[i] += 1
+                    break
+            series[-2] += span.duration
+            series[-1] += 1
+
+    def render(self) -> str:
+        """Текущее состояние в текстовом формате экспозиции Prometheus."""
+        with self._lock:
+            snapshot = {labels: list(values) for labels, values in sorted(self._series.items())}
+        lines = [
+            f"# HELP {self._metric} Длительность этапов скоринга",
+            f"# TYPE {self._metric} histogram",
+        ]
+        for labels, values in snapshot.items():
+            cumulative = 0.0
+            for bound, count in zip(self._buckets, values):
+                cumulative += count
+                lines.append(f"{self._metric}_bucket{_labels(labels, le=_format_bound(bound))} {cumulative:g}")
+            lines.append(f"{self._metric}_bucket{_labels(labels, le='+Inf')} {values[-1]:g}")
+            lines.append(f"{self._metric}_sum{_labels(labels)} {values[-2]!r}")
+            lines.append(f"{self._metric}_count{_labels(labels)} {values[-1]:g}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str) -> None:
+        """Атомарно записывает render() в файл (для node_exporter textfile collector)."""
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(self.render())
+        os.replace(tmp, path)
+
+    def close(self) -> None:
+        if self._path is not None:
+            self.write(self._path)
+
+
+class OTLPJsonlExporter(SpanSink):
+    """
+    Span'ы в файл JSONL: каждая строка — пакет в формате OTLP/JSON
+    ({"resourceSpans": [...]}), который принимает OpenTelemetry Collector
+    (receiver otlpjsonfile). Пишется пакетами по batch_size span'ов.
+    """
+
+    def __init__(self, path: str, *, service_name: str = "wolfeye", batch_size: int = 512):
+        """
+        Args:
+            path: Файл (дописывается)
+            service_name: Значение service.name в ресурсе
+            batch_size: Сколько span'ов копить перед записью
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size должен быть >= 1")
+        self._service_name = service_name
+        self._batch_size = batch_size
+        self._lock = threading.Lock()
+        self._pending: List[SpanRecord] = []
+        self._file: Optional[TextIO] = open(path, "a", encoding="utf-8")
+
+    def record(self, span: SpanRecord) -> None:
+        with self._lock:
+            self._pending.append(span)
+            if len(self._pending) >= self._batch_size:
+                self._flush_locked()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush_locked()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _flush_locked(self) -> None:
+        if not self._pending or self._file is None:
+            return
+        batch = {
+            "resourceSpans": [{
+                "resource": {"attributes": _otlp_attributes({"service.name": self._service_name})},
+                "scopeSpans": [{
+                    "scope": {"name": "wolfeye"},
+                    "spans": [_otlp_span(s) for s in self._pending],
+                }],
+            }]
+        }
+        self._file.write(json.dumps(batch, ensure_ascii=False, separators=(",", ":")) + "\n")
+        self._file.flush()
+        self._pending.clear()
+
+
+class FanoutSink(SpanSink):
+    """Передаёт span'ы нескольким приёмникам."""
+
+    def __init__(self, sinks: Iterable[SpanSink]):
+        self._sinks = tuple(sinks)
+
+    @property
+    def sinks(self) -> Tuple[SpanSink, ...]:
+        return self._sinks
+
+    def record(self, span: SpanRecord) -> None:
+        for sink in self._sinks:
+            sink.record(span)
+
+    def close(self) -> None:
+        for sink in self._sinks:
+            sink.close()
+
+
+def _labels(labels: Tuple[Tuple[str, str], ...], **extra: str) -> str:
+    items = list(labels) + list(extra.items())
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in items) + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_bound(bound: float) -> str:
+    return f"{bound:g}"
+
+
+def _otlp_span(span: SpanRecord) -> Dict[str, Any]:
+    data: Dict[str, Any] = {
+        "traceId": span.trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        "kind": 1,                                  # SPAN_KIND_INTERNAL
+        "startTimeUnixNano": str(span.start_ns),
+        "endTimeUnixNano": str(span.start_ns + int(span.duration * 1e9)),
+        "attributes": _otlp_attributes(span.attributes),
+    }
+    if span.parent_id is not None:
+        data["parentSpanId"] = span.parent_id
+    if "error" in span.attributes:
+        data["status"] = {"code": 2, "message": str(span.attributes["error"])}
+    return data
+
+
+def _otlp_attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    result = []
+    for key, value in attributes.items():
+        if isinstance(value, bool):
+            typed = {"boolValue": value}
+        elif isinstance(value, int):
+            typed = {"intValue": str(value)}
+        elif isinstance(value, float):
+            typed = {"doubleValue": value}
+        else:
+            typed = {"stringValue": str(value)}
+        result.append({"key": key, "value": typed})
+    return result
@@ -0,0 +1,143 @@
+"""
+Замеры длительности этапов (span'ы).
+
+    with span("core.fio"):
+        ...
+    with span("llm.http", attempt=1) as s:
+        resp = session.post(...)
+        s.set("status", resp.status_code)
+
+Пока приёмник не задан (set_sink), span() возвращает общий пустой объект:
+ни часов, ни выделения памяти, только одна проверка глобальной переменной.
+С приёмником span'ы образуют дерево (родитель берётся из contextvars, так
+что вложенность сохраняется и в потоках пула, и в asyncio-задачах) и по
+завершении передаются приёмнику.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
+from app.infrastructure.telemetry.sinks import SpanRecord, SpanSink
+
+
+_sink: Optional[SpanSink] = None
+_sink_lock = threading.Lock()
+_current: ContextVar[Optional["Span"]] = ContextVar("wolfeye_span", default=None)
+
+
+class _NoopSpan:
+    """Заглушка на случай выключенных замеров."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        return None
+
+    def set(self, key: str, value: Any) -> None:
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+class Span:
+    """Активный замер; передаётся приёмнику при выходе из with."""
+
+    __slots__ = ("name", "attributes", "trace_id", "span_id", "parent_id", "_sink", "_start_ns", "_start", "_token")
+
+    def __init__(self, name: str, attributes: Dict[str, Any], sink: SpanSink):
+        self.name = name
+        self.attributes = attributes
+        self._sink = sink
+        self.span_id = _new_id(8)
+        self.parent_id: Optional[str] = None
+        self.trace_id: Optional[str] = None
+
+    def __enter__(self) -> "Span":
+        parent = _current.get()
+        if parent is None:
+            self.trace_id = _new_id(16)
+        else:
+            self.trace_id, self.parent_id = parent.trace_id, parent.span_id
+        self._token = _current.set(self)
+        self._start_ns = time.time_ns()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        duration = time.perf_counter() - self._start
+        _current.reset(self._token)
+        if exc_type is not None:
+            self.attributes["error"] = exc_type.__name__
+        try:
+            self._sink.record(SpanRecord(
+                name=self.name,
+                trace_id=self.trace_id,
+                span_id=self.span_id,
+                parent_id=self.parent_id,
+                start_ns=self._start_ns,
+                duration=duration,
+                attributes=self.attributes,
+            ))
+        except Exception:
+            # Сбой приёмника не должен ломать скоринг
+            pass
+
+    def set(self, key: str, value: Any) -> None:
+        """Добавляет атрибут (например, HTTP-статус, известный только после вызова)."""
+        self.attributes[key] = value
+
+
+def span(name: str, **attributes: Any):
+    """
+    Замер этапа name. Использовать как контекстный менеджер.
+
+    Args:
+        name: Имя этапа ("core.fio", "llm.http", "llm.parse", ...)
+        **attributes: Атрибуты span'а
+
+    Returns:
+        Span или пустая заглушка, если замеры выключены
+    """
+    sink = _sink
+    if sink is None:
+        return _NOOP
+    return Span(name, attributes, sink)
+
+
+def enabled() -> bool:
+    """Включены ли замеры (задан ли приёмник)."""
+    return _sink is not None
+
+
+def get_sink() -> Optional[SpanSink]:
+    return _sink
+
+
+def set_sink(sink: Optional[SpanSink]) -> Optional[SpanSink]:
+    """
+    Задаёт приёмник span'ов (None — выключить замеры).
+    Прежний приёмник не закрывается.
+
+    Args:
+        sink: Новый приёмник
+
+    Returns:
+        Optional[SpanSink]: Прежний приёмник
+    """
+    global _sink
+    with _sink_lock:
+        previous, _sink = _sink, sink
+    return previous
+
+
+def _new_id(size: int) -> str:
+    return os.urandom(size).hex()
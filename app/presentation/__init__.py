@@ -0,0 +1,3 @@
+"""
+Внешние интерфейсы: HTTP API скоринга.
+"""
@@ -0,0 +1,148 @@
+"""
+HTTP API скоринга (FastAPI).
+
+    POST /score         — Rezume в JSON → ScoreResult (reused — компоненты,
+                          взятые из кэша без пересчёта)
+    POST /score/batch   — список Rezume → {"results": [ScoreResult, ...]}
+    GET  /health        — состояние выключателя LLM и очереди
+    GET  /metrics       — span'ы в формате Prometheus (если включён PrometheusSink)
+
+Все запросы проходят через общую очередь BatchScorer: близкие по времени
+резюме скорятся одним пакетом, а проверки ФИО группируются в пакетные
+запросы к LLM. Переполненная очередь — ответ 503 с Retry-After.
+
+Запуск: python -m app serve --port 8000
+"""
+
+from __future__ import annotations
+
+from contextlib import asynccontextmanager
+from typing import List, Optional
+
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import PlainTextResponse
+from pydantic import BaseModel
+
+from app.application.batch_scorer import BatchScorer, QueueFullError
+from app.application.core import CoreML
+from app.application.incremental import ComponentStore
+from app.application.services.duplicates import DuplicateDetector, get_duplicate_detector
+from app.config import CONFIG
+from app.domain.models import Rezume, ScoreResult
+from app.infrastructure.telemetry import FanoutSink, PrometheusSink, get_sink
+
+
+class BatchResponse(BaseModel):
+    results: List[ScoreResult]
+
+
+class HealthResponse(BaseModel):
+    # "ok" — LLM доступна, "degraded" — выключатель не замкнут, ФИО оцениваются локально
+    status: str
+    circuit: Optional[dict] = None
+    queue: dict
+
+
+def create_app(
+    core: Optional[CoreML] = None,
+    *,
+    workers: Optional[int] = None,
+    max_batch: Optional[int] = None,
+    max_wait: Optional[float] = None,
+    queue_size: Optional[int] = None,
+    max_request_items: Optional[int] = None,
+) -> FastAPI:
+    """
+    Создаёт приложение; параметры по умолчанию берутся из конфигурации (SERVICE_*).
+
+    Args:
+        core: Экземпляр CoreML (по умолчанию — с пакетной проверкой ФИО по FIO_BATCH_SIZE
+            и кэшем компонентов на SERVICE_COMPONENT_CACHE_SIZE значений; при SERVICE_DUPLICATES —
+            с индексом дубликатов, который сохраняется в DUPLICATE_INDEX_PATH при остановке)
+        workers: Сколько микропакетов обрабатывать одновременно
+        max_batch: Максимальный размер микропакета
+        max_wait: Ожидание добора микропакета, секунды
+        queue_size: Ёмкость очереди резюме
+        max_request_items: Максимум резюме в одном запросе /score/batch
+
+    Returns:
+        FastAPI: Приложение (очередь запускается в lifespan)
+    """
+    max_batch = max_batch or CONFIG.get("SERVICE_MAX_BATCH", 32)
+    max_request_items = max_request_items or CONFIG.get("SERVICE_MAX_REQUEST_ITEMS", 1000)
+    detector: Optional[DuplicateDetector] = None
+    if core is None:
+        if CONFIG.get("SERVICE_DUPLICATES"):
+            detector = get_duplicate_detector()
+        cache_size = CONFIG.get("SERVICE_COMPONENT_CACHE_SIZE", 100_000)
+        core = CoreML(
+            max_in_flight=CONFIG.get("SERVICE_MAX_IN_FLIGHT", 16),
+            chunk_size=max_batch,
+            fio_batch_size=CONFIG.get("FIO_BATCH_SIZE", 20),
+            component_store=ComponentStore(cache_size) if cache_size > 0 else None,
+            duplicates=detector,
+        )
+    scorer = BatchScorer(
+        core,
+        workers=workers or CONFIG.get("SERVICE_WORKERS", 4),
+        max_batch=max_batch,
+        max_wait=max_wait if max_wait is not None else CONFIG.get("SERVICE_MAX_WAIT", 0.005),
+        queue_size=queue_size or CONFIG.get("SERVICE_QUEUE_SIZE", 1024),
+    )
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        await scorer.start()
+        try:
+            yield
+        finally:
+            await scorer.stop()
+            index_path = CONFIG.get("DUPLICATE_INDEX_PATH")
+            if detector is not None and index_path:
+                detector.save(index_path)
+
+    app = FastAPI(title="WolfEye", lifespan=lifespan)
+    app.state.core = core
+    app.state.scorer = scorer
+
+    @app.post("/score", response_model=ScoreResult)
+    async def score(rezume: Rezume) -> ScoreResult:
+        try:
+            return await scorer.score(rezume)
+        except QueueFullError:
+            raise _overloaded()
+
+    @app.post("/score/batch", response_model=BatchResponse)
+    async def score_batch(rezumes: List[Rezume]) -> BatchResponse:
+        if len(rezumes) > max_request_items:
+            raise HTTPException(status_code=413, detail=f"Не больше {max_request_items} резюме в запросе")
+        try:
+            return BatchResponse(results=await scorer.score_many(rezumes) if rezumes else [])
+        except QueueFullError:
+            raise _overloaded()
+
+    @app.get("/health", response_model=HealthResponse)
+    async def health() -> HealthResponse:
+        breaker = core.llm.breaker
+        circuit = breaker.stats() if breaker is not None else None
+        status = "ok" if circuit is None or circuit["state"] == "closed" else "degraded"
+        return HealthResponse(status=status, circuit=circuit, queue=scorer.stats())
+
+    @app.get("/metrics", response_class=PlainTextResponse)
+    async def metrics() -> str:
+        sink = _prometheus_sink()
+        if sink is None:
+            raise HTTPException(status_code=404, detail="PrometheusSink не включён (TELEMETRY_SINKS=prometheus)")
+        return sink.render()
+
+    return app
+
+
+def _overloaded() -> HTTPException:
+    return HTTPException(status_code=503, detail="Очередь скоринга заполнена", headers={"Retry-After": "1"})
+
+
+def _prometheus_sink() -> Optional[PrometheusSink]:
+    sink = get_sink()
+    candidates = sink.sinks if isinstance(sink, FanoutSink) else (sink,)
+    return next((s for s in candidates if isinstance(s, PrometheusSink)), None)
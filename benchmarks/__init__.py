@@ -0,0 +1,26 @@
+"""
+Бенчмарки конвейера скоринга (запуск: python -m benchmarks).
+
+LLM-провайдер подменяется локальным StubLLMServer с настраиваемой
+задержкой и долей ошибок; результаты можно сохранить как эталон и
+сравнивать с ним перед выкладкой.
+"""
+
+from benchmarks.harness import BenchResult, compare, load_baseline, measure, save_baseline
+from benchmarks.stub_server import StubLLMServer
+from benchmarks.suite import BENCHMARKS, BenchContext, Case, benchmark, make_rezumes, run_benchmarks
+
+__all__ = [
+    "BENCHMARKS",
+    "BenchContext",
+    "BenchResult",
+    "Case",
+    "StubLLMServer",
+    "benchmark",
+    "compare",
+    "load_baseline",
+    "make_rezumes",
+    "measure",
+    "run_benchmarks",
+    "save_baseline",
+]
@@ -0,0 +1,74 @@
+"""
+Запуск бенчмарков.
+
+    python -m benchmarks                              # все замеры, таблица
+    python -m benchmarks -k services. --runs 50       # только сервисы
+    python -m benchmarks --save-baseline benchmarks/baseline.json
+    python -m benchmarks --compare benchmarks/baseline.json --tolerance 0.3
+
+С --compare код возврата 1, если есть регрессии относительно эталона.
+"""
+
+import argparse
+import json
+import sys
+from typing import List, Optional
+
+from benchmarks.harness import compare, format_table, load_baseline, save_baseline
+from benchmarks.stub_server import StubLLMServer
+from benchmarks.suite import BENCHMARKS, BenchContext, run_benchmarks
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Бенчмарки скоринга WolfEye")
+    parser.add_argument("-k", "--filter", action="append", default=[], help="Подстрока имени замера (можно несколько)")
+    parser.add_argument("--list", action="store_true", help="Показать имена замеров и выйти")
+    parser.add_argument("--runs", type=int, default=20, help="Вызовов на замер по умолчанию")
+    parser.add_argument("--size", type=int, default=200, help="Резюме в пакете")
+    parser.add_argument("--seed", type=int, default=0, help="Зерно генератора данных")
+    parser.add_argument("--latency", type=float, default=0.002, help="Задержка stub LLM, секунды")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Случайная добавка к задержке, секунды")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Доля ошибочных ответов stub LLM")
+    parser.add_argument("--json", dest="json_output", help="Записать результаты в JSON")
+    parser.add_argument("--save-baseline", help="Сохранить результаты как эталон")
+    parser.add_argument("--compare", help="Сравнить с эталоном")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Допустимое ухудшение (0.25 — 25%%)")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    names = [n for n in BENCHMARKS if not args.filter or any(f in n for f in args.filter)]
+    if args.list:
+        print("\n".join(names))
+        return 0
+    if not names:
+        print("Нет замеров, подходящих под фильтр", file=sys.stderr)
+        return 2
+
+    baseline = load_baseline(args.compare) if args.compare else None
+    with StubLLMServer(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate, seed=args.seed) as stub:
+        ctx = BenchContext(stub, size=args.size, runs=args.runs, seed=args.seed)
+        results = run_benchmarks(
+            ctx, names, progress=lambda r: print(f"  {r.name}: {r.throughput:.1f}/s", file=sys.stderr)
+        )
+
+    print(format_table(results, baseline))
+    if args.json_output:
+        with open(args.json_output, "w", encoding="utf-8") as f:
+            json.dump({name: r.to_dict() for name, r in results.items()}, f, ensure_ascii=False, indent=2)
+    if args.save_baseline:
+        save_baseline(args.save_baseline, results)
+
+    if baseline is not None:
+        regressions = compare(results, baseline, tolerance=args.tolerance)
+        if regressions:
+            print("\nРегрессии относительно эталона:", file=sys.stderr)
+            for line in regressions:
+                print(f"  {line}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
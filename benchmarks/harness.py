@@ -0,0 +1,240 @@
+"""
+Замеры и сравнение с эталоном.
+
+Каждый замер — многократный вызов функции, обрабатывающей items резюме
+(или других единиц). Время считается по каждому вызову: call_p50/call_p99 —
+перцентили времени одного вызова (задержка на резюме, только если items=1),
+throughput — единиц в секунду по всем вызовам. Отдельно от замера
+под tracemalloc выполняется ещё один вызов, чтобы оценить пиковую память
+на единицу.
+"""
+
+from __future__ import annotations
+
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+
+class BenchResult:
+    """Результат одного замера."""
+
+    FIELDS = ("runs", "items", "throughput", "call_p50", "call_p99", "memory_per_item")
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        runs: int,
+        items: int,
+        throughput: float,
+        call_p50: float,
+        call_p99: float,
+        memory_per_item: float,
+        extra: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Args:
+            name: Имя замера
+            runs: Число вызовов
+            items: Единиц (резюме) на вызов
+            throughput: Единиц в секунду
+            call_p50: Медиана времени одного вызова (items единиц), секунды
+            call_p99: 99-й перцентиль времени одного вызова, секунды
+            memory_per_item: Пиковая выделенная память на единицу, байты
+            extra: Дополнительные показатели (счётчики stub-сервера и т.п.)
+        """
+        self.name = name
+        self.runs = runs
+        self.items = items
+        self.throughput = throughput
+        self.call_p50 = call_p50
+        self.call_p99 = call_p99
+        self.memory_per_item = memory_per_item
+        self.extra = extra or {}
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {field: getattr(self, field) for field in self.FIELDS}
+        if self.extra:
+            data["extra"] = self.extra
+        return data
+
+    @classmethod
+    def from_dict(cls, name: str, data: Dict[str, Any]) -> "BenchResult":
+        missing = [field for field in cls.FIELDS if field not in data]
+        if missing:
+            raise ValueError(f"{name}: в эталоне нет полей {missing} — эталон старого формата, пересоздайте его")
+        return cls(name, extra=data.get("extra"), **{field: data[field] for field in cls.FIELDS})
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Перцентиль с линейной интерполяцией (q от 0 до 100)."""
+    if not values:
+        raise ValueError("Пустая выборка")
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q / 100.0
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def measure(
+    name: str,
+    body: Callable[[], Any],
+    *,
+    items: int = 1,
+    runs: int = 20,
+    warmup: int = 2,
+    trace_memory: bool = True,
+) -> BenchResult:
+    """
+    Замеряет body.
+
+    Args:
+        name: Имя замера
+        body: Вызов, обрабатывающий items единиц
+        items: Единиц на вызов
+        runs: Число замеряемых вызовов
+        warmup: Число вызовов до замера (кэши, пулы соединений)
+        trace_memory: Оценивать пиковую память (ещё один вызов под tracemalloc)
+
+    Returns:
+        BenchResult: Результат
+    """
+    if items < 1 or runs < 1:
+        raise ValueError("items и runs должны быть >= 1")
+    for _ in range(warmup):
+        body()
+
+    durations: List[float] = []
+    gc.collect()
+    for _ in range(runs):
+        started = time.perf_counter()
+        body()
+        durations.append(time.perf_counter() - started)
+
+    memory = 0.0
+    if trace_memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            body()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        memory = peak / items
+
+    return BenchResult(
+        name,
+        runs=runs,
+        items=items,
+        throughput=runs * items / sum(durations) if sum(durations) > 0 else float("inf"),
+        call_p50=percentile(durations, 50),
+        call_p99=percentile(durations, 99),
+        memory_per_item=memory,
+    )
+
+
+# -----------------------
+# Эталон
+# -----------------------
+
+def save_baseline(path: str, results: Dict[str, BenchResult]) -> None:
+    """Сохраняет результаты как эталон (JSON) вместе с описанием окружения."""
+    data = {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "results": {name: result.to_dict() for name, result in results.items()},
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def load_baseline(path: str) -> Dict[str, BenchResult]:
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return {name: BenchResult.from_dict(name, item) for name, item in data["results"].items()}
+
+
+def compare(
+    current: Dict[str, BenchResult],
+    baseline: Dict[str, BenchResult],
+    *,
+    tolerance: float = 0.25,
+    memory_slack: float = 1024.0,
+) -> List[str]:
+    """
+    Сравнивает замеры с эталоном.
+
+    Регрессия — медиана или p99 выросли, пропускная способность упала
+    больше чем на tolerance, или память на единицу выросла больше чем на
+    tolerance и memory_slack байт одновременно. Замеры без эталона пропускаются.
+
+    Args:
+        current: Текущие результаты
+        baseline: Эталон
+        tolerance: Допустимое относительное ухудшение (0.25 — 25%)
+        memory_slack: Абсолютный допуск по памяти, байты
+
+    Returns:
+        List[str]: Описания регрессий (пустой — регрессий нет)
+    """
+    regressions: List[str] = []
+    limit = 1.0 + tolerance
+    for name, result in current.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        for field in ("call_p50", "call_p99"):
+            old, new = getattr(base, field), getattr(result, field)
+            if old > 0 and new > old * limit:
+                regressions.append(f"{name}: {field} {_format_seconds(old)} -> {_format_seconds(new)}")
+        if result.throughput * limit < base.throughput:
+            regressions.append(f"{name}: throughput {base.throughput:.1f}/s -> {result.throughput:.1f}/s")
+        old_memory, new_memory = base.memory_per_item, result.memory_per_item
+        if new_memory > old_memory * limit and new_memory - old_memory > memory_slack:
+            regressions.append(f"{name}: memory/item {old_memory:.0f} B -> {new_memory:.0f} B")
+    return regressions
+
+
+# -----------------------
+# Вывод
+# -----------------------
+
+def format_table(results: Dict[str, BenchResult], baseline: Optional[Dict[str, BenchResult]] = None) -> str:
+    """Таблица результатов; с эталоном — с изменением медианы в процентах."""
+    header = (
+        f"{'benchmark':<36} {'items/s':>11} {'items':>6} {'call p50':>10} {'call p99':>10} {'mem/item':>10}"
+    )
+    if baseline is not None:
+        header += f" {'p50 Δ':>8}"
+    lines = [header, "-" * len(header)]
+    for name, r in results.items():
+        line = (
+            f"{name:<36} {r.throughput:>11.1f} {r.items:>6} {_format_seconds(r.call_p50):>10} "
+            f"{_format_seconds(r.call_p99):>10} {r.memory_per_item:>9.0f}B"
+        )
+        if baseline is not None:
+            base = baseline.get(name)
+            line += f" {(r.call_p50 / base.call_p50 - 1) * 100:>+7.1f}%" if base and base.call_p50 else f" {'—':>8}"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def _format_seconds(value: float) -> str:
+    if value >= 1:
+        return f"{value:.2f}s"
+    if value >= 1e-3:
+        return f"{value * 1e3:.2f}ms"
+    return f"{value * 1e6:.1f}µs"
@@ -0,0 +1,177 @@
+"""
+Локальный stub LLM-провайдера для бенчмарков.
+
+Отвечает в форматах Gemini (generateContent) и OpenAI (chat/completions)
+с настраиваемой задержкой и долей ошибок, поэтому замеры не зависят
+от сети и лимитов настоящего прокси. Тот же сервер служит фикстурой stub
+в тестах адаптеров (tests/conftest.py).
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+
+
+class StubLLMServer:
+    """
+    HTTP-сервер, имитирующий LLM.
+
+    Использование:
+        with StubLLMServer(latency=0.005, error_rate=0.01) as stub:
+            adapter = GeminiAdapter(endpoint=stub.gemini_endpoint)
+    """
+
+    def __init__(
+        self,
+        *,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        fail_first: int = 0,
+        answer: str = "000",
+        seed: int = 0,
+    ):
+        """
+        Args:
+            latency: Задержка ответа, секунды
+            jitter: Случайная добавка к задержке (равномерно от 0 до jitter), секунды
+            error_rate: Доля запросов, завершающихся ошибкой (от 0 до 1)
+            error_status: HTTP-статус ошибочного ответа (503 — с Retry-After: 0)
+            fail_first: Сколько первых запросов завершить ошибкой error_status
+            answer: Текст ответа модели
+            seed: Зерно генератора ошибок и задержек
+        """
+        if not 0.0 <= error_rate <= 1.0:
+            raise ValueError("error_rate должен быть от 0 до 1")
+        if latency < 0 or jitter < 0:
+            raise ValueError("latency и jitter не могут быть отрицательными")
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.fail_first = fail_first
+        self.answer = answer
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._errors = 0
+        self._in_flight = 0
+        self._max_in_flight = 0
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        if self._server is None:
+            raise RuntimeError("Сервер не запущен")
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    @property
+    def gemini_endpoint(self) -> str:
+        return self.url + "/v1beta/models/stub:generateContent"
+
+    @property
+    def openai_endpoint(self) -> str:
+        return self.url + "/v1/chat/completions"
+
+    def start(self) -> "StubLLMServer":
+        server = _Server(("127.0.0.1", 0), _make_handler(self))
+        self._server = server
+        self._thread = threading.Thread(target=server.serve_forever, name="llm-stub", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "StubLLMServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    @property
+    def requests(self) -> int:
+        with self._lock:
+            return self._requests
+
+    @property
+    def max_in_flight(self) -> int:
+        """Наибольшее число одновременно обрабатываемых запросов."""
+        with self._lock:
+            return self._max_in_flight
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"requests": self._requests, "errors": self._errors}
+
+    def _begin(self) -> tuple:
+        """(задержка, ошибка ли) для очередного запроса."""
+        with self._lock:
+            self._requests += 1
+            self._in_flight += 1
+            self._max_in_flight = max(self._max_in_flight, self._in_flight)
+            fail = self._requests <= self.fail_first or self._random.random() < self.error_rate
+            self._errors += fail
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+        return delay, fail
+
+    def _end(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256
+
+
+def _make_handler(stub: StubLLMServer):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"   # keep-alive, как у настоящего провайдера
+        disable_nagle_algorithm = True  # иначе заголовки и тело ответа ждут delayed ACK (~40 мс)
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            delay, fail = stub._begin()
+            try:
+                if delay:
+                    time.sleep(delay)
+                try:
+                    json.loads(body)
+                except ValueError:
+                    fail_status = 400
+                else:
+                    fail_status = stub.error_status if fail else None
+                if fail_status is not None:
+                    self.send_response(fail_status)
+                    self.send_header("Retry-After", "0")
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                if self.path.endswith("/chat/completions"):
+                    payload = {"choices": [{"message": {"content": stub.answer}}]}
+                else:
+                    payload = {"candidates": [{"content": {"parts": [{"text": stub.answer}]}}]}
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+            finally:
+                stub._end()
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
@@ -0,0 +1,420 @@
+"""
+Набор замеров конвейера скоринга.
+
+Замер описывается функцией, которая получает BenchContext и возвращает
+Case — вызов для замера и число резюме (единиц) на вызов. Регистрация —
+декоратором @benchmark; имена сгруппированы по префиксу (fio_result.,
+services., core., adapter.).
+"""
+
+from __future__ import annotations
+
+import random
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks.harness import BenchResult, measure
+from benchmarks.stub_server import StubLLMServer
+
+
+class Case:
+    """Подготовленный замер."""
+
+    def __init__(
+        self,
+        body: Callable[[], Any],
+        *,
+        items: int = 1,
+        runs: Optional[int] = None,
+        teardown: Optional[Callable[[], None]] = None,
+        extra: Optional[Callable[[], Dict[str, Any]]] = None,
+    ):
+        """
+        Args:
+            body: Замеряемый вызов
+            items: Единиц на вызов
+            runs: Число вызовов (None — из контекста)
+            teardown: Освобождение ресурсов после замера
+            extra: Дополнительные показатели для отчёта (вызывается после замера)
+        """
+        self.body = body
+        self.items = items
+        self.runs = runs
+        self.teardown = teardown
+        self.extra = extra
+
+
+class BenchContext:
+    """Общие параметры запуска и stub LLM."""
+
+    def __init__(self, stub: StubLLMServer, *, size: int = 200, runs: int = 20, seed: int = 0):
+        """
+        Args:
+            stub: Запущенный stub LLM-провайдера
+            size: Резюме в пакете для замеров сервисов
+            runs: Число вызовов по умолчанию
+            seed: Зерно генератора данных
+        """
+        self.stub = stub
+        self.size = size
+        self.runs = runs
+        self.seed = seed
+        self._rezumes = None
+
+    @property
+    def rezumes(self) -> List["Rezume"]:
+        if self._rezumes is None:
+            self._rezumes = make_rezumes(self.size, self.seed)
+        return self._rezumes
+
+    def llm_service(self, max_concurrency: int = 64) -> "LLMService":
+        """LLMService поверх stub, без кэша — каждая проверка ФИО доходит до «провайдера»."""
+        from app.infrastructure.llm import LLMService
+        from app.infrastructure.llm.adapters.gemini_adapter import GeminiAdapter
+        from app.infrastructure.llm.rate_limit import RateLimiter
+
+        limiter = RateLimiter(initial_concurrency=max_concurrency, max_concurrency=max_concurrency)
+        return LLMService(GeminiAdapter(endpoint=self.stub.gemini_endpoint, rate_limiter=limiter))
+
+
+BENCHMARKS: Dict[str, Callable[[BenchContext], Case]] = {}
+
+
+def benchmark(name: str):
+    """Регистрирует фабрику замера под именем name."""
+    def register(factory: Callable[[BenchContext], Case]) -> Callable[[BenchContext], Case]:
+        if name in BENCHMARKS:
+            raise ValueError(f"Замер {name} уже зарегистрирован")
+        BENCHMARKS[name] = factory
+        return factory
+    return register
+
+
+def run_benchmarks(
+    ctx: BenchContext,
+    names: Optional[List[str]] = None,
+    progress: Optional[Callable[[BenchResult], None]] = None,
+) -> Dict[str, BenchResult]:
+    """
+    Выполняет замеры.
+
+    Args:
+        ctx: Контекст запуска
+        names: Какие замеры выполнить (None — все, в порядке регистрации)
+        progress: Вызывается после каждого замера
+
+    Returns:
+        Dict[str, BenchResult]: Результаты по именам
+    """
+    results: Dict[str, BenchResult] = {}
+    for name in names if names is not None else list(BENCHMARKS):
+        case = BENCHMARKS[name](ctx)
+        try:
+            result = measure(name, case.body, items=case.items, runs=case.runs or ctx.runs)
+            if case.extra is not None:
+                result.extra = case.extra()
+        finally:
+            if case.teardown is not None:
+                case.teardown()
+        results[name] = result
+        if progress is not None:
+            progress(result)
+    return results
+
+
+# -----------------------
+# Данные
+# -----------------------
+
+_SYLLABLES = ["ко", "ва", "ли", "зю", "мар", "тон", "рик", "ше", "бу", "дол", "пре", "ган"]
+_NAMES = ["Иван", "Пётр", "Анна", "Мария", "Олег", "Дарья"]
+_FATHER_NAMES = ["Иванович", "Петровна", "Олегович", ""]
+_CITIES = ["Москва", "Санкт-Петербург", "Казань", "Новосибирск", None]
+
+
+def make_rezumes(n: int, seed: int = 0) -> List["Rezume"]:
+    """
+    Синтетические резюме: редкие (выдуманные) фамилии, чтобы проверка ФИО
+    доходила до LLM, 0–3 места работы и 0–2 записи об образовании.
+    """
+    from app.domain.models import Education, EducationEntry, NameParts, PlaceWork, Rezume
+
+    rng = random.Random(seed)
+
+    def some_date(start_year: int, end_year: int) -> date:
+        return date(start_year, 1, 1) + timedelta(days=rng.randrange((end_year - start_year) * 365))
+
+    rezumes = []
+    for _ in range(n):
+        born = some_date(1965, 2003)
+        surname = "".join(rng.choice(_SYLLABLES) for _ in range(3)).capitalize() + rng.choice(["ов", "ин", "ский"])
+        places = [
+            PlaceWork(
+                company=f"ООО Компания {rng.randrange(1000)}",
+                start_date=some_date(born.year + 16, 2024),
+                position="Инженер",
+            )
+            for _ in range(rng.randrange(4))
+        ]
+        education = Education(
+            higher=rng.choice([True, False, None]),
+            items=[
+                EducationEntry(
+                    university="МГУ",
+                    city=rng.choice(_CITIES),
+                    faculty="ВМК",
+                    end_date=date(born.year + rng.randrange(20, 26), 6, 30),
+                )
+                for _ in range(rng.randrange(3))
+            ],
+        )
+        rezumes.append(Rezume(
+            fio=NameParts(surname=surname, name=rng.choice(_NAMES), father_name=rng.choice(_FATHER_NAMES)),
+            born_date=born,
+            residence_city=rng.choice(_CITIES),
+            places=places,
+            education=education,
+            skills=["Python", "SQL"],
+        ))
+    return rezumes
+
+
+_LEGEND_WORDS = [
+    "разрабатывал", "сервис", "отчёты", "клиентов", "договоры", "склад", "логистику", "API",
+    "PostgreSQL", "тарифы", "закупки", "документацию", "поставщиков", "релизы", "интеграцию",
+]
+_LEGEND_TEMPLATES = [
+    "Отвечал за развитие направления, выстраивал процессы отдела и взаимодействие с подрядчиками.",
+    "Обеспечивал выполнение плановых показателей, контролировал качество работы сотрудников смены.",
+    "Участвовал в проектах компании, готовил отчётность для руководства по итогам каждого квартала.",
+]
+_LEGEND_INFLATED = "Стрессоустойчив, коммуникабелен, нацелен на результат, увеличил продажи в 10 раз."
+_LEGEND_AMBIGUOUS = "Вёл ключевых клиентов направления, готовил договоры и сверки."
+
+
+def make_legends(n: int, seed: int = 0) -> List[tuple]:
+    """
+    Пары (легенда, владелец): 60% уникальных описаний, 20% шаблонов, кочующих
+    между резюме, 15% «накрученных» и 5% неоднозначных (уходят в LLM).
+    """
+    rng = random.Random(seed)
+    legends = []
+    for owner in range(n):
+        roll = rng.random()
+        if roll < 0.6:
+            text = " ".join(rng.choice(_LEGEND_WORDS) for _ in range(rng.randrange(10, 30)))
+        elif roll < 0.8:
+            text = rng.choice(_LEGEND_TEMPLATES)
+        elif roll < 0.95:
+            text = _LEGEND_INFLATED
+        else:
+            text = _LEGEND_AMBIGUOUS
+        legends.append((text, owner))
+    return legends
+
+
+# -----------------------
+# FIOResult
+# -----------------------
+
+@benchmark("fio_result.validated")
+def _fio_result_validated(ctx: BenchContext) -> Case:
+    from app.domain.models import FIOResult
+
+    flags = ["000", "024", "124", "440"] * 250
+    return Case(lambda: [FIOResult(f) for f in flags], items=len(flags))
+
+
+@benchmark("fio_result.interned")
+def _fio_result_interned(ctx: BenchContext) -> Case:
+    from app.domain.models import FIOResult
+
+    flags = [(0, 0, 0), (0, 2, 4), (1, 2, 4), (4, 4, 0)] * 250
+    return Case(lambda: [FIOResult.of(*f) for f in flags], items=len(flags))
+
+
+@benchmark("domain.work_history")
+def _work_history(ctx: BenchContext) -> Case:
+    from app.domain.work_history import WorkHistory
+
+    places = [r.places for r in ctx.rezumes]
+    return Case(lambda: [WorkHistory(p) for p in places], items=len(places))
+
+
+# -----------------------
+# Сервисы (без LLM)
+# -----------------------
+
+@benchmark("services.age_education")
+def _age_education(ctx: BenchContext) -> Case:
+    from app.application.services.age_education_analysis import analyze_age_education_comprehensive
+
+    rows = [(r.born_date, r.first_work, r.education) for r in ctx.rezumes]
+    return Case(lambda: [analyze_age_education_comprehensive(*row) for row in rows], items=len(rows))
+
+
+@benchmark("services.age_education_batch")
+def _age_education_batch(ctx: BenchContext) -> Case:
+    from app.application.services.age_education_columnar import analyze_age_education_batch
+    from app.domain.batch import RezumeBatch
+
+    batch = RezumeBatch.from_rezumes(ctx.rezumes)
+    return Case(lambda: analyze_age_education_batch(batch), items=len(batch))
+
+
+@benchmark("services.education")
+def _education(ctx: BenchContext) -> Case:
+    from app.application.services.education import analyze_education
+
+    rezumes = ctx.rezumes
+    return Case(lambda: [analyze_education(r.education, r.residence_city) for r in rezumes], items=len(rezumes))
+
+
+@benchmark("services.company")
+def _company(ctx: BenchContext) -> Case:
+    from app.application.services.company import analyze_company
+
+    rezumes = ctx.rezumes
+    return Case(lambda: [analyze_company(r.places) for r in rezumes], items=len(rezumes))
+
+
+def _company_registry(size: int = 50_000):
+    from app.infrastructure.registry import CompanyRecord, CompanyRegistry
+
+    return CompanyRegistry(
+        CompanyRecord(inn=f"{7700000000 + i}", name=f"ООО Компания {i}", registered=date(1995 + i % 25, 1, 1))
+        for i in range(size)
+    )
+
+
+@benchmark("services.company_registry")
+def _company_with_registry(ctx: BenchContext) -> Case:
+    from app.application.services.company import analyze_company
+
+    registry = _company_registry()
+    rezumes = ctx.rezumes
+    return Case(
+        lambda: [analyze_company(r.places, r.work_history, registry) for r in rezumes],
+        items=len(rezumes),
+    )
+
+
+@benchmark("services.company_registry_batch")
+def _company_with_registry_batch(ctx: BenchContext) -> Case:
+    from app.application.services.company import analyze_company_batch
+    from app.domain.batch import RezumeBatch
+
+    registry = _company_registry()
+    batch = RezumeBatch.from_rezumes(ctx.rezumes)
+    return Case(lambda: analyze_company_batch(batch, registry), items=len(batch))
+
+
+@benchmark("services.legend")
+def _legend(ctx: BenchContext) -> Case:
+    from app.application.services.legend import LegendAnalyzer
+
+    llm = ctx.llm_service()
+    analyzer = LegendAnalyzer(llm=llm)
+    legends = make_legends(ctx.size, ctx.seed)
+    return Case(
+        lambda: analyzer.analyze_many(legends),
+        items=len(legends),
+        teardown=llm.close,
+        extra=lambda: {"llm_share": round(analyzer.stats()["llm_share"], 3)},
+    )
+
+
+@benchmark("services.duplicates")
+def _duplicates(ctx: BenchContext) -> Case:
+    from app.infrastructure.similarity import DuplicateIndex
+
+    # Запросы идут к уже заполненному индексу: время запроса не должно расти линейно с его размером
+    index = DuplicateIndex()
+    for text, owner in make_legends(20_000, ctx.seed + 1):
+        index.add(f"stored-{owner}", text)
+    legends = make_legends(ctx.size, ctx.seed)
+    return Case(
+        lambda: [index.query(text) for text, _ in legends],
+        items=len(legends),
+        extra=lambda: {"records": len(index), "nbytes": index.stats()["nbytes"]},
+    )
+
+
+@benchmark("services.check_fio_local")
+def _check_fio_local(ctx: BenchContext) -> Case:
+    from app.application.services.fio import check_fio_local
+
+    rezumes = ctx.rezumes
+    return Case(lambda: [check_fio_local(r.fio) for r in rezumes], items=len(rezumes))
+
+
+# -----------------------
+# LLM через stub
+# -----------------------
+
+@benchmark("adapter.gemini_generate_content")
+def _gemini_generate_content(ctx: BenchContext) -> Case:
+    from app.infrastructure.llm import FIO_PROMPT
+    from app.infrastructure.llm.adapters.gemini_adapter import GeminiAdapter
+    from app.infrastructure.llm.rate_limit import RateLimiter
+
+    adapter = GeminiAdapter(endpoint=ctx.stub.gemini_endpoint, rate_limiter=RateLimiter())
+    before = ctx.stub.stats()
+    return Case(
+        lambda: adapter.generate_content(FIO_PROMPT, "Иванов Иван Иванович"),
+        runs=max(ctx.runs * 5, 50),
+        teardown=adapter.close,
+        extra=lambda: _stub_delta(ctx, before),
+    )
+
+
+@benchmark("core.get_score")
+def _core_get_score(ctx: BenchContext) -> Case:
+    from app.application.core import CoreML
+
+    llm = ctx.llm_service()
+    model = CoreML(llm=llm)
+    rezumes = ctx.rezumes[:20]
+    state = {"next": 0}
+
+    def body() -> None:
+        # По одному резюме за вызов — call_p50/call_p99 здесь и есть задержка на резюме
+        rezume = rezumes[state["next"] % len(rezumes)]
+        state["next"] += 1
+        model.get_score(rezume)
+
+    before = ctx.stub.stats()
+    return Case(
+        body,
+        runs=max(ctx.runs * 5, 50),
+        teardown=llm.close,
+        extra=lambda: _stub_delta(ctx, before),
+    )
+
+
+@benchmark("core.score_batch")
+def _core_score_batch(ctx: BenchContext) -> Case:
+    from app.application.core import CoreML
+
+    llm = ctx.llm_service()
+    model = CoreML(max_in_flight=16, chunk_size=64, llm=llm)
+    rezumes = ctx.rezumes
+
+    def body() -> None:
+        results = model.score_batch(rezumes)
+        degraded[0] += sum(r.degraded for r in results)
+
+    degraded = [0]
+    before = ctx.stub.stats()
+    return Case(
+        body,
+        items=len(rezumes),
+        runs=max(ctx.runs // 4, 3),
+        teardown=llm.close,
+        extra=lambda: dict(_stub_delta(ctx, before), degraded=degraded[0]),
+    )
+
+
+def _stub_delta(ctx: BenchContext, before: Dict[str, int]) -> Dict[str, int]:
+    after = ctx.stub.stats()
+    return {f"stub_{key}": after[key] - before[key] for key in after}
@@ -0,0 +1,12 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from benchmarks.stub_server import StubLLMServer
+
+
+@pytest.fixture
+def stub():
+    """Локальный HTTP-сервер, отвечающий в форматах Gemini и OpenAI (тот же, что в бенчмарках)."""
+    with StubLLMServer(answer="002", error_status=429) as server:
+        yield server
@@ -0,0 +1,123 @@
+# python -m pytest tests/test_age_education_columnar.py -v
+# -*- coding: utf-8 -*-
+
+import random
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.application.services.age_education_analysis import (
+    _calculate_education_bonus,
+    _when_start_working,
+    analyze_age_education_comprehensive,
+)
+from app.application.services.age_education_columnar import (
+    analyze_age_education_columnar,
+    education_bonus_columnar,
+    education_end_dates,
+    to_datetime64,
+    when_start_working_columnar,
+)
+from app.domain.models import Education, EducationEntry
+
+
+def make_education(end_date):
+    return SimpleNamespace(items=[SimpleNamespace(end_date=end_date)])
+
+
+# Все сочетания (born, first_work, education) из tests/test_age_education.py
+CASES = [
+    (None, date(2020, 1, 1), None),
+    (date(2000, 1, 1), None, None),
+    (date(2000, 1, 10), date(2018, 1, 9), None),
+    (date(2000, 1, 10), date(2018, 1, 10), None),
+    (date(2000, 1, 10), date(2018, 1, 11), None),
+    (date(2000, 1, 1), date(2019, 9, 1), None),
+    (date(2000, 1, 1), date(2019, 9, 1), SimpleNamespace(items=[])),
+    (date(2000, 1, 1), date(2019, 9, 1), make_education(None)),
+    (None, date(2016, 8, 31), make_education(date(2020, 6, 30))),
+    (date(2000, 1, 1), date(2016, 8, 31), make_education(date(2020, 6, 30))),
+    (date(2000, 1, 1), date(2016, 10, 1), make_education(date(2020, 6, 30))),
+    (date(2000, 1, 1), date(2017, 10, 1), make_education(date(2020, 6, 30))),
+    (date(2000, 1, 1), date(2018, 10, 1), make_education(date(2020, 6, 30))),
+    (None, date(2016, 1, 1), None),
+    (date(2000, 1, 10), date(2016, 10, 1), make_education(date(2020, 6, 30))),
+    (date(2000, 1, 1), None, make_education(date(2020, 6, 30))),
+    (None, None, None),
+    (date(2000, 1, 1), date(2019, 1, 1), None),
+    (date(2000, 1, 1), date(2019, 1, 1), SimpleNamespace(items=[])),
+    (date(2000, 1, 1), date(2019, 1, 1), make_education(None)),
+    (date(2000, 1, 1), date(2017, 10, 1), make_education(date(2020, 6, 30))),
+    (date(2000, 1, 1), date(2019, 10, 1), make_education(date(2020, 6, 30))),
+    (date(2000, 1, 1), date(2015, 1, 1), make_education(date(2020, 6, 30))),
+    (None, date(2015, 1, 1), make_education(date(2020, 6, 30))),
+    (date(2000, 1, 10), date(2018, 1, 10), make_education(date(2020, 6, 30))),
+    (date(2000, 1, 1), date(2017, 8, 15), make_education(date(2020, 6, 30))),
+    (date(2000, 1, 1), date(2017, 9, 1), make_education(date(2020, 6, 30))),
+    (date(2000, 1, 1), date(2015, 1, 1), make_education(date(2010, 6, 30))),
+    (date(2000, 1, 1), date(2019, 1, 1), make_education(date(2030, 6, 30))),
+    # 29 февраля: 18-летие в невисокосный год переносится на 28 февраля
+    (date(2000, 2, 29), date(2018, 2, 27), None),
+    (date(2000, 2, 29), date(2018, 2, 28), None),
+    (date(2004, 2, 29), date(2022, 3, 1), make_education(date(2024, 6, 30))),
+    # 18-летие в високосный год остаётся 29 февраля
+    (date(1998, 2, 28), date(2016, 2, 28), None),
+]
+
+
+def columns(cases):
+    born = to_datetime64(c[0] for c in cases)
+    first_work = to_datetime64(c[1] for c in cases)
+    education_end = education_end_dates(c[2] for c in cases)
+    return born, first_work, education_end
+
+
+@pytest.mark.parametrize("born, first_work, education", CASES)
+def test_parity_single_case(born, first_work, education):
+    b, w, e = columns([(born, first_work, education)])
+
+    assert when_start_working_columnar(b, w)[0] == _when_start_working(born, first_work)
+    assert education_bonus_columnar(b, w, e)[0] == _calculate_education_bonus(born, first_work, education)
+    assert analyze_age_education_columnar(b, w, e)[0] == analyze_age_education_comprehensive(born, first_work, education)
+
+
+def test_parity_all_cases_in_one_batch():
+    expected = [analyze_age_education_comprehensive(*case) for case in CASES]
+    assert analyze_age_education_columnar(*columns(CASES)).tolist() == expected
+
+
+def random_date(rng, start_year, end_year):
+    start = date(start_year, 1, 1)
+    return start + timedelta(days=rng.randrange((date(end_year, 12, 31) - start).days))
+
+
+def test_parity_randomized():
+    rng = random.Random(42)
+    cases = []
+    for _ in range(5000):
+        born = None if rng.random() < 0.1 else random_date(rng, 1960, 2006)
+        if born is not None and rng.random() < 0.05:
+            born = date(rng.choice([1980, 1984, 1996, 2000, 2004]), 2, 29)
+        first_work = None if rng.random() < 0.1 else random_date(rng, 1975, 2025)
+        roll = rng.random()
+        if roll < 0.05:
+            education = None
+        elif roll < 0.1:
+            education = Education(items=[])
+        elif roll < 0.15:
+            education = Education(items=[EducationEntry(end_date=None)])
+        else:
+            education = Education(items=[EducationEntry(end_date=random_date(rng, 1980, 2030))])
+        cases.append((born, first_work, education))
+
+    expected = np.array([analyze_age_education_comprehensive(*case) for case in cases])
+    actual = analyze_age_education_columnar(*columns(cases))
+
+    np.testing.assert_array_equal(actual, expected)
+
+
+def test_columns_must_have_same_length():
+    with pytest.raises(ValueError):
+        analyze_age_education_columnar(to_datetime64([None]), to_datetime64([None, None]), to_datetime64([None]))
@@ -0,0 +1,141 @@
+# python -m pytest tests/test_api.py -v
+# -*- coding: utf-8 -*-
+
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app.application.core as core
+from app.application.batch_scorer import BatchScorer, QueueFullError
+from app.application.core import CoreML
+from app.infrastructure.llm import LLMService
+from app.infrastructure.llm.circuit_breaker import CircuitBreaker, GuardedLLMClient
+from app.infrastructure.llm.llm_client import LLMClient
+from app.presentation.api import create_app
+from tests.test_core import make_rezume
+
+
+class Client(LLMClient):
+    def generate_content(self, system_prompt, user_text, generation_config=None):
+        return "000"
+
+    def close(self) -> None:
+        pass
+
+
+@pytest.fixture
+def batches(monkeypatch):
+    """Подменяет пакетную проверку ФИО и запоминает размеры пакетов."""
+    sizes = []
+
+    def _check_batch(names, llm=None):
+        sizes.append(len(names))
+        time.sleep(0.01)
+        return [1.0 if n.surname == "Подмена" else 0.0 for n in names]
+
+    monkeypatch.setattr(core, "check_fio_batch", _check_batch)
+    return sizes
+
+
+def make_core(breaker=None):
+    llm = LLMService(GuardedLLMClient(Client(), breaker or CircuitBreaker()))
+    return CoreML(fio_batch_size=32, chunk_size=32, llm=llm)
+
+
+def rezume_json(surname):
+    return make_rezume(surname).model_dump(mode="json")
+
+
+def test_score_and_batch_endpoints(batches):
+    with TestClient(create_app(make_core(), workers=2, max_wait=0.01)) as client:
+        single = client.post("/score", json=rezume_json("Подмена"))
+        batch = client.post("/score/batch", json=[rezume_json("Иванов"), rezume_json("Подмена")])
+
+    assert single.status_code == 200
+    assert single.json()["score"] > 0 and single.json()["error"] is None
+    results = batch.json()["results"]
+    assert [r["score"] for r in results][1] == single.json()["score"]
+    assert results[0]["score"] < results[1]["score"]
+
+
+def test_concurrent_requests_are_micro_batched(batches):
+    app = create_app(make_core(), workers=1, max_batch=64, max_wait=0.05)
+    with TestClient(app) as client:
+        threads = [
+            threading.Thread(target=client.post, args=("/score",), kwargs={"json": rezume_json(f"Иванов{i}")})
+            for i in range(20)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        stats = client.get("/health").json()["queue"]
+
+    assert stats["items"] == 20
+    assert stats["batches"] < 20
+    assert max(batches) > 1                 # ФИО из разных запросов ушли одним пакетом
+
+
+def test_invalid_and_oversized_requests(batches):
+    with TestClient(create_app(make_core(), max_request_items=2)) as client:
+        assert client.post("/score", json={"born_date": "2000-01-01"}).status_code == 422
+        assert client.post("/score/batch", json=[rezume_json("А")] * 3).status_code == 413
+        assert client.post("/score/batch", json=[]).json() == {"results": []}
+
+
+def test_health_reports_circuit_state(batches):
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=60)
+    with TestClient(create_app(make_core(breaker))) as client:
+        assert client.get("/health").json()["status"] == "ok"
+        breaker.record_failure()
+        body = client.get("/health").json()
+
+    assert body["status"] == "degraded"
+    assert body["circuit"]["state"] == "open"
+
+
+def test_queue_full_is_rejected(monkeypatch):
+    release = threading.Event()
+
+    def _blocking_batch(rezumes):
+        release.wait(5)
+        return [core.ScoreResult(score=0.0) for _ in rezumes]
+
+    model = make_core()
+    monkeypatch.setattr(model, "score_batch", _blocking_batch)
+
+    async def run():
+        scorer = BatchScorer(model, workers=1, max_batch=1, max_wait=0, queue_size=2)
+        await scorer.start()
+        first = asyncio.ensure_future(scorer.score(make_rezume("А")))
+        await asyncio.sleep(0.05)                            # первый уже у обработчика
+        queued = [asyncio.ensure_future(scorer.score(make_rezume("Б"))) for _ in range(2)]
+        await asyncio.sleep(0)
+        with pytest.raises(QueueFullError):
+            await scorer.score(make_rezume("В"))
+        with pytest.raises(QueueFullError):
+            await scorer.score_many([make_rezume("Г")])
+        release.set()
+        results = await asyncio.gather(first, *queued)
+        stats = scorer.stats()
+        await scorer.stop()
+        return results, stats
+
+    results, stats = asyncio.run(run())
+    assert len(results) == 3
+    assert stats["rejected"] == 2
+
+
+def test_stop_drains_accepted_requests(batches):
+    async def run():
+        scorer = BatchScorer(make_core(), workers=2, max_batch=4, max_wait=0.01)
+        await scorer.start()
+        pending = [asyncio.ensure_future(scorer.score(make_rezume(f"Иванов{i}"))) for i in range(10)]
+        await asyncio.sleep(0)
+        await scorer.stop()
+        return await asyncio.gather(*pending)
+
+    assert all(r.ok for r in asyncio.run(run()))
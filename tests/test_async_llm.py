@@ -0,0 +1,90 @@
+# python -m pytest tests/test_async_llm.py -v
+# -*- coding: utf-8 -*-
+
+import asyncio
+import time
+
+from app.domain.models import NameParts
+from app.infrastructure.llm import LLMService, create_llm_service
+from app.infrastructure.llm.adapters import (
+    AsyncGeminiAdapter,
+    AsyncOpenAIAdapter,
+    GeminiAdapter,
+    create_async_http_client,
+)
+from app.infrastructure.llm.cache import FIOCache
+from app.infrastructure.llm.rate_limit import RateLimiter
+
+
+def names(n):
+    return [NameParts(surname=f"Иванов{i}", name="Иван", father_name="Иванович") for i in range(n)]
+
+
+def test_async_gemini_adapter_parses_response(stub):
+    async def run():
+        async with AsyncGeminiAdapter(endpoint=stub.url + "/generateContent") as client:
+            return await client.agenerate_content("system", "user")
+
+    assert asyncio.run(run()) == "002"
+
+
+def test_async_adapters_share_one_pool(stub):
+    async def run():
+        pool = create_async_http_client(pool_maxsize=10)
+        gemini = AsyncGeminiAdapter(http_client=pool, endpoint=stub.url + "/generateContent")
+        openai = AsyncOpenAIAdapter(http_client=pool, endpoint=stub.url + "/chat/completions")
+        results = await asyncio.gather(
+            gemini.agenerate_content("s", "u"),
+            openai.agenerate_content("s", "u"),
+        )
+        await gemini.aclose()
+        await openai.aclose()
+        # Общий пул закрывает владелец, адаптеры его не трогают
+        assert not pool.is_closed
+        await pool.aclose()
+        return results
+
+    assert asyncio.run(run()) == ["002", "002"]
+
+
+def test_async_adapter_retries_on_429(stub):
+    stub.fail_first = 2
+
+    async def run():
+        async with AsyncGeminiAdapter(endpoint=stub.url + "/generateContent") as client:
+            return await client.agenerate_content("s", "u")
+
+    assert asyncio.run(run()) == "002"
+    assert stub.requests == 3
+
+
+def test_acheck_fio_keeps_many_requests_in_flight(stub):
+    stub.latency = 0.2
+    service = create_llm_service(
+        cache=FIOCache(),
+        with_async=True,
+        endpoint=stub.url + "/generateContent",
+        rate_limiter=RateLimiter(initial_concurrency=200, max_concurrency=200),
+    )
+
+    async def run():
+        try:
+            return await asyncio.gather(*(service.acheck_fio(n) for n in names(100)))
+        finally:
+            await service.aclose()
+
+    started = time.perf_counter()
+    results = asyncio.run(run())
+    elapsed = time.perf_counter() - started
+
+    assert all(r.father_name == 2 for r in results)
+    assert stub.max_in_flight > 50
+    assert elapsed < 100 * stub.latency / 5
+
+
+def test_acheck_fio_falls_back_to_sync_client(stub):
+    service = LLMService(GeminiAdapter(endpoint=stub.url + "/generateContent"))
+
+    result = asyncio.run(service.acheck_fio(names(1)[0]))
+
+    assert result.surname == 0 and result.father_name == 2
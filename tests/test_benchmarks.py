@@ -0,0 +1,105 @@
+# python -m pytest tests/test_benchmarks.py -v
+# -*- coding: utf-8 -*-
+
+import json
+import time
+
+import pytest
+import requests
+
+from benchmarks.harness import BenchResult, compare, load_baseline, measure, percentile, save_baseline
+from benchmarks.stub_server import StubLLMServer
+from benchmarks.suite import BenchContext, run_benchmarks
+
+
+def make_result(name="x", **overrides):
+    data = dict(runs=10, items=1, throughput=100.0, call_p50=0.01, call_p99=0.02, memory_per_item=2048.0)
+    data.update(overrides)
+    return BenchResult(name, **data)
+
+
+def test_percentile_interpolates():
+    assert percentile([1.0, 2.0, 3.0, 4.0], 50) == 2.5
+    assert percentile([5.0], 99) == 5.0
+
+
+def test_measure_counts_items():
+    result = measure("sum", lambda: sum(range(1000)), items=10, runs=5, warmup=0)
+
+    assert result.runs == 5 and result.items == 10
+    assert result.throughput > 0
+    assert 0 < result.call_p50 <= result.call_p99
+
+
+def test_compare_reports_only_real_regressions():
+    baseline = {"a": make_result("a"), "b": make_result("b")}
+    current = {
+        "a": make_result("a", call_p50=0.011, throughput=95.0, memory_per_item=2500.0),   # в пределах допуска
+        "b": make_result("b", call_p50=0.02, throughput=50.0, memory_per_item=8192.0),
+        "new": make_result("new"),                                                     # без эталона
+    }
+
+    regressions = compare(current, baseline, tolerance=0.25)
+
+    assert all(line.startswith("b:") for line in regressions)
+    assert any("p50" in line for line in regressions)
+    assert any("throughput" in line for line in regressions)
+    assert any("memory" in line for line in regressions)
+
+
+def test_baseline_round_trip(tmp_path):
+    path = tmp_path / "baseline.json"
+    save_baseline(str(path), {"a": make_result("a", extra={"stub_requests": 3})})
+
+    loaded = load_baseline(str(path))
+
+    assert loaded["a"].to_dict() == make_result("a", extra={"stub_requests": 3}).to_dict()
+
+
+def test_measure_reports_call_latency_not_divided_by_items():
+    def body():
+        time.sleep(0.01)
+
+    result = measure("sleep", body, items=100, runs=3, warmup=0, trace_memory=False)
+
+    assert result.call_p50 >= 0.01
+    assert result.throughput < 100 / 0.01
+
+
+def test_old_baseline_format_is_rejected(tmp_path):
+    path = tmp_path / "baseline.json"
+    path.write_text(json.dumps({"results": {"a": {"runs": 1, "items": 1, "throughput": 1.0,
+                                                  "p50": 0.1, "p99": 0.1, "memory_per_item": 0.0}}}))
+
+    with pytest.raises(ValueError):
+        load_baseline(str(path))
+
+
+def test_stub_fails_first_requests_and_tracks_concurrency():
+    with StubLLMServer(fail_first=2, error_status=429) as stub:
+        statuses = [requests.post(stub.gemini_endpoint, data="{}").status_code for _ in range(3)]
+        bad = requests.post(stub.gemini_endpoint, data="not json")
+
+    assert statuses == [429, 429, 200]
+    assert bad.status_code == 400
+    assert stub.requests == 4
+    assert stub.max_in_flight == 1
+
+
+def test_stub_error_rate_and_formats():
+    with StubLLMServer(error_rate=0.5, seed=1, answer="024") as stub:
+        statuses = [requests.post(stub.gemini_endpoint, data="{}").status_code for _ in range(40)]
+        ok = requests.post(stub.openai_endpoint, data="{}")
+
+    assert stub.stats()["requests"] == 41
+    assert 5 < statuses.count(503) < 35
+    assert ok.status_code == 503 or ok.json()["choices"][0]["message"]["content"] == "024"
+
+
+def test_suite_runs_against_stub():
+    with StubLLMServer() as stub:
+        ctx = BenchContext(stub, size=10, runs=1)
+        results = run_benchmarks(ctx, ["services.education", "core.get_score"])
+
+    assert set(results) == {"services.education", "core.get_score"}
+    assert results["core.get_score"].extra["stub_requests"] > 0
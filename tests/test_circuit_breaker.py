@@ -0,0 +1,299 @@
+# python -m pytest tests/test_circuit_breaker.py -v
+# -*- coding: utf-8 -*-
+
+import asyncio
+import time
+
+import pytest
+
+import app.application.services.fio as fio
+from app.application.core import CoreML
+from app.domain.models import NameParts
+from app.infrastructure.llm import LLMService
+from app.infrastructure.llm.circuit_breaker import (
+    AsyncGuardedLLMClient,
+    CircuitBreaker,
+    CircuitOpenError,
+    CircuitState,
+    GuardedLLMClient,
+    LLMRequestError,
+    LLMUnavailableError,
+)
+from app.infrastructure.llm.adapters import GeminiAdapter
+from app.infrastructure.llm.rate_limit import RateLimiter
+from app.infrastructure.llm.llm_client import AsyncLLMClient, LLMClient
+from tests.test_core import make_rezume
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FlakyClient(LLMClient, AsyncLLMClient):
+    """Клиент, отвечающий None (как адаптер после таймаутов), пока down=True."""
+
+    def __init__(self, down=True, delay=0.0):
+        self.down = down
+        self.delay = delay
+        self.calls = 0
+
+    def generate_content(self, system_prompt, user_text, generation_config=None):
+        self.calls += 1
+        time.sleep(self.delay)
+        return None if self.down else "002"
+
+    async def agenerate_content(self, system_prompt, user_text, generation_config=None):
+        self.calls += 1
+        return None if self.down else "002"
+
+    def close(self) -> None:
+        pass
+
+    async def aclose(self) -> None:
+        pass
+
+
+# -----------------------
+# Тесты CircuitBreaker
+# -----------------------
+
+def test_opens_after_threshold_and_fails_fast():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=10, clock=clock)
+    client = FlakyClient()
+    guarded = GuardedLLMClient(client, breaker)
+
+    for _ in range(3):
+        with pytest.raises(LLMUnavailableError):
+            guarded.generate_content("s", "u")
+    assert breaker.state is CircuitState.OPEN
+
+    with pytest.raises(CircuitOpenError):
+        guarded.generate_content("s", "u")
+    assert client.calls == 3
+    assert breaker.stats()["rejected"] == 1
+
+
+def test_half_open_success_closes():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=10, clock=clock)
+    client = FlakyClient()
+    guarded = GuardedLLMClient(client, breaker)
+
+    with pytest.raises(LLMUnavailableError):
+        guarded.generate_content("s", "u")
+    clock.now = 10
+    assert breaker.state is CircuitState.HALF_OPEN
+
+    client.down = False
+    assert guarded.generate_content("s", "u") == "002"
+    assert breaker.state is CircuitState.CLOSED
+
+
+def test_half_open_failure_reopens():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=10, clock=clock)
+    guarded = GuardedLLMClient(FlakyClient(), breaker)
+
+    with pytest.raises(LLMUnavailableError):
+        guarded.generate_content("s", "u")
+    clock.now = 10
+    with pytest.raises(LLMUnavailableError):
+        guarded.generate_content("s", "u")
+
+    assert breaker.state is CircuitState.OPEN
+    assert breaker.stats()["retry_in"] == pytest.approx(10)
+
+
+def test_half_open_allows_single_trial():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=1, clock=clock)
+    breaker.record_failure()
+    clock.now = 1
+
+    breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_success_resets_failure_count():
+    breaker = CircuitBreaker(failure_threshold=2)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state is CircuitState.CLOSED
+
+
+def test_transitions_are_observable():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=5, clock=clock)
+    seen = []
+    breaker.add_listener(lambda old, new: seen.append((old.value, new.value, breaker.stats()["state"])))
+
+    breaker.record_failure()
+    clock.now = 5
+    breaker.before_call()
+    breaker.record_success()
+
+    assert seen == [
+        ("closed", "open", "open"),
+        ("open", "half_open", "half_open"),
+        ("half_open", "closed", "closed"),
+    ]
+    assert breaker.stats()["transitions"] == {"closed->open": 1, "open->half_open": 1, "half_open->closed": 1}
+
+
+def test_async_client_shares_breaker():
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=60)
+    client = FlakyClient()
+    guarded = AsyncGuardedLLMClient(client, breaker)
+
+    async def run():
+        with pytest.raises(LLMUnavailableError):
+            await guarded.agenerate_content("s", "u")
+        with pytest.raises(CircuitOpenError):
+            await guarded.agenerate_content("s", "u")
+
+    asyncio.run(run())
+    assert client.calls == 1
+    with pytest.raises(CircuitOpenError):
+        GuardedLLMClient(client, breaker).generate_content("s", "u")
+
+
+class RejectingClient(LLMClient):
+    """Клиент, отклоняющий каждый запрос (как адаптер на 4xx или неразборчивый ответ)."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def generate_content(self, system_prompt, user_text, generation_config=None):
+        self.calls += 1
+        raise LLMRequestError("HTTP 400")
+
+    def close(self) -> None:
+        pass
+
+
+def test_request_errors_do_not_open_circuit():
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=60)
+    client = RejectingClient()
+    guarded = GuardedLLMClient(client, breaker)
+
+    for _ in range(5):
+        with pytest.raises(LLMRequestError):
+            guarded.generate_content("s", "u")
+
+    assert client.calls == 5
+    assert breaker.state is CircuitState.CLOSED
+    assert breaker.stats()["consecutive_failures"] == 0
+
+
+@pytest.mark.parametrize("status", [400, 422, 200])
+def test_adapter_rejections_are_request_errors(stub, status):
+    # 200 без тела — неразборчивый ответ
+    stub.fail_first = 100
+    stub.error_status = status
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=60)
+    guarded = GuardedLLMClient(
+        GeminiAdapter(endpoint=stub.url + "/generateContent", rate_limiter=RateLimiter()), breaker
+    )
+
+    for _ in range(3):
+        with pytest.raises(LLMRequestError):
+            guarded.generate_content("s", "u")
+
+    assert stub.requests == 3
+    assert breaker.state is CircuitState.CLOSED
+
+
+def test_throttling_still_opens_circuit(stub):
+    stub.fail_first = 100
+    stub.error_status = 429
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=60)
+    guarded = GuardedLLMClient(
+        GeminiAdapter(endpoint=stub.url + "/generateContent", rate_limiter=RateLimiter(decrease_cooldown=0)), breaker
+    )
+
+    with pytest.raises(LLMUnavailableError) as error:
+        guarded.generate_content("s", "u")
+
+    assert not isinstance(error.value, LLMRequestError)
+    assert breaker.state is CircuitState.OPEN
+
+
+# -----------------------
+# Деградированный скоринг
+# -----------------------
+
+@pytest.fixture
+def down_service(monkeypatch):
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=60)
+    client = FlakyClient(delay=0.05)
+    service = LLMService(GuardedLLMClient(client, breaker))
+    monkeypatch.setattr(fio, "get_llm", lambda: service)
+    return service, client
+
+
+def test_service_reports_circuit_state(down_service):
+    service, _ = down_service
+    assert service.stats()["circuit"]["state"] == "closed"
+
+
+def test_core_returns_degraded_score_when_llm_down(down_service):
+    service, client = down_service
+    # Фамилия неизвестна словарю — нужна LLM; имя набрано латиницей — ловится локально
+    rezumes = [make_rezume("Зюзякин") for _ in range(10)]
+    rezumes.append(make_rezume("Зюзякин").model_copy(
+        update={"fio": NameParts(surname="Зюзякин", name="Ivan", father_name="Иванович")}
+    ))
+
+    started = time.perf_counter()
+    results = CoreML(max_in_flight=1).score_batch(rezumes)
+    elapsed = time.perf_counter() - started
+
+    assert all(r.ok and r.degraded for r in results)
+    assert results[-1].score > results[0].score
+    assert client.calls == 2                # остальные отклонены без запроса
+    assert elapsed < 0.5
+    assert service.stats()["circuit"]["state"] == "open"
+
+
+def test_single_score_is_flagged(down_service):
+    result = CoreML().score(make_rezume("Зюзякин"))
+    assert result.degraded
+    assert result.score is not None
+
+
+def test_batched_fio_does_not_retry_per_item_when_down(down_service):
+    _, client = down_service
+    rezumes = [make_rezume(f"Зюзякин{'а' * i}") for i in range(4)]
+
+    results = CoreML(fio_batch_size=4).score_batch(rezumes)
+
+    assert all(r.degraded for r in results)
+    assert client.calls == 1
+
+
+def test_rejected_names_are_degraded_without_opening_circuit(monkeypatch):
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=60)
+    service = LLMService(GuardedLLMClient(RejectingClient(), breaker))
+    monkeypatch.setattr(fio, "get_llm", lambda: service)
+
+    results = CoreML(max_in_flight=1).score_batch([make_rezume(f"Зюзякин{'а' * i}") for i in range(5)])
+
+    assert all(r.ok and r.degraded for r in results)
+    assert breaker.state is CircuitState.CLOSED
+
+
+def test_healthy_llm_is_not_degraded(monkeypatch):
+    service = LLMService(GuardedLLMClient(FlakyClient(down=False), CircuitBreaker()))
+    monkeypatch.setattr(fio, "get_llm", lambda: service)
+
+    result = CoreML().score(make_rezume("Зюзякин"))
+
+    assert not result.degraded
+    assert result.score == CoreML().get_score(make_rezume("Зюзякин"))
@@ -0,0 +1,125 @@
+# python -m pytest tests/test_city.py -v
+# -*- coding: utf-8 -*-
+
+import itertools
+
+import pytest
+
+from app.application.services.city import city_keys, compare_cities
+from app.domain.batch import StringPool
+from app.infrastructure.geo import UNKNOWN, CityGazetteer, get_gazetteer, normalize_city
+from app.infrastructure.geo.city_gazetteer import DEFAULT_GAZETTEER_PATH
+
+
+@pytest.mark.parametrize("text", [
+    "Санкт-Петербург", "санкт петербург", "г. Санкт-Петербург", "город Санкт-Петербург",
+    "СПб", "Питер", "Ленинград", "Saint Petersburg", "St. Petersburg", "Sankt-Peterburg",
+    "Санкт-Петербург (Россия)", "Санкт-Петербург, Россия",
+])
+def test_spellings_of_one_city(text):
+    assert get_gazetteer().resolve(text) == "spb"
+
+
+@pytest.mark.parametrize("text, code", [
+    ("Ёбург", "ekaterinburg"),
+    ("Yekaterinburg", "ekaterinburg"),
+    ("Ekaterinburg", "ekaterinburg"),
+    ("Nizhniy Novgorod", "nizhny_novgorod"),
+    ("Nizhny Novgorod", "nizhny_novgorod"),
+    ("Habarovsk", "khabarovsk"),
+    ("Moskva", "moscow"),
+    ("Kiev", "kyiv"),
+    ("Rostov-na-Donu", "rostov_on_don"),
+])
+def test_transliteration_variants(text, code):
+    assert get_gazetteer().resolve(text) == code
+
+
+def test_unknown_and_empty():
+    gazetteer = get_gazetteer()
+
+    assert gazetteer.resolve("Петушки") is None
+    assert gazetteer.resolve("") is None and gazetteer.resolve(None) is None
+    assert gazetteer.same_city("Петушки", "Москва") is None
+
+
+def test_normalize_city():
+    assert normalize_city("  г.  Нижний   Новгород ") == "нижний новгород"
+    assert normalize_city("Орёл (Орловская обл.)") == "орел"
+    assert normalize_city("г.") == "г"
+
+
+def test_compare_cities():
+    assert compare_cities("СПб", "Saint Petersburg")
+    assert not compare_cities("Москва", "Питер")
+    assert compare_cities("г. Петушки", "петушки")                 # вне справочника — по написанию
+    assert not compare_cities("Петушки", "Москва")
+    assert not compare_cities("", "Москва") and not compare_cities(None, "Москва")
+
+
+def test_resolve_many_parses_each_string_once():
+    gazetteer = CityGazetteer([("moscow", "Москва", ["Мск"]), ("spb", "Санкт-Петербург", ["СПб"])], cache_size=8)
+
+    result = gazetteer.resolve_many(["Мск", "СПб", "Мск", None, "Тверь", "Мск"])
+
+    assert result.tolist() == [0, 1, 0, UNKNOWN, UNKNOWN, 0]
+    assert gazetteer.stats()["cache_misses"] == 3
+
+
+def test_lru_cache_is_bounded():
+    gazetteer = CityGazetteer([("moscow", "Москва", [])], cache_size=2)
+    for text in ["Москва", "москва", "МОСКВА", "Москва"]:
+        gazetteer.resolve(text)
+
+    stats = gazetteer.stats()
+    assert stats["cache_size"] == 2
+    assert stats["cache_misses"] == 4                # «Москва» вытеснена до повтора
+    assert stats["resolved"] == 4
+
+
+def test_conflicting_alias_is_rejected():
+    with pytest.raises(ValueError, match="Новгород"):
+        CityGazetteer([("a", "Новгород", []), ("b", "Великий Новгород", ["Новгород"])])
+
+
+def test_colliding_transliteration_is_ambiguous():
+    gazetteer = CityGazetteer([("nizhny", "Нижний Новгород", ["ННовгород"]), ("veliky", "Великий Новгород", ["Новгород"])])
+
+    assert gazetteer.ambiguous_latin == {"novgorod"}
+    assert gazetteer.stats()["ambiguous_latin"] == 1
+    assert gazetteer.resolve("Novgorod") is None
+    assert (gazetteer.resolve("ННовгород"), gazetteer.resolve("Новгород")) == ("nizhny", "veliky")
+    assert not compare_cities("Novgorod", "Нижний Новгород", gazetteer)
+
+
+def test_shipped_spellings_resolve_to_their_city():
+    gazetteer = get_gazetteer()
+    with open(DEFAULT_GAZETTEER_PATH, encoding="utf-8") as f:
+        rows = [line.rstrip("\n").split("\t") for line in f if line.strip() and not line.startswith("#")]
+
+    for code, name, *aliases in rows:
+        for spelling in [name, *(aliases[0].split(";") if aliases else [])]:
+            assert gazetteer.resolve(spelling) == code, spelling
+    assert gazetteer.resolve("Novgorod") == gazetteer.resolve("Новгород") == "veliky_novgorod"
+    assert compare_cities("Novgorod", "Нижний Новгород") == compare_cities("Новгород", "Нижний Новгород") is False
+
+
+def test_from_file(tmp_path):
+    path = tmp_path / "cities.txt"
+    path.write_text("# комментарий\n\nmoscow\tМосква\tМск;Moscow\n", encoding="utf-8")
+    assert CityGazetteer.from_file(path).resolve("moscow") == "moscow"
+
+    path.write_text("moscow\n", encoding="utf-8")
+    with pytest.raises(ValueError, match=":1:"):
+        CityGazetteer.from_file(path)
+
+
+def test_city_keys_match_compare_cities():
+    cities = [None, "", " ", "Москва", "г. Москва", "Moscow", "СПб", "Питер", "Петушки", "петушки", "Тмутаракань"]
+    pool = StringPool()
+    codes = [pool.intern(city) for city in cities]
+
+    keys = city_keys(pool, codes)
+
+    for (i, a), (j, b) in itertools.product(enumerate(cities), repeat=2):
+        assert ((keys[i] == keys[j]) & (keys[i] != -1)) == compare_cities(a, b), (a, b)
@@ -0,0 +1,137 @@
+# python -m pytest tests/test_company.py -v
+# -*- coding: utf-8 -*-
+
+import random
+from datetime import date
+
+import pytest
+
+import app.application.services.company as company
+from app.application.services.company import analyze_company, analyze_company_batch, check_places
+from app.domain.batch import RezumeBatch
+from app.domain.models import NameParts, PlaceWork, Rezume
+from app.infrastructure.registry import CompanyRecord, CompanyRegistry, extract_inn, normalize_company
+
+
+@pytest.fixture
+def registry():
+    return CompanyRegistry([
+        CompanyRecord("7707083893", "ПАО «Сбербанк России»", date(1991, 6, 20)),
+        CompanyRecord("7701000001", "ООО \"Ромашка\"", date(2010, 3, 1)),
+        CompanyRecord("7701000002", "Ромашка-Плюс ООО", date(2015, 1, 1), liquidated=date(2018, 12, 31)),
+        CompanyRecord("7701000003", "ООО Лютик", date(2005, 1, 1)),
+    ])
+
+
+def place(company, start=None, end=None, info=None):
+    return PlaceWork(company=company, start_date=start, end_date=end, company_info=info)
+
+
+def test_normalize_company_drops_legal_form_and_quotes():
+    assert normalize_company("ООО «Ромашка»") == "ромашка"
+    assert normalize_company("Ромашка, ООО") == "ромашка"
+    assert normalize_company("Общество с ограниченной ответственностью \"Ёлка\"") == "елка"
+    assert normalize_company("Acme LLC") == "acme"
+    assert normalize_company("  ") == ""
+
+
+def test_extract_inn():
+    assert extract_inn("Москва, ИНН 7707083893, sber.ru") == "7707083893"
+    assert extract_inn("инн: 500100732259") == "500100732259"
+    assert extract_inn("тел. 77070838931234") is None
+
+
+def test_registry_lookups(registry):
+    assert [r.inn for r in registry.find("ромашка")] == ["7701000001"]
+    assert registry.find("Неизвестная", "ИНН 7707083893")[0].name == "ПАО «Сбербанк России»"
+    assert registry.find("Ромашка", "ИНН 1234567890") == []
+    assert registry.by_inn("7701000003").name == "ООО Лютик"
+    assert registry.prefix("ООО Ромаш") == ["ромашка", "ромашка плюс"]
+    assert registry.prefix("ромашка п", limit=1) == ["ромашка плюс"]
+    assert registry.stats()["lookups"] == 3
+
+
+def test_registry_from_csv(tmp_path):
+    path = tmp_path / "egrul.csv"
+    path.write_text(
+        "inn;name;registered;liquidated\n"
+        "7701000001;ООО Ромашка;2010-03-01;\n"
+        "7701000002;АО Лютик;2001-01-01;2019-05-01\n",
+        encoding="utf-8",
+    )
+
+    registry = CompanyRegistry.from_file(path)
+
+    assert len(registry) == 2
+    assert registry.by_inn("7701000002").liquidated == date(2019, 5, 1)
+    assert registry.by_inn("7701000001").liquidated is None
+
+
+def test_registry_csv_errors(tmp_path):
+    path = tmp_path / "bad.csv"
+    path.write_text("inn,name\n1,x\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="registered"):
+        CompanyRegistry.from_csv(path)
+
+    path.write_text("inn,name,registered\n1,x,31.12.2020\n", encoding="utf-8")
+    with pytest.raises(ValueError, match=":2:"):
+        CompanyRegistry.from_csv(path)
+
+
+def test_place_flags(registry):
+    places = [
+        place("ООО Ромашка", date(2009, 1, 1), date(2011, 1, 1)),         # до регистрации
+        place("ООО Ромашка Плюс", date(2019, 2, 1), date(2019, 6, 1)),    # после ликвидации
+        place("ООО Несуществующая", date(2012, 1, 1), date(2013, 1, 1)),
+        place(" ", date(2014, 1, 1), date(2015, 1, 1)),
+        place("Лютик", date(2016, 1, 1), date(2018, 1, 1)),
+        place("Сбер", date(2017, 1, 1), date(2017, 6, 1), info="ИНН 7707083893"),
+    ]
+
+    assert check_places(places, registry=registry) == [
+        ["before_registration"],
+        ["after_liquidation"],
+        ["unknown"],
+        ["missing"],
+        ["overlap"],
+        ["overlap"],
+    ]
+
+
+def test_scores(registry):
+    clean = [place("ООО Лютик", date(2010, 1, 1), date(2012, 1, 1))]
+    parallel = clean + [place("ООО Ромашка", date(2011, 1, 1), date(2013, 1, 1))]
+    unknown = clean + [place("ООО Фантом", date(2013, 1, 1))]
+
+    assert analyze_company([], registry=registry) == 0.0
+    assert analyze_company(clean, registry=registry) == 0.0
+    assert analyze_company(parallel, registry=registry) == 0.5
+    assert analyze_company(unknown, registry=registry) == 1.0
+    assert analyze_company([place(None)]) == 1.0
+
+
+def test_batch_matches_scalar(registry, monkeypatch):
+    rng = random.Random(7)
+    names = ["ООО Ромашка", "Ромашка Плюс", "Лютик", "ООО Фантом", "", None]
+    rezumes = []
+    for i in range(200):
+        places = []
+        for _ in range(rng.randrange(4)):
+            start = date(rng.randrange(2004, 2022), rng.randrange(1, 13), 1) if rng.random() > 0.1 else None
+            end = date(start.year + rng.randrange(0, 3), 12, 31) if start and rng.random() > 0.3 else None
+            info = "ИНН 7707083893" if rng.random() < 0.1 else None
+            places.append(place(rng.choice(names), start, end, info))
+        rezumes.append(Rezume(fio=NameParts(surname=f"Иванов{i}", name="Иван"), places=places))
+
+    batch = RezumeBatch.from_rezumes(rezumes)
+
+    for reg in (registry, None):
+        expected = [analyze_company(r.places, r.work_history, reg) for r in rezumes]
+        assert analyze_company_batch(batch, reg).tolist() == expected
+
+    # Разные веса: столбцовый путь не должен сливать флаги реестра в один
+    uneven = {"missing": 0.9, "unknown": 0.8, "before_registration": 0.6, "after_liquidation": 0.7, "overlap": 0.5}
+    monkeypatch.setattr(company, "FLAG_WEIGHTS", uneven)
+    expected = [analyze_company(r.places, r.work_history, registry) for r in rezumes]
+    assert set(expected) >= set(uneven.values())
+    assert analyze_company_batch(batch, registry).tolist() == expected
@@ -0,0 +1,119 @@
+# python -m pytest tests/test_core.py -v
+# -*- coding: utf-8 -*-
+
+from datetime import date
+
+import pytest
+
+import app.application.core as core
+from app.application.core import CoreML
+from app.domain.models import Education, EducationEntry, NameParts, PlaceWork, Rezume
+
+
+def make_rezume(surname: str, start: date | None = date(2019, 10, 1)) -> Rezume:
+    """Удобный конструктор заполненного резюме."""
+    places = [PlaceWork(company="ООО Ромашка", start_date=start)] if start else []
+    return Rezume(
+        fio=NameParts(surname=surname, name="Иван", father_name="Иванович"),
+        born_date=date(2000, 1, 1),
+        residence_city="Москва",
+        places=places,
+        education=Education(items=[
+            EducationEntry(university="МГУ", city="Москва", faculty="ВМК", end_date=date(2021, 6, 30))
+        ]),
+    )
+
+
+@pytest.fixture
+def fake_fio(monkeypatch):
+    """Подменяет проверку ФИО: фамилия 'Сбой' падает, 'Подмена' даёт 1.0, остальные 0."""
+    def _check(data: NameParts, llm=None) -> float:
+        if data.surname == "Сбой":
+            raise RuntimeError("llm down")
+        return 1.0 if data.surname == "Подмена" else 0.0
+
+    monkeypatch.setattr(core, "check_fio", _check)
+
+
+def test_score_batch_matches_get_score_and_keeps_order(fake_fio):
+    rezumes = [make_rezume("Иванов"), make_rezume("Подмена"), make_rezume("Петров", start=None)]
+    model = CoreML(max_in_flight=2, chunk_size=2)
+
+    results = model.score_batch(rezumes)
+
+    assert [r.score for r in results] == [model.get_score(r) for r in rezumes]
+    assert results[1].score > results[0].score
+
+
+def test_score_batch_isolates_failures(fake_fio):
+    rezumes = [make_rezume("Иванов"), make_rezume("Сбой"), make_rezume("Петров")]
+
+    results = CoreML(max_in_flight=4).score_batch(rezumes)
+
+    assert results[0].ok and results[2].ok
+    assert not results[1].ok
+    assert results[1].score is None
+    assert "llm down" in results[1].error
+
+
+def test_iter_score_batch_is_lazy(fake_fio):
+    consumed = []
+
+    def source():
+        for i in range(5):
+            consumed.append(i)
+            yield make_rezume("Иванов")
+
+    stream = CoreML(chunk_size=2).iter_score_batch(source())
+    first = next(stream)
+
+    assert first.ok
+    assert len(consumed) == 2
+
+
+def test_invalid_in_flight_limit():
+    with pytest.raises(ValueError):
+        CoreML(max_in_flight=0)
+
+
+def test_score_batch_grouped_fio_falls_back_per_item(fake_fio, monkeypatch):
+    def _check_batch(names, llm=None):
+        if any(data.surname == "Сбой" for data in names):
+            raise RuntimeError("batch failed")
+        return [1.0 if data.surname == "Подмена" else 0.0 for data in names]
+
+    monkeypatch.setattr(core, "check_fio_batch", _check_batch)
+    rezumes = [make_rezume("Иванов"), make_rezume("Сбой"), make_rezume("Подмена"), make_rezume("Петров")]
+
+    results = CoreML(fio_batch_size=2).score_batch(rezumes)
+
+    assert [r.ok for r in results] == [True, False, True, True]
+    assert results[0].score == CoreML().get_score(rezumes[0])
+    assert results[2].score > results[3].score
+
+
+def test_injected_llm_service_is_used(monkeypatch):
+    import app.application.services.fio as fio
+    from app.infrastructure.llm import LLMService
+    from app.infrastructure.llm.llm_client import LLMClient
+
+    class Client(LLMClient):
+        calls = 0
+
+        def generate_content(self, system_prompt, user_text, generation_config=None):
+            Client.calls += 1
+            return "200"
+
+        def close(self) -> None:
+            pass
+
+    def _no_global():
+        raise AssertionError("глобальный сервис не должен создаваться")
+
+    monkeypatch.setattr(fio, "get_llm", _no_global)
+    rezumes = [make_rezume("Зюзякин"), make_rezume("Зюзякина")]
+    model = CoreML(llm=LLMService(Client()), fio_batch_size=2)
+
+    assert all(r.ok for r in model.score_batch(rezumes))
+    assert model.get_score(rezumes[0]) > CoreML().get_score(make_rezume("Иванов"))
+    assert Client.calls >= 2
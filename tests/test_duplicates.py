@@ -0,0 +1,167 @@
+# python -m pytest tests/test_duplicates.py -v
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pytest
+
+import app.application.core as core
+from app.application.core import DUPLICATE_WEIGHT, CoreML
+from app.application.services.duplicates import DuplicateDetector, owner_key, rezume_text
+from app.domain.batch import RezumeBatch
+from app.domain.models import NameParts, PlaceWork
+from app.infrastructure.similarity import DuplicateIndex
+from tests.test_core import make_rezume
+
+TEMPLATE = (
+    "Опытный менеджер по продажам B2B, пять лет руководил отделом из двенадцати человек, "
+    "вывел компанию на рынок Казахстана и увеличил выручку направления в три раза."
+)
+OTHER = (
+    "Инженер-электроник, проектирую печатные платы для промышленных контроллеров, "
+    "веду документацию по ЕСКД и сопровождаю серийное производство на заводе."
+)
+
+
+def templated(surname: str, about: str = TEMPLATE, name: str = "Иван"):
+    rezume = make_rezume(surname)
+    rezume.fio = NameParts(surname=surname, name=name, father_name="Иванович")
+    rezume.about = about
+    rezume.skills = ["Переговоры", "CRM"]
+    rezume.places = [PlaceWork(company="ООО Ромашка", legend="Руководил отделом продаж")]
+    return rezume
+
+
+@pytest.fixture
+def fake_fio(monkeypatch):
+    monkeypatch.setattr(core, "check_fio", lambda data, llm=None: 0.0)
+
+
+def test_index_clusters_owners_transitively():
+    index = DuplicateIndex(merge_every=2)
+
+    assert index.add("a", TEMPLATE).cluster_size == 1
+    assert index.add("b", TEMPLATE + " Готов к командировкам.").matches[0][0] == "a"
+    index.add("c", OTHER)
+    match = index.add("d", TEMPLATE)
+
+    assert match.cluster_size == 3
+    assert {owner for owner, _ in match.matches} == {"a", "b"}
+    assert index.cluster_size("c") == 1
+    assert index.cluster_size("нет такого") == 0
+    assert index.stats()["duplicate_clusters"] == 1
+
+
+def test_repeated_text_of_same_owner_is_not_duplicate():
+    index = DuplicateIndex()
+
+    index.add("a", TEMPLATE)
+    match = index.add("a", TEMPLATE)
+
+    assert match.duplicates == 0
+    assert len(index) == 1
+    assert index.query(TEMPLATE, owner="a").matches == []
+    assert index.query(TEMPLATE).matches == [("a", 1.0)]
+
+
+def test_pending_and_merged_records_are_both_found():
+    index = DuplicateIndex(merge_every=4)
+    texts = [f"{OTHER} Проект номер {i}, заказчик {i * 7919}." for i in range(10)]
+    for i, text in enumerate(texts):
+        index.add(f"owner-{i}", text)
+
+    assert index.stats()["pending"] < 4
+    for i, text in enumerate(texts):
+        assert (f"owner-{i}", 1.0) in index.query(text).matches
+
+
+def test_save_and_load_round_trip(tmp_path):
+    path = str(tmp_path / "duplicates.npz")
+    index = DuplicateIndex(threshold=0.7, merge_every=2)
+    for owner, text in (("a", TEMPLATE), ("b", TEMPLATE), ("c", OTHER)):
+        index.add(owner, text)
+    index.save(path)
+
+    loaded = DuplicateIndex.load(path)
+
+    assert len(loaded) == len(index)
+    assert loaded.threshold == 0.7
+    assert loaded.cluster_size("a") == 2
+    assert loaded.add("d", TEMPLATE).cluster_size == 3
+    assert np.array_equal(loaded.signature(OTHER), index.signature(OTHER))
+    assert DuplicateIndex.open(str(tmp_path / "missing.npz")).stats()["records"] == 0
+
+
+def test_owner_key_must_not_contain_newline():
+    with pytest.raises(ValueError):
+        DuplicateIndex().add("a\nb", TEMPLATE)
+
+
+def test_detector_skips_short_texts():
+    detector = DuplicateDetector(min_chars=40)
+    short = [templated(surname, about="Продажи") for surname in ("Иванов", "Петров")]
+    for rezume in short:
+        rezume.places, rezume.skills = [], []
+
+    assert [detector.check(rezume) for rezume in short] == [0, 0]
+    assert detector.stats()["skipped"] == 2
+    assert detector.stats()["records"] == 0
+
+
+def test_detector_text_and_owner():
+    rezume = templated("Иванов")
+
+    assert rezume_text(rezume) == f"{TEMPLATE}\nРуководил отделом продаж\nПереговоры\nCRM"
+    assert owner_key(rezume) == "Иванов Иван Иванович|2000-01-01"
+
+
+def test_core_flags_template_with_swapped_fio(fake_fio):
+    plain = CoreML()
+    model = CoreML(duplicates=DuplicateDetector())
+
+    first = model.score(templated("Иванов"))
+    second = model.score(templated("Петров", name="Пётр"))
+    again = model.score(templated("Петров", name="Пётр"))
+    honest = model.score(templated("Сидоров", about=OTHER))
+
+    base = plain.score(templated("Петров")).score
+    assert (first.duplicates, first.score) == (0, base)
+    assert second.duplicates == 1
+    assert second.score == min(base + DUPLICATE_WEIGHT, 100)
+    assert again.duplicates == 1
+    assert honest.duplicates == 0
+    assert plain.score(templated("Сидоров")).duplicates == 0
+
+
+def test_core_batch_paths_report_duplicates(fake_fio):
+    rezumes = [templated("Иванов"), templated("Петров"), templated("Сидоров", about=OTHER)]
+
+    listed = CoreML(duplicates=DuplicateDetector()).score_batch(rezumes)
+    columnar = CoreML(duplicates=DuplicateDetector()).score_batch(RezumeBatch.from_rezumes(rezumes))
+
+    assert [r.duplicates for r in listed] == [0, 1, 0]
+    assert [r.duplicates for r in columnar] == [0, 1, 0]
+    assert [r.score for r in columnar] == pytest.approx([r.score for r in listed])
+
+
+class BrokenDetector(DuplicateDetector):
+    """Детектор, у которого индекс падает на резюме Петрова."""
+
+    def check(self, rezume):
+        if rezume.fio.surname == "Петров":
+            raise RuntimeError("индекс недоступен")
+        return super().check(rezume)
+
+
+def test_duplicate_failure_falls_back_to_zero_per_row(fake_fio):
+    rezumes = [templated("Иванов"), templated("Петров"), templated("Сидоров")]
+
+    single = CoreML(duplicates=BrokenDetector()).score(templated("Петров"))
+    listed = CoreML(duplicates=BrokenDetector()).score_batch(rezumes)
+    columnar = CoreML(duplicates=BrokenDetector()).score_batch(RezumeBatch.from_rezumes(rezumes))
+
+    base = CoreML().score(templated("Петров")).score
+    assert (single.ok, single.duplicates, single.score) == (True, 0, base)
+    for results in (listed, columnar):
+        assert all(r.ok for r in results)
+        assert [r.duplicates for r in results] == [0, 0, 1]
+        assert results[1].score == base
@@ -148,12 +148,11 @@ class TestAnalyzeEducation:
         result3 = analyze_education(education, "МОСКВА")
         result4 = analyze_education(education, "г. Москва")
         
-        # Первые три должны возвращать 0.0 (город совпадает)
-        # Четвертый - 0.75 (город не совпадает из-за префикса "г.")
+        # Все варианты — один город: регистр и префикс "г." не учитываются
         assert result1 == 0.0
         assert result2 == 0.0
         assert result3 == 0.0
-        assert result4 == 0.75
+        assert result4 == 0.0
 
 
 class TestIsEducationBasicComplete:
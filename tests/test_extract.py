@@ -0,0 +1,197 @@
+# python -m pytest tests/test_extract.py -v
+# -*- coding: utf-8 -*-
+
+from datetime import date
+from typing import List
+
+import pytest
+
+from app.infrastructure.extract import ExtractData, ExtractionError, ResumeTextParser, parse_date
+
+
+def make_pdf(pages: List[str]) -> bytes:
+    """
+    Минимальный PDF с текстовым слоем: по строке текста на оператор Tj,
+    кириллица кодируется однобайтно и восстанавливается через ToUnicode.
+    """
+    chars = sorted({c for page in pages for c in page if ord(c) > 126})
+    codes = {c: 128 + i for i, c in enumerate(chars)}
+    n = len(pages)
+
+    bfchar = "\n".join(f"<{codes[c]:02X}> <{ord(c):04X}>" for c in chars)
+    cmap = (
+        "/CIDInit /ProcSet findresource begin 12 dict begin begincmap /CMapName /U def "
+        "1 begincodespacerange <00> <FF> endcodespacerange "
+        f"{len(chars)} beginbfchar\n{bfchar}\nendbfchar endcmap "
+        "CMapName currentdict /CMap defineresource pop end end"
+    ).encode("ascii")
+
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        ("<< /Type /Pages /Kids [%s] /Count %d >>" % (" ".join(f"{4 + 2 * i} 0 R" for i in range(n)), n)).encode(),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /ToUnicode %d 0 R >>" % (4 + 2 * n),
+    ]
+    for i, text in enumerate(pages):
+        ops = []
+        for row, line in enumerate(text.split("\n")):
+            encoded = "".join(chr(codes[c]) if c in codes else c for c in line)
+            encoded = encoded.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+            ops.append(f"BT /F1 10 Tf 40 {800 - 14 * row} Td ({encoded}) Tj ET")
+        content = "\n".join(ops).encode("latin-1")
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % (5 + 2 * i)
+        )
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(content), content))
+    objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(cmap), cmap))
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+HH_PAGES = [
+    "Петров Пётр Сергеевич\n"
+    "Мужчина, 25 лет, родился 3 марта 1999\n"
+    "+7 (999) 123-45-67\n"
+    "Проживает: Москва\n"
+    "Желаемая должность и зарплата\n"
+    "Python-разработчик\n"
+    "Опыт работы — 4 года 1 месяц\n"
+    "Октябрь 2019 —\n"
+    "настоящее время\n"
+    "4 года 1 месяц\n"
+    "ООО Ромашка\n"
+    "Москва, romashka.ru\n"
+    "Ведущий разработчик\n"
+    "Разработка сервисов скоринга\n"
+    "Июль 2018 — Сентябрь 2019\n",
+    # Страница обрывается внутри раздела «Опыт работы»
+    "1 год 3 месяца\n"
+    "АО Лютик\n"
+    "Стажёр\n"
+    "Образование\n"
+    "Высшее\n"
+    "2021\n"
+    "Московский государственный университет\n"
+    "Вычислительной математики и кибернетики\n"
+    "Ключевые навыки\n"
+    "Python, SQL, Docker\n"
+    "О себе\n"
+    "Люблю чистый код.\n",
+]
+
+
+def test_parse_date_formats():
+    assert parse_date("1 января 2000") == date(2000, 1, 1)
+    assert parse_date("Май 2019") == date(2019, 5, 1)
+    assert parse_date("сент. 2020") == date(2020, 9, 1)
+    assert parse_date("15.02.2001") == date(2001, 2, 15)
+    assert parse_date("02.2019") == date(2019, 2, 1)
+    assert parse_date("2019") == date(2019, 1, 1)
+    assert parse_date("31.02.2019") is None
+    assert parse_date("вчера") is None
+
+
+def test_parser_handles_hh_layout_across_pages():
+    parser = ResumeTextParser()
+    for page in HH_PAGES:
+        parser.feed(page)
+    fields = parser.result()
+
+    assert fields["fio"] == {"surname": "Петров", "name": "Пётр", "father_name": "Сергеевич"}
+    assert fields["born_date"] == date(1999, 3, 3)
+    assert fields["residence_city"] == "Москва"
+    assert fields["desired_position"] == "Python-разработчик"
+    assert fields["phone"] == "+7 (999) 123-45-67"
+
+    first, second = fields["places"]
+    assert first["company"] == "ООО Ромашка"
+    assert first["start_date"] == date(2019, 10, 1) and first["end_date"] is None
+    assert first["position"] == "Ведущий разработчик"
+    assert first["company_info"] == "Москва, romashka.ru"
+    assert first["legend"] == "Разработка сервисов скоринга"
+    assert second == {
+        "start_date": date(2018, 7, 1), "end_date": date(2019, 9, 1),
+        "company": "АО Лютик", "position": "Стажёр",
+    }
+
+    assert fields["education"]["higher"] is True
+    assert fields["education"]["items"] == [{
+        "university": "Московский государственный университет",
+        "end_date": date(2021, 6, 30),
+        "faculty": "Вычислительной математики и кибернетики",
+    }]
+    assert fields["skills"] == ["Python", "SQL", "Docker"]
+    assert fields["about"] == "Люблю чистый код."
+
+
+def test_parser_handles_labelled_layout():
+    text = (
+        "ФИО: Сидорова Анна Ивановна\n"
+        "Дата рождения: 12.05.1995\n"
+        "Город: г. Казань\n"
+        "Опыт работы\n"
+        "Компания: ООО Вектор\n"
+        "Период: 03.2017 - 05.2020\n"
+        "Должность: Аналитик\n"
+        "Образование\n"
+        "Учебное заведение: КФУ\n"
+        "Год окончания: 2017\n"
+        "Город: Казань\n"
+    )
+    parser = ResumeTextParser()
+    parser.feed(text)
+    fields = parser.result()
+
+    assert fields["fio"]["surname"] == "Сидорова"
+    assert fields["born_date"] == date(1995, 5, 12)
+    assert fields["residence_city"] == "Казань"
+    assert fields["places"] == [{
+        "company": "ООО Вектор", "start_date": date(2017, 3, 1),
+        "end_date": date(2020, 5, 1), "position": "Аналитик",
+    }]
+    assert fields["education"]["items"] == [
+        {"university": "КФУ", "end_date": date(2017, 6, 30), "city": "Казань"}
+    ]
+
+
+def test_extract_pdf(tmp_path):
+    path = tmp_path / "resume.pdf"
+    path.write_bytes(make_pdf(HH_PAGES))
+    extractor = ExtractData()
+
+    rezume, timings = extractor.extract_timed(str(path))
+
+    assert rezume.fio.surname == "Петров"
+    assert rezume.born_date == date(1999, 3, 3)
+    assert [p.company for p in rezume.places] == ["ООО Ромашка", "АО Лютик"]
+    assert rezume.education.items[0].end_date == date(2021, 6, 30)
+    assert timings["pages"] == 2
+    assert set(timings) >= {"open", "text", "parse", "validate"}
+
+    extractor.extract(str(path))
+    stats = extractor.stats()
+    assert stats["documents"] == 2
+    assert stats["pages"] == 4
+    assert stats["total_seconds"]["text"] > 0
+
+
+def test_extract_without_fio_fails(tmp_path):
+    path = tmp_path / "scan.pdf"
+    path.write_bytes(make_pdf(["", ""]))
+    extractor = ExtractData()
+
+    with pytest.raises(ExtractionError):
+        extractor.extract(str(path))
+
+    stats = extractor.stats()
+    assert stats["failed"] == 1
+    assert stats["empty_pages"] == 2
@@ -0,0 +1,119 @@
+# python -m pytest tests/test_fio_batch.py -v
+# -*- coding: utf-8 -*-
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from app.domain.models import NameParts
+from app.infrastructure.llm import LLMService
+from app.infrastructure.llm.batching import format_fio_batch, parse_fio_batch_response
+from app.infrastructure.llm.cache import FIOCache
+from app.infrastructure.llm.llm_client import LLMClient
+from app.infrastructure.llm.prompts.fio import FIO_BATCH_PROMPT
+
+
+class BatchClient(LLMClient):
+    """
+    LLM-клиент: на пакетный промпт отвечает «N: 002» по каждой строке,
+    кроме строк с фамилией из broken; на одиночный — «004».
+    """
+
+    def __init__(self, broken=()):
+        self.broken = set(broken)
+        self.batch_calls = 0
+        self.single_calls = 0
+        self.lock = threading.Lock()
+
+    def generate_content(self, system_prompt, user_text, generation_config=None):
+        with self.lock:
+            if system_prompt != FIO_BATCH_PROMPT:
+                self.single_calls += 1
+                return "004"
+            self.batch_calls += 1
+        lines = []
+        for line in user_text.splitlines():
+            number, fio = line.split(". ", 1)
+            lines.append(f"{number}: {'9x9' if fio.split()[0] in self.broken else '002'}")
+        return "\n".join(lines)
+
+    def close(self) -> None:
+        pass
+
+
+def names(n, prefix="Иванов"):
+    return [NameParts(surname=f"{prefix}{i}", name="Иван", father_name="Иванович") for i in range(n)]
+
+
+# -----------------------
+# Тесты разбора ответа
+# -----------------------
+
+def test_format_numbers_lines_from_one():
+    assert format_fio_batch(names(2)) == "1. Иванов0 Иван Иванович\n2. Иванов1 Иван Иванович"
+
+
+def test_parse_accepts_separators_and_skips_garbage():
+    parsed = parse_fio_batch_response("1: 000\n2) 024\nмусор\n3: 999\n4 - 111\n9: 000\n1: 444", 4)
+
+    assert set(parsed) == {1, 2, 4}
+    assert parsed[1].surname == 0
+    assert parsed[2].father_name == 4
+    assert parsed[4].name == 1
+
+
+def test_parse_none_response():
+    assert parse_fio_batch_response(None, 3) == {}
+
+
+# -----------------------
+# Тесты LLMService.checking_FIO_batch
+# -----------------------
+
+def test_batch_packs_names_into_few_requests():
+    client = BatchClient()
+    service = LLMService(client, fio_batch_size=10)
+
+    results = service.checking_FIO_batch(names(25))
+
+    assert [r.father_name for r in results] == [2] * 25
+    assert client.batch_calls == 3
+    assert client.single_calls == 0
+
+
+def test_batch_falls_back_to_single_for_bad_lines():
+    client = BatchClient(broken={"Иванов3"})
+    service = LLMService(client, fio_batch_size=10)
+
+    results = service.checking_FIO_batch(names(5))
+
+    assert results[3].father_name == 4
+    assert [r.father_name for i, r in enumerate(results) if i != 3] == [2] * 4
+    assert client.single_calls == 1
+    assert service.fio_batch_stats()["single_fallbacks"] == 1
+
+
+def test_batch_deduplicates_and_uses_cache():
+    client = BatchClient()
+    service = LLMService(client, cache=FIOCache(), fio_batch_size=10)
+    batch = names(3) * 2
+
+    service.checking_FIO_batch(batch)
+    service.checking_FIO_batch(batch)
+
+    assert client.batch_calls == 1
+    assert service.checking_FIO(batch[0]).father_name == 2
+    assert client.single_calls == 0
+
+
+def test_submit_collects_concurrent_calls_into_batches():
+    client = BatchClient()
+    service = LLMService(client, fio_batch_size=50, fio_flush_interval=0.2)
+
+    with ThreadPoolExecutor(max_workers=20) as pool:
+        futures = list(pool.map(service.submit_FIO, names(100)))
+    results = [f.result(timeout=5) for f in futures]
+    service.close()
+
+    assert all(r.father_name == 2 for r in results)
+    assert client.batch_calls <= 10
+    assert service.fio_batch_stats()["batcher"]["items"] == 100
@@ -0,0 +1,131 @@
+# python -m pytest tests/test_fio_cache.py -v
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from app.domain.models import NameParts
+from app.infrastructure.llm import LLMService, LLMUnavailableError
+from app.infrastructure.llm.cache import FIOCache, fio_cache_key, make_namespace
+from app.infrastructure.llm.llm_client import LLMClient
+
+
+class CountingClient(LLMClient):
+    """LLM-клиент, отвечающий заданной строкой и считающий вызовы."""
+
+    def __init__(self, answer="024", model="stub-model"):
+        self.answer = answer
+        self.calls = 0
+        self._model = model
+
+    @property
+    def model(self) -> str:
+        return self._model
+
+    def generate_content(self, system_prompt, user_text, generation_config=None):
+        self.calls += 1
+        return self.answer
+
+    def close(self) -> None:
+        pass
+
+
+IVANOV = NameParts(surname="Иванов", name="Иван", father_name="Иванович")
+
+
+# -----------------------
+# Тесты FIOCache
+# -----------------------
+
+def test_key_normalizes_case_and_spaces():
+    assert fio_cache_key(IVANOV) == fio_cache_key(
+        NameParts(surname=" ИВАНОВ ", name="иван", father_name="Иванович ")
+    )
+
+
+def test_key_keeps_latin_homoglyphs_distinct():
+    spoofed = NameParts(surname="Ивaнoв", name="Иван", father_name="Иванович")
+    assert fio_cache_key(spoofed) != fio_cache_key(IVANOV)
+
+
+def test_namespace_depends_on_prompt_and_model():
+    assert make_namespace("p", "m1") != make_namespace("p", "m2")
+    assert make_namespace("p1", "m") != make_namespace("p2", "m")
+
+
+def test_memory_lru_evicts_oldest():
+    cache = FIOCache(memory_size=2)
+    cache.set("ns", ("a", "", ""), "000")
+    cache.set("ns", ("b", "", ""), "000")
+    cache.get("ns", ("a", "", ""))
+    cache.set("ns", ("c", "", ""), "000")
+
+    assert cache.get("ns", ("b", "", "")) is None
+    assert cache.get("ns", ("a", "", "")) == "000"
+
+
+def test_disk_level_survives_restart(tmp_path):
+    path = str(tmp_path / "fio.sqlite")
+    cache = FIOCache(path=path)
+    cache.set("ns", fio_cache_key(IVANOV), "002")
+    cache.close()
+
+    reopened = FIOCache(path=path)
+    assert reopened.get("ns", fio_cache_key(IVANOV)) == "002"
+    assert reopened.stats()["disk_hits"] == 1
+
+
+def test_disk_ttl_expires(tmp_path):
+    cache = FIOCache(memory_size=0, path=str(tmp_path / "fio.sqlite"), ttl=-1)
+    cache.set("ns", fio_cache_key(IVANOV), "002")
+
+    assert cache.get("ns", fio_cache_key(IVANOV)) is None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_disk_size_limit(tmp_path):
+    cache = FIOCache(memory_size=0, path=str(tmp_path / "fio.sqlite"), max_disk_entries=5)
+    for i in range(20):
+        cache.set("ns", (str(i), "", ""), "000")
+
+    stored = sum(cache.get("ns", (str(i), "", "")) is not None for i in range(20))
+    assert stored <= 5
+    assert cache.get("ns", ("19", "", "")) == "000"
+
+
+# -----------------------
+# Тесты LLMService с кэшем
+# -----------------------
+
+def test_service_hits_cache_for_repeated_names():
+    client = CountingClient()
+    service = LLMService(client, cache=FIOCache())
+
+    for _ in range(3):
+        assert service.checking_FIO(IVANOV).father_name == 4
+
+    assert client.calls == 1
+    stats = service.cache.stats()
+    assert stats["memory_hits"] == 2
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == pytest.approx(2 / 3)
+
+
+def test_service_does_not_cache_failures():
+    client = CountingClient(answer=None)
+    service = LLMService(client, cache=FIOCache())
+
+    for _ in range(2):
+        with pytest.raises(LLMUnavailableError):
+            service.checking_FIO(IVANOV)
+
+    assert client.calls == 2
+
+
+def test_model_change_invalidates_cache(tmp_path):
+    path = str(tmp_path / "fio.sqlite")
+    LLMService(CountingClient(model="m1"), cache=FIOCache(path=path)).checking_FIO(IVANOV)
+
+    client = CountingClient(model="m2")
+    LLMService(client, cache=FIOCache(path=path)).checking_FIO(IVANOV)
+
+    assert client.calls == 1
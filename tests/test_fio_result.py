@@ -0,0 +1,48 @@
+# python -m pytest tests/test_fio_result.py -v
+# -*- coding: utf-8 -*-
+
+from itertools import product
+
+import pytest
+from pydantic import ValidationError
+
+from app.application.services import fio
+from app.domain.models import FIOResult, NameParts
+
+
+@pytest.mark.parametrize("flags", ["".join(p) for p in product("0124", repeat=3)])
+def test_table_matches_validated_constructor(flags):
+    validated = FIOResult(flags)
+
+    assert FIOResult.of(validated.surname, validated.name, validated.father_name) == validated
+    assert FIOResult.from_flags(flags) == validated
+    assert FIOResult.from_flags(f" {flags}\n") == validated
+
+
+def test_instances_are_interned_and_frozen():
+    result = FIOResult.of(0, 2, 4)
+
+    assert FIOResult.of(0, 2, 4) is result
+    assert FIOResult.from_flags("024") is result
+    with pytest.raises(ValidationError):
+        result.surname = 1
+
+
+@pytest.mark.parametrize("args", [(3, 0, 0), (0, 0, "1"), (0, 0, None)])
+def test_of_rejects_invalid_values(args):
+    with pytest.raises(ValueError):
+        FIOResult.of(*args)
+
+
+@pytest.mark.parametrize("flags", ["", "12", "0123", "abc", "003"])
+def test_from_flags_stays_strict(flags):
+    with pytest.raises(ValueError):
+        FIOResult.from_flags(flags)
+
+
+def test_local_analysis_returns_interned_result(monkeypatch):
+    monkeypatch.setattr(fio, "get_llm", lambda: pytest.fail("LLM не должна вызываться"))
+
+    result = fio._analysis_fio(NameParts(surname="Ivanov", name="Ivan", father_name=""))
+
+    assert result is FIOResult.of(result.surname, result.name, result.father_name)
@@ -0,0 +1,97 @@
+# python -m pytest tests/test_homoglyph.py -v
+# -*- coding: utf-8 -*-
+
+import pytest
+
+import app.application.services.fio as fio
+from app.application.services.homoglyph import (
+    ScriptClass,
+    classify_name,
+    classify_names,
+    classify_part,
+    classify_parts,
+)
+from app.domain.models import NameParts
+
+
+# -----------------------
+# Тесты classify_part
+# -----------------------
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("Иванов", ScriptClass.CYRILLIC),
+        ("Салтыков-Щедрин", ScriptClass.CYRILLIC),
+        ("Ёлкина", ScriptClass.CYRILLIC),
+        ("Ivanov", ScriptClass.LATIN),
+        ("Müller", ScriptClass.LATIN),
+        ("Ивaнoв", ScriptClass.MIXED),          # латинские a и o
+        ("Сергееvна", ScriptClass.MIXED),
+        ("Ивαнов", ScriptClass.CONFUSABLE),     # греческая альфа
+        ("Ив0нов", ScriptClass.CONFUSABLE),     # цифра ноль
+        ("Ива​нов", ScriptClass.CONFUSABLE),  # пробел нулевой ширины
+        ("Ｉｖａｎ", ScriptClass.CONFUSABLE),     # полноширинные буквы
+        ("Պետրոսյան", ScriptClass.OTHER),       # армянский
+        ("", ScriptClass.MISSING),
+        ("   ", ScriptClass.MISSING),
+    ],
+)
+def test_classify_part(text, expected):
+    assert classify_part(text) == expected
+
+
+def test_classify_parts_matches_single_calls():
+    parts = ["Иванов", "Ivanov", "", "Ивaнoв", "Ивαнов", "Петрович"]
+    assert classify_parts(parts) == [classify_part(p) for p in parts]
+
+
+def test_classify_parts_handles_separator_inside_text():
+    assert classify_parts(["Ива\x00нов", "Петров"]) == [ScriptClass.OTHER, ScriptClass.CYRILLIC]
+
+
+def test_classify_names_batch():
+    names = [
+        NameParts(surname="Иванов", name="Иван", father_name="Иванович"),
+        NameParts(surname="Ivanov", name="Ivan", father_name=""),
+    ]
+    assert classify_names(names) == [classify_name(n) for n in names]
+    assert classify_names(names)[1] == (ScriptClass.LATIN, ScriptClass.LATIN, ScriptClass.MISSING)
+
+
+# -----------------------
+# Тесты локального решения без LLM
+# -----------------------
+
+class FailingLLM:
+    def checking_FIO(self, data):
+        raise AssertionError("LLM не должна вызываться")
+
+    def checking_FIO_batch(self, names):
+        raise AssertionError("LLM не должна вызываться")
+
+
+@pytest.fixture
+def no_llm(monkeypatch):
+    monkeypatch.setattr(fio, "get_llm", lambda: FailingLLM())
+
+
+def test_fully_local_name_skips_llm(no_llm):
+    result = fio._analysis_fio(NameParts(surname="Ivanov", name="Ивαн", father_name=""))
+    assert (result.surname, result.name, result.father_name) == (4, 4, 1)
+
+
+def test_batch_fully_local_names_skip_llm(no_llm):
+    names = [NameParts(surname="Ivanov", name="Ivan", father_name="Ivanovich")] * 3
+    assert fio.check_fio_batch(names) == [1.0, 1.0, 1.0]
+
+
+def test_local_verdicts_override_llm(monkeypatch):
+    class LLM:
+        def checking_FIO(self, data):
+            return fio.FIOResult("000")
+
+    monkeypatch.setattr(fio, "get_llm", lambda: LLM())
+    result = fio._analysis_fio(NameParts(surname="Зюзякин", name="Ивaн", father_name="Иванович"))
+
+    assert (result.surname, result.name, result.father_name) == (0, 4, 0)
@@ -0,0 +1,168 @@
+# python -m pytest tests/test_incremental.py -v
+# -*- coding: utf-8 -*-
+
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app.application.core as core
+import app.application.incremental as incremental
+import app.application.services.company as company_service
+import app.application.services.education as education_service
+import app.domain.models as models
+import app.domain.work_history as work_history
+from app.application.core import CoreML
+from app.application.incremental import ComponentStore, component_fingerprints
+from app.domain.models import NameParts, PlaceWork
+from app.infrastructure.llm.circuit_breaker import LLMUnavailableError
+from app.presentation.api import create_app
+from tests.test_core import make_rezume
+
+ALL = ["fio", "age_education", "education", "company"]
+
+
+@pytest.fixture
+def fio_calls(monkeypatch):
+    """Подменяет проверки ФИО и считает, сколько ФИО ушло в «LLM»."""
+    calls = []
+
+    def _check(data: NameParts, llm=None) -> float:
+        calls.append(data.surname)
+        if data.surname == "Сбой":
+            raise LLMUnavailableError("circuit open")
+        return 1.0 if data.surname == "Подмена" else 0.0
+
+    def _check_batch(names, llm=None):
+        return [_check(n) for n in names]
+
+    monkeypatch.setattr(core, "check_fio", _check)
+    monkeypatch.setattr(core, "check_fio_batch", _check_batch)
+    return calls
+
+
+def fingerprints(rezume):
+    return component_fingerprints(rezume)
+
+
+def test_fingerprints_ignore_unrelated_fields():
+    rezume = make_rezume("Иванов")
+    edited = rezume.model_copy(update={"phone": "+7 999 000-00-00", "skills": ["Python"]})
+
+    assert fingerprints(edited) == fingerprints(rezume)
+
+
+def test_fingerprints_track_component_inputs():
+    rezume = make_rezume("Иванов")
+    moved = rezume.model_copy(update={"residence_city": "Казань"})
+    renamed = rezume.model_copy(update={"fio": NameParts(surname="Петров", name="Иван", father_name="Иванович")})
+
+    before, after_move, after_rename = fingerprints(rezume), fingerprints(moved), fingerprints(renamed)
+    assert [c for c in ALL if before[c] != after_move[c]] == ["education"]
+    assert [c for c in ALL if before[c] != after_rename[c]] == ["fio"]
+
+
+def test_rescore_reuses_everything(fio_calls):
+    store = ComponentStore()
+    model = CoreML(component_store=store)
+    rezume = make_rezume("Подмена")
+
+    first = model.score(rezume)
+    second = model.score(rezume.model_copy(update={"skills": ["SQL"]}))
+
+    assert first.reused == []
+    assert second.reused == ALL
+    assert second.score == first.score
+    assert fio_calls == ["Подмена"]
+    assert store.stats()["hits"]["fio"] == 1
+
+
+def test_changed_places_recompute_only_dependent_components(fio_calls):
+    model = CoreML(component_store=ComponentStore())
+    rezume = make_rezume("Иванов")
+    model.score(rezume)
+
+    edited = rezume.model_copy(update={"places": [PlaceWork(company="ООО Лютик", start_date=date(2018, 9, 1))]})
+    result = model.score(edited)
+
+    assert result.reused == ["fio", "education"]
+    assert result.score == CoreML().score(edited).score
+
+
+def fixed_today(monkeypatch, day: date) -> None:
+    """Подменяет сегодняшнюю дату в отпечатках и в правилах, зависящих от неё."""
+    class FixedDate(date):
+        @classmethod
+        def today(cls):
+            return cls(day.year, day.month, day.day)
+
+    for module in (incremental, education_service, company_service, models, work_history):
+        monkeypatch.setattr(module, "date", FixedDate)
+
+
+def test_date_dependent_components_expire_with_the_day(fio_calls, monkeypatch):
+    model = CoreML(component_store=ComponentStore())
+    rezume = make_rezume("Иванов")
+    rezume.places = [PlaceWork(company="ООО Ромашка", start_date=date(2021, 1, 1))]
+    rezume.residence_city = "Казань"            # учится в другом городе, пока не окончил
+    rezume.education.items[0].end_date = date(2021, 6, 30)
+
+    fixed_today(monkeypatch, date(2021, 6, 1))
+    before = model.score(rezume)
+    fixed_today(monkeypatch, date(2021, 7, 1))
+    after = model.score(rezume)
+
+    assert after.reused == ["fio", "age_education"]
+    assert after.score == CoreML().score(rezume).score
+    assert after.score != before.score          # выпуск состоялся — оценка образования изменилась
+
+
+def test_degraded_fio_is_not_cached(fio_calls):
+    model = CoreML(component_store=ComponentStore())
+    rezume = make_rezume("Сбой")
+
+    assert model.score(rezume).degraded
+    second = model.score(rezume)
+
+    assert second.degraded and "fio" not in second.reused
+    assert fio_calls == ["Сбой", "Сбой"]
+
+
+def test_batch_checks_only_stale_names(fio_calls):
+    model = CoreML(component_store=ComponentStore(), fio_batch_size=8)
+    model.score_batch([make_rezume("Иванов"), make_rezume("Подмена")])
+    fio_calls.clear()
+
+    results = model.score_batch([make_rezume("Иванов"), make_rezume("Петров"), make_rezume("Подмена")])
+
+    assert fio_calls == ["Петров"]
+    assert [r.reused for r in results] == [ALL, ["age_education", "education", "company"], ALL]
+    assert [r.score for r in results] == [r.score for r in CoreML().score_batch(
+        [make_rezume("Иванов"), make_rezume("Петров"), make_rezume("Подмена")]
+    )]
+
+
+def test_store_evicts_least_recently_used():
+    store = ComponentStore(max_entries=2)
+    store.put("fio", "a", 1.0)
+    store.put("fio", "b", 2.0)
+    assert store.get("fio", "a") == 1.0
+    store.put("fio", "c", 3.0)
+
+    assert store.get("fio", "b") is None
+    assert (store.get("fio", "a"), store.get("fio", "c")) == (1.0, 3.0)
+    assert len(store) == 2
+    with pytest.raises(ValueError):
+        ComponentStore(max_entries=0)
+
+
+def test_api_reports_reused_components(fio_calls):
+    model = CoreML(component_store=ComponentStore(), fio_batch_size=8)
+    payload = make_rezume("Иванов").model_dump(mode="json")
+    with TestClient(create_app(model, workers=1, max_wait=0)) as client:
+        first = client.post("/score", json=payload).json()
+        payload["phone"] = "+7 999 000-00-00"
+        second = client.post("/score", json=payload).json()
+
+    assert first["reused"] == []
+    assert second["reused"] == ALL
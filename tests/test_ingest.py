@@ -0,0 +1,115 @@
+# python -m pytest tests/test_ingest.py -v
+# -*- coding: utf-8 -*-
+
+import csv
+import json
+import subprocess
+import sys
+
+import pytest
+
+from app.__main__ import main
+from app.application.core import CoreML
+from app.application.ingest import Checkpoint, IngestPipeline, iter_pdf_files
+from app.infrastructure.llm import LLMService
+from app.infrastructure.llm.llm_client import LLMClient
+from tests.test_extract import HH_PAGES, make_pdf
+
+
+class CleanClient(LLMClient):
+    def generate_content(self, system_prompt, user_text, generation_config=None):
+        return "000"
+
+    def close(self) -> None:
+        pass
+
+
+SURNAMES = ["Петров", "Сидоров", "Кузнецов", "Смирнов", "Зюзякин"]
+
+
+@pytest.fixture
+def drop(tmp_path):
+    """Каталог с пятью резюме (одно во вложенной папке) и одним битым файлом."""
+    root = tmp_path / "drop"
+    (root / "nested").mkdir(parents=True)
+    for i, surname in enumerate(SURNAMES):
+        pages = [HH_PAGES[0].replace("Петров", surname), HH_PAGES[1]]
+        folder = root / "nested" if i == 4 else root
+        (folder / f"{i}.pdf").write_bytes(make_pdf(pages))
+    (root / "broken.pdf").write_bytes(b"not a pdf")
+    (root / "notes.txt").write_text("не резюме")
+    return root
+
+
+def pipeline(**kwargs):
+    core = CoreML(llm=LLMService(CleanClient()), chunk_size=2)
+    return IngestPipeline(workers=2, core=core, **kwargs)
+
+
+def read_jsonl(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_iter_pdf_files_is_recursive_and_filtered(drop):
+    names = [p.rsplit("/", 1)[-1] for p in iter_pdf_files(str(drop))]
+    assert sorted(names) == ["0.pdf", "1.pdf", "2.pdf", "3.pdf", "4.pdf", "broken.pdf"]
+
+
+def test_ingest_writes_jsonl(drop, tmp_path):
+    output = tmp_path / "scores.jsonl"
+
+    stats = pipeline(queue_size=2).run(str(drop), str(output))
+
+    rows = read_jsonl(output)
+    assert len(rows) == 6
+    by_name = {row["path"].rsplit("/", 1)[-1]: row for row in rows}
+    assert by_name["broken.pdf"]["error"] and by_name["broken.pdf"]["score"] is None
+    assert all(by_name[f"{i}.pdf"]["score"] is not None for i in range(5))
+    assert stats["extracted"] == 5
+    assert stats["extract_failed"] == 1
+    assert stats["scored"] == 5
+    assert stats["extract_seconds"]["text"] > 0
+
+
+def test_ingest_resumes_from_checkpoint(drop, tmp_path):
+    output = tmp_path / "scores.jsonl"
+    checkpoint = tmp_path / "progress"
+    first_two = list(iter_pdf_files(str(drop)))[:2]
+    checkpoint.write_text("".join(p + "\n" for p in first_two), encoding="utf-8")
+
+    stats = pipeline().run(str(drop), str(output), checkpoint=str(checkpoint))
+    assert stats["skipped"] == 2
+    assert len(read_jsonl(output)) == 4
+
+    stats = pipeline().run(str(drop), str(output), checkpoint=str(checkpoint))
+    assert stats["skipped"] == 6
+    assert len(read_jsonl(output)) == 4
+    assert len(Checkpoint(str(checkpoint)).done) == 6
+
+
+def test_ingest_writes_csv(drop, tmp_path):
+    output = tmp_path / "scores.csv"
+
+    pipeline().run(str(drop), str(output))
+
+    with open(output, encoding="utf-8", newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 6
+    assert set(rows[0]) == {"path", "score", "degraded", "error"}
+
+
+def test_cli_ingest(drop, tmp_path, monkeypatch):
+    import app.application.services.fio as fio
+
+    service = LLMService(CleanClient())
+    monkeypatch.setattr(fio, "get_llm", lambda: service)
+    output = tmp_path / "out.jsonl"
+
+    assert main(["ingest", str(drop), "-o", str(output), "--workers", "1"]) == 0
+    assert len(read_jsonl(output)) == 6
+
+
+def test_module_entry_point():
+    proc = subprocess.run([sys.executable, "-m", "app", "ingest", "--help"], capture_output=True, text=True)
+    assert proc.returncode == 0
+    assert "--checkpoint" in proc.stdout
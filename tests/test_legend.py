@@ -0,0 +1,173 @@
+# python -m pytest tests/test_legend.py -v
+# -*- coding: utf-8 -*-
+
+from datetime import date
+
+import pytest
+
+from app.application.services.legend import LEGEND_CLEAN, LEGEND_SUSPICIOUS, LegendAnalyzer
+from app.domain.models import NameParts, PlaceWork, Rezume
+from app.infrastructure.legend import PatternMatcher, load_patterns
+from app.infrastructure.llm import LLMService
+from app.infrastructure.llm.circuit_breaker import CircuitBreaker, GuardedLLMClient
+from app.infrastructure.llm.llm_client import LLMClient
+from app.infrastructure.similarity import LSHIndex, MinHasher
+
+HONEST = (
+    "Разрабатывал сервис расчёта тарифов на Python и PostgreSQL, перевёл отчёты "
+    "с ночных выгрузок на потоковую обработку, сопровождал релизы раз в две недели."
+)
+BOILERPLATE = (
+    "Отвечал за развитие направления, выстраивал процессы отдела и взаимодействие "
+    "с подрядчиками, готовил отчётность для руководства по итогам каждого квартала."
+)
+
+
+class Client(LLMClient):
+    def __init__(self, answer="1"):
+        self.answer = answer
+        self.requests = []
+
+    def generate_content(self, system_prompt, user_text, generation_config=None):
+        self.requests.append(user_text)
+        if isinstance(self.answer, Exception):
+            raise self.answer
+        return self.answer
+
+    def close(self) -> None:
+        pass
+
+
+def make_analyzer(answer="1", **kwargs):
+    client = Client(answer)
+    llm = LLMService(GuardedLLMClient(client, CircuitBreaker(failure_threshold=1)))
+    return LegendAnalyzer(llm=llm, **kwargs), client
+
+
+def test_matcher_finds_word_prefixes():
+    matcher = PatternMatcher({1: "стрессоустойчив", 2: "работа в команде", 3: "работа"})
+
+    found = matcher.find("Стрессоустойчивый;  работа\nв команде, безответственная работа")
+
+    assert [number for number, _, _ in found] == [1, 2, 3]
+    assert found[0][1:] == (0, 15)
+    assert PatternMatcher.for_patterns({1: "a"}) is PatternMatcher.for_patterns({1: "a"})
+    assert PatternMatcher({}).find("текст") == []
+
+
+def test_default_patterns_load(tmp_path):
+    assert len(load_patterns()) >= 40
+    path = tmp_path / "patterns.txt"
+    path.write_text("1\tодин\n1\tдва\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="дважды"):
+        load_patterns(path)
+
+
+def test_minhash_similarity_and_lsh():
+    hasher = MinHasher(num_perm=64)
+    a, b, c = (hasher.signature(t) for t in (BOILERPLATE, BOILERPLATE.replace("квартала", "месяца"), HONEST))
+    index = LSHIndex(num_perm=64, bands=8, threshold=0.7)
+    index.insert("a", a)
+    index.insert("c", c)
+
+    assert MinHasher.similarity(a, b) > 0.7 > MinHasher.similarity(a, c)
+    assert [key for key, _ in index.query(b)] == ["a"]
+    index.remove("a")
+    assert index.query(b) == [] and len(index) == 1
+    # Сигнатуры воспроизводимы между экземплярами
+    assert (MinHasher(num_perm=64).signature(HONEST) == c).all()
+
+
+def test_local_tier_decides_clear_cases():
+    analyzer, client = make_analyzer()
+
+    empty = analyzer.analyze("  ")
+    honest = analyzer.analyze(HONEST, owner="a")
+    inflated = analyzer.analyze("Стрессоустойчив, коммуникабелен, нацелен на результат.", owner="b")
+
+    assert (empty.verdict, empty.tier) == (LEGEND_CLEAN, "empty")
+    assert (honest.verdict, honest.tier) == (LEGEND_CLEAN, "patterns")
+    assert (inflated.verdict, inflated.tier) == (LEGEND_SUSPICIOUS, "patterns")
+    assert client.requests == []
+
+
+def test_copied_legend_across_rezumes():
+    analyzer, client = make_analyzer()
+
+    first = analyzer.analyze(BOILERPLATE, owner="a")
+    again = analyzer.analyze(BOILERPLATE, owner="a")               # повторная загрузка того же резюме
+    copy = analyzer.analyze(BOILERPLATE.replace("квартала", "месяца"), owner="b")
+
+    assert first.tier == again.tier == "patterns" and not again.suspicious
+    assert copy.tier == "duplicate" and copy.suspicious
+    assert copy.duplicate_of == "a" and copy.similarity >= 0.8
+    assert analyzer.stats()["indexed"] == 2
+    assert client.requests == []
+
+
+def test_anonymous_legend_is_not_copy_of_itself():
+    analyzer, client = make_analyzer()
+
+    verdicts = [analyzer.analyze(BOILERPLATE) for _ in range(3)]
+    many = analyzer.analyze_many([(BOILERPLATE, None), (BOILERPLATE, None)])
+
+    assert [(v.tier, v.verdict) for v in verdicts + many] == [("patterns", LEGEND_CLEAN)] * 5
+    assert analyzer.stats()["indexed"] == 0
+    assert client.requests == []
+
+
+def test_ambiguous_tail_goes_to_llm():
+    analyzer, client = make_analyzer(answer="0")
+
+    verdict = analyzer.analyze("Вёл ключевых клиентов банка, настраивал лимиты и проверял договоры.")
+
+    assert (verdict.verdict, verdict.tier) == (LEGEND_CLEAN, "llm")
+    assert client.requests[0].startswith("Найденные шаблоны: ключевых клиентов")
+
+
+def test_llm_failure_degrades_to_local_guess():
+    analyzer, _ = make_analyzer(answer=ConnectionError("down"))
+
+    one_hit = analyzer.analyze("Работал с ключевых клиентов сегмента.")
+    two_hits = analyzer.analyze("Работал с ключевых клиентов, увеличил продажи.")
+
+    assert (one_hit.tier, one_hit.verdict) == ("degraded", LEGEND_CLEAN)
+    assert (two_hits.tier, two_hits.verdict) == ("degraded", LEGEND_SUSPICIOUS)
+
+
+def test_bad_llm_answer_is_rejected():
+    analyzer, _ = make_analyzer(answer="да")
+    with pytest.raises(ValueError):
+        analyzer._llm.analysis_of_legend("текст", {1: "текст"})
+    assert analyzer.analyze("Вёл ключевых клиентов банка.").tier == "degraded"
+
+
+def test_rezume_score_and_llm_share():
+    analyzer, client = make_analyzer(answer="1")
+    rezume = Rezume(
+        fio=NameParts(surname="Иванов", name="Иван"),
+        born_date=date(1990, 1, 1),
+        places=[
+            PlaceWork(company="А", legend=HONEST),
+            PlaceWork(company="Б", legend="Стрессоустойчив, коммуникабелен, лидерские качества."),
+            PlaceWork(company="В", legend=None),
+        ],
+        about="Вёл ключевых клиентов банка.",
+    )
+
+    verdicts = analyzer.analyze_rezume(rezume)
+
+    assert [v.tier for v in verdicts] == ["patterns", "patterns", "empty", "llm"]
+    assert analyzer.score(rezume) == pytest.approx(2 / 3)
+    stats = analyzer.stats()
+    assert stats["total"] == 8
+    assert stats["llm_share"] == pytest.approx(2 / 8)
+    assert len(client.requests) == 2
+
+
+def test_index_is_bounded():
+    analyzer, _ = make_analyzer(max_indexed=2)
+    for owner in range(4):
+        analyzer.analyze(f"{HONEST} Вариант номер {owner} с отличиями в тексте легенды {owner * 7}.", owner=owner)
+
+    assert analyzer.stats()["indexed"] == 2
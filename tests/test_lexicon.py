@@ -0,0 +1,157 @@
+# python -m pytest tests/test_lexicon.py -v
+# -*- coding: utf-8 -*-
+
+import pytest
+
+import app.application.services.fio as fio
+from app.domain.models import FIOResult, NameParts
+from app.infrastructure.lexicon import NameLexicon
+from app.infrastructure.lexicon.name_lexicon import DEFAULT_LEXICON_PATH
+
+
+@pytest.fixture(scope="module")
+def lexicon():
+    return NameLexicon.from_file(DEFAULT_LEXICON_PATH)
+
+
+# -----------------------
+# Тесты словаря
+# -----------------------
+
+@pytest.mark.parametrize("surname", ["Иванов", "Иванова", "ИВАНОВ", "Высоцкая", "Толстая", "Шевченко", "Рабинович"])
+def test_known_surnames(lexicon, surname):
+    assert lexicon.is_surname(surname)
+
+
+@pytest.mark.parametrize(
+    "patronymic, gender",
+    [
+        ("Иванович", "male"),
+        ("Ивановна", "female"),
+        ("Сергеевич", "male"),
+        ("Анатольевна", "female"),
+        ("Игоревич", "male"),
+        ("Павлович", "male"),
+        ("Львовна", "female"),
+        ("Никитична", "female"),
+        ("Ильич", "male"),
+        ("Фёдорович", "male"),
+        ("Али оглы", "male"),
+        ("Рашид-кызы", "female"),
+        ("Факторович", None),
+        ("Кызы", None),
+        ("Дмитриевич", "male"),
+        ("Георгиевна", "female"),
+        ("Васильевич", "male"),
+        ("Евгеньевна", "female"),
+        ("Дмитрьевич", None),
+        ("Василиевич", None),
+        ("Григориевич", None),
+        ("Юриевич", None),
+        ("Евгениевич", None),
+        ("Ильична", None),
+        ("Никитинична", None),
+    ],
+)
+def test_patronymic_rules(lexicon, patronymic, gender):
+    assert lexicon.patronymic_gender(patronymic) == gender
+
+
+def test_gender_mismatch_is_not_confident(lexicon):
+    verdicts = lexicon.verdicts(NameParts(surname="Иванов", name="Мария", father_name="Иванович"))
+    assert verdicts == (0, None, None)
+
+
+@pytest.mark.parametrize(
+    "surname, name, father_name",
+    [("Иванова", "Иван", "Иванович"), ("Высоцкий", "Анна", "Сергеевна"), ("Толстой", "Анна", "Львовна")],
+)
+def test_surname_of_other_gender_is_not_confident(lexicon, surname, name, father_name):
+    assert lexicon.verdicts(NameParts(surname=surname, name=name, father_name=father_name)) == (None, 0, 0)
+
+
+def test_gender_neutral_surname_fits_both_genders(lexicon):
+    assert lexicon.surname_gender("Шевченко") == "any"
+    assert lexicon.verdicts(NameParts(surname="Шевченко", name="Анна", father_name="Ивановна")) == (0, 0, 0)
+
+
+def test_surname_gender_uses_parts_scored_elsewhere(lexicon):
+    verdicts = lexicon.verdicts(
+        NameParts(surname="Иванова", name="Иван", father_name="Иванович"),
+        needed=(True, False, False),
+    )
+    assert verdicts == (None, None, None)
+
+
+def test_only_requested_parts_are_checked(lexicon):
+    verdicts = lexicon.verdicts(
+        NameParts(surname="Иванов", name="Иван", father_name="Иванович"),
+        needed=(False, True, True),
+    )
+    assert verdicts == (None, 0, 0)
+
+
+def test_from_file_rejects_bad_lines(tmp_path):
+    path = tmp_path / "names.txt"
+    path.write_text("surname\tИванов\nнепонятно\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        NameLexicon.from_file(path)
+
+
+def test_stats_report_hit_rate():
+    lexicon = NameLexicon(surnames=["Иванов"], male_names=["Иван"])
+    lexicon.verdicts(NameParts(surname="Иванов", name="Иван", father_name="Зюзевич"))
+    lexicon.record_name(False)
+
+    stats = lexicon.stats()
+    assert stats["parts_checked"] == 3
+    assert stats["parts_hit"] == 2
+    assert stats["names_checked"] == 1
+    assert stats["llm_calls_avoided"] == 0
+
+
+# -----------------------
+# Тесты быстрого пути check_fio
+# -----------------------
+
+class RecordingLLM:
+    def __init__(self):
+        self.calls = []
+
+    def checking_FIO(self, data):
+        self.calls.append(data)
+        return FIOResult("222")
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    recording = RecordingLLM()
+    monkeypatch.setattr(fio, "get_llm", lambda: recording)
+    return recording
+
+
+def test_known_name_skips_llm(llm):
+    assert fio.check_fio(NameParts(surname="Петрова", name="Анна", father_name="Сергеевна")) == 0.0
+    assert llm.calls == []
+
+
+def test_unknown_parts_escalate_to_llm(llm):
+    result = fio._analysis_fio(NameParts(surname="Зюзякин", name="Иван", father_name="Иванович"))
+
+    assert len(llm.calls) == 1
+    assert (result.surname, result.name, result.father_name) == (2, 0, 0)
+
+
+@pytest.mark.parametrize(
+    "data, expected",
+    [
+        (NameParts(surname="Петров", name="Дмитрий", father_name="Дмитрьевич"), (0, 0, 2)),
+        (NameParts(surname="Петров", name="Юрий", father_name="Юриевич"), (0, 0, 2)),
+        (NameParts(surname="Иванова", name="Иван", father_name="Иванович"), (2, 0, 0)),
+    ],
+)
+def test_typos_and_gender_mismatch_escalate_to_llm(llm, data, expected):
+    result = fio._analysis_fio(data)
+
+    assert llm.calls == [data]
+    assert (result.surname, result.name, result.father_name) == expected
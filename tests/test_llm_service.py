@@ -0,0 +1,68 @@
+# python -m pytest tests/test_llm_service.py -v
+# -*- coding: utf-8 -*-
+
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import app.infrastructure.llm as llm
+
+
+@pytest.fixture
+def fresh_global(monkeypatch):
+    """Сбрасывает глобальный сервис на время теста."""
+    monkeypatch.setattr(llm, "_llm_service", None)
+
+
+def test_import_does_not_build_service():
+    code = (
+        "import app.application.core, app.infrastructure.llm as m; "
+        "assert m._llm_service is None"
+    )
+    proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=os.getcwd())
+    assert proc.returncode == 0, proc.stderr
+    assert proc.stdout == ""
+
+
+def test_get_llm_builds_once_across_threads(fresh_global, monkeypatch):
+    built = []
+    lock = threading.Lock()
+
+    def slow_factory():
+        time.sleep(0.05)
+        with lock:
+            built.append(object())
+        return built[-1]
+
+    monkeypatch.setattr(llm, "create_llm_service", slow_factory)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        services = list(pool.map(lambda _: llm.get_llm(), range(8)))
+
+    assert len(built) == 1
+    assert all(s is built[0] for s in services)
+
+
+def test_set_llm_overrides_and_resets(fresh_global, monkeypatch):
+    monkeypatch.setattr(llm, "create_llm_service", lambda: "built")
+    assert llm.set_llm("custom") is None
+    assert llm.get_llm() == "custom"
+
+    assert llm.set_llm(None) == "custom"
+    assert llm.get_llm() == "built"
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="нужен fork")
+def test_forked_child_builds_its_own_service(fresh_global):
+    llm.set_llm("parent")
+    pid = os.fork()
+    if pid == 0:
+        os._exit(0 if llm._llm_service is None else 1)
+    _, status = os.waitpid(pid, 0)
+    assert os.waitstatus_to_exitcode(status) == 0
+    assert llm.get_llm() == "parent"
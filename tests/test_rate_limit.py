@@ -0,0 +1,161 @@
+# python -m pytest tests/test_rate_limit.py -v
+# -*- coding: utf-8 -*-
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.infrastructure.llm.adapters import AsyncGeminiAdapter, GeminiAdapter
+from app.infrastructure.llm.rate_limit import RateLimiter, TokenBucket, estimate_tokens
+
+
+# -----------------------
+# Тесты TokenBucket и RateLimiter
+# -----------------------
+
+def test_token_bucket_reserves_in_order():
+    bucket = TokenBucket(rate=10, capacity=2)
+    now = time.monotonic()
+
+    assert bucket.reserve(1, now) == 0.0
+    assert bucket.reserve(1, now) == 0.0
+    assert bucket.reserve(1, now) == pytest.approx(0.1)
+    assert bucket.reserve(1, now) == pytest.approx(0.2)
+
+
+def test_requests_per_second_limit():
+    limiter = RateLimiter(requests_per_second=10)
+
+    started = time.monotonic()
+    for _ in range(15):
+        limiter.acquire().release()
+
+    assert time.monotonic() - started >= 0.4
+
+
+def test_tokens_per_minute_limit():
+    limiter = RateLimiter(tokens_per_minute=600)   # 10 токенов в секунду
+
+    limiter.acquire(tokens=600).release()
+    started = time.monotonic()
+    limiter.acquire(tokens=5).release()
+
+    assert time.monotonic() - started >= 0.4
+
+
+def test_concurrency_limit_is_respected():
+    limiter = RateLimiter(initial_concurrency=2, max_concurrency=2)
+    lock = threading.Lock()
+    state = {"now": 0, "max": 0}
+
+    def work(_):
+        with limiter.acquire() as slot:
+            with lock:
+                state["now"] += 1
+                state["max"] = max(state["max"], state["now"])
+            time.sleep(0.05)
+            with lock:
+                state["now"] -= 1
+            slot.report(200)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(work, range(8)))
+
+    assert state["max"] == 2
+
+
+def test_aimd_decrease_on_throttle_and_increase_on_success():
+    limiter = RateLimiter(initial_concurrency=8, max_concurrency=16, decrease_cooldown=0)
+
+    with limiter.acquire() as slot:
+        slot.report(429, retry_after=0)
+    assert limiter.concurrency_limit == 4
+
+    for _ in range(20):
+        with limiter.acquire() as slot:
+            slot.report(200)
+    assert limiter.concurrency_limit > 4
+    assert limiter.stats()["throttled"] == 1
+
+
+def test_burst_of_429_is_one_signal():
+    limiter = RateLimiter(initial_concurrency=8, decrease_cooldown=60)
+
+    for _ in range(5):
+        with limiter.acquire() as slot:
+            slot.report(503, retry_after=0)
+
+    assert limiter.concurrency_limit == 4
+
+
+def test_retry_after_pauses_new_requests():
+    limiter = RateLimiter()
+    with limiter.acquire() as slot:
+        slot.report(429, retry_after=0.3)
+
+    assert limiter.stats()["paused_for"] > 0
+    started = time.monotonic()
+    limiter.acquire().release()
+    assert time.monotonic() - started >= 0.25
+
+
+def test_async_acquire_respects_limit():
+    limiter = RateLimiter(initial_concurrency=1, max_concurrency=1)
+    active = []
+
+    async def work():
+        async with await limiter.aacquire() as slot:
+            active.append(limiter.stats()["in_flight"])
+            await asyncio.sleep(0.01)
+            slot.report(200)
+
+    async def run():
+        await asyncio.gather(*(work() for _ in range(5)))
+
+    asyncio.run(run())
+    assert active == [1] * 5
+
+
+def test_estimate_tokens_includes_output_budget():
+    assert estimate_tokens("a" * 30, "b" * 30, {"maxOutputTokens": 3}) == 24
+
+
+# -----------------------
+# Тесты адаптеров с общим лимитером
+# -----------------------
+
+def test_sync_adapter_backs_off_through_limiter(stub):
+    stub.fail_first = 2
+    limiter = RateLimiter(decrease_cooldown=0)
+    adapter = GeminiAdapter(endpoint=stub.url + "/generateContent", rate_limiter=limiter)
+
+    assert adapter.generate_content("s", "u") == "002"
+    assert stub.requests == 3
+    stats = limiter.stats()
+    assert stats["throttled"] == 2
+    assert stats["succeeded"] == 1
+    assert stats["in_flight"] == 0
+
+
+def test_sync_adapter_gives_up_after_throttle_retries(stub):
+    stub.fail_first = 100
+    stub.error_status = 503
+    adapter = GeminiAdapter(endpoint=stub.url + "/generateContent", rate_limiter=RateLimiter())
+
+    assert adapter.generate_content("s", "u") is None
+    assert stub.requests == 4
+
+
+def test_async_adapter_reports_to_shared_limiter(stub):
+    stub.fail_first = 1
+    limiter = RateLimiter()
+
+    async def run():
+        async with AsyncGeminiAdapter(endpoint=stub.url + "/generateContent", rate_limiter=limiter) as client:
+            return await client.agenerate_content("s", "u")
+
+    assert asyncio.run(run()) == "002"
+    assert limiter.stats()["throttled"] == 1
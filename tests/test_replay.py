@@ -0,0 +1,134 @@
+# python -m pytest tests/test_replay.py -v
+# -*- coding: utf-8 -*-
+
+import json
+
+import pytest
+
+from app.application.services.fio import check_fio
+from app.domain.models import NameParts
+from app.infrastructure.llm import LLMRequestError, LLMUnavailableError, create_llm_service
+from app.config import CONFIG
+from app.infrastructure.llm import CircuitState
+from app.infrastructure.llm.adapters import GeminiAdapter, ReplayAdapter, ReplayMissError, replay_key
+from app.infrastructure.llm.cache import FIOCache
+from app.infrastructure.llm.rate_limit import RateLimiter
+
+
+NAME = NameParts(surname="Зюзякин", name="Иван", father_name="Иванович")
+
+
+def record(stub, path, answer="200"):
+    stub.answer = answer
+    upstream = GeminiAdapter(endpoint=stub.url + "/generateContent", rate_limiter=RateLimiter())
+    service = create_llm_service("replay", path=str(path), mode="record", upstream=upstream, cache=FIOCache())
+    score = check_fio(NAME, llm=service)
+    service.close()
+    return score
+
+
+def test_record_then_replay_offline(stub, tmp_path):
+    path = tmp_path / "fio.replay.jsonl"
+    recorded = record(stub, path)
+    requests_after_record = stub.requests
+
+    service = create_llm_service("replay", path=str(path), cache=FIOCache())
+    replayed = check_fio(NAME, llm=service)
+
+    assert replayed == recorded > 0
+    assert stub.requests == requests_after_record     # сеть при воспроизведении не используется
+    service.close()
+
+
+def test_file_is_compact_and_has_no_plain_text(stub, tmp_path):
+    path = tmp_path / "fio.replay.jsonl"
+    record(stub, path)
+
+    lines = path.read_text(encoding="utf-8").splitlines()
+
+    assert json.loads(lines[0]) == {"model": "gemini-2.0-flash"}
+    assert len(lines) == 2
+    assert "Зюзякин" not in path.read_text(encoding="utf-8")
+    assert len(json.loads(lines[1])["k"]) == 32
+
+
+def test_replay_uses_recorded_model_for_cache_namespace(stub, tmp_path):
+    path = tmp_path / "fio.replay.jsonl"
+    record(stub, path)
+
+    assert ReplayAdapter(str(path)).model == "gemini-2.0-flash"
+
+
+def test_replay_miss_does_not_open_circuit(stub, tmp_path):
+    path = tmp_path / "fio.replay.jsonl"
+    recorded = record(stub, path)
+    service = create_llm_service("replay", path=str(path), cache=FIOCache())
+
+    for i in range(10):
+        with pytest.raises(ReplayMissError):
+            check_fio(NameParts(surname=f"Зюзякин{'а' * (i + 1)}", name="Иван", father_name="Иванович"), llm=service)
+
+    # Промах — пробел в записи, а не сбой провайдера: записанные ФИО по-прежнему отвечают
+    assert service.breaker.state is CircuitState.CLOSED
+    assert check_fio(NAME, llm=service) == recorded
+    assert isinstance(ReplayMissError("x"), LLMUnavailableError)
+
+
+def test_record_with_warm_disk_cache_still_records(stub, tmp_path, monkeypatch):
+    cache_path = str(tmp_path / "fio_cache.sqlite")
+    monkeypatch.setitem(CONFIG, "FIO_CACHE_PATH", cache_path)
+    upstream = GeminiAdapter(endpoint=stub.url + "/generateContent", rate_limiter=RateLimiter())
+    stub.answer = "200"
+
+    # Прогрев общего дискового кэша обычным сервисом
+    for _ in range(2):
+        warm = create_llm_service("gemini", endpoint=stub.url + "/generateContent", rate_limiter=RateLimiter())
+        expected = check_fio(NAME, llm=warm)
+        warm.close()
+    assert stub.requests == 1                         # второй сервис ответил из дискового кэша
+
+    path = tmp_path / "fio.replay.jsonl"
+    recorder = create_llm_service("replay", path=str(path), mode="record", upstream=upstream)
+    requests_before = stub.requests
+    check_fio(NAME, llm=recorder)
+    recorder.close()
+    assert stub.requests == requests_before + 1
+
+    service = create_llm_service("replay", path=str(path), cache=FIOCache())
+    assert check_fio(NAME, llm=service) == expected
+
+
+def test_replay_default_answer_and_stats(tmp_path):
+    path = tmp_path / "fio.replay.jsonl"
+    path.write_text(
+        '{"model": "m"}\n' + json.dumps({"k": replay_key("p", "known"), "r": "024"}) + "\n",
+        encoding="utf-8",
+    )
+    adapter = ReplayAdapter(str(path), default="000")
+
+    assert adapter.generate_content("p", "known") == "024"
+    assert adapter.generate_content("p", "unknown") == "000"
+    assert adapter.stats() == {"mode": "replay", "entries": 1, "hits": 1, "misses": 1, "recorded": 0}
+
+
+def test_record_skips_failures(stub, tmp_path):
+    stub.fail_first = 100
+    stub.error_status = 400
+    upstream = GeminiAdapter(endpoint=stub.url + "/generateContent", rate_limiter=RateLimiter())
+    adapter = ReplayAdapter(str(tmp_path / "r.jsonl"), mode="record", upstream=upstream)
+
+    with pytest.raises(LLMRequestError):
+        adapter.generate_content("p", "x")
+    assert len(adapter) == 0
+    adapter.close()
+
+
+def test_invalid_configuration(tmp_path):
+    with pytest.raises(ValueError):
+        create_llm_service("replay", path=None)
+    with pytest.raises(FileNotFoundError):
+        ReplayAdapter(str(tmp_path / "missing.jsonl"))
+    with pytest.raises(ValueError):
+        ReplayAdapter(str(tmp_path / "r.jsonl"), mode="record")
+    with pytest.raises(ValueError):
+        ReplayAdapter(str(tmp_path / "r.jsonl"), mode="rewind")
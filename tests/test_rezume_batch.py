@@ -0,0 +1,177 @@
+# python -m pytest tests/test_rezume_batch.py -v
+# -*- coding: utf-8 -*-
+
+import random
+import sys
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+import app.application.core as core
+from app.application.core import CoreML
+from app.application.services.age_education_analysis import analyze_age_education_comprehensive
+from app.application.services.age_education_columnar import analyze_age_education_batch
+from app.application.services.company import analyze_company, analyze_company_batch
+from app.application.services.education import analyze_education, analyze_education_batch
+from app.domain.batch import RezumeBatch
+from app.domain.models import Education, EducationEntry, NameParts, PlaceWork, Rezume
+from tests.test_core import fake_fio, make_rezume  # noqa: F401 - фикстура
+
+
+CITIES = ["Москва", "москва", "Санкт-Петербург", "Казань", None, ""]
+SURNAMES = ["Иванов", "Петров", "Сидоров", "Подмена", "Кузнецов"]
+
+
+def random_date(rng: random.Random, start: int = 1960, end: int = 2024):
+    if rng.random() < 0.15:
+        return None
+    return date(start, 1, 1) + timedelta(days=rng.randrange((end - start) * 365))
+
+
+def random_rezume(rng: random.Random) -> Rezume:
+    places = [
+        PlaceWork(
+            company=rng.choice(["ООО Ромашка", "АО Вектор", None]),
+            start_date=random_date(rng, 1975),
+            end_date=random_date(rng, 1975),
+            position=rng.choice(["Инженер", None]),
+        )
+        for _ in range(rng.randrange(4))
+    ]
+    items = [
+        EducationEntry(
+            university=rng.choice(["МГУ", "", None]),
+            city=rng.choice(CITIES),
+            faculty=rng.choice(["ВМК", "", None]),
+            end_date=random_date(rng, 1975),
+        )
+        for _ in range(rng.randrange(3))
+    ]
+    return Rezume(
+        fio=NameParts(surname=rng.choice(SURNAMES), name=rng.choice(["Иван", "Пётр"]), father_name=rng.choice(["", "Иванович"])),
+        born_date=random_date(rng),
+        phone=rng.choice([None, "+7 999 000-00-00"]),
+        residence_city=rng.choice(CITIES),
+        experience_years=rng.choice([None, 0, 5, 12]),
+        places=places,
+        education=Education(higher=rng.choice([None, True, False]), items=items),
+        skills=rng.sample(["Python", "SQL", "Git", "Docker"], rng.randrange(4)),
+        about=rng.choice([None, "О себе"]),
+    )
+
+
+@pytest.fixture(scope="module")
+def rezumes():
+    rng = random.Random(14)
+    return [random_rezume(rng) for _ in range(400)]
+
+
+def first_work(rezume):
+    starts = [p.start_date for p in rezume.places if p.start_date is not None]
+    return min(starts) if starts else None
+
+
+def test_round_trip(rezumes):
+    batch = RezumeBatch.from_rezumes(rezumes)
+
+    assert len(batch) == len(rezumes)
+    assert batch.to_rezumes() == rezumes
+    assert batch[7].to_rezume() == rezumes[7]
+
+
+def test_view_fields_match_source(rezumes):
+    batch = RezumeBatch.from_rezumes(rezumes)
+
+    for view, rezume in zip(batch, rezumes):
+        assert view.fio == rezume.fio
+        assert view.born_date == rezume.born_date
+        assert view.residence_city == rezume.residence_city
+        assert len(view.places) == len(rezume.places)
+        assert [p.start_date for p in view.places] == [p.start_date for p in rezume.places]
+        assert view.education.higher == rezume.education.higher
+        assert [e.city for e in view.education.items] == [e.city for e in rezume.education.items]
+        assert view.skills == rezume.skills
+
+
+def test_scalar_services_accept_views(rezumes):
+    batch = RezumeBatch.from_rezumes(rezumes[:50])
+
+    for view, rezume in zip(batch, rezumes):
+        assert analyze_education(view.education, view.residence_city) == analyze_education(
+            rezume.education, rezume.residence_city
+        )
+        assert analyze_company(view.places) == analyze_company(rezume.places)
+
+
+def test_batch_rules_match_scalar(rezumes):
+    batch = RezumeBatch.from_rezumes(rezumes)
+
+    expected_ae = [
+        analyze_age_education_comprehensive(r.born_date, first_work(r), r.education) for r in rezumes
+    ]
+    expected_edu = [analyze_education(r.education, r.residence_city) for r in rezumes]
+    expected_comp = [analyze_company(r.places) for r in rezumes]
+
+    np.testing.assert_allclose(analyze_age_education_batch(batch), expected_ae)
+    assert analyze_education_batch(batch).tolist() == expected_edu
+    assert analyze_company_batch(batch).tolist() == expected_comp
+
+
+def test_unique_names_maps_back(rezumes):
+    batch = RezumeBatch.from_rezumes(rezumes)
+
+    names, inverse = batch.unique_names()
+
+    assert len(names) < len(rezumes)
+    assert [names[i] for i in inverse] == [r.fio for r in rezumes]
+
+
+def test_score_batch_accepts_rezume_batch(fake_fio, rezumes):
+    model = CoreML(max_in_flight=2, chunk_size=7)
+
+    expected = model.score_batch(rezumes)
+    actual = model.score_batch(RezumeBatch.from_rezumes(rezumes))
+
+    assert [r.score for r in actual] == [r.score for r in expected]
+    assert all(r.ok for r in actual)
+
+
+def test_score_rezume_batch_checks_each_name_once(monkeypatch):
+    calls = []
+
+    def _check(data: NameParts, llm=None) -> float:
+        calls.append(data.surname)
+        if data.surname == "Сбой":
+            raise RuntimeError("llm down")
+        return 0.5
+
+    monkeypatch.setattr(core, "check_fio", _check)
+    rezumes = [make_rezume("Иванов"), make_rezume("Сбой"), make_rezume("Иванов"), make_rezume("Петров")]
+
+    results = CoreML(max_in_flight=2).score_batch(RezumeBatch.from_rezumes(rezumes))
+
+    assert sorted(calls) == ["Иванов", "Петров", "Сбой"]
+    assert results[0].score == results[2].score
+    assert not results[1].ok and "llm down" in results[1].error
+    assert results[3].ok
+
+
+def test_batch_is_more_compact_than_objects(rezumes):
+    batch = RezumeBatch.from_rezumes(rezumes)
+
+    def deep_size(obj, seen=None):
+        seen = set() if seen is None else seen
+        if id(obj) in seen:
+            return 0
+        seen.add(id(obj))
+        size = sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            size += sum(deep_size(k, seen) + deep_size(v, seen) for k, v in obj.items())
+        elif isinstance(obj, (list, tuple)):
+            size += sum(deep_size(v, seen) for v in obj)
+        elif hasattr(obj, "__dict__"):
+            size += deep_size(vars(obj), seen)
+        return size
+
+    assert batch.nbytes < deep_size(rezumes) / 4
@@ -0,0 +1,126 @@
+# python -m pytest tests/test_singleflight.py -v
+# -*- coding: utf-8 -*-
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.domain.models import NameParts
+from app.infrastructure.llm import LLMService
+from app.infrastructure.llm.llm_client import AsyncLLMClient, LLMClient
+from app.infrastructure.llm.singleflight import SingleFlight
+
+
+class SlowClient(LLMClient, AsyncLLMClient):
+    """Медленный LLM-клиент (синхронный и асинхронный), считающий запросы."""
+
+    def __init__(self, delay=0.2):
+        self.delay = delay
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def generate_content(self, system_prompt, user_text, generation_config=None):
+        with self.lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        return "002"
+
+    async def agenerate_content(self, system_prompt, user_text, generation_config=None):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return "002"
+
+    def close(self) -> None:
+        pass
+
+    async def aclose(self) -> None:
+        pass
+
+
+IVANOV = NameParts(surname="Иванов", name="Иван", father_name="Иванович")
+
+
+def test_threads_share_one_call():
+    flight = SingleFlight()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.2)
+        return 42
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: flight.do("k", slow), range(8)))
+
+    assert results == [42] * 8
+    assert len(calls) == 1
+    assert flight.stats()["coalesced"] == 7
+
+
+def test_exception_reaches_all_waiters():
+    flight = SingleFlight()
+
+    def failing():
+        time.sleep(0.1)
+        raise RuntimeError("boom")
+
+    def call(_):
+        with pytest.raises(RuntimeError):
+            flight.do("k", failing)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(call, range(4)))
+
+    assert flight.stats()["in_flight"] == 0
+
+
+def test_different_keys_are_not_coalesced():
+    flight = SingleFlight()
+    assert flight.do("a", lambda: 1) == 1
+    assert flight.do("b", lambda: 2) == 2
+    assert flight.stats()["coalesced"] == 0
+
+
+def test_async_callers_share_one_task():
+    flight = SingleFlight()
+    calls = []
+
+    async def slow():
+        calls.append(1)
+        await asyncio.sleep(0.1)
+        return "ok"
+
+    async def run():
+        return await asyncio.gather(*(flight.ado("k", slow) for _ in range(10)))
+
+    assert asyncio.run(run()) == ["ok"] * 10
+    assert len(calls) == 1
+    assert flight.stats()["coalesced"] == 9
+
+
+def test_service_coalesces_threaded_duplicates():
+    client = SlowClient()
+    service = LLMService(client)
+
+    with ThreadPoolExecutor(max_workers=10) as pool:
+        results = list(pool.map(lambda _: service.checking_FIO(IVANOV), range(10)))
+
+    assert all(r.father_name == 2 for r in results)
+    assert client.calls == 1
+    assert service.stats()["coalescing"]["coalesced"] == 9
+
+
+def test_service_coalesces_async_duplicates():
+    client = SlowClient(delay=0.1)
+    service = LLMService(client, async_client=client)
+
+    async def run():
+        return await asyncio.gather(*(service.acheck_fio(IVANOV) for _ in range(20)))
+
+    results = asyncio.run(run())
+
+    assert all(r.father_name == 2 for r in results)
+    assert client.calls == 1
@@ -0,0 +1,160 @@
+# python -m pytest tests/test_telemetry.py -v
+# -*- coding: utf-8 -*-
+
+import json
+
+import pytest
+
+from app.application.core import CoreML
+from app.config import CONFIG
+from app.infrastructure.llm.adapters import GeminiAdapter
+from app.infrastructure.llm.rate_limit import RateLimiter
+from app.infrastructure.telemetry import (
+    MemorySink,
+    OTLPJsonlExporter,
+    PrometheusSink,
+    configure_telemetry,
+    get_sink,
+    set_sink,
+    span,
+)
+from app.infrastructure.telemetry.sinks import SpanRecord
+from tests.test_core import fake_fio, make_rezume  # noqa: F401 - фикстура
+
+
+@pytest.fixture
+def sink():
+    memory = MemorySink()
+    previous = set_sink(memory)
+    yield memory
+    set_sink(previous)
+
+
+def record(name, duration, **attributes):
+    return SpanRecord(
+        name=name, trace_id="t" * 32, span_id="s" * 16, parent_id=None,
+        start_ns=1_000_000_000, duration=duration, attributes=attributes,
+    )
+
+
+def test_disabled_spans_are_shared_noop():
+    assert get_sink() is None
+    first, second = span("a", x=1), span("b")
+
+    assert first is second
+    with first as s:
+        s.set("status", 200)
+
+
+def test_nested_spans_share_trace(sink):
+    with span("outer") as outer:
+        with span("inner", size=3):
+            pass
+        outer.set("status", 200)
+
+    inner, outer_record = sink.spans
+    assert (inner.name, outer_record.name) == ("inner", "outer")
+    assert inner.trace_id == outer_record.trace_id
+    assert inner.parent_id == outer_record.span_id
+    assert outer_record.parent_id is None
+    assert outer_record.attributes == {"status": 200}
+    assert inner.duration <= outer_record.duration
+
+
+def test_exception_is_recorded_and_propagated(sink):
+    with pytest.raises(KeyError):
+        with span("boom"):
+            raise KeyError("x")
+
+    assert sink.by_name("boom")[0].attributes["error"] == "KeyError"
+
+
+def test_get_score_spans_each_service(sink, fake_fio):
+    CoreML().get_score(make_rezume("Иванов"))
+
+    names = [s.name for s in sink.spans]
+    assert names == ["core.fio", "core.age_education", "core.education", "core.company", "core.score"]
+    score = sink.by_name("core.score")[0]
+    assert all(s.parent_id == score.span_id for s in sink.spans if s is not score)
+    assert score.attributes["degraded"] is False
+
+
+def test_http_attempts_and_parsing(sink, stub):
+    stub.fail_first = 1                     # первая попытка — 429 с Retry-After: 0
+    adapter = GeminiAdapter(endpoint=stub.url + "/generateContent", rate_limiter=RateLimiter())
+
+    assert adapter.generate_content("p", "Иванов Иван") == stub.answer
+    adapter.close()
+
+    attempts = sink.by_name("llm.http")
+    assert [(a.attributes["attempt"], a.attributes["status"]) for a in attempts] == [(1, 429), (2, 200)]
+    assert all(a.attributes["retries"] == 0 for a in attempts)
+    assert len(sink.by_name("llm.acquire")) == 2
+    assert sink.by_name("llm.parse")[0].attributes == {"provider": "gemini"}
+
+
+def test_prometheus_exposition():
+    sink = PrometheusSink(buckets=(0.01, 0.1))
+    sink.record(record("llm.http", 0.005, status=200, attempt=1))
+    sink.record(record("llm.http", 0.05, status=200, attempt=2))
+    sink.record(record("llm.http", 0.5, status=429))
+    sink.record(record('odd"name', 0.001))
+
+    text = sink.render()
+
+    assert "# TYPE wolfeye_span_duration_seconds histogram" in text
+    assert 'wolfeye_span_duration_seconds_bucket{span="llm.http",status="200",le="0.01"} 1' in text
+    assert 'wolfeye_span_duration_seconds_bucket{span="llm.http",status="200",le="0.1"} 2' in text
+    assert 'wolfeye_span_duration_seconds_bucket{span="llm.http",status="429",le="+Inf"} 1' in text
+    assert 'wolfeye_span_duration_seconds_count{span="llm.http",status="200"} 2' in text
+    assert 'span="odd\\"name"' in text
+    assert "attempt" not in text
+
+
+def test_prometheus_writes_file_on_close(tmp_path):
+    path = tmp_path / "wolfeye.prom"
+    sink = PrometheusSink(path=str(path))
+    sink.record(record("core.score", 0.002))
+
+    sink.close()
+
+    assert 'span="core.score"' in path.read_text(encoding="utf-8")
+
+
+def test_otlp_jsonl_exporter(tmp_path, sink):
+    path = tmp_path / "spans.jsonl"
+    exporter = OTLPJsonlExporter(str(path), batch_size=2)
+    set_sink(exporter)
+    with span("outer", degraded=False):
+        with span("inner", status=200, ratio=0.5, provider="gemini"):
+            pass
+    exporter.close()
+
+    batch = json.loads(path.read_text(encoding="utf-8").splitlines()[0])
+    spans = batch["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    inner, outer = spans
+    assert inner["parentSpanId"] == outer["spanId"] and "parentSpanId" not in outer
+    assert int(inner["endTimeUnixNano"]) >= int(inner["startTimeUnixNano"])
+    values = {a["key"]: a["value"] for a in inner["attributes"]}
+    assert values == {
+        "status": {"intValue": "200"},
+        "ratio": {"doubleValue": 0.5},
+        "provider": {"stringValue": "gemini"},
+    }
+    assert outer["attributes"] == [{"key": "degraded", "value": {"boolValue": False}}]
+
+
+def test_configure_telemetry(tmp_path, monkeypatch):
+    monkeypatch.setitem(CONFIG, "TELEMETRY_OTLP_PATH", str(tmp_path / "spans.jsonl"))
+    monkeypatch.setitem(CONFIG, "TELEMETRY_PROMETHEUS_PATH", str(tmp_path / "wolfeye.prom"))
+    previous = get_sink()
+    try:
+        assert configure_telemetry("") is None
+        sink = configure_telemetry("otlp, prometheus")
+        assert get_sink() is sink
+        with pytest.raises(ValueError):
+            configure_telemetry("statsd")
+    finally:
+        configured = set_sink(previous)
+        if configured is not None:
+            configured.close()
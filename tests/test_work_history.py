@@ -0,0 +1,99 @@
+# python -m pytest tests/test_work_history.py -v
+# -*- coding: utf-8 -*-
+
+import copy
+from datetime import date
+
+from app.domain.batch import RezumeBatch
+from app.domain.models import NameParts, PlaceWork, Rezume
+from app.domain.work_history import WorkHistory
+
+
+def place(company, start=None, end=None):
+    return PlaceWork(company=company, start_date=start, end_date=end)
+
+
+def rezume(*places):
+    return Rezume(fio=NameParts(surname="Иванов", name="Иван"), places=list(places))
+
+
+def test_empty_history():
+    history = WorkHistory([], as_of=date(2024, 1, 1))
+
+    assert history.first_work is None and history.last_end is None
+    assert history.tenure_days == 0
+    assert history.gaps == [] and history.overlaps == []
+
+
+def test_sorted_places_tenure_and_gaps():
+    b = place("Б", date(2020, 1, 1), date(2021, 1, 1))
+    a = place("А", date(2015, 1, 1), date(2016, 1, 1))
+    undated = place("Без даты")
+    c = place("В", date(2021, 1, 1), None)                  # продолжается
+
+    history = WorkHistory([b, undated, c, a], as_of=date(2022, 1, 1))
+
+    assert history.places == (a, b, c)
+    assert history.undated == (undated,)
+    assert history.first_work == date(2015, 1, 1)
+    assert history.last_end == date(2022, 1, 1)
+    assert history.gaps == [(date(2016, 1, 1), date(2020, 1, 1))]
+    assert history.longest_gap_days == (date(2020, 1, 1) - date(2016, 1, 1)).days
+    assert history.tenure_days == 365 + 366 + 365
+    assert history.overlaps == []                           # стык дат — не пересечение
+
+
+def test_overlaps_are_counted_once_in_tenure():
+    main = place("Основная", date(2020, 1, 1), date(2020, 12, 31))
+    side = place("Подработка", date(2020, 3, 1), date(2020, 4, 1))
+    tail = place("Хвост", date(2020, 12, 1), date(2021, 2, 1))
+
+    history = WorkHistory([tail, side, main], as_of=date(2024, 1, 1))
+
+    assert history.overlaps == [(main, side), (main, tail)]
+    assert history.tenure_days == (date(2021, 2, 1) - date(2020, 1, 1)).days
+    assert history.gaps == []
+
+
+def test_end_before_start_is_one_day_place():
+    history = WorkHistory([place("А", date(2020, 5, 1), date(2019, 1, 1))], as_of=date(2024, 1, 1))
+
+    assert history.tenure_days == 0 and history.last_end == date(2020, 5, 1)
+
+
+def test_rezume_caches_index_until_places_change():
+    model = rezume(place("А", date(2019, 1, 1), date(2020, 1, 1)))
+    first = model.work_history
+
+    assert model.work_history is first
+    assert model.first_work == date(2019, 1, 1)
+
+    model.places.append(place("Б", date(2017, 1, 1), date(2018, 1, 1)))
+    assert model.work_history is not first
+    assert model.first_work == date(2017, 1, 1)
+
+    model.places[0].start_date = date(2016, 1, 1)            # изменение самого места
+    assert model.first_work == date(2016, 1, 1)
+
+    model.places = []
+    assert model.first_work is None
+
+
+def test_cache_does_not_affect_equality_or_copies():
+    model = rezume(place("А", date(2019, 1, 1)))
+    other = rezume(place("А", date(2019, 1, 1)))
+    model.work_history
+
+    assert model == other
+    copied = model.model_copy(update={"places": [place("Б", date(2010, 1, 1))]})
+    assert copied.first_work == date(2010, 1, 1)
+    assert model.first_work == date(2019, 1, 1)
+    assert copy.deepcopy(model).work_history is not model.work_history
+
+
+def test_batch_view_matches_model():
+    model = rezume(place("Б", date(2020, 1, 1), date(2021, 1, 1)), place("А", date(2015, 1, 1), date(2016, 1, 1)))
+    view = RezumeBatch.from_rezumes([model])[0]
+
+    assert view.first_work == model.first_work
+    assert view.work_history.gaps == model.work_history.gaps